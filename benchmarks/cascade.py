@@ -0,0 +1,180 @@
+"""
+Cost, latency and agreement of the model cascade on the labeled fixtures.
+
+Runs detection over every labeled pre-screen passage with the strong model
+alone, the screening model alone and the cascade at each escalation
+threshold, and reports per configuration::
+
+    python -m benchmarks.cascade
+
+By default both models are served by the local stand-ins, which answer a
+labeled passage from its label and get a model-specific share of them
+wrong (``--strong-error``/``--screening-error``). ``--live`` uses the real
+API from the environment instead, which is what the threshold should be
+tuned on before changing ``cascade_min_confidence``.
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fallacy_detector.analyzer import FallacyAnalyzer
+from fallacy_detector.config import AnalysisConfig
+from fallacy_detector.metrics import track_analysis
+
+from .prescreen import FIXTURE, load_labeled
+from .run import summarize
+from .stubs import StubConfig, StubServer
+
+THRESHOLDS = ("High", "Medium", "Low")
+
+
+def run_detection(
+    analyzer: FallacyAnalyzer, labeled: List[Tuple[str, bool]]
+) -> Dict[str, Any]:
+    """Detect over every passage; verdicts, detection calls, cost and latency."""
+    verdicts, latencies = [], []
+    calls, cost = 0, 0.0
+    for text, _ in labeled:
+        with track_analysis() as metrics:
+            detection = analyzer._detect(text)
+        summary = metrics.to_dict()
+        verdicts.append(analyzer._finds_fallacies(detection))
+        latencies.append(summary["processing_time"])
+        calls += sum(
+            1 for m in metrics.stages if m.stage == "detection" and not m.cached
+        )
+        cost += summary["cost"]["total"]
+    return {"verdicts": verdicts, "latencies": latencies, "calls": calls, "cost": cost}
+
+
+def score(
+    run: Dict[str, Any], labeled: List[Tuple[str, bool]], reference: List[bool]
+) -> Dict[str, Any]:
+    """Precision/recall against the labels and agreement with the strong model."""
+    labels = [has_fallacy for _, has_fallacy in labeled]
+    verdicts = run["verdicts"]
+    true_positives = sum(v and l for v, l in zip(verdicts, labels))
+    flagged = sum(verdicts)
+    return {
+        "precision": true_positives / flagged if flagged else 0.0,
+        "recall": true_positives / sum(labels) if any(labels) else 0.0,
+        "agreement": sum(v == r for v, r in zip(verdicts, reference)) / len(reference),
+        "detection_calls": run["calls"],
+        "cost_usd": run["cost"],
+        "latency": summarize(run["latencies"]),
+    }
+
+
+def bench_cascade(
+    make_config: Callable[..., AnalysisConfig],
+    labeled: List[Tuple[str, bool]],
+    strong_model: str,
+    screening_model: str,
+) -> Dict[str, Any]:
+    """Score the strong model, the screening model and the cascade per threshold."""
+    strong = run_detection(
+        FallacyAnalyzer(make_config(model_name=strong_model)), labeled
+    )
+    reference = strong["verdicts"]
+    report: Dict[str, Any] = {
+        "strong": score(strong, labeled, reference),
+        "screening": score(
+            run_detection(
+                FallacyAnalyzer(make_config(model_name=screening_model)), labeled
+            ),
+            labeled,
+            reference,
+        ),
+    }
+    for threshold in THRESHOLDS:
+        analyzer = FallacyAnalyzer(
+            make_config(
+                model_name=strong_model,
+                cascade_model=screening_model,
+                cascade_min_confidence=threshold,
+            )
+        )
+        report[f"cascade_{threshold.lower()}"] = dict(
+            score(run_detection(analyzer, labeled), labeled, reference),
+            cascade=analyzer.cascade.stats(),
+        )
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Model cascade cost, latency and agreement"
+    )
+    parser.add_argument("--fixture", default=str(FIXTURE), help="Labeled JSONL file")
+    parser.add_argument(
+        "--strong-model", default="gpt-4.1", help="Detection model escalated to"
+    )
+    parser.add_argument(
+        "--screening-model", default="gpt-4.1-nano", help="Cheap screening model"
+    )
+    parser.add_argument(
+        "--strong-error",
+        type=float,
+        default=0.05,
+        help="Stub error rate of the strong model",
+    )
+    parser.add_argument(
+        "--screening-error",
+        type=float,
+        default=0.25,
+        help="Stub error rate of the screening model",
+    )
+    parser.add_argument(
+        "--llm-latency", type=float, default=0.05, help="Stub time to first token (s)"
+    )
+    parser.add_argument(
+        "--live",
+        action="store_true",
+        help="Call the real API configured in the environment",
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    labeled = load_labeled(Path(args.fixture))
+    report: Dict[str, Any] = {
+        "examples": len(labeled),
+        "positives": sum(has_fallacy for _, has_fallacy in labeled),
+        "strong_model": args.strong_model,
+        "screening_model": args.screening_model,
+    }
+    if args.live:
+
+        def live_config(**config: Any) -> AnalysisConfig:
+            return AnalysisConfig(
+                cache_enabled=False, fetch_cache_enabled=False, **config
+            )
+
+        report["configurations"] = bench_cascade(
+            live_config, labeled, args.strong_model, args.screening_model
+        )
+    else:
+        stub_config = StubConfig(
+            llm_latency=args.llm_latency,
+            tokens_per_second=2000.0,
+            labels={text: has_fallacy for text, has_fallacy in labeled},
+            model_error_rates={
+                args.strong_model: args.strong_error,
+                args.screening_model: args.screening_error,
+            },
+        )
+        with StubServer(stub_config) as stubs:
+            report["configurations"] = bench_cascade(
+                stubs.analysis_config, labeled, args.strong_model, args.screening_model
+            )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Accuracy and speed of the local pre-screen on the labeled fixture set.
+
+Reports precision/recall per threshold and the scoring time per
+article-sized input as JSON::
+
+    python -m benchmarks.prescreen
+"""
+
+import argparse
+import json
+import timeit
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from fallacy_detector.prescreen import PreScreener, evaluate
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "prescreen_labeled.jsonl"
+
+
+def load_labeled(path: Path = FIXTURE) -> List[Tuple[str, bool]]:
+    """Read ``{"text", "has_fallacy"}`` JSON lines."""
+    with open(path, encoding="utf-8") as f:
+        return [
+            (item["text"], bool(item["has_fallacy"]))
+            for item in map(json.loads, f)
+            if item
+        ]
+
+
+def time_scoring(
+    screener: PreScreener, labeled: List[Tuple[str, bool]], chars: int, number: int
+) -> Dict[str, float]:
+    """Microseconds to score a ``chars``-long article built from the fixtures."""
+
+    def article(texts: List[str]) -> str:
+        text = " ".join(texts)
+        return (text * (chars // max(1, len(text)) + 1))[:chars]
+
+    samples = {
+        "mixed": article([text for text, _ in labeled]),
+        "neutral": article([text for text, has_fallacy in labeled if not has_fallacy]),
+    }
+    return {
+        f"{name}_us": timeit.timeit(lambda: screener.score(text), number=number)
+        / number
+        * 1e6
+        for name, text in samples.items()
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Pre-screen precision/recall and speed"
+    )
+    parser.add_argument("--fixture", default=str(FIXTURE), help="Labeled JSONL file")
+    parser.add_argument(
+        "--thresholds", default="0.5,1,1.5,2", help="Comma-separated score thresholds"
+    )
+    parser.add_argument(
+        "--chars", type=int, default=5000, help="Article length for the timing run"
+    )
+    parser.add_argument("--number", type=int, default=2000, help="Timing iterations")
+    args = parser.parse_args(argv)
+
+    screener = PreScreener()
+    labeled = load_labeled(Path(args.fixture))
+    report: Dict[str, Any] = {
+        "examples": len(labeled),
+        "positives": sum(has_fallacy for _, has_fallacy in labeled),
+        "thresholds": [
+            evaluate(screener, labeled, float(t)) for t in args.thresholds.split(",")
+        ],
+        "timing": time_scoring(screener, labeled, args.chars, args.number),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,859 @@
+"""
+Offline benchmark suite for the Fallacy Detector.
+
+Runs the real analyzer against the local stand-ins in :mod:`benchmarks.stubs`
+and reports the results as JSON, so they can be compared across commits.
+Scenarios (one report section each):
+
+- startup time and prompt size
+- page extraction and near-duplicate lookups
+- corpus parsing in worker processes
+- condensation and fallacy statistics
+- end-to-end latency, throughput under concurrency and memory per analysis
+- long-article detection and staged vs fused pipeline
+- the search/page cache and the results store
+- the resident server
+
+Usage::
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --compare bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from fallacy_detector.aggregate import CONFIDENCE_LEVELS, FallacyStats, day_number
+from fallacy_detector.analyzer import FallacyAnalyzer
+from fallacy_detector.catalog import load_catalog
+from fallacy_detector.client import AnalysisClient
+from fallacy_detector.condense import Condenser, TokenCounter
+from fallacy_detector.corpus import aanalyze_corpus, iter_corpus
+from fallacy_detector.dedup import NearDuplicateIndex
+from fallacy_detector.detection import parse_detection_text
+from fallacy_detector.prompts import FALLACY_DETECTION_PROMPT
+from fallacy_detector.server import AnalysisServer
+from fallacy_detector.store import ResultStore, content_hash
+from fallacy_detector.utils import clean_article_text
+
+from .prescreen import load_labeled
+from .stubs import ARTICLE_SENTENCES, StubConfig, StubServer
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    index = max(
+        0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1)
+    )
+    return ordered[index]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """Mean/p50/p95/max of a sample."""
+    return {
+        "mean": statistics.mean(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "max": max(values),
+    }
+
+
+def git_commit() -> str:
+    """Return the current commit hash, or '' outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+STARTUP_SNIPPETS = {
+    "import_seconds": "import fallacy_detector",
+    "import_analyzer_seconds": "from fallacy_detector import FallacyAnalyzer",
+    "cold_init_seconds": (
+        "from fallacy_detector import AnalysisConfig, FallacyAnalyzer; "
+        "FallacyAnalyzer(AnalysisConfig(openai_api_key='k', serper_api_key='k'))"
+    ),
+    "cold_llm_ready_seconds": (
+        "from fallacy_detector import AnalysisConfig, FallacyAnalyzer; "
+        "FallacyAnalyzer(AnalysisConfig(openai_api_key='k', serper_api_key='k'))"
+        ".fallacy_detection_chain"
+    ),
+}
+
+
+def bench_startup(repeats: int = 5) -> Dict[str, float]:
+    """Time cold imports and analyzer construction in fresh interpreters.
+
+    ``cold_llm_ready_seconds`` includes the deferred LangChain/OpenAI
+    imports paid by the first LLM stage.
+    """
+    report = {}
+    for name, snippet in STARTUP_SNIPPETS.items():
+        code = (
+            "import time; t = time.perf_counter(); "
+            f"{snippet}; print(time.perf_counter() - t)"
+        )
+        samples = []
+        for _ in range(repeats):
+            output = subprocess.run(
+                [sys.executable, "-c", code],
+                cwd=REPO_ROOT,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            samples.append(float(output.strip().splitlines()[-1]))
+        report[name] = statistics.median(samples)
+    return report
+
+
+def count_tokens(text: str) -> Tuple[int, str]:
+    """Count tokens with tiktoken, or approximate them when it is unavailable.
+
+    The approximation counts words, punctuation and each run of up to four
+    spaces, which is how BPE tokenizers split padded tables.
+    """
+    try:
+        import tiktoken
+
+        return len(tiktoken.get_encoding("o200k_base").encode(text)), "o200k_base"
+    except Exception:
+        return len(re.findall(r"\w+|[^\w\s]| {2,4}", text)), "approximate"
+
+
+def bench_prompt_size(
+    subset: Sequence[str] = ("Adhominem", "Adpopulum", "False Dilemma")
+) -> Dict[str, Any]:
+    """Tokens of the detection prompt catalog: padded table vs compact lines."""
+    catalog = load_catalog()
+    renderings = {
+        "to_string": catalog.to_dataframe().to_string(),
+        "compact": catalog.render(),
+        "subset": catalog.subset(subset).render(),
+    }
+    report: Dict[str, Any] = {}
+    for name, catalog in renderings.items():
+        tokens, tokenizer = count_tokens(
+            FALLACY_DETECTION_PROMPT.format(fallacy_catalog=catalog, content="")
+        )
+        report[f"{name}_tokens"] = tokens
+        report["tokenizer"] = tokenizer
+    return report
+
+
+BOILERPLATE_SENTENCES = [
+    "By Jane Smith, Political Correspondent.",
+    "Photo: Getty Images.",
+    "Sign up for our morning newsletter to get the day's top stories.",
+    "Read more: the council's full budget proposal.",
+]
+
+
+def bench_condense(
+    budgets: Sequence[int] = (250, 200, 150), articles: int = 20, passages: int = 12
+) -> Dict[str, Any]:
+    """Tokens saved by condensation and which labeled passages survive it.
+
+    Each article is ``passages`` random pre-screen fixture passages with the
+    boilerplate sentences mixed in twice. ``fallacious_kept`` and
+    ``neutral_kept`` are the shares of labeled passages still whole in the
+    condensed text.
+    """
+    rng = random.Random(0)
+    labeled = load_labeled()
+    documents = []
+    for _ in range(articles):
+        chosen = rng.sample(labeled, passages)
+        sentences = [text for text, _ in chosen] + BOILERPLATE_SENTENCES * 2
+        rng.shuffle(sentences)
+        documents.append((" ".join(sentences), chosen))
+
+    counter = TokenCounter()
+    original_tokens = statistics.mean(counter.count(text) for text, _ in documents)
+    report: Dict[str, Any] = {
+        "tokenizer": counter.name,
+        "original_tokens": original_tokens,
+    }
+    for budget in budgets:
+        condenser = Condenser(budget, counter)
+        kept = {True: [0, 0], False: [0, 0]}
+        tokens, seconds = [], []
+        for text, chosen in documents:
+            start = time.perf_counter()
+            condensed = condenser.condense(text)
+            seconds.append(time.perf_counter() - start)
+            tokens.append(condensed.tokens)
+            for passage, has_fallacy in chosen:
+                kept[has_fallacy][0] += passage in condensed.text
+                kept[has_fallacy][1] += 1
+        report[f"budget_{budget}"] = {
+            "tokens": statistics.mean(tokens),
+            "saved": 1 - statistics.mean(tokens) / original_tokens,
+            "ms_per_article": statistics.mean(seconds) * 1000,
+            "fallacious_kept": kept[True][0] / kept[True][1],
+            "neutral_kept": kept[False][0] / kept[False][1],
+        }
+    return report
+
+
+def bench_aggregate(
+    detections: int = 2_000_000,
+    fallacies: int = 20,
+    domains: int = 500,
+    days: int = 365,
+) -> Dict[str, Any]:
+    """Ingest and query cost of the running fallacy statistics.
+
+    ``detections`` random detections are backfilled with ``add_many``, then
+    10,000 results of three detections each are added one at a time as the
+    analyzer would. Queries are timed over the resulting cells.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    names = [f"Fallacy {i}" for i in range(fallacies)]
+    sites = [f"site{i}.com" for i in range(domains)]
+    start_day = day_number("2024-01-01")
+
+    stats = FallacyStats()
+    begin = time.perf_counter()
+    stats.add_many(
+        [names[i] for i in rng.integers(0, fallacies, detections)],
+        [sites[i] for i in rng.integers(0, domains, detections)],
+        (start_day + rng.integers(0, days, detections)).tolist(),
+        [CONFIDENCE_LEVELS[i] for i in rng.integers(0, 3, detections)],
+    )
+    backfill = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    for i in range(10_000):
+        records = [
+            {"fallacy": names[(i + j) % fallacies], "confidence": "High"}
+            for j in range(3)
+        ]
+        stats.add_result(
+            {"url": f"https://{sites[i % domains]}/{i}", "fallacies": records},
+            start_day + i % days,
+        )
+    stats.stats()  # Merge what is buffered
+    incremental = time.perf_counter() - begin
+
+    queries = {
+        "by_fallacy": lambda: stats.counts(),
+        "by_fallacy_domain": lambda: stats.counts(by=("fallacy", "domain")),
+        "domain_timeline": lambda: stats.counts(by=("day",), domain="site7.com"),
+        "one_fallacy_by_domain_month": lambda: stats.counts(
+            by=("domain",), fallacy="Fallacy 3", since="2024-03-01", until="2024-03-31"
+        ),
+        "confidence_histogram": lambda: stats.confidence_histogram(fallacy="Fallacy 3"),
+    }
+    query_ms = {}
+    for name, query in queries.items():
+        samples = []
+        for _ in range(5):
+            begin = time.perf_counter()
+            query()
+            samples.append(time.perf_counter() - begin)
+        query_ms[name] = statistics.median(samples) * 1000
+
+    totals = stats.stats()
+    return {
+        "detections": totals["detections"],
+        "cells": totals["cells"],
+        "backfill_per_s": detections / backfill,
+        "incremental_results_per_s": 10_000 / incremental,
+        "cell_array_mb": totals["cells"] * (8 + 3 * 8) / 1e6,
+        "query_ms": query_ms,
+    }
+
+
+def bench_init(stubs: StubServer, **config: Any) -> Dict[str, float]:
+    """Time constructing a FallacyAnalyzer in-process."""
+    start = time.perf_counter()
+    FallacyAnalyzer(stubs.analysis_config(**config))
+    return {"init_seconds": time.perf_counter() - start}
+
+
+def bench_latency(analyzer: FallacyAnalyzer, runs: int) -> Dict[str, Any]:
+    """Sequential end-to-end analyze_article latency with a stage breakdown."""
+    totals = []
+    stages: Dict[str, List[float]] = {}
+    for i in range(runs):
+        result = analyzer.analyze_article(f"latency topic {i}")
+        if "error" in result:
+            raise RuntimeError(result["error"])
+        totals.append(result["processing_time"])
+        for stage, seconds in result["timings"].items():
+            stages.setdefault(stage, []).append(seconds)
+    return {
+        "runs": runs,
+        "total": summarize(totals),
+        "stages": {stage: statistics.mean(values) for stage, values in stages.items()},
+    }
+
+
+def bench_throughput(analyzer: FallacyAnalyzer, concurrency: int) -> Dict[str, Any]:
+    """Articles per second for the threaded batch path and the asyncio path."""
+    start = time.perf_counter()
+    results = analyzer.analyze_articles("throughput topic", max_articles=concurrency)
+    threaded_elapsed = time.perf_counter() - start
+    errors = sum("error" in r for r in results)
+
+    async def run_many() -> List[Dict[str, Any]]:
+        async with analyzer:
+            return await analyzer.aanalyze_many(
+                [f"async topic {i}" for i in range(concurrency)]
+            )
+
+    start = time.perf_counter()
+    async_results = asyncio.run(run_many())
+    async_elapsed = time.perf_counter() - start
+    errors += sum("error" in r for r in async_results)
+
+    return {
+        "concurrency": concurrency,
+        "threaded_articles_per_second": len(results) / threaded_elapsed,
+        "threaded_seconds": threaded_elapsed,
+        "async_articles_per_second": len(async_results) / async_elapsed,
+        "async_seconds": async_elapsed,
+        "errors": errors,
+    }
+
+
+def bench_long_article(stubs: StubServer, chars: int = 40_000) -> Dict[str, Any]:
+    """Detection latency on a long article: truncated vs chunked."""
+    paragraphs = stubs.article_text("long-article")
+    content = " ".join(paragraphs * (chars // len(" ".join(paragraphs)) + 1))[:chars]
+    report: Dict[str, Any] = {"chars": len(content)}
+    for mode in ("truncate", "chunk"):
+        analyzer = FallacyAnalyzer(
+            stubs.analysis_config(long_article_mode=mode, max_workers=32)
+        )
+        text = (
+            content
+            if mode == "chunk"
+            else content[: analyzer.config.article_char_limit]
+        )
+        start = time.perf_counter()
+        result = analyzer._detect(text)
+        report[mode] = {
+            "seconds": time.perf_counter() - start,
+            "chunks": len(analyzer._chunks(text)),
+            "findings": len(parse_detection_text(result["detected_fallacies"])),
+        }
+    return report
+
+
+def bench_pipeline_modes(stubs: StubServer, runs: int = 3) -> Dict[str, Any]:
+    """End-to-end latency, LLM calls and tokens: staged vs fused pipeline."""
+    report: Dict[str, Any] = {}
+    for mode in ("staged", "fused"):
+        analyzer = FallacyAnalyzer(stubs.analysis_config(pipeline_mode=mode))
+        analyzer.analyze_article(
+            "pipeline warm-up"
+        )  # Pays the one-off LLM client setup
+        calls_before = stubs.requests.get("chat", 0)
+        totals = []
+        prompt_tokens = completion_tokens = 0
+        for i in range(runs):
+            result = analyzer.analyze_article(f"pipeline topic {i}")
+            if "error" in result:
+                raise RuntimeError(result["error"])
+            totals.append(result["processing_time"])
+            for usage in result["token_usage"].values():
+                prompt_tokens += usage["prompt_tokens"]
+                completion_tokens += usage["completion_tokens"]
+        report[mode] = {
+            "seconds": statistics.mean(totals),
+            "llm_calls": (stubs.requests.get("chat", 0) - calls_before) / runs,
+            "prompt_tokens": prompt_tokens / runs,
+            "completion_tokens": completion_tokens / runs,
+        }
+    return report
+
+
+def bench_extraction(
+    paragraphs: int = 60,
+    padding_bytes: int = 2_000_000,
+    bytes_per_second: float = 20_000_000.0,
+) -> Dict[str, Any]:
+    """Fetch and extract a heavy page.
+
+    Compares a full download parsed by BeautifulSoup with the streaming
+    extractor.
+    """
+    stub_config = StubConfig(
+        fetch_latency=0.0,
+        article_paragraphs=paragraphs,
+        page_padding_bytes=padding_bytes,
+        fetch_bytes_per_second=bytes_per_second,
+    )
+    with StubServer(stub_config) as stubs:
+        analyzer = FallacyAnalyzer(stubs.analysis_config())
+        url = f"{stubs.base_url}/articles/heavy"
+
+        def full_page() -> str:
+            from bs4 import BeautifulSoup
+
+            html = analyzer.transport.request("GET", url).text
+            return clean_article_text(
+                BeautifulSoup(html, "html.parser").get_text(),
+                analyzer.config.article_char_limit,
+            )
+
+        def streaming() -> str:
+            return analyzer._fetch_article(url, "Heavy")["content"]
+
+        report: Dict[str, Any] = {
+            "page_bytes": len(stubs.article_html("heavy").encode("utf-8"))
+        }
+        for name, fetch in (("full_page", full_page), ("streaming", streaming)):
+            fetch()  # Warm up the pooled connection
+            start = time.perf_counter()
+            text = fetch()
+            seconds = time.perf_counter() - start
+            tracemalloc.start()
+            try:
+                fetch()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            report[name] = {
+                "seconds": seconds,
+                "peak_kib": peak / 1024,
+                "chars": len(text),
+            }
+        analyzer.close()
+    return report
+
+
+def bench_fetch_cache(
+    stubs: StubServer, topic: str = "fetch cache topic"
+) -> Dict[str, Any]:
+    """Load one article cold, again from a persistent cache, then once it went stale."""
+    report: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        phases = (
+            ("cold", {}),
+            ("repeat", {}),
+            ("revalidate", {"page_cache_ttl": 0.0}),
+        )
+        for name, overrides in phases:
+            # A new analyzer per phase only shares the on-disk tier,
+            # like a new process would
+            analyzer = FallacyAnalyzer(
+                stubs.analysis_config(
+                    fetch_cache_enabled=True,
+                    fetch_cache_path=str(Path(tmp) / "fetch.sqlite"),
+                    **overrides,
+                )
+            )
+            before = dict(stubs.requests)
+            start = time.perf_counter()
+            analyzer.load_article(topic)
+            seconds = time.perf_counter() - start
+            requests = {
+                route: count - before.get(route, 0)
+                for route, count in stubs.requests.items()
+                if route in ("search", "article", "article_not_modified")
+                and count != before.get(route, 0)
+            }
+            report[name] = {"seconds": seconds, "requests": requests}
+            analyzer.fetch_cache.store.close()
+            analyzer.close()
+    return report
+
+
+def bench_dedup(
+    indexed: int = 1000, probes: int = 100, words: int = 800
+) -> Dict[str, Any]:
+    """Index articles, then look up syndicated copies and unrelated articles."""
+    vocabulary = " ".join(ARTICLE_SENTENCES).split()
+
+    def article(seed: int) -> str:
+        rng = random.Random(seed)
+        return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+    def syndicated(text: str, seed: int) -> str:
+        # New byline, a rewritten sentence and a trimmed ending
+        tokens = text.split()
+        start = random.Random(seed).randrange(len(tokens) - 20)
+        tokens[start : start + 12] = (
+            "a spokesperson for the agency declined to comment on the report".split()
+        )
+        return "By Staff Reporter, Associated Press. " + " ".join(tokens[:-15])
+
+    index = NearDuplicateIndex()
+    signature_times = []
+    for seed in range(indexed):
+        start = time.perf_counter()
+        signature = index.signature(article(seed))
+        signature_times.append(time.perf_counter() - start)
+        index.add(signature, seed)
+
+    lookup_times = []
+    found = false_matches = 0
+    for seed in range(probes):
+        for text, expected in (
+            (syndicated(article(seed), seed), seed),
+            (article(indexed + seed), None),
+        ):
+            signature = index.signature(text)
+            start = time.perf_counter()
+            match = index.query(signature)
+            lookup_times.append(time.perf_counter() - start)
+            if expected is None:
+                false_matches += match is not None
+            else:
+                found += match is not None and match[0] == expected
+    return {
+        "indexed": indexed,
+        "signature_ms": summarize([t * 1000 for t in signature_times]),
+        "lookup_ms": summarize([t * 1000 for t in lookup_times]),
+        "recall": found / probes,
+        "false_matches": false_matches,
+    }
+
+
+def bench_store(
+    stubs: StubServer, articles: int = 5, rows: int = 20_000
+) -> Dict[str, Any]:
+    """A topic sweep repeated over a results store, and store lookups at size.
+
+    The second sweep uses a new analyzer (as the next day's process would)
+    and finds every article unchanged. ``lookup_ms``/``list_ms`` time
+    :class:`ResultStore` with ``rows`` stored analyses.
+    """
+    report: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "results.sqlite")
+        for name in ("first", "repeat"):
+            analyzer = FallacyAnalyzer(stubs.analysis_config(store_path=path))
+            calls_before = stubs.requests.get("chat", 0)
+            start = time.perf_counter()
+            results = analyzer.analyze_articles(
+                "store sweep topic", max_articles=articles
+            )
+            report[name] = {
+                "seconds": time.perf_counter() - start,
+                "llm_calls": stubs.requests.get("chat", 0) - calls_before,
+                "served": sum(
+                    1 for result in results if result.get("store", {}).get("reused")
+                ),
+            }
+            analyzer.store.close()
+            analyzer.close()
+
+        store = ResultStore(str(Path(tmp) / "sized.sqlite"))
+        result = {"title": "T", "synthesized_result": "x" * 2000, "fallacies": []}
+        for i in range(rows):
+            store.save(
+                {**result, "url": f"https://site{i % 200}.com/{i}"},
+                content_hash(str(i)),
+                "model",
+                "v1",
+            )
+        lookups = []
+        for i in range(0, rows, rows // 200):
+            start = time.perf_counter()
+            store.find(
+                f"https://site{i % 200}.com/{i}", content_hash(str(i)), "model", "v1"
+            )
+            lookups.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        listed = store.list(domain="site7.com", limit=None)
+        report["rows"] = rows
+        report["lookup_ms"] = summarize([t * 1000 for t in lookups])
+        report["list_domain_ms"] = (time.perf_counter() - start) * 1000
+        report["listed"] = len(listed)
+        store.close()
+    return report
+
+
+def bench_server(
+    stubs: StubServer, clients: int = 16, requests: int = 32, topics: int = 4
+) -> Dict[str, Any]:
+    """Requests per second through the resident server, with and without coalescing.
+
+    ``sequential`` sends distinct topics one at a time (the per-request cost
+    once the analyzer is warm); ``distinct`` and ``repeated`` send
+    ``requests`` requests from ``clients`` threads, all different or spread
+    over ``topics`` topics. ``backpressure`` bursts distinct requests at a
+    two-slot queue without retrying refusals.
+    """
+
+    def run(
+        client: AnalysisClient, names: List[str]
+    ) -> Tuple[float, List[Dict[str, Any]]]:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as executor:
+            results = list(executor.map(lambda name: client.analyze(topic=name), names))
+        return time.perf_counter() - start, results
+
+    report: Dict[str, Any] = {"clients": clients, "requests": requests}
+    with AnalysisServer(
+        FallacyAnalyzer(stubs.analysis_config()), port=0, workers=clients
+    ) as server, AnalysisClient(server.base_url) as client:
+        start = time.perf_counter()
+        for i in range(5):
+            client.analyze(topic=f"server sequential {i}")
+        report["sequential_seconds"] = (time.perf_counter() - start) / 5
+
+        for name, names in (
+            ("distinct", [f"server distinct {i}" for i in range(requests)]),
+            ("repeated", [f"server repeated {i % topics}" for i in range(requests)]),
+        ):
+            before = server.service.stats()
+            elapsed, results = run(client, names)
+            after = server.service.stats()
+            report[name] = {
+                "requests_per_second": len(results) / elapsed,
+                "seconds": elapsed,
+                "pipeline_runs": after["submitted"] - before["submitted"],
+                "coalesced": after["coalesced"] - before["coalesced"],
+                "errors": sum("error" in r for r in results),
+            }
+
+    with AnalysisServer(
+        FallacyAnalyzer(stubs.analysis_config()), port=0, workers=2, max_queue=2
+    ) as server, AnalysisClient(server.base_url, busy_retries=0) as client:
+
+        def submit(i: int) -> bool:
+            try:
+                client.submit(topic=f"server burst {i}")
+                return True
+            except httpx.HTTPStatusError:
+                return False
+
+        with ThreadPoolExecutor(max_workers=clients) as executor:
+            accepted = sum(executor.map(submit, range(clients)))
+        report["backpressure"] = {
+            "burst": clients,
+            "accepted": accepted,
+            "refused": clients - accepted,
+        }
+        while server.service.stats()["queued"] or server.service.stats()["running"]:
+            time.sleep(0.05)
+    return report
+
+
+def bench_cpu_pool(
+    documents: int = 100,
+    processes: Sequence[int] = (0, 2, 4),
+    padding_bytes: int = 200_000,
+    concurrency: int = 16,
+) -> Dict[str, Any]:
+    """A directory corpus of heavy HTML pages with and without worker processes.
+
+    The stub LLM answers instantly, so the run is bound by parsing, cleaning
+    and MinHash signing. ``parent_cpu_ms_per_document`` is the CPU time the
+    event-loop process spends per document; the rest of the work moves to
+    the workers, and wall time scales with them up to the number of cores.
+    """
+    stub_config = StubConfig(
+        llm_latency=0.0,
+        tokens_per_second=1_000_000.0,
+        article_paragraphs=60,
+        page_padding_bytes=padding_bytes,
+    )
+    report: Dict[str, Any] = {"documents": documents, "cores": os.cpu_count()}
+    with StubServer(stub_config) as stubs, tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "corpus"
+        root.mkdir()
+        for i in range(documents):
+            (root / f"{i:05d}.html").write_text(
+                stubs.article_html(f"doc-{i}"), encoding="utf-8"
+            )
+        report["page_bytes"] = len(stubs.article_html("doc-0").encode("utf-8"))
+
+        for workers in processes:
+            analyzer = FallacyAnalyzer(
+                stubs.analysis_config(cpu_workers=workers, dedup_enabled=True)
+            )
+            analyzer.llm  # Chain construction is not part of the run
+
+            async def run() -> Dict[str, int]:
+                async with analyzer:
+                    if (
+                        analyzer.cpu_pool is not None
+                    ):  # Start the workers outside the timing
+                        await asyncio.gather(
+                            *(
+                                analyzer.cpu_pool.prepare("warm up")
+                                for _ in range(workers)
+                            )
+                        )
+                    start_cpu, start = time.process_time(), time.perf_counter()
+                    stats = await aanalyze_corpus(
+                        analyzer,
+                        iter_corpus(root, load=not workers),
+                        Path(tmp) / f"out-{workers}.jsonl",
+                        concurrency=concurrency,
+                        resume=False,
+                    )
+                    timings["seconds"] = time.perf_counter() - start
+                    timings["cpu"] = time.process_time() - start_cpu
+                    return stats
+
+            timings: Dict[str, float] = {}
+            stats = asyncio.run(run())
+            report[f"processes_{workers}"] = {
+                "seconds": timings["seconds"],
+                "documents_per_second": documents / timings["seconds"],
+                "parent_cpu_ms_per_document": timings["cpu"] / documents * 1000,
+                "failed": stats["failed"],
+            }
+    return report
+
+
+def bench_memory(analyzer: FallacyAnalyzer) -> Dict[str, float]:
+    """Peak Python heap allocated during one analysis (tracemalloc)."""
+    analyzer.analyze_article("warm-up topic")
+    tracemalloc.start()
+    try:
+        analyzer.analyze_article("memory topic")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"peak_kib_per_analysis": peak / 1024}
+
+
+def run_suite(
+    stub_config: StubConfig, runs: int, concurrency: int, **config: Any
+) -> Dict[str, Any]:
+    """Run every benchmark and return a machine-readable report."""
+    report: Dict[str, Any] = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "stubs": stub_config.__dict__.copy(),
+            "config": config,
+        },
+        "startup": bench_startup(),
+        "prompt": bench_prompt_size(),
+        "extraction": bench_extraction(),
+        "dedup": bench_dedup(),
+        "cpu_pool": bench_cpu_pool(),
+        "condense": bench_condense(),
+        "aggregate": bench_aggregate(),
+    }
+    with StubServer(stub_config) as stubs:
+        report["startup"].update(bench_init(stubs, **config))
+        analyzer = FallacyAnalyzer(
+            stubs.analysis_config(max_workers=concurrency, **config)
+        )
+        report["latency"] = bench_latency(analyzer, runs)
+        report["throughput"] = bench_throughput(analyzer, concurrency)
+        report["memory"] = bench_memory(analyzer)
+        report["http"] = analyzer.transport.stats()
+        report["long_article"] = bench_long_article(stubs)
+        report["pipeline"] = bench_pipeline_modes(stubs, runs)
+        report["fetch_cache"] = bench_fetch_cache(stubs)
+        report["store"] = bench_store(stubs)
+        report["server"] = bench_server(stubs)
+        report["meta"]["stub_requests"] = dict(stubs.requests)
+    return report
+
+
+def flatten(data: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """Flatten nested numeric values into dotted keys."""
+    flat: Dict[str, float] = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> str:
+    """Render a table of relative changes between two reports."""
+    old = flatten({k: v for k, v in baseline.items() if k != "meta"})
+    new = flatten({k: v for k, v in current.items() if k != "meta"})
+    lines = [f"{'metric':<48} {'baseline':>12} {'current':>12} {'change':>9}"]
+    for key in sorted(set(old) & set(new)):
+        change = (new[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+        lines.append(f"{key:<48} {old[key]:>12.4f} {new[key]:>12.4f} {change:>+8.1f}%")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Offline Fallacy Detector benchmarks")
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="Sequential analyses for the latency benchmark",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=5, help="Articles analyzed in parallel"
+    )
+    parser.add_argument(
+        "--llm-latency", type=float, default=0.2, help="Stub time to first token (s)"
+    )
+    parser.add_argument(
+        "--tokens-per-second", type=float, default=200.0, help="Stub generation rate"
+    )
+    parser.add_argument(
+        "--fetch-latency",
+        type=float,
+        default=0.05,
+        help="Stub article fetch latency (s)",
+    )
+    parser.add_argument(
+        "--search-latency", type=float, default=0.05, help="Stub search latency (s)"
+    )
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Compare against a previous JSON report")
+    args = parser.parse_args(argv)
+
+    stub_config = StubConfig(
+        llm_latency=args.llm_latency,
+        tokens_per_second=args.tokens_per_second,
+        fetch_latency=args.fetch_latency,
+        search_latency=args.search_latency,
+    )
+    report = run_suite(stub_config, args.runs, args.concurrency)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        print()
+        print(compare(baseline, report))
+
+
+if __name__ == "__main__":
+    main()
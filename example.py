@@ -31,7 +31,10 @@ def basic_example():
             print(f"✓ Successfully analyzed: {result['title']}")
             print(f"✓ Processing time: {result.get('processing_time', 0):.2f} seconds")
             print(f"\nAnalysis preview:")
-            print(result['analysis'][:300] + "..." if len(result['analysis']) > 300 else result['analysis'])
+            print(result['synthesized_result'][:300] + "..." if len(result['synthesized_result']) > 300 else result['synthesized_result'])
+            timings = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in result['timings'].items())
+            print(f"\nStage timings: {timings}")
+            print(f"Estimated cost: ${result['cost']['total']:.5f}")
         else:
             print(f"✗ Error: {result['error']}")
             
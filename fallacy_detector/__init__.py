@@ -5,8 +5,29 @@ An intelligent agent that analyzes news articles for logical fallacies
 based on Aristotelian logic principles.
 """
 
-from .analyzer import FallacyAnalyzer
-from .config import AnalysisConfig
+import importlib
+from typing import Any, List
 
 __version__ = "1.0.0"
-__all__ = ["FallacyAnalyzer", "AnalysisConfig"]
+__all__ = ["FallacyAnalyzer", "AnalysisConfig", "ResultCache", "PrometheusExporter"]
+
+# Public names and their modules; imported on first access so that
+# ``import fallacy_detector`` stays cheap
+_EXPORTS = {
+    "FallacyAnalyzer": ".analyzer",
+    "AnalysisConfig": ".config",
+    "ResultCache": ".cache",
+    "PrometheusExporter": ".metrics",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
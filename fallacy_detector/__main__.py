@@ -4,47 +4,361 @@ Main entry point for the Fallacy Detector AI.
 
 import argparse
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
 
 from .analyzer import FallacyAnalyzer
+from .client import DEFAULT_SERVER_URL, AnalysisClient
 from .config import AnalysisConfig
+from .corpus import analyze_corpus, batch_analyze_corpus, iter_corpus
+from .store import ResultStore
+from .streaming import (
+    AnalysisEvent,
+    STAGE_SEARCH,
+    STAGE_RESULT,
+    EVENT_START,
+    EVENT_TOKEN,
+    EVENT_FALLACY,
+    EVENT_END,
+    EVENT_ERROR
+)
 from .utils import format_analysis_result
 
-def main():
+STAGE_HEADINGS = {
+    "detection": "LOGICAL FALLACY ANALYSIS:",
+    "explanation": "EDUCATIONAL EXPLANATIONS:",
+    "synthesis": "SYNTHESIS REPORT:",
+}
+
+def render_stream(events: Iterable[AnalysisEvent]) -> Dict[str, Any]:
+    """Print streaming events as they arrive and return the final result."""
+    result: Dict[str, Any] = {'error': 'Analysis produced no result'}
+    for event in events:
+        if event.stage == STAGE_SEARCH and event.kind == EVENT_END:
+            print(f"\nTitle: {event.data['title']}\nURL: {event.data['url']}")
+        elif event.kind == EVENT_START and event.stage in STAGE_HEADINGS:
+            heading = STAGE_HEADINGS[event.stage]
+            print(f"\n{heading}\n{'-' * len(heading)}", flush=True)
+        elif event.kind == EVENT_TOKEN:
+            print(event.data, end="", flush=True)
+        elif event.kind == EVENT_FALLACY:
+            detection = event.data
+            print(f"• {detection.fallacy} ({detection.confidence.value}): \"{detection.quote}\"", flush=True)
+        elif event.stage == STAGE_RESULT and event.kind in (EVENT_END, EVENT_ERROR):
+            result = event.data
+            if event.kind == EVENT_ERROR:
+                print(f"\nError: {result['error']}")
+        elif event.kind == EVENT_END:
+            print(flush=True)
+    return result
+
+def corpus_main(argv: List[str]) -> None:
+    """Analyze a local corpus into a JSONL file (``python -m fallacy_detector corpus``)."""
+    parser = argparse.ArgumentParser(
+        prog="python -m fallacy_detector corpus",
+        description="Analyze a JSONL file, CSV file or directory of text/HTML files without searching"
+    )
+    parser.add_argument("path", help="Corpus: .jsonl, .csv or a directory")
+    parser.add_argument("--output", required=True, help="JSONL file results are appended to (also the checkpoint)")
+    parser.add_argument("--text-field", default="text", help="Field holding the document text (JSONL/CSV)")
+    parser.add_argument("--id-field", default="id", help="Field holding the document id (JSONL/CSV)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Documents analyzed at once")
+    parser.add_argument("--no-resume", action="store_true", help="Overwrite the output instead of resuming from it")
+    parser.add_argument("--batch-state",
+                        help="Run through the provider Batch API, tracking submitted batches in this file")
+    parser.add_argument("--poll-interval", type=float, default=30.0, help="Seconds between batch status checks")
+    parser.add_argument("--model", default="gpt-4.1-nano", help="OpenAI model to use")
+    parser.add_argument("--prescreen", choices=["off", "skip", "detect"], default="off",
+                        help="Local cue pre-screen: skip or reduce LLM calls for articles without fallacy cues")
+    parser.add_argument("--pipeline", choices=["staged", "fused"], default="staged",
+                        help="Run detection, explanation and synthesis as three LLM calls or one")
+    parser.add_argument("--dedup", action="store_true",
+                        help="Reuse the analysis of a near-duplicate document (syndicated copies)")
+    parser.add_argument("--cascade-model", default="",
+                        help="Cheap model that screens detection first; only flagged documents use --model")
+    parser.add_argument("--condense", type=int, default=0, metavar="TOKENS",
+                        help="Drop the least argumentative sentences of longer documents to fit this many tokens")
+    parser.add_argument("--processes", type=int, default=0,
+                        help="Worker processes that parse and clean documents (default: none, in the event loop)")
+    parser.add_argument("--stats",
+                        help="Write fallacy x domain x day counts to this CSV (or .parquet) file after the run")
+    parser.add_argument("--store",
+                        help="SQLite file of finished analyses; documents with unchanged text are served from it")
+    args = parser.parse_args(argv)
+    
+    def progress(stats: Dict[str, int]) -> None:
+        print(f"\r{stats['analyzed']} analyzed, {stats['failed']} failed, {stats['skipped']} skipped",
+              end="", flush=True)
+    
+    try:
+        config = AnalysisConfig(
+            model_name=args.model,
+            prescreen_mode=args.prescreen,
+            pipeline_mode=args.pipeline,
+            dedup_enabled=args.dedup,
+            cascade_model=args.cascade_model,
+            condense_tokens=args.condense,
+            stats_enabled=bool(args.stats),
+            detection_mode="structured" if args.stats else "text",
+            store_path=args.store or "",
+            cpu_workers=args.processes
+        )
+        analyzer = FallacyAnalyzer(config)
+        # With worker processes, directory files are read and parsed there, not here
+        load = not args.processes or bool(args.batch_state)
+        documents = iter_corpus(args.path, args.text_field, args.id_field, load=load)
+        if args.batch_state:
+            stats = batch_analyze_corpus(
+                analyzer,
+                documents,
+                args.output,
+                args.batch_state,
+                resume=not args.no_resume,
+                poll_interval=args.poll_interval
+            )
+        else:
+            stats = analyze_corpus(
+                analyzer,
+                documents,
+                args.output,
+                concurrency=args.concurrency,
+                resume=not args.no_resume,
+                progress=progress
+            )
+        print(f"\nDone: {stats['analyzed']} analyzed, {stats['failed']} failed, "
+              f"{stats['skipped']} already in {args.output}")
+        if analyzer.dedup is not None:
+            dedup = analyzer.dedup.stats()
+            print(f"Near-duplicates: {dedup['duplicates']}, LLM calls saved: {dedup['llm_calls_saved']}")
+        if analyzer.cascade is not None:
+            cascade = analyzer.cascade.stats()
+            print(f"Cascade: {cascade['escalated']} of {cascade['screened']} screened texts escalated to {args.model}")
+        if analyzer.store is not None:
+            print(f"Store: {analyzer.store.stats()['served']} served from {args.store}")
+        if analyzer.fallacy_stats is not None:
+            totals = analyzer.fallacy_stats.stats()
+            print(f"Statistics: {totals['detections']} detections in {totals['articles']} documents "
+                  f"written to {analyzer.fallacy_stats.export(args.stats)}")
+    except KeyboardInterrupt:
+        print("\nInterrupted; rerun the same command to resume.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+
+def serve_main(argv: List[str]) -> None:
+    """Run the resident analysis server (``python -m fallacy_detector serve``)."""
+    from .server import DEFAULT_PORT, AnalysisServer
+    
+    parser = argparse.ArgumentParser(
+        prog="python -m fallacy_detector serve",
+        description="Serve analyses over HTTP/JSON from one warm analyzer"
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=4, help="Jobs analyzed at once")
+    parser.add_argument("--max-queue", type=int, default=64,
+                        help="Jobs waiting for a worker before new requests are refused with 503")
+    parser.add_argument("--model", default="gpt-4.1-nano", help="OpenAI model to use")
+    parser.add_argument("--prescreen", choices=["off", "skip", "detect"], default="off",
+                        help="Local cue pre-screen: skip or reduce LLM calls for articles without fallacy cues")
+    parser.add_argument("--fallacies", help="Comma-separated fallacies to check for (default: all)")
+    parser.add_argument("--pipeline", choices=["staged", "fused"], default="staged",
+                        help="Run detection, explanation and synthesis as three LLM calls or one")
+    parser.add_argument("--dedup", action="store_true",
+                        help="Reuse the analysis of a near-duplicate article (syndicated copies)")
+    parser.add_argument("--cascade-model", default="",
+                        help="Cheap model that screens detection first; only flagged articles use --model")
+    parser.add_argument("--condense", type=int, default=0, metavar="TOKENS",
+                        help="Drop the least argumentative sentences of longer articles to fit this many tokens")
+    parser.add_argument("--stats", action="store_true",
+                        help="Count structured detections by fallacy, domain and day for GET /stats")
+    parser.add_argument("--store",
+                        help="SQLite file of finished analyses; articles with unchanged text are served from it")
+    args = parser.parse_args(argv)
+    
+    try:
+        config = AnalysisConfig(
+            model_name=args.model,
+            prescreen_mode=args.prescreen,
+            pipeline_mode=args.pipeline,
+            dedup_enabled=args.dedup,
+            cascade_model=args.cascade_model,
+            condense_tokens=args.condense,
+            stats_enabled=args.stats,
+            detection_mode="structured" if args.stats else "text",
+            store_path=args.store or "",
+            fallacy_subset=[name.strip() for name in args.fallacies.split(',')] if args.fallacies else None
+        )
+        server = AnalysisServer(
+            FallacyAnalyzer(config),
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            max_queue=args.max_queue
+        )
+        print(f"Serving on {server.base_url} ({args.workers} workers, queue of {args.max_queue})")
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+
+def results_main(argv: List[str]) -> None:
+    """List or show stored analyses (``python -m fallacy_detector results``)."""
+    parser = argparse.ArgumentParser(
+        prog="python -m fallacy_detector results",
+        description="List the analyses kept in a results store, newest first"
+    )
+    parser.add_argument("store", help="SQLite results store (see --store)")
+    parser.add_argument("--domain", help="Only analyses of articles from this domain (e.g., 'cnn.com')")
+    parser.add_argument("--url", help="Only analyses of this article")
+    parser.add_argument("--since", help="Analyzed on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--until", help="Analyzed on or before this date (YYYY-MM-DD)")
+    parser.add_argument("--limit", type=int, default=50, help="Analyses listed at most")
+    parser.add_argument("--show", type=int, metavar="ID", help="Print the full analysis with this id")
+    args = parser.parse_args(argv)
+    
+    if not Path(args.store).exists():
+        print(f"Error: no results store at {args.store}")
+        sys.exit(1)
+    store = ResultStore(args.store)
+    try:
+        if args.show is not None:
+            result = store.get(args.show)
+            if result is None:
+                print(f"Error: no analysis with id {args.show}")
+                sys.exit(1)
+            print(format_analysis_result(result))
+            return
+        
+        entries = store.list(args.domain, args.url, args.since, args.until, limit=args.limit)
+        for entry in entries:
+            analyzed = datetime.fromtimestamp(entry['analyzed_at'], timezone.utc).strftime("%Y-%m-%d %H:%M")
+            fallacies = "-" if entry['fallacies'] is None else entry['fallacies']
+            print(f"{entry['id']:>6}  {analyzed}  {entry['domain'] or '(text)':<24}  {fallacies:>3}  "
+                  f"{entry['title'] or entry['url']}")
+        print(f"{len(entries)} analyses")
+    except ValueError as e:  # Malformed date
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+    finally:
+        store.close()
+
+def analyze_locally(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Build an analyzer from the command-line options and run the analysis."""
+    config = AnalysisConfig(
+        model_name=args.model,
+        prescreen_mode=args.prescreen,
+        pipeline_mode=args.pipeline,
+        dedup_enabled=args.dedup,
+        cascade_model=args.cascade_model,
+        condense_tokens=args.condense,
+        store_path=args.store or "",
+        fallacy_subset=[name.strip() for name in args.fallacies.split(',')] if args.fallacies else None
+    )
+    
+    # Initialize analyzer
+    print("🔍 Initializing Fallacy Detector AI...")
+    analyzer = FallacyAnalyzer(config)
+    
+    # Run analysis
+    print(f"Analyzing articles for topic: '{args.topic}'")
+    if args.domain:
+        print(f"Searching within domain: {args.domain}")
+    if args.verbose:
+        print(f"Will analyze up to {args.max_articles} articles")
+        print(f"Using model: {args.model}")
+    
+    if args.stream:
+        return [render_stream(analyzer.stream_analysis(args.topic, args.domain))]
+    return analyzer.analyze_articles(args.topic, args.domain, args.max_articles)
+
+def main(argv: Optional[List[str]] = None):
     """Main function to run the fallacy detector."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "corpus":
+        corpus_main(argv[1:])
+        return
+    if argv and argv[0] == "serve":
+        serve_main(argv[1:])
+        return
+    if argv and argv[0] == "results":
+        results_main(argv[1:])
+        return
+    
     parser = argparse.ArgumentParser(
         description="AI Agent for Detecting Logical Fallacies in News Articles"
     )
-    parser.add_argument("topic", help="Search topic for news articles")
+    parser.add_argument("topic",
+                        help="Search topic for news articles ('corpus' analyzes local files, 'serve' starts a "
+                             "server, 'results' lists stored analyses)")
     parser.add_argument("--domain", default="", help="Domain to search within (e.g., 'cnn.com')")
     parser.add_argument("--model", default="gpt-4.1-nano", help="OpenAI model to use")
     parser.add_argument("--output", help="Output file to save results")
-    parser.add_argument("--max-articles", type=int, default=5, help="Number of articles to analyze")
+    parser.add_argument("--max-articles", type=int, help="Number of articles to analyze (default: 5)")
     parser.add_argument("--verbose", action="store_true", help="Show detailed output")
+    parser.add_argument("--stream", action="store_true", help="Stream the top article's analysis as it is generated")
+    parser.add_argument("--prescreen", choices=["off", "skip", "detect"], default="off",
+                        help="Local cue pre-screen: skip or reduce LLM calls for articles without fallacy cues")
+    parser.add_argument("--fallacies", help="Comma-separated fallacies to check for (default: all)")
+    parser.add_argument("--pipeline", choices=["staged", "fused"], default="staged",
+                        help="Run detection, explanation and synthesis as three LLM calls or one")
+    parser.add_argument("--dedup", action="store_true",
+                        help="Reuse the analysis of a near-duplicate article (syndicated copies)")
+    parser.add_argument("--cascade-model", default="",
+                        help="Cheap model that screens detection first; only flagged articles use --model")
+    parser.add_argument("--condense", type=int, default=0, metavar="TOKENS",
+                        help="Drop the least argumentative sentences of longer articles to fit this many tokens")
+    parser.add_argument("--store",
+                        help="SQLite file of finished analyses; articles with unchanged text are served from it")
+    parser.add_argument("--server", nargs="?", const=DEFAULT_SERVER_URL,
+                        help=f"Send the topic to a running server (default {DEFAULT_SERVER_URL}) "
+                             "instead of analyzing locally; analyzes the top article")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.server and args.stream:
+        parser.error("--stream is not supported with --server")
+    if args.server and args.store:
+        parser.error("--store is not supported with --server; start the server with --store")
+    if args.server and args.max_articles is not None:
+        parser.error("--max-articles is not supported with --server, which analyzes the top article")
+    if args.max_articles is None:
+        args.max_articles = 5
     
     try:
-        # Create configuration
-        config = AnalysisConfig(model_name=args.model)
-        
-        # Initialize analyzer
-        print("🔍 Initializing Fallacy Detector AI...")
-        analyzer = FallacyAnalyzer(config)
-        
-        # Run analysis
-        print(f"Analyzing articles for topic: '{args.topic}'")
-        if args.domain:
-            print(f"Searching within domain: {args.domain}")
-        if args.verbose:
-            print(f"Will analyze up to {args.max_articles} articles")
-            print(f"Using model: {args.model}")
-        
-        result = analyzer.analyze_article(args.topic, args.domain)
+        if args.server:
+            # The server's warm analyzer does the work; no local setup needed
+            with AnalysisClient(args.server) as client:
+                results = [client.analyze(topic=args.topic, domain=args.domain)]
+        else:
+            results = analyze_locally(args)
         
         # Format and display results
-        formatted_result = format_analysis_result(result)
-        print(formatted_result)
+        formatted_results = []
+        for result in results:
+            formatted_result = format_analysis_result(result)
+            if args.verbose and 'processing_time' in result:
+                formatted_result += f"\nProcessing time: {result['processing_time']:.2f}s\n"
+                formatted_result += "Stage timings: " + ", ".join(
+                    f"{stage} {seconds:.2f}s" for stage, seconds in result.get('timings', {}).items()
+                ) + "\n"
+                if result.get('condensed'):
+                    condensed = result['condensed']
+                    formatted_result += (f"Condensed: {condensed['tokens_saved']} of {condensed['original_tokens']} "
+                                         f"tokens saved, {condensed['dropped_sentences']} sentences dropped\n")
+                if result.get('cost'):
+                    formatted_result += f"Estimated cost: ${result['cost']['total']:.5f}\n"
+            formatted_results.append(formatted_result)
+            if not args.stream:
+                print(formatted_result)
+        formatted_result = "\n".join(formatted_results)
+        if args.store:
+            served = sum(1 for result in results if result.get('store', {}).get('reused'))
+            print(f"{served} of {len(results)} articles served from {args.store}, "
+                  f"{len(results) - served} analyzed")
         
         # Save to file if requested
         if args.output:
@@ -86,7 +400,7 @@ def demo():
         
         if 'error' not in result:
             print(f"✓ Title: {result['title']}")
-            print(f"✓ Analysis preview: {result['analysis'][:200]}...")
+            print(f"✓ Analysis preview: {result['synthesized_result'][:200]}...")
             print(f"✓ Processing time: {result.get('processing_time', 0):.2f}s")
         else:
             print(f"✗ Error: {result['error']}")
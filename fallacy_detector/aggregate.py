@@ -0,0 +1,414 @@
+"""
+Running fallacy statistics across analyzed articles.
+
+Monitoring a topic across sources needs counts, not isolated results:
+which fallacies each domain uses, how that changes day by day and how
+confident the detections are. :class:`FallacyStats` ingests the structured
+detections of each result as it completes and keeps detection counts per
+fallacy x domain x day cell, split by confidence level, plus article counts
+per domain x day.
+
+Names are dictionary-encoded and each cell is one packed ``int64`` key
+(fallacy, domain and day since the epoch) in a sorted array, next to an
+``(n, 3)`` array of counts per confidence level. New detections go to a
+buffer that is merged in bulk (one ``np.unique`` over keys, one
+``np.bincount``) when it fills or a query arrives. Queries are vectorized
+masks and group-bys over the cell arrays, so they cost milliseconds even
+when the cells summarize millions of detections.
+"""
+
+import numbers
+import threading
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlparse
+
+from .detection import Confidence
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# Confidence levels in ascending order; the columns of the count arrays
+CONFIDENCE_LEVELS = tuple(level.value for level in Confidence)
+GROUP_FIELDS = ("fallacy", "domain", "day")
+
+# Packed cell key: fallacy code (15 bits) | domain code (24 bits) | day (24 bits)
+_FIELD_BITS = 24
+_FIELD_MASK = (1 << _FIELD_BITS) - 1
+_FALLACY_SHIFT = 2 * _FIELD_BITS
+_MAX_FALLACIES = 1 << 15
+_EPOCH = date(1970, 1, 1)
+
+Day = Union[int, str, date, datetime]
+
+
+def domain_of(url: str) -> str:
+    """Host name of a URL without a leading ``www.``; empty for text without a URL."""
+    host = urlparse(url).hostname or ""
+    return host[4:] if host.startswith("www.") else host
+
+
+def day_number(value: Day) -> int:
+    """Days since 1970-01-01 of a date, datetime, ISO string or day number."""
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, str):
+        value = date.fromisoformat(value.strip()[:10])
+    if isinstance(value, datetime):
+        value = value.astimezone(timezone.utc).date() if value.tzinfo else value.date()
+    return (value - _EPOCH).days
+
+
+def day_string(number: int) -> str:
+    """ISO date of a day number."""
+    return (_EPOCH + timedelta(days=int(number))).isoformat()
+
+
+class _Codes:
+    """Dictionary encoding of names to dense integer codes."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.codes: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def encode(self, name: str) -> int:
+        code = self.codes.get(name)
+        if code is None:
+            if len(self.names) >= self.limit:
+                raise ValueError(f"More than {self.limit} distinct values")
+            code = self.codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+
+class _PackedCounts:
+    """Counts per packed key in sorted arrays, with a buffer of pending increments."""
+
+    def __init__(self, width: int, flush_size: int):
+        import numpy as np
+
+        self.width = width
+        self.flush_size = flush_size
+        self.keys = np.empty(0, dtype=np.int64)
+        self.counts = np.empty((0, width), dtype=np.int64)
+        self._pending_keys: List[int] = []
+        self._pending_columns: List[int] = []
+        self._fields: Optional[Tuple["np.ndarray", "np.ndarray", "np.ndarray"]] = None
+
+    def add(self, key: int, column: int = 0) -> None:
+        self._pending_keys.append(key)
+        self._pending_columns.append(column)
+        if len(self._pending_keys) >= self.flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending_keys:
+            import numpy as np
+
+            keys, columns = self._pending_keys, self._pending_columns
+            self._pending_keys, self._pending_columns = [], []
+            self.merge(np.array(keys, dtype=np.int64), np.array(columns, dtype=np.int64))
+
+    def merge(self, keys: "np.ndarray", columns: "np.ndarray") -> None:
+        """Add one to ``(key, column)`` for each pair of the arrays."""
+        import numpy as np
+
+        if not keys.size:
+            return
+        existing = len(self.keys)
+        unique, inverse = np.unique(np.concatenate([self.keys, keys]), return_inverse=True)
+        counts = np.zeros((len(unique), self.width), dtype=np.int64)
+        counts[inverse[:existing]] = self.counts  # Existing keys are unique
+        counts += np.bincount(
+            inverse[existing:] * self.width + columns,
+            minlength=len(unique) * self.width
+        ).reshape(-1, self.width)
+        self.keys, self.counts = unique, counts
+        self._fields = None
+
+    def fields(self) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """Fallacy codes, domain codes and days of the keys, unpacked once per merge."""
+        import numpy as np
+
+        if self._fields is None:
+            self._fields = (
+                (self.keys >> _FALLACY_SHIFT).astype(np.int32),
+                ((self.keys >> _FIELD_BITS) & _FIELD_MASK).astype(np.int32),
+                (self.keys & _FIELD_MASK).astype(np.int32),
+            )
+        return self._fields
+
+
+class FallacyStats:
+    """Incremental fallacy x domain x day counts and confidence histograms.
+
+    Thread-safe. ``flush_size`` pending detections are buffered before they
+    are merged into the arrays; queries merge whatever is pending first.
+    """
+
+    def __init__(self, flush_size: int = 65_536):
+        if flush_size < 1:
+            raise ValueError("flush_size must be at least 1")
+        self._lock = threading.Lock()
+        self._fallacies = _Codes(_MAX_FALLACIES)
+        self._domains = _Codes(1 << _FIELD_BITS)
+        self._detections = _PackedCounts(len(CONFIDENCE_LEVELS), flush_size)
+        self._articles = _PackedCounts(1, flush_size)
+        self._level_index = {level: i for i, level in enumerate(CONFIDENCE_LEVELS)}
+
+    def _key(self, fallacy_code: int, domain_code: int, day: int) -> int:
+        if not 0 <= day <= _FIELD_MASK:
+            raise ValueError(f"Day {day} out of range")
+        return (fallacy_code << _FALLACY_SHIFT) | (domain_code << _FIELD_BITS) | day
+
+    def add(self, fallacy: str, domain: str, day: Day, confidence: Any = Confidence.LOW) -> None:
+        """Count one detection."""
+        with self._lock:
+            key = self._key(self._fallacies.encode(fallacy), self._domains.encode(domain), day_number(day))
+            self._detections.add(key, self._level_index[Confidence.parse(confidence).value])
+
+    def add_article(self, domain: str, day: Day) -> None:
+        """Count one analyzed article, with or without detections."""
+        with self._lock:
+            self._articles.add(self._key(0, self._domains.encode(domain), day_number(day)))
+
+    def add_result(self, result: Dict[str, Any], day: Optional[Day] = None) -> bool:
+        """Count an analysis result and its structured detections.
+
+        The domain comes from the result's URL. The day is the publication
+        date when given and parseable, otherwise today (UTC). Failed results
+        and text-mode results, which have no ``fallacies`` list, are not
+        counted; returns whether it was.
+        """
+        if 'error' in result or not isinstance(result.get('fallacies'), list):
+            return False
+        domain = domain_of(result.get('url') or "")
+        try:
+            day = day_number(day)  # type: ignore[arg-type]
+        except (TypeError, ValueError):  # None, or a date like "3 days ago"
+            day = day_number(datetime.now(timezone.utc))
+        with self._lock:
+            domain_code = self._domains.encode(domain)
+            self._articles.add(self._key(0, domain_code, day))
+            for record in result['fallacies']:
+                key = self._key(self._fallacies.encode(record['fallacy']), domain_code, day)
+                self._detections.add(key, self._level_index[Confidence.parse(record.get('confidence')).value])
+        return True
+
+    def add_many(
+        self,
+        fallacies: Sequence[str],
+        domains: Sequence[str],
+        days: Sequence[Day],
+        confidences: Optional[Sequence[Any]] = None
+    ) -> None:
+        """Count many detections at once, bypassing the buffer (backfills)."""
+        import numpy as np
+
+        if not len(fallacies) == len(domains) == len(days):
+            raise ValueError("fallacies, domains and days must have the same length")
+        with self._lock:
+            fallacy_codes = np.fromiter((self._fallacies.encode(f) for f in fallacies), dtype=np.int64)
+            domain_codes = np.fromiter((self._domains.encode(d) for d in domains), dtype=np.int64)
+            day_numbers = np.fromiter((day_number(d) for d in days), dtype=np.int64)
+            if day_numbers.size and (day_numbers.min() < 0 or day_numbers.max() > _FIELD_MASK):
+                raise ValueError("Day out of range")
+            if confidences is None:
+                levels = np.zeros(len(fallacies), dtype=np.int64)
+            else:
+                levels = np.fromiter(
+                    (self._level_index[Confidence.parse(c).value] for c in confidences), dtype=np.int64
+                )
+            self._detections.flush()
+            self._detections.merge(
+                (fallacy_codes << _FALLACY_SHIFT) | (domain_codes << _FIELD_BITS) | day_numbers,
+                levels
+            )
+
+    def _mask(
+        self,
+        packed: _PackedCounts,
+        fallacy: Optional[str] = None,
+        domain: Optional[str] = None,
+        since: Optional[Day] = None,
+        until: Optional[Day] = None
+    ) -> Any:
+        """Index of the cells matching the filters; None when a name was never seen."""
+        fallacy_codes, domain_codes, days = packed.fields()
+        conditions = []
+        if fallacy is not None:
+            if fallacy not in self._fallacies.codes:
+                return None
+            conditions.append(fallacy_codes == self._fallacies.codes[fallacy])
+        if domain is not None:
+            if domain not in self._domains.codes:
+                return None
+            conditions.append(domain_codes == self._domains.codes[domain])
+        if since is not None:
+            conditions.append(days >= day_number(since))
+        if until is not None:
+            conditions.append(days <= day_number(until))
+        if not conditions:
+            return slice(None)  # A view, not a copy
+        mask = conditions[0]
+        for condition in conditions[1:]:
+            mask &= condition
+        return mask
+
+    def counts(
+        self,
+        by: Sequence[str] = ("fallacy",),
+        fallacy: Optional[str] = None,
+        domain: Optional[str] = None,
+        since: Optional[Day] = None,
+        until: Optional[Day] = None,
+        min_confidence: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Detection counts grouped by any of ``fallacy``, ``domain`` and ``day``.
+
+        Each row holds the group fields, ``count`` and the count per
+        confidence level, most frequent first. ``since``/``until`` are
+        inclusive; ``min_confidence`` drops weaker detections.
+        """
+        import numpy as np
+
+        unknown = set(by) - set(GROUP_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot group by {', '.join(sorted(unknown))}")
+        by = [name for name in GROUP_FIELDS if name in by]
+        with self._lock:
+            self._detections.flush()
+            mask = self._mask(self._detections, fallacy, domain, since, until)
+            if mask is None:
+                return []
+            counts = self._detections.counts[mask]
+            if min_confidence is not None:
+                counts = counts[:, self._level_index[Confidence.parse(min_confidence).value]:]
+            selected = dict(zip(GROUP_FIELDS, (field[mask] for field in self._detections.fields())))
+            if not len(counts):
+                return []
+
+            # Dense group ids over the grouped fields, so grouping needs no sort
+            offsets = {'fallacy': 0, 'domain': 0, 'day': int(selected['day'].min())}
+            sizes = {
+                'fallacy': len(self._fallacies.names),
+                'domain': len(self._domains.names),
+                'day': int(selected['day'].max()) - offsets['day'] + 1,
+            }
+            shape = tuple(sizes[name] for name in by)
+            group_ids = np.ravel_multi_index(
+                tuple(selected[name] - offsets[name] for name in by), shape
+            ) if by else np.zeros(len(counts), dtype=np.int64)
+            if by == list(GROUP_FIELDS[:len(by)]):
+                # Cells are sorted by their key, so these groups are runs: sum each run
+                starts = np.flatnonzero(np.r_[True, group_ids[1:] != group_ids[:-1]])
+                groups, totals = group_ids[starts], np.add.reduceat(counts, starts, axis=0)
+            else:
+                groups, inverse = np.arange(int(np.prod(shape))), group_ids
+                if len(groups) > 4 * len(group_ids):  # Sparse: group the ids that occur instead
+                    groups, inverse = np.unique(group_ids, return_inverse=True)
+                totals = np.stack([
+                    np.bincount(inverse, weights=counts[:, i], minlength=len(groups))
+                    for i in range(counts.shape[1])
+                ], axis=1).astype(np.int64)
+            present = np.flatnonzero(totals.sum(axis=1))
+            groups, totals = groups[present], totals[present]
+            order = np.lexsort((groups, -totals.sum(axis=1)))
+            fields = np.unravel_index(groups[order], shape) if by else ()
+
+            rows = []
+            padding = len(CONFIDENCE_LEVELS) - counts.shape[1]
+            for position, level_counts in enumerate(totals[order].tolist()):
+                row: Dict[str, Any] = {}
+                for name, values in zip(by, fields):
+                    value = int(values[position]) + offsets[name]
+                    if name == "fallacy":
+                        row[name] = self._fallacies.names[value]
+                    elif name == "domain":
+                        row[name] = self._domains.names[value]
+                    else:
+                        row[name] = day_string(value)
+                row['count'] = sum(level_counts)
+                row['confidence'] = dict(zip(CONFIDENCE_LEVELS, [0] * padding + level_counts))
+                rows.append(row)
+            return rows
+
+    def confidence_histogram(
+        self,
+        fallacy: Optional[str] = None,
+        domain: Optional[str] = None,
+        since: Optional[Day] = None,
+        until: Optional[Day] = None
+    ) -> Dict[str, int]:
+        """Detections per confidence level matching the filters."""
+        with self._lock:
+            self._detections.flush()
+            mask = self._mask(self._detections, fallacy, domain, since, until)
+            if mask is None:
+                return dict.fromkeys(CONFIDENCE_LEVELS, 0)
+            totals = self._detections.counts[mask].sum(axis=0)
+            return dict(zip(CONFIDENCE_LEVELS, map(int, totals)))
+
+    def articles(
+        self,
+        domain: Optional[str] = None,
+        since: Optional[Day] = None,
+        until: Optional[Day] = None
+    ) -> int:
+        """Articles counted matching the filters."""
+        with self._lock:
+            self._articles.flush()
+            mask = self._mask(self._articles, None, domain, since, until)
+            return 0 if mask is None else int(self._articles.counts[mask].sum())
+
+    def to_frame(self) -> "pd.DataFrame":
+        """One row per fallacy x domain x day cell with its count per confidence level."""
+        import pandas as pd
+
+        with self._lock:
+            self._detections.flush()
+            keys, counts = self._detections.keys, self._detections.counts
+            fallacy_names = pd.Categorical.from_codes(keys >> _FALLACY_SHIFT, self._fallacies.names)
+            domain_names = pd.Categorical.from_codes((keys >> _FIELD_BITS) & _FIELD_MASK, self._domains.names)
+            frame = pd.DataFrame({
+                'fallacy': fallacy_names,
+                'domain': domain_names,
+                'day': pd.to_datetime(keys & _FIELD_MASK, unit='D').date,
+                **{level: counts[:, i] for i, level in enumerate(CONFIDENCE_LEVELS)},
+                'count': counts.sum(axis=1),
+            })
+        return frame
+
+    def export(self, path: Union[str, Path]) -> Path:
+        """Write :meth:`to_frame` as CSV, or as Parquet for a ``.parquet`` path.
+
+        Parquet needs ``pyarrow`` (``pip install fallacy-detector-ai[parquet]``).
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        frame = self.to_frame()
+        if path.suffix.lower() == ".parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError as e:
+                raise ImportError("Parquet export needs pyarrow: pip install pyarrow") from e
+            frame.to_parquet(path, index=False)
+        else:
+            frame.to_csv(path, index=False)
+        return path
+
+    def stats(self) -> Dict[str, Any]:
+        """Totals: detections, articles, distinct fallacies, domains and cells."""
+        with self._lock:
+            self._detections.flush()
+            self._articles.flush()
+            return {
+                'detections': int(self._detections.counts.sum()),
+                'articles': int(self._articles.counts.sum()),
+                'fallacies': len(self._fallacies.names),
+                'domains': len(self._domains.names),
+                'cells': len(self._detections.keys),
+            }
@@ -1,180 +1,1868 @@
 """
 AI Agent for detecting logical fallacies in news articles.
+
+LangChain, the OpenAI client, the HTTP and HTML libraries and pandas
+are imported on first use rather than at import time, so importing the
+package and constructing an analyzer stay fast on cold starts.
 """
 
+import asyncio
+import contextvars
+import copy
 import json
 import os
-import requests
-import pandas as pd
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from pydantic import SecretStr  # Required for OpenAI API key security
-
-from langchain.chains import LLMChain
-from langchain.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
-from langchain_community.document_loaders import WebBaseLoader  # For article content loading
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union
+)
 
+from .aggregate import FallacyStats
+from .batch import collected_output, collecting_stages, defer_stage
+from .cache import CachedPage, FetchCache, ResultCache, make_cache_key
+from .cascade import ModelCascade
+from .catalog import FallacyCatalog, load_catalog
+from .chunking import TextChunk, merge_detections, split_into_chunks
+from .condense import CondensedText, Condenser, TokenCounter
 from .config import AnalysisConfig
+from .corpus import read_document
+from .cpu_pool import CpuPool
+from .dedup import NearDuplicateIndex
+from .extraction import ArticleExtractor, check_content_type
+from .metrics import (
+    AnalysisMetrics,
+    MetricsHook,
+    current_metrics,
+    record_cache_hit,
+    time_stage,
+    track_analysis,
+    track_llm_stage,
+    using_metrics
+)
+from .detection import (
+    NO_FALLACIES_DETECTED,
+    Confidence,
+    DetectedFallacy,
+    IncrementalFallacyParser,
+    build_detection,
+    parse_detection_json,
+    parse_detection_text,
+    parse_fused_json,
+    render_detections,
+    resolve_quote_offsets
+)
+from .prescreen import PRESCREEN_EXPLANATION, PRESCREEN_SYNTHESIS, PreScreener
 from .prompts import (
     FALLACY_DETECTION_PROMPT,
+    STRUCTURED_FALLACY_DETECTION_PROMPT,
+    FUSED_ANALYSIS_PROMPT,
     EDUCATIONAL_EXPLANATION_PROMPT,
-    RESULT_SYNTHESIS_PROMPT
+    RESULT_SYNTHESIS_PROMPT,
+    FALLACY_PRIMER_PROMPT,
+    ARTICLE_IMPROVEMENT_PROMPT
 )
 
-from .utils import load_fallacies_data, clean_article_text, setup_logging
+from .transport import HttpTransport
+from .store import ResultStore, content_hash
+from .streaming import (
+    AnalysisEvent,
+    STAGE_SEARCH,
+    STAGE_DETECTION,
+    STAGE_EXPLANATION,
+    STAGE_SYNTHESIS,
+    STAGE_RESULT,
+    EVENT_START,
+    EVENT_TOKEN,
+    EVENT_FALLACY,
+    EVENT_END,
+    EVENT_ERROR
+)
+from .utils import clean_article_text, extract_fallacy_names, setup_logging
+
+if TYPE_CHECKING:
+    import httpx
+    import pandas as pd
+    from langchain.chains import LLMChain
+    from langchain_core.language_models import BaseChatModel
 
 # Set user agent to avoid warnings
 if not os.environ.get('USER_AGENT'):
     os.environ['USER_AGENT'] = 'Fallacy-Detector-AI/1.0'
 
+
+# Stage names of the LLM chains (see _setup_chains)
+LLM_STAGES = frozenset({"detection", "explanation", "synthesis", "analysis"})
+
+
+@dataclass
+class _Call:
+    """Pipeline step: ``call(*args)``, awaited as ``acall(*args)`` on the async path."""
+    
+    call: Callable[..., Any]
+    acall: Callable[..., Awaitable[Any]]
+    args: Tuple[Any, ...] = ()
+
+
+@dataclass
+class _Findings:
+    """Pipeline step: structured detection over ``content``, one event per finding."""
+    
+    content: str
+
+
+@dataclass
+class _Tokens:
+    """Pipeline step: one LLM stage, whose tokens are events when streaming.
+    
+    With ``findings_in`` the tokens are parsed as JSON detections against
+    that text and emitted as findings instead.
+    """
+    
+    stage: str
+    chain: "LLMChain"
+    inputs: Dict[str, Any]
+    findings_in: Optional[str] = None
+
+
+# What the pipeline generators yield (see FallacyAnalyzer._pipeline_steps)
+PipelineSteps = Generator[Union[AnalysisEvent, _Call, _Findings, _Tokens], Any, Any]
+
+
+def create_chat_model(config: AnalysisConfig, model_name: str = "") -> "BaseChatModel":
+    """Build the OpenAI chat model for a configuration (``model_name`` overrides its model)."""
+    from langchain_openai import ChatOpenAI
+    from pydantic import SecretStr  # Required for OpenAI API key security
+    
+    return ChatOpenAI(
+        temperature=config.temperature,
+        model=model_name or config.model_name,
+        api_key=SecretStr(config.openai_api_key),  # SecretStr required by langchain-openai
+        base_url=config.openai_base_url or None,
+        stream_usage=True  # Report token usage on streamed responses too
+    )
+
+
 class FallacyAnalyzer:
     """Main analyzer class for detecting logical fallacies in news articles."""
     
-    def __init__(self, config: AnalysisConfig):
-        """Initialize the analyzer with configuration."""
+    # Built by _setup_chains on first access, so that constructing an
+    # analyzer does not import LangChain or the OpenAI client
+    _LAZY_LLM_ATTRIBUTES = frozenset({
+        'llm',
+        'fallacy_detection_chain',
+        'structured_detection_chain',
+        'educational_explanation_chain',
+        'result_synthesis_chain',
+        'fallacy_primer_chain',
+        'article_improvement_chain',
+        'fused_analysis_chain',
+        'screening_detection_chain',
+        'screening_structured_detection_chain',
+        '_chain_stages',
+        '_chain_models',
+    })
+    
+    def __init__(
+        self,
+        config: AnalysisConfig,
+        cache: Optional[Any] = None,
+        hooks: Optional[List[MetricsHook]] = None
+    ):
+        """Initialize the analyzer with configuration.
+        
+        ``cache`` overrides the :class:`ResultCache` built from the config;
+        any object with ``get``/``set``/``stats`` methods works. ``hooks``
+        receive per-stage metrics (see :mod:`fallacy_detector.metrics`).
+        """
         self.config = config
         self.logger = setup_logging()
+        self.hooks: List[MetricsHook] = list(hooks or [])
         
-        # Initialize OpenAI chat model
-        self.llm = ChatOpenAI(
-            temperature=config.temperature,
-            model=config.model_name,
-            api_key=SecretStr(config.openai_api_key)  # SecretStr required by langchain-openai
-        )
+        # The chat model is created on first use (see _setup_chains)
+        self._create_chat_model = create_chat_model
+        self._setup_lock = threading.Lock()
         
         # Load fallacies data
-        self.fallacies_df = load_fallacies_data()
-        self.logger.info(f"Loaded {len(self.fallacies_df)} fallacy definitions")
+        self.catalog: FallacyCatalog = load_catalog()
+        if config.fallacy_subset:
+            self.catalog = self.catalog.subset(config.fallacy_subset)
+        self.logger.info(f"Loaded {len(self.catalog)} fallacy definitions")
+        
+        # Rendered once and shared by every detection prompt
+        self.fallacy_catalog = self.catalog.render()
+        self.fallacies_version = self.catalog.version
+        self.analysis_version = self._analysis_version()
+        
+        # Cache for LLM stage outputs
+        if cache is None and config.cache_enabled:
+            cache = ResultCache(
+                path=config.cache_path,
+                ttl=config.cache_ttl,
+                max_entries=config.cache_max_entries,
+                max_disk_entries=config.cache_max_disk_entries
+            )
+        self.cache = cache
+        
+        # Cache for Serper results and fetched pages
+        self.fetch_cache: Optional[FetchCache] = None
+        if config.fetch_cache_enabled:
+            self.fetch_cache = FetchCache(
+                ResultCache(
+                    path=config.fetch_cache_path,
+                    ttl=config.page_cache_max_age,
+                    max_entries=config.fetch_cache_max_entries,
+                    max_disk_entries=config.fetch_cache_max_disk_entries
+                ),
+                search_ttl=config.search_cache_ttl,
+                page_ttl=config.page_cache_ttl
+            )
+        
+        # MinHash index of analyzed articles, so syndicated copies reuse an analysis
+        self.dedup: Optional[NearDuplicateIndex] = None
+        if config.dedup_enabled:
+            self.dedup = NearDuplicateIndex(
+                threshold=config.dedup_threshold,
+                max_entries=config.dedup_max_entries
+            )
+        
+        # Finished analyses, so unchanged articles are not analyzed again
+        self.store: Optional[ResultStore] = ResultStore(config.store_path) if config.store_path else None
+        
+        # Fallacy x domain x day counts of every structured result
+        self.fallacy_stats: Optional[FallacyStats] = FallacyStats() if config.stats_enabled else None
         
-        # Create analysis chains
-        self._setup_chains()
+        # Worker processes preparing texts for aanalyze_text
+        self.cpu_pool: Optional[CpuPool] = None
+        if config.cpu_workers:
+            self.cpu_pool = CpuPool(config.cpu_workers, self._content_limit(), self.dedup)
+        
+        # Generic per-fallacy explanations, reused across articles
+        self.primers: Dict[str, str] = {}
+        if config.primers_path:
+            self.load_primers(config.primers_path)
+        
+        # Local cue scorer deciding which articles need the LLM stages
+        self.prescreener = PreScreener() if config.prescreen_mode != "off" else None
+        
+        # Sentence ranking that fits article text into the LLM token budget
+        self.condenser: Optional[Condenser] = None
+        if config.condense_tokens:
+            self.condenser = Condenser(
+                config.condense_tokens,
+                TokenCounter(config.condense_encoding),
+                screener=self.prescreener
+            )
+        
+        # Screening model whose detections are escalated to the detection model when needed
+        self.cascade: Optional[ModelCascade] = None
+        if config.cascade_model:
+            self.cascade = ModelCascade(
+                config.cascade_model,
+                min_confidence=config.cascade_min_confidence,
+                cue_score=config.cascade_cue_score,
+                screener=self.prescreener
+            )
+        
+        # Pooled, retrying HTTP client shared by searches and article fetches
+        self.transport = HttpTransport.from_config(config, headers={"User-Agent": os.environ['USER_AGENT']})
+        
+        # Async resources are bound to the event loop that first uses them
+        self._aio_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def __getattr__(self, name: str) -> Any:
+        """Create the chat model and chains the first time one is needed."""
+        if name in FallacyAnalyzer._LAZY_LLM_ATTRIBUTES and '_setup_lock' in self.__dict__:
+            with self._setup_lock:
+                if name not in self.__dict__:
+                    self._setup_chains()
+            return self.__dict__[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+    
+    @property
+    def fallacies_df(self) -> "pd.DataFrame":
+        """The catalog as a DataFrame (built on demand; imports pandas)."""
+        return self.catalog.to_dataframe()
     
     def _setup_chains(self):
-        """Set up LangChain chains for analysis."""
-        # Fallacy detection chain
-        self.fallacy_detection_chain = LLMChain(
-            llm=self.llm,
-            prompt=PromptTemplate(
-                input_variables=["content", "fallacies_df"],
-                template=FALLACY_DETECTION_PROMPT
+        """Set up the chat models and LangChain chains for analysis."""
+        from langchain.chains import LLMChain
+        from langchain.prompts import PromptTemplate
+        
+        # One OpenAI chat model per distinct model name
+        models: Dict[str, "BaseChatModel"] = {}
+        
+        def chat_model(model_name: str) -> "BaseChatModel":
+            if model_name not in models:
+                if model_name == self.config.model_name:
+                    models[model_name] = self._create_chat_model(self.config)
+                else:
+                    models[model_name] = self._create_chat_model(self.config, model_name)
+            return models[model_name]
+        
+        self.llm = chat_model(self.config.model_name)
+        self._chain_stages = {}
+        self._chain_models = {}
+        
+        def chain(stage: str, template: str, input_variables: List[str], json_mode: bool = False,
+                  model_name: str = "") -> "LLMChain":
+            model_name = model_name or self.config.stage_model(stage)
+            llm = chat_model(model_name)
+            stage_chain = LLMChain(
+                llm=llm.bind(response_format={"type": "json_object"}) if json_mode else llm,
+                prompt=PromptTemplate(input_variables=input_variables, template=template)
             )
+            # Stage and model names used for instrumentation and cache keys
+            self._chain_stages[id(stage_chain)] = stage
+            self._chain_models[id(stage_chain)] = model_name
+            return stage_chain
+        
+        # Fallacy detection chain
+        self.fallacy_detection_chain = chain(
+            "detection", FALLACY_DETECTION_PROMPT, ["content", "fallacy_catalog"]
+        )
+        
+        # Structured detection chain (JSON mode)
+        self.structured_detection_chain = chain(
+            "detection", STRUCTURED_FALLACY_DETECTION_PROMPT, ["content", "fallacy_catalog"], json_mode=True
         )
         
         # Educational explanation chain
-        self.educational_explanation_chain = LLMChain(
-            llm=self.llm,
-            prompt=PromptTemplate(
-                input_variables=["detected_fallacies"],
-                template=EDUCATIONAL_EXPLANATION_PROMPT
-            )
+        self.educational_explanation_chain = chain(
+            "explanation", EDUCATIONAL_EXPLANATION_PROMPT, ["detected_fallacies"]
         )
         
         # Result synthesis chain
-        self.result_synthesis_chain = LLMChain(
-            llm=self.llm,
-            prompt=PromptTemplate(
-                input_variables=["summary", "detailed_analysis"],
-                template=RESULT_SYNTHESIS_PROMPT
+        self.result_synthesis_chain = chain(
+            "synthesis", RESULT_SYNTHESIS_PROMPT, ["summary", "detailed_analysis"]
+        )
+        
+        # Primer mode: generic explanation once per fallacy, article-specific advice per article
+        self.fallacy_primer_chain = chain(
+            "explanation", FALLACY_PRIMER_PROMPT, ["fallacy_name", "fallacy_description"]
+        )
+        
+        self.article_improvement_chain = chain(
+            "explanation", ARTICLE_IMPROVEMENT_PROMPT, ["detected_fallacies"]
+        )
+        
+        # Fused pipeline: detection, explanations and report in one JSON response
+        self.fused_analysis_chain = chain(
+            "analysis", FUSED_ANALYSIS_PROMPT, ["content", "fallacy_catalog"], json_mode=True
+        )
+        
+        # Cascade: the same detection prompts on the screening model
+        self.screening_detection_chain = None
+        self.screening_structured_detection_chain = None
+        if self.cascade is not None:
+            self.screening_detection_chain = chain(
+                "detection", FALLACY_DETECTION_PROMPT, ["content", "fallacy_catalog"],
+                model_name=self.cascade.screening_model
             )
+            self.screening_structured_detection_chain = chain(
+                "detection", STRUCTURED_FALLACY_DETECTION_PROMPT, ["content", "fallacy_catalog"],
+                json_mode=True, model_name=self.cascade.screening_model
+            )
+    
+    def _analysis_version(self) -> str:
+        """Short hash of the prompts, fallacy table and settings that shape a result."""
+        config = self.config
+        return make_cache_key(
+            FALLACY_DETECTION_PROMPT,
+            STRUCTURED_FALLACY_DETECTION_PROMPT,
+            FUSED_ANALYSIS_PROMPT,
+            EDUCATIONAL_EXPLANATION_PROMPT,
+            RESULT_SYNTHESIS_PROMPT,
+            FALLACY_PRIMER_PROMPT,
+            ARTICLE_IMPROVEMENT_PROMPT,
+            self.fallacies_version,
+            [config.temperature, config.stage_models, config.cascade_model, config.cascade_min_confidence,
+             config.pipeline_mode, config.detection_mode, config.explanation_mode, config.long_article_mode,
+             config.article_char_limit, config.chunk_overlap, config.prescreen_mode, config.prescreen_threshold,
+             config.condense_tokens, config.condense_encoding]
+        )[:16]
+    
+    def _stage_cache_key(self, chain: "LLMChain", inputs: Dict[str, Any]) -> str:
+        """Key a stage by model, temperature, template, fallacy table and inputs."""
+        return make_cache_key(
+            self._chain_model(chain),
+            self.config.temperature,
+            chain.prompt.template,
+            self.fallacies_version,
+            inputs
         )
     
-    def load_article(self, search_topic: str, domain: str = "") -> Dict[str, Any]:
-        """Load article from search results."""
+    def _cached_stage(self, chain: "LLMChain", inputs: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """Key of a stage and its output if already known (collected batch outputs first, then the cache)."""
+        if self.cache is None and not collecting_stages():
+            return None, None
+        key = self._stage_cache_key(chain, inputs)
+        cached = collected_output(key)
+        if cached is None and self.cache is not None:
+            cached = self.cache.get(key)
+        return key, cached
+    
+    def _cache_stage(self, key: Optional[str], output: str) -> None:
+        """Keep a stage output in the result cache."""
+        if key is not None and self.cache is not None:
+            self.cache.set(key, output)
+    
+    def _stage_name(self, chain: "LLMChain") -> str:
+        """Return the pipeline stage a chain belongs to."""
+        return self._chain_stages.get(id(chain), "llm")
+    
+    def _chain_model(self, chain: "LLMChain") -> str:
+        """Return the model a chain calls."""
+        return self._chain_models.get(id(chain), self.config.model_name)
+    
+    def _run_chain(self, chain: "LLMChain", **inputs: Any) -> str:
+        """Run a chain, serving repeat inputs from the result cache."""
+        stage = self._stage_name(chain)
+        key, cached = self._cached_stage(chain, inputs)
+        if cached is not None:
+            record_cache_hit(stage)
+            return cached
+        defer_stage(self.config, key, chain, inputs, self._chain_model(chain))
+        
+        with track_llm_stage(stage, self._chain_model(chain)) as usage:
+            output = chain.run(**inputs, callbacks=[usage])
+        
+        self._cache_stage(key, output)
+        return output
+    
+    def _fallacy_description(self, fallacy_name: str) -> str:
+        """Look up the catalog description for a fallacy."""
+        entry = self.catalog.get(fallacy_name)
+        return entry.description if entry is not None else ""
+    
+    def get_primer(self, fallacy_name: str) -> str:
+        """Return the generic explanation for a fallacy, generating it on first use."""
+        primer = self.primers.get(fallacy_name)
+        if primer is None:
+            primer = self._run_chain(
+                self.fallacy_primer_chain,
+                fallacy_name=fallacy_name,
+                fallacy_description=self._fallacy_description(fallacy_name)
+            ).strip()
+            self.primers[fallacy_name] = primer
+        return primer
+    
+    async def aget_primer(self, fallacy_name: str) -> str:
+        """Async version of :meth:`get_primer`."""
+        primer = self.primers.get(fallacy_name)
+        if primer is None:
+            primer = (await self._arun_chain(
+                self.fallacy_primer_chain,
+                fallacy_name=fallacy_name,
+                fallacy_description=self._fallacy_description(fallacy_name)
+            )).strip()
+            self.primers[fallacy_name] = primer
+        return primer
+    
+    def build_primers(self) -> Dict[str, str]:
+        """Generate primers for every fallacy in the catalog."""
+        for fallacy_name in self.catalog.names:
+            self.get_primer(fallacy_name)
+        return dict(self.primers)
+    
+    def save_primers(self, path: str) -> None:
+        """Write primers to a JSON artifact that can be shipped and reloaded."""
+        output_path = Path(path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'fallacies_version': self.fallacies_version,
+                'model_name': self.config.stage_model("explanation"),
+                'primers': self.primers
+            }, f, indent=2, ensure_ascii=False)
+    
+    def load_primers(self, path: str) -> None:
+        """Load precomputed primers, ignoring artifacts built for another fallacy table."""
         try:
-            query = f"site:{domain} {search_topic}" if domain else search_topic
-            self.logger.info(f"Searching for: {query}")
-            
-            # Use Serper API for Google search
-            response = requests.post(
-                "https://google.serper.dev/search",
+            with open(path, encoding='utf-8') as f:
+                artifact = json.load(f)
+        except FileNotFoundError:
+            self.logger.warning(f"Primers file not found at {path}")
+            return
+        
+        if artifact.get('fallacies_version') != self.fallacies_version:
+            self.logger.warning(f"Ignoring primers at {path}: built for a different fallacy table")
+            return
+        self.primers.update(artifact.get('primers', {}))
+    
+    @staticmethod
+    def _compose_explanations(primers: List[str], names: List[str], improvements: str) -> str:
+        """Join cached primers with the article-specific advice."""
+        sections = [f"### {name}\n{primer}" for name, primer in zip(names, primers)]
+        sections.append(f"### Better approach\n{improvements.strip()}")
+        return "\n\n".join(sections)
+    
+    def _explanation_plan(self, detected_fallacies: str) -> List[str]:
+        """Return the fallacies to explain from primers, or [] for the full chain."""
+        if self.config.explanation_mode != "primer":
+            return []
+        return extract_fallacy_names(detected_fallacies, self.catalog.names)
+    
+    def _primers(self, names: List[str]) -> List[str]:
+        """Primers for the named fallacies."""
+        return [self.get_primer(name) for name in names]
+    
+    async def _aprimers(self, names: List[str]) -> List[str]:
+        """Async version of :meth:`_primers`; missing primers are generated concurrently."""
+        return list(await asyncio.gather(*(self.aget_primer(name) for name in names)))
+    
+    def _explanation_steps(self, detected_fallacies: str) -> PipelineSteps:
+        """Steps of the explanation stage in the configured mode; returns the explanations."""
+        names = self._explanation_plan(detected_fallacies)
+        if not names:
+            return (yield _Tokens(
+                STAGE_EXPLANATION,
+                self.educational_explanation_chain,
+                {'detected_fallacies': detected_fallacies}
+            ))
+        
+        primers = yield _Call(self._primers, self._aprimers, (names,))
+        for name, primer in zip(names, primers):
+            yield AnalysisEvent(STAGE_EXPLANATION, EVENT_TOKEN, f"### {name}\n{primer}\n\n")
+        yield AnalysisEvent(STAGE_EXPLANATION, EVENT_TOKEN, "### Better approach\n")
+        improvements = yield _Tokens(
+            STAGE_EXPLANATION,
+            self.article_improvement_chain,
+            {'detected_fallacies': detected_fallacies}
+        )
+        return self._compose_explanations(primers, names, improvements)
+    
+    def _explain(self, detected_fallacies: str) -> str:
+        """Run the explanation stage in the configured mode."""
+        return self._run_steps(self._explanation_steps(detected_fallacies))
+    
+    async def _aexplain(self, detected_fallacies: str) -> str:
+        """Async version of :meth:`_explain`."""
+        return await self._arun_steps(self._explanation_steps(detected_fallacies))
+    
+    def _build_detections(self, records: List[Dict[str, Any]], content: str) -> List[DetectedFallacy]:
+        """Resolve raw JSON records against the catalog and the article text."""
+        detections = []
+        for record in records:
+            detection = build_detection(record, content, self.catalog.names)
+            if detection is None:
+                self.logger.debug(f"Dropping detection with unknown fallacy: {record}")
+            else:
+                detections.append(detection)
+        return detections
+    
+    def iter_fallacies(self, content: str, chain: Optional["LLMChain"] = None) -> Iterator[DetectedFallacy]:
+        """Stream structured detections, yielding each as soon as it is parsed.
+        
+        ``chain`` replaces the structured detection chain (the cascade's
+        screening chain uses the same prompt on another model).
+        """
+        chain = chain or self.structured_detection_chain
+        inputs = {'content': content, 'fallacy_catalog': self.fallacy_catalog}
+        
+        key, cached = self._cached_stage(chain, inputs)
+        if cached is not None:
+            record_cache_hit("detection")
+            yield from self._build_detections(parse_detection_json(cached), content)
+            return
+        defer_stage(self.config, key, chain, inputs, self._chain_model(chain))
+        
+        parser = IncrementalFallacyParser()
+        raw_chunks = []
+        with track_llm_stage("detection", self._chain_model(chain)) as usage:
+            for chunk in (chain.prompt | chain.llm).stream(inputs, config={'callbacks': [usage]}):
+                raw_chunks.append(chunk.content)
+                yield from self._build_detections(parser.feed(chunk.content), content)
+        
+        self._cache_stage(key, ''.join(raw_chunks))
+    
+    async def aiter_fallacies(
+        self,
+        content: str,
+        chain: Optional["LLMChain"] = None
+    ) -> AsyncIterator[DetectedFallacy]:
+        """Async version of :meth:`iter_fallacies`."""
+        chain = chain or self.structured_detection_chain
+        inputs = {'content': content, 'fallacy_catalog': self.fallacy_catalog}
+        
+        key, cached = self._cached_stage(chain, inputs)
+        if cached is not None:
+            record_cache_hit("detection")
+            for detection in self._build_detections(parse_detection_json(cached), content):
+                yield detection
+            return
+        defer_stage(self.config, key, chain, inputs, self._chain_model(chain))
+        
+        parser = IncrementalFallacyParser()
+        raw_chunks = []
+        async for chunk in self._astream_tokens(chain, inputs, "detection"):
+            raw_chunks.append(chunk)
+            for detection in self._build_detections(parser.feed(chunk), content):
+                yield detection
+        
+        self._cache_stage(key, ''.join(raw_chunks))
+    
+    def detect_fallacies_structured(self, content: str) -> List[DetectedFallacy]:
+        """Return typed detections for cleaned article text."""
+        return list(self.iter_fallacies(content))
+    
+    def _content_limit(self) -> int:
+        """Characters of cleaned article text kept for analysis."""
+        if self.config.long_article_mode == "chunk":
+            return self.config.max_article_chars
+        return self.config.article_char_limit
+    
+    def _synthesis_text(self, content: str) -> str:
+        """Article text given to the synthesis stage (the lead of long articles)."""
+        if self.config.long_article_mode != "chunk":
+            return content
+        return clean_article_text(content, self.config.article_char_limit)
+    
+    def _chunks(self, content: str) -> List[TextChunk]:
+        """Detection windows over the article; one unless chunking applies."""
+        if self.config.long_article_mode != "chunk":
+            return [TextChunk(content, 0)]
+        return split_into_chunks(content, self.config.article_char_limit, self.config.chunk_overlap)
+    
+    def _detection_result(self, detections: List[DetectedFallacy]) -> Dict[str, Any]:
+        """Detection stage output for merged chunk detections."""
+        result: Dict[str, Any] = {'detected_fallacies': render_detections(detections)}
+        if self.config.detection_mode == "structured":
+            result['fallacies'] = [d.to_dict() for d in detections]
+        return result
+    
+    def _run_detection(self, chunk: TextChunk, screening: bool = False) -> List[DetectedFallacy]:
+        """Run one detection call on a chunk, on the screening model if asked."""
+        if self.config.detection_mode == "structured":
+            chain = self.screening_structured_detection_chain if screening else None
+            return list(self.iter_fallacies(chunk.text, chain))
+        output = self._run_chain(
+            self.screening_detection_chain if screening else self.fallacy_detection_chain,
+            content=chunk.text,
+            fallacy_catalog=self.fallacy_catalog
+        )
+        return self._build_detections(parse_detection_text(output), chunk.text)
+    
+    async def _arun_detection(self, chunk: TextChunk, screening: bool = False) -> List[DetectedFallacy]:
+        """Async version of :meth:`_run_detection`."""
+        if self.config.detection_mode == "structured":
+            chain = self.screening_structured_detection_chain if screening else None
+            return [d async for d in self.aiter_fallacies(chunk.text, chain)]
+        output = await self._arun_chain(
+            self.screening_detection_chain if screening else self.fallacy_detection_chain,
+            content=chunk.text,
+            fallacy_catalog=self.fallacy_catalog
+        )
+        return self._build_detections(parse_detection_text(output), chunk.text)
+    
+    def _screen_chunk(self, chunk: TextChunk) -> Tuple[List[DetectedFallacy], Optional[str]]:
+        """Cascade detection of one chunk: its detections and why it was escalated, if it was."""
+        screened = self._run_detection(chunk, screening=True)
+        reason = self.cascade.escalation_reason(screened, chunk.text)
+        detections = screened if reason is None else self._run_detection(chunk)
+        self.cascade.record(screened, detections, reason)
+        return detections, reason
+    
+    async def _ascreen_chunk(self, chunk: TextChunk) -> Tuple[List[DetectedFallacy], Optional[str]]:
+        """Async version of :meth:`_screen_chunk`."""
+        screened = await self._arun_detection(chunk, screening=True)
+        reason = self.cascade.escalation_reason(screened, chunk.text)
+        detections = screened if reason is None else await self._arun_detection(chunk)
+        self.cascade.record(screened, detections, reason)
+        return detections, reason
+    
+    def _detect_chunk(self, chunk: TextChunk) -> List[DetectedFallacy]:
+        """Run detection on one chunk; offsets are relative to the chunk."""
+        if self.cascade is not None:
+            return self._screen_chunk(chunk)[0]
+        return self._run_detection(chunk)
+    
+    async def _adetect_chunk(self, chunk: TextChunk) -> List[DetectedFallacy]:
+        """Async version of :meth:`_detect_chunk`."""
+        if self.cascade is not None:
+            return (await self._ascreen_chunk(chunk))[0]
+        return await self._arun_detection(chunk)
+    
+    def _map_chunks(self, detect: Any, chunks: List[TextChunk]) -> List[Any]:
+        """Apply a per-chunk detection function to all chunks in parallel."""
+        if len(chunks) == 1:
+            return [detect(chunks[0])]
+        workers = max(1, min(self.config.max_workers, len(chunks)))
+        # Each task runs in a copy of this context so stage metrics still
+        # reach the analysis being tracked
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda chunk: context.copy().run(detect, chunk), chunks))
+    
+    def _detect_chunks(self, chunks: List[TextChunk]) -> List[DetectedFallacy]:
+        """Detect over all chunks in parallel and merge the findings."""
+        return merge_detections(zip(chunks, self._map_chunks(self._detect_chunk, chunks)))
+    
+    async def _adetect_chunks(self, chunks: List[TextChunk]) -> List[DetectedFallacy]:
+        """Async version of :meth:`_detect_chunks`."""
+        per_chunk = await asyncio.gather(*(self._adetect_chunk(chunk) for chunk in chunks))
+        return merge_detections(zip(chunks, per_chunk))
+    
+    def _cascade_detections(self, chunks: List[TextChunk]) -> Tuple[List[DetectedFallacy], Dict[str, Any]]:
+        """Cascade detection over all chunks: merged findings and the cascade record."""
+        per_chunk = self._map_chunks(self._screen_chunk, chunks)
+        detections = merge_detections(zip(chunks, [found for found, _ in per_chunk]))
+        return detections, self.cascade.summary([reason for _, reason in per_chunk])
+    
+    async def _acascade_detections(self, chunks: List[TextChunk]) -> Tuple[List[DetectedFallacy], Dict[str, Any]]:
+        """Async version of :meth:`_cascade_detections`."""
+        per_chunk = await asyncio.gather(*(self._ascreen_chunk(chunk) for chunk in chunks))
+        detections = merge_detections(zip(chunks, [found for found, _ in per_chunk]))
+        return detections, self.cascade.summary([reason for _, reason in per_chunk])
+    
+    def _detection_steps(self, content: str) -> PipelineSteps:
+        """Steps of the detection stage in the configured mode; returns the detection output."""
+        chunks = self._chunks(content)
+        if self.cascade is not None:
+            # Screening and any escalation finish before findings are emitted
+            detections, cascade = yield _Call(self._cascade_detections, self._acascade_detections, (chunks,))
+            for detection in detections:
+                yield AnalysisEvent(STAGE_DETECTION, EVENT_FALLACY, detection)
+            return {**self._detection_result(detections), 'cascade': cascade}
+        
+        if len(chunks) > 1:
+            # Chunks run in parallel; findings are emitted once merged
+            detections = yield _Call(self._detect_chunks, self._adetect_chunks, (chunks,))
+            for detection in detections:
+                yield AnalysisEvent(STAGE_DETECTION, EVENT_FALLACY, detection)
+            return self._detection_result(detections)
+        
+        if self.config.detection_mode == "structured":
+            detections = yield _Findings(content)
+            return {
+                'detected_fallacies': render_detections(detections),
+                'fallacies': [d.to_dict() for d in detections]
+            }
+        
+        return {'detected_fallacies': (yield _Tokens(
+            STAGE_DETECTION,
+            self.fallacy_detection_chain,
+            {'content': content, 'fallacy_catalog': self.fallacy_catalog}
+        ))}
+    
+    def _detect(self, content: str) -> Dict[str, Any]:
+        """Run the detection stage in the configured mode."""
+        return self._run_steps(self._detection_steps(content))
+    
+    async def _adetect(self, content: str) -> Dict[str, Any]:
+        """Async version of :meth:`_detect`."""
+        return await self._arun_steps(self._detection_steps(content))
+    
+    def _prescreen(self, content: str) -> Optional[Dict[str, Any]]:
+        """Score content locally and decide how much of the pipeline to run.
+        
+        Returns None when the pre-screen is off, otherwise the score, the
+        matched cues and an ``action``: "analyze" (full pipeline), "skip"
+        (no LLM calls) or "detect" (detection only unless it finds fallacies).
+        """
+        if self.prescreener is None:
+            return None
+        with time_stage("prescreen"):
+            screen = self.prescreener.score(content)
+        action = "analyze"
+        if screen.score < self.config.prescreen_threshold:
+            action = self.config.prescreen_mode
+        return {**screen.to_dict(), 'threshold': self.config.prescreen_threshold, 'action': action}
+    
+    def _skipped_detection(self) -> Dict[str, Any]:
+        """Detection output for an article the pre-screen skipped."""
+        detection: Dict[str, Any] = {'detected_fallacies': NO_FALLACIES_DETECTED}
+        if self.config.detection_mode == "structured":
+            detection['fallacies'] = []
+        return detection
+    
+    def _finds_fallacies(self, detection: Dict[str, Any]) -> bool:
+        """Whether detection output names at least one catalog fallacy."""
+        if 'fallacies' in detection:
+            return bool(detection['fallacies'])
+        return bool(extract_fallacy_names(detection['detected_fallacies'], self.catalog.names))
+    
+    @staticmethod
+    def _screened_result(
+        article_data: Dict[str, Any],
+        detection: Dict[str, Any],
+        screen: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Final result for an article cleared by the pre-screen."""
+        result = {
+            'title': article_data['title'],
+            'url': article_data['url'],
+            'detected_fallacies': detection['detected_fallacies'],
+            'educational_explanations': PRESCREEN_EXPLANATION,
+            'synthesized_result': PRESCREEN_SYNTHESIS,
+            'prescreen': screen
+        }
+        if 'fallacies' in detection:
+            result['fallacies'] = detection['fallacies']
+        if 'cascade' in detection:
+            result['cascade'] = detection['cascade']
+        return result
+    
+    def _uses_fused(self, content: str) -> bool:
+        """Whether content goes through the single-call fused pipeline.
+        
+        Articles split into several detection chunks stay on the staged
+        pipeline, which merges findings across chunks.
+        """
+        return self.config.pipeline_mode == "fused" and len(self._chunks(content)) == 1
+    
+    def _parse_fused(self, raw: str, content: str) -> Tuple[Dict[str, Any], str, str]:
+        """Split a fused response into detection output, explanations and report."""
+        parsed = parse_fused_json(raw)
+        detection = self._detection_result(self._build_detections(parsed['fallacies'], content))
+        return detection, parsed['explanations'], parsed['report']
+    
+    @staticmethod
+    def _fused_result(
+        article_data: Dict[str, Any],
+        detection: Dict[str, Any],
+        explanations: str,
+        synthesis: str,
+        screen: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Final result of a fused analysis, shaped like the staged one."""
+        result = {
+            'title': article_data['title'],
+            'url': article_data['url'],
+            'detected_fallacies': detection['detected_fallacies'],
+            'educational_explanations': explanations,
+            'synthesized_result': synthesis
+        }
+        if 'fallacies' in detection:
+            result['fallacies'] = detection['fallacies']
+        if screen is not None:
+            result['prescreen'] = screen
+        return result
+    
+    def _fused_steps(self, article_data: Dict[str, Any], screen: Optional[Dict[str, Any]]) -> PipelineSteps:
+        """Run detection, explanation and synthesis as one LLM call.
+        
+        When streaming, detections are emitted as soon as they are parsed.
+        """
+        content = article_data['content']
+        raw = yield _Tokens(
+            STAGE_DETECTION,
+            self.fused_analysis_chain,
+            {'content': content, 'fallacy_catalog': self.fallacy_catalog},
+            findings_in=content
+        )
+        detection, explanations, synthesis = self._parse_fused(raw, content)
+        yield AnalysisEvent(STAGE_DETECTION, EVENT_END, detection['detected_fallacies'])
+        if screen is not None and screen['action'] == "detect" and not self._finds_fallacies(detection):
+            return self._screened_result(article_data, detection, screen)
+        yield AnalysisEvent(STAGE_EXPLANATION, EVENT_START)
+        yield AnalysisEvent(STAGE_EXPLANATION, EVENT_END, explanations)
+        yield AnalysisEvent(STAGE_SYNTHESIS, EVENT_START)
+        yield AnalysisEvent(STAGE_SYNTHESIS, EVENT_END, synthesis)
+        return self._fused_result(article_data, detection, explanations, synthesis, screen)
+    
+    def search_articles(self, search_topic: str, domain: str = "", num_results: int = 5) -> List[Dict[str, Any]]:
+        """Run a single Serper search and return the organic hits."""
+        query = f"site:{domain} {search_topic}" if domain else search_topic
+        cached = self._cached_search(query, num_results)
+        if cached is not None:
+            return cached
+        self.logger.info(f"Searching for: {query}")
+        
+        # Use Serper API for Google search
+        with time_stage("search"):
+            response = self.transport.request(
+                "POST",
+                self.config.serper_endpoint,
                 headers={
                     "X-API-KEY": self.config.serper_api_key,
                     "Content-Type": "application/json"
                 },
                 json={
                     "q": query,
-                    "num": 5
+                    "num": num_results
                 }
             )
+            response.raise_for_status()
             search_results = response.json()
+        return self._store_search(query, num_results, search_results)
+    
+    def _cached_search(self, query: str, num_results: int) -> Optional[List[Dict[str, Any]]]:
+        """Organic hits of a recent identical search, if cached."""
+        if self.fetch_cache is None:
+            return None
+        hits = self.fetch_cache.get_search(self.config.serper_endpoint, query, num_results)
+        if hits is not None:
+            record_cache_hit("search")
+        return hits
+    
+    def _store_search(self, query: str, num_results: int, search_results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Cache and return the organic hits of a Serper response."""
+        hits = search_results.get('organic', [])[:num_results]
+        if self.fetch_cache is not None:
+            self.fetch_cache.set_search(self.config.serper_endpoint, query, num_results, hits)
+        return hits
+    
+    def _cached_page(self, url: str) -> Tuple[Optional[CachedPage], bool]:
+        """Stored copy of a page, and whether it is fresh enough to skip the request."""
+        if self.fetch_cache is None:
+            return None, False
+        page = self.fetch_cache.get_page(url, self._content_limit())
+        if page is None:
+            return None, False
+        fresh = self.fetch_cache.is_fresh(page)
+        if fresh:
+            record_cache_hit("fetch")
+        return page, fresh
+    
+    def _revalidated_page(self, url: str, page: CachedPage, response: "httpx.Response") -> str:
+        """Renew a stored page after a 304 and return its text."""
+        page.etag = response.headers.get('ETag', page.etag)
+        page.last_modified = response.headers.get('Last-Modified', page.last_modified)
+        self.fetch_cache.set_page(url, self._content_limit(), page, revalidated=True)
+        return page.text
+    
+    def _store_page(self, url: str, text: str, response: "httpx.Response") -> str:
+        """Cache the extracted text of a page with its validators."""
+        if self.fetch_cache is not None and 'no-store' not in response.headers.get('Cache-Control', ''):
+            page = CachedPage(
+                text=text,
+                etag=response.headers.get('ETag', ''),
+                last_modified=response.headers.get('Last-Modified', '')
+            )
+            self.fetch_cache.set_page(url, self._content_limit(), page)
+        return text
+    
+    def _page_extractor(self, response: "httpx.Response") -> ArticleExtractor:
+        """Check a fetched page's status and type and build its text extractor."""
+        response.raise_for_status()
+        content_type = response.headers.get('Content-Type')
+        check_content_type(content_type)
+        return ArticleExtractor(
+            max_chars=self._content_limit(),
+            max_bytes=self.config.max_page_bytes,
+            encoding=response.charset_encoding,
+            content_type=content_type
+        )
+    
+    def _fetch_article(self, article_url: str, article_title: str) -> Dict[str, Any]:
+        """Download and clean the content of a single search hit.
+        
+        The body is parsed as it streams in and the download stops once
+        enough article text has been extracted. Cached pages are reused
+        while fresh and revalidated with their ETag/Last-Modified after that.
+        """
+        page, fresh = self._cached_page(article_url)
+        if fresh:
+            page_text = page.text
+        else:
+            validators = page.validators() if page is not None else {}
+            with time_stage("fetch"):
+                with self.transport.stream("GET", article_url, headers=validators) as response:
+                    if validators and response.status_code == 304:
+                        page_text = self._revalidated_page(article_url, page, response)
+                    else:
+                        extractor = self._page_extractor(response)
+                        for chunk in response.iter_bytes():
+                            if extractor.feed(chunk):
+                                break
+                        page_text = self._store_page(article_url, extractor.close(), response)
+        
+        # Clean and limit content
+        with time_stage("clean"):
+            article_text = clean_article_text(page_text, self._content_limit())
+        
+        return {
+            'url': article_url,
+            'title': article_title,
+            'content': article_text
+        }
+    
+    def load_article(self, search_topic: str, domain: str = "") -> Dict[str, Any]:
+        """Load article from search results."""
+        try:
+            hits = self.search_articles(search_topic, domain)
             
             # Check if we found any articles
-            if not search_results.get('organic'):
+            if not hits:
                 return {'error': 'No articles found for the given search criteria'}
             
             # Get the first article
-            first_article = search_results['organic'][0]
-            article_url = first_article['link']
-            article_title = first_article['title']
-            
-            # Load article content
-            loader = WebBaseLoader(article_url)
-            article_content = loader.load()
-            
-            # Clean and limit content
-            article_text = clean_article_text(
-                article_content[0].page_content, 
-                self.config.article_char_limit
-            )
-            
-            return {
-                'url': article_url,
-                'title': article_title,
-                'content': article_text
-            }
+            first_article = hits[0]
+            return self._fetch_article(first_article['link'], first_article['title'])
             
         except Exception as e:
             self.logger.error(f"Failed to load article: {str(e)}")
             return {'error': f'Article loading failed: {str(e)}'}
     
+    def _find_duplicate(self, article_data: Dict[str, Any]) -> Tuple[Any, Optional[Dict[str, Any]]]:
+        """Signature of the article and, for a near-duplicate, the reused result."""
+        if self.dedup is None:
+            return None, None
+        with time_stage("dedup"):
+            signature = article_data.get('signature')  # Computed by a CPU pool worker
+            if signature is None:
+                signature = self.dedup.signature(article_data['content'])
+            match = self.dedup.query(signature) if signature is not None else None
+        if match is None:
+            return signature, None
+        
+        (prior, llm_calls), similarity = match
+        self.logger.info(f"Reusing the analysis of near-duplicate {prior['url']} ({similarity:.2f})")
+        result = copy.deepcopy(prior)
+        result.update(title=article_data['title'], url=article_data['url'])
+        for record in result.get('fallacies', ()):
+            # Offsets pointed into the earlier article; find each quote again in this one
+            record['start'], record['end'] = resolve_quote_offsets(record['quote'], article_data['content'])
+        result['near_duplicate'] = {
+            'title': prior['title'],
+            'url': prior['url'],
+            'similarity': similarity,
+            'llm_calls_saved': llm_calls
+        }
+        return signature, result
+    
+    def _remember_analysis(self, signature: Any, result: Dict[str, Any]) -> None:
+        """Index a finished analysis for later near-duplicates."""
+        if self.dedup is None or signature is None or 'error' in result:
+            return
+        metrics = current_metrics()
+        llm_calls = sum(
+            1 for m in metrics.stages if m.stage in LLM_STAGES and not m.cached
+        ) if metrics is not None else 0
+        self.dedup.add(signature, (copy.deepcopy(result), llm_calls), llm_calls)
+    
+    def _stored_analysis(self, article_data: Dict[str, Any]) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Hash of the article text and, if that text was analyzed before, the stored result."""
+        if self.store is None:
+            return None, None
+        with time_stage("store"):
+            text_hash = content_hash(article_data['content'])
+            stored = self.store.find(article_data['url'], text_hash, self.config.model_name, self.analysis_version)
+        if stored is None:
+            return text_hash, None
+        self.logger.info(f"Serving the stored analysis of {article_data['url'] or 'the text'}")
+        if stored['store']['url'] != article_data['url']:  # Same text under another URL
+            stored.update(title=article_data['title'], url=article_data['url'])
+            self._save_analysis(article_data, text_hash, stored)
+        return text_hash, stored
+    
+    def _save_analysis(self, article_data: Dict[str, Any], text_hash: Optional[str], result: Dict[str, Any]) -> None:
+        """Keep a finished analysis in the store."""
+        if text_hash is not None:
+            self.store.save(
+                result, text_hash, self.config.model_name, self.analysis_version, article_data.get('published')
+            )
+    
+    def _record_stats(self, article_data: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        """Count a finished result's detections in the running statistics."""
+        if self.fallacy_stats is not None:
+            self.fallacy_stats.add_result(result, article_data.get('published'))
+        return result
+    
+    def _condense(self, article_data: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[CondensedText]]:
+        """Article data with its text fitted into the token budget, and the offset map."""
+        if self.condenser is None:
+            return article_data, None
+        with time_stage("condense"):
+            condensed = self.condenser.condense(article_data['content'])
+        return {**article_data, 'content': condensed.text}, condensed
+    
+    @staticmethod
+    def _restore_offsets(result: Dict[str, Any], condensed: Optional[CondensedText]) -> Dict[str, Any]:
+        """Map detection offsets in a result back to the article text and report the tokens saved."""
+        if condensed is None or 'error' in result:
+            return result
+        for record in result.get('fallacies', ()):
+            record['start'], record['end'] = condensed.to_original(record['start'], record['end'])
+        result['condensed'] = condensed.stats()
+        return result
+    
+    def _restore_event(self, event: AnalysisEvent, condensed: Optional[CondensedText]) -> AnalysisEvent:
+        """:meth:`_restore_offsets` for a streamed finding or result."""
+        if condensed is None:
+            return event
+        if event.kind == EVENT_FALLACY:
+            start, end = condensed.to_original(event.data.start, event.data.end)
+            return AnalysisEvent(event.stage, event.kind, replace(event.data, start=start, end=end))
+        if event.stage == STAGE_RESULT and event.kind == EVENT_END:
+            self._restore_offsets(event.data, condensed)
+        return event
+    
+    def _analyze_content(self, article_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Analyze loaded article data, serving a stored analysis of the same text or reusing a near-duplicate's."""
+        text_hash, stored = self._stored_analysis(article_data)
+        if stored is not None:
+            return self._record_stats(article_data, stored)
+        signature, reused = self._find_duplicate(article_data)
+        if reused is not None:
+            self._save_analysis(article_data, text_hash, reused)
+            return self._record_stats(article_data, reused)
+        condensed_data, condensed = self._condense(article_data)
+        result = self._restore_offsets(self._run_pipeline(condensed_data), condensed)
+        self._remember_analysis(signature, result)
+        self._save_analysis(article_data, text_hash, result)
+        return self._record_stats(article_data, result)
+    
+    def _pipeline_steps(self, article_data: Dict[str, Any]) -> PipelineSteps:
+        """Detection, explanation and synthesis over loaded article data.
+        
+        The one definition of the pipeline behind the blocking, async and
+        streaming APIs: it yields stage events and the steps a driver
+        performs (see :meth:`_drive`), and returns the final result.
+        """
+        content = article_data['content']
+        # Pre-screen locally before paying for any LLM call
+        screen = self._prescreen(content)
+        
+        # Detect fallacies
+        yield AnalysisEvent(STAGE_DETECTION, EVENT_START)
+        if screen is not None and screen['action'] == "skip":
+            detection = self._skipped_detection()
+            yield AnalysisEvent(STAGE_DETECTION, EVENT_END, detection['detected_fallacies'])
+            return self._screened_result(article_data, detection, screen)
+        
+        if self._uses_fused(content):
+            return (yield from self._fused_steps(article_data, screen))
+        
+        detection = yield from self._detection_steps(content)
+        detected_fallacies_result = detection['detected_fallacies']
+        yield AnalysisEvent(STAGE_DETECTION, EVENT_END, detected_fallacies_result)
+        if screen is not None and screen['action'] == "detect" and not self._finds_fallacies(detection):
+            return self._screened_result(article_data, detection, screen)
+        
+        # Debug output
+        self.logger.debug(f"Detected fallacies result: {detected_fallacies_result[:300]}...")
+        
+        # Text mode output is passed on as is; structured mode is rendered to the same format
+        detected_fallacies_cleaned = detected_fallacies_result.strip()
+        
+        # Generate educational explanations
+        yield AnalysisEvent(STAGE_EXPLANATION, EVENT_START)
+        educational_explanations = yield from self._explanation_steps(detected_fallacies_cleaned)
+        yield AnalysisEvent(STAGE_EXPLANATION, EVENT_END, educational_explanations)
+        
+        # Synthesize results
+        yield AnalysisEvent(STAGE_SYNTHESIS, EVENT_START)
+        result = yield _Tokens(STAGE_SYNTHESIS, self.result_synthesis_chain, {
+            'summary': self._synthesis_text(content),
+            'detailed_analysis': educational_explanations
+        })
+        yield AnalysisEvent(STAGE_SYNTHESIS, EVENT_END, result)
+        
+        # Compile final result
+        final_result = {
+            'title': article_data['title'],
+            'url': article_data['url'],
+            'detected_fallacies': detected_fallacies_result,
+            'educational_explanations': educational_explanations,
+            'synthesized_result': result
+        }
+        if 'fallacies' in detection:
+            final_result['fallacies'] = detection['fallacies']
+        if 'cascade' in detection:
+            final_result['cascade'] = detection['cascade']
+        if screen is not None:
+            final_result['prescreen'] = screen
+        return final_result
+    
+    def _token_events(
+        self,
+        step: _Tokens,
+        parser: Optional[IncrementalFallacyParser],
+        token: str
+    ) -> List[AnalysisEvent]:
+        """Events for one streamed token of an LLM stage."""
+        if parser is None:
+            return [AnalysisEvent(step.stage, EVENT_TOKEN, token)]
+        return [
+            AnalysisEvent(step.stage, EVENT_FALLACY, detection)
+            for detection in self._build_detections(parser.feed(token), step.findings_in)
+        ]
+    
+    def _drive(self, steps: PipelineSteps, streaming: bool = True) -> Generator[AnalysisEvent, None, Any]:
+        """Perform pipeline steps, passing their events on; returns what the steps return.
+        
+        Without ``streaming`` each LLM stage is a single call and emits no
+        token events.
+        """
+        reply = None
+        while True:
+            try:
+                step = steps.send(reply)
+            except StopIteration as done:
+                return done.value
+            reply = None
+            if isinstance(step, AnalysisEvent):
+                yield step
+            elif isinstance(step, _Call):
+                reply = step.call(*step.args)
+            elif isinstance(step, _Findings):
+                reply = []
+                for detection in self.iter_fallacies(step.content):
+                    reply.append(detection)
+                    yield AnalysisEvent(STAGE_DETECTION, EVENT_FALLACY, detection)
+            elif not streaming:
+                reply = self._run_chain(step.chain, **step.inputs)
+            else:
+                parser = IncrementalFallacyParser() if step.findings_in is not None else None
+                chunks = []
+                for token in self._stream_chain(step.chain, **step.inputs):
+                    chunks.append(token)
+                    yield from self._token_events(step, parser, token)
+                reply = ''.join(chunks)
+    
+    def _run_steps(self, steps: PipelineSteps) -> Any:
+        """Perform pipeline steps without streaming and return their result."""
+        events = self._drive(steps, streaming=False)
+        while True:
+            try:
+                next(events)
+            except StopIteration as done:
+                return done.value
+    
+    def _run_pipeline(self, article_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run detection, explanation and synthesis over loaded article data."""
+        return self._run_steps(self._pipeline_steps(article_data))
+    
     def analyze_article(self, search_topic: str, domain: str = "") -> Dict[str, Any]:
         """Complete analysis pipeline for a news article."""
+        with track_analysis(self.hooks) as metrics:
+            try:
+                # Load article
+                article_data = self.load_article(search_topic, domain)
+                if 'error' in article_data:
+                    return article_data
+                
+                result = self._analyze_content(article_data)
+                
+            except Exception as e:
+                self.logger.error(f"Analysis failed: {str(e)}")
+                return {'error': f'Analysis failed: {str(e)}'}
+        
+        result.update(metrics.to_dict())
+        return result
+    
+    def analyze_url(self, url: str, title: str = "") -> Dict[str, Any]:
+        """Fetch and analyze one article by URL, timing the whole round trip."""
+        with track_analysis(self.hooks) as metrics:
+            try:
+                article_data = self._fetch_article(url, title or url)
+                result = self._analyze_content(article_data)
+            except Exception as e:
+                self.logger.error(f"Analysis failed for {url}: {str(e)}")
+                result = {
+                    'title': title or 'Unknown',
+                    'url': url,
+                    'error': f'Analysis failed: {str(e)}'
+                }
+        
+        result.update(metrics.to_dict())
+        return result
+    
+    def _analyze_hit(self, rank: int, hit: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch and analyze one search hit."""
+        return {**self.analyze_url(hit.get('link', 'Unknown'), hit.get('title', 'Unknown')), 'rank': rank}
+    
+    def analyze_articles(self, search_topic: str, domain: str = "", max_articles: int = 5) -> List[Dict[str, Any]]:
+        """Analyze up to ``max_articles`` hits from one search concurrently.
+        
+        Results are returned in search-rank order; failed articles carry an
+        ``error`` key instead of aborting the whole batch.
+        """
         try:
-            # Load article
-            article_data = self.load_article(search_topic, domain)
-            if 'error' in article_data:
-                return article_data
-            
-            # Detect fallacies - SIMPLE
-            detected_fallacies_result = self.fallacy_detection_chain.run(
-                content=article_data['content'],
-                fallacies_df=self.fallacies_df.to_string()
-            )
-            
-            # Debug output
-            print(f"DEBUG - Detected fallacies result: {detected_fallacies_result[:300]}...")
-            
-            # No JSON parsing needed - just pass as is
-            detected_fallacies_cleaned = detected_fallacies_result.strip()
-            
-            # Generate educational explanations
-            educational_explanations = self.educational_explanation_chain.run(
-                detected_fallacies=detected_fallacies_cleaned
-            )
-            
-            # Synthesize results
-            result = self.result_synthesis_chain.run(
-                summary=article_data['content'],  # Assuming summary is the article content for synthesis
-                detailed_analysis=educational_explanations
-            )
+            hits = self.search_articles(search_topic, domain, num_results=max_articles)
+        except Exception as e:
+            self.logger.error(f"Failed to search articles: {str(e)}")
+            return [{'error': f'Article loading failed: {str(e)}'}]
+        
+        if not hits:
+            return [{'error': 'No articles found for the given search criteria'}]
+        
+        # Fetch and analyze each hit on a bounded pool; map() keeps rank order
+        workers = max(1, min(self.config.max_workers, len(hits)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self._analyze_hit, range(1, len(hits) + 1), hits))
+    
+    def _text_article(self, text: str, metadata: Optional[Dict[str, Any]], source: str = "") -> Dict[str, Any]:
+        """Article data for text supplied by the caller."""
+        metadata = metadata or {}
+        with time_stage("clean"):
+            content = clean_article_text(read_document(source) if source else text, self._content_limit())
+        if not content:
+            raise ValueError("No text to analyze")
+        return {
+            'url': metadata.get('url', ''),
+            'title': metadata.get('title', ''),
+            'published': metadata.get('date') or metadata.get('published'),
+            'content': content
+        }
+    
+    async def _atext_article(self, text: str, metadata: Optional[Dict[str, Any]], source: str = "") -> Dict[str, Any]:
+        """Async version of :meth:`_text_article`, in the CPU pool when there is one."""
+        if self.cpu_pool is None:
+            return self._text_article(text, metadata, source)
+        metadata = metadata or {}
+        with time_stage("clean"):
+            content, signature = await self.cpu_pool.prepare(text, source)
+        if not content:
+            raise ValueError("No text to analyze")
+        return {
+            'url': metadata.get('url', ''),
+            'title': metadata.get('title', ''),
+            'published': metadata.get('date') or metadata.get('published'),
+            'content': content,
+            'signature': signature
+        }
+    
+    def _text_failure(self, metadata: Optional[Dict[str, Any]], error: Exception) -> Dict[str, Any]:
+        """Result for text that could not be analyzed."""
+        self.logger.error(f"Analysis failed: {str(error)}")
+        metadata = metadata or {}
+        return {
+            'title': metadata.get('title', ''),
+            'url': metadata.get('url', ''),
+            'error': f'Analysis failed: {str(error)}'
+        }
+    
+    def analyze_text(self, text: str, metadata: Optional[Dict[str, Any]] = None, source: str = "") -> Dict[str, Any]:
+        """Analyze text already at hand, without searching or fetching.
+        
+        ``title`` and ``url`` are taken from ``metadata`` when present; the
+        whole mapping is returned under ``metadata``. With ``source`` the
+        text is read from that text or HTML file instead.
+        """
+        with track_analysis(self.hooks) as metrics:
+            try:
+                result = self._analyze_content(self._text_article(text, metadata, source))
+            except Exception as e:
+                result = self._text_failure(metadata, e)
+        
+        if metadata:
+            result['metadata'] = dict(metadata)
+        result.update(metrics.to_dict())
+        return result
+    
+    def get_fallacies_info(self) -> "pd.DataFrame":
+        """Return information about available fallacies."""
+        return self.catalog.to_dataframe()
+    
+    # ------------------------------------------------------------------
+    # Async API
+    # ------------------------------------------------------------------
+    
+    def _ensure_async_resources(self) -> None:
+        """Create the semaphores for the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._aio_loop is loop:
+            return
+        
+        self._aio_loop = loop
+        self._search_semaphore = asyncio.Semaphore(self.config.search_concurrency)
+        self._fetch_semaphore = asyncio.Semaphore(self.config.fetch_concurrency)
+        self._llm_semaphore = asyncio.Semaphore(self.config.llm_concurrency)
+    
+    def close(self) -> None:
+        """Close the shared blocking HTTP client and stop the CPU pool."""
+        self.transport.close()
+        if self.cpu_pool is not None:
+            self.cpu_pool.close()
+    
+    async def aclose(self) -> None:
+        """Close the shared async HTTP client and stop the CPU pool."""
+        await self.transport.aclose()
+        self._aio_loop = None
+        if self.cpu_pool is not None:
+            self.cpu_pool.close()
+    
+    async def __aenter__(self) -> "FallacyAnalyzer":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
+    async def asearch_articles(self, search_topic: str, domain: str = "", num_results: int = 5) -> List[Dict[str, Any]]:
+        """Async version of :meth:`search_articles`."""
+        self._ensure_async_resources()
+        query = f"site:{domain} {search_topic}" if domain else search_topic
+        cached = self._cached_search(query, num_results)
+        if cached is not None:
+            return cached
+        self.logger.info(f"Searching for: {query}")
+        
+        async with self._search_semaphore:
+            with time_stage("search"):
+                response = await self.transport.arequest(
+                    "POST",
+                    self.config.serper_endpoint,
+                    headers={
+                        "X-API-KEY": self.config.serper_api_key,
+                        "Content-Type": "application/json"
+                    },
+                    json={
+                        "q": query,
+                        "num": num_results
+                    }
+                )
+        response.raise_for_status()
+        search_results = response.json()
+        return self._store_search(query, num_results, search_results)
+    
+    async def _afetch_article(self, article_url: str, article_title: str) -> Dict[str, Any]:
+        """Async version of :meth:`_fetch_article`."""
+        self._ensure_async_resources()
+        page, fresh = self._cached_page(article_url)
+        if fresh:
+            page_text = page.text
+        else:
+            validators = page.validators() if page is not None else {}
+            async with self._fetch_semaphore:
+                with time_stage("fetch"):
+                    async with self.transport.astream("GET", article_url, headers=validators) as response:
+                        if validators and response.status_code == 304:
+                            page_text = self._revalidated_page(article_url, page, response)
+                        else:
+                            extractor = self._page_extractor(response)
+                            async for chunk in response.aiter_bytes():
+                                if extractor.feed(chunk):
+                                    break
+                            page_text = self._store_page(article_url, extractor.close(), response)
+        
+        with time_stage("clean"):
+            article_text = clean_article_text(page_text, self._content_limit())
+        
+        return {
+            'url': article_url,
+            'title': article_title,
+            'content': article_text
+        }
+    
+    async def aload_article(self, search_topic: str, domain: str = "") -> Dict[str, Any]:
+        """Async version of :meth:`load_article`."""
+        try:
+            hits = await self.asearch_articles(search_topic, domain)
             
-            # Compile final result
-            final_result = {
-                'title': article_data['title'],
-                'url': article_data['url'],
-                'detected_fallacies': detected_fallacies_result,
-                'educational_explanations': educational_explanations,
-                'synthesized_result': result
-            }
+            if not hits:
+                return {'error': 'No articles found for the given search criteria'}
             
-            return final_result
+            first_article = hits[0]
+            return await self._afetch_article(first_article['link'], first_article['title'])
             
+        except Exception as e:
+            self.logger.error(f"Failed to load article: {str(e)}")
+            return {'error': f'Article loading failed: {str(e)}'}
+    
+    async def _arun_chain(self, chain: "LLMChain", **inputs: Any) -> str:
+        """Run a chain on the async LLM path under the LLM semaphore."""
+        stage = self._stage_name(chain)
+        key, cached = self._cached_stage(chain, inputs)
+        if cached is not None:
+            record_cache_hit(stage)
+            return cached
+        defer_stage(self.config, key, chain, inputs, self._chain_model(chain))
+        
+        self._ensure_async_resources()
+        async with self._llm_semaphore:
+            with track_llm_stage(stage, self._chain_model(chain)) as usage:
+                output = await chain.arun(**inputs, callbacks=[usage])
+        
+        self._cache_stage(key, output)
+        return output
+    
+    async def _aanalyze_content(self, article_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async version of :meth:`_analyze_content`."""
+        text_hash, stored = self._stored_analysis(article_data)
+        if stored is not None:
+            return self._record_stats(article_data, stored)
+        signature, reused = self._find_duplicate(article_data)
+        if reused is not None:
+            self._save_analysis(article_data, text_hash, reused)
+            return self._record_stats(article_data, reused)
+        condensed_data, condensed = self._condense(article_data)
+        result = self._restore_offsets(await self._arun_pipeline(condensed_data), condensed)
+        self._remember_analysis(signature, result)
+        self._save_analysis(article_data, text_hash, result)
+        return self._record_stats(article_data, result)
+    
+    async def _adrive(
+        self,
+        steps: PipelineSteps,
+        streaming: bool = True,
+        outcome: Optional[List[Any]] = None
+    ) -> AsyncIterator[AnalysisEvent]:
+        """Async version of :meth:`_drive`.
+        
+        An async generator cannot return a value, so what the steps return
+        is appended to ``outcome`` instead.
+        """
+        reply = None
+        while True:
+            try:
+                step = steps.send(reply)
+            except StopIteration as done:
+                if outcome is not None:
+                    outcome.append(done.value)
+                return
+            reply = None
+            if isinstance(step, AnalysisEvent):
+                yield step
+            elif isinstance(step, _Call):
+                reply = await step.acall(*step.args)
+            elif isinstance(step, _Findings):
+                reply = []
+                async for detection in self.aiter_fallacies(step.content):
+                    reply.append(detection)
+                    yield AnalysisEvent(STAGE_DETECTION, EVENT_FALLACY, detection)
+            elif not streaming:
+                reply = await self._arun_chain(step.chain, **step.inputs)
+            else:
+                parser = IncrementalFallacyParser() if step.findings_in is not None else None
+                chunks = []
+                async for token in self._astream_chain(step.chain, **step.inputs):
+                    chunks.append(token)
+                    for event in self._token_events(step, parser, token):
+                        yield event
+                reply = ''.join(chunks)
+    
+    async def _arun_steps(self, steps: PipelineSteps) -> Any:
+        """Async version of :meth:`_run_steps`."""
+        outcome: List[Any] = []
+        async for _ in self._adrive(steps, streaming=False, outcome=outcome):
+            pass
+        return outcome[0]
+    
+    async def _arun_pipeline(self, article_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async version of :meth:`_run_pipeline`."""
+        return await self._arun_steps(self._pipeline_steps(article_data))
+    
+    async def aanalyze_article(self, search_topic: str, domain: str = "") -> Dict[str, Any]:
+        """Async version of :meth:`analyze_article`."""
+        with track_analysis(self.hooks) as metrics:
+            try:
+                article_data = await self.aload_article(search_topic, domain)
+                if 'error' in article_data:
+                    return article_data
+                
+                result = await self._aanalyze_content(article_data)
+                
+            except Exception as e:
+                self.logger.error(f"Analysis failed: {str(e)}")
+                return {'error': f'Analysis failed: {str(e)}'}
+        
+        result.update(metrics.to_dict())
+        return result
+    
+    async def aanalyze_url(self, url: str, title: str = "") -> Dict[str, Any]:
+        """Async version of :meth:`analyze_url`."""
+        with track_analysis(self.hooks) as metrics:
+            try:
+                article_data = await self._afetch_article(url, title or url)
+                result = await self._aanalyze_content(article_data)
+            except Exception as e:
+                self.logger.error(f"Analysis failed for {url}: {str(e)}")
+                result = {
+                    'title': title or 'Unknown',
+                    'url': url,
+                    'error': f'Analysis failed: {str(e)}'
+                }
+        
+        result.update(metrics.to_dict())
+        return result
+    
+    async def _aanalyze_hit(self, rank: int, hit: Dict[str, Any]) -> Dict[str, Any]:
+        """Async version of :meth:`_analyze_hit`."""
+        return {**await self.aanalyze_url(hit.get('link', 'Unknown'), hit.get('title', 'Unknown')), 'rank': rank}
+    
+    async def aanalyze_articles(self, search_topic: str, domain: str = "", max_articles: int = 5) -> List[Dict[str, Any]]:
+        """Async version of :meth:`analyze_articles`; concurrency is bounded by the semaphores."""
+        try:
+            hits = await self.asearch_articles(search_topic, domain, num_results=max_articles)
+        except Exception as e:
+            self.logger.error(f"Failed to search articles: {str(e)}")
+            return [{'error': f'Article loading failed: {str(e)}'}]
+        
+        if not hits:
+            return [{'error': 'No articles found for the given search criteria'}]
+        
+        return list(await asyncio.gather(*(
+            self._aanalyze_hit(rank, hit) for rank, hit in enumerate(hits, 1)
+        )))
+    
+    async def aanalyze_many(self, search_topics: Iterable[str], domain: str = "") -> List[Dict[str, Any]]:
+        """Analyze the top article for many topics concurrently, preserving input order."""
+        return list(await asyncio.gather(*(
+            self.aanalyze_article(topic, domain) for topic in search_topics
+        )))
+    
+    async def aanalyze_text(
+        self,
+        text: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        source: str = ""
+    ) -> Dict[str, Any]:
+        """Async version of :meth:`analyze_text`; loading and cleaning run in the CPU pool if configured."""
+        with track_analysis(self.hooks) as metrics:
+            try:
+                result = await self._aanalyze_content(await self._atext_article(text, metadata, source))
+            except Exception as e:
+                result = self._text_failure(metadata, e)
+        
+        if metadata:
+            result['metadata'] = dict(metadata)
+        result.update(metrics.to_dict())
+        return result
+    
+    # ------------------------------------------------------------------
+    # Streaming API
+    # ------------------------------------------------------------------
+    
+    def _stream_chain(self, chain: "LLMChain", **inputs: Any) -> Iterator[str]:
+        """Yield a chain's output tokens as they arrive, serving repeats from the cache."""
+        key, cached = self._cached_stage(chain, inputs)
+        stage = self._stage_name(chain)
+        if cached is not None:
+            record_cache_hit(stage)
+            yield cached
+            return
+        defer_stage(self.config, key, chain, inputs, self._chain_model(chain))
+        
+        chunks = []
+        with track_llm_stage(stage, self._chain_model(chain)) as usage:
+            for chunk in (chain.prompt | chain.llm).stream(inputs, config={'callbacks': [usage]}):
+                chunks.append(chunk.content)
+                yield chunk.content
+        
+        self._cache_stage(key, ''.join(chunks))
+    
+    async def _astream_chain(self, chain: "LLMChain", **inputs: Any) -> AsyncIterator[str]:
+        """Async version of :meth:`_stream_chain`."""
+        key, cached = self._cached_stage(chain, inputs)
+        stage = self._stage_name(chain)
+        if cached is not None:
+            record_cache_hit(stage)
+            yield cached
+            return
+        defer_stage(self.config, key, chain, inputs, self._chain_model(chain))
+        
+        chunks = []
+        async for chunk in self._astream_tokens(chain, inputs, stage):
+            chunks.append(chunk)
+            yield chunk
+        
+        self._cache_stage(key, ''.join(chunks))
+    
+    async def _astream_tokens(self, chain: "LLMChain", inputs: Dict[str, Any], stage: str) -> AsyncIterator[str]:
+        """Yield a chain's output tokens from the provider.
+        
+        The tokens are read by a separate task that holds an LLM slot only
+        while the provider streams, so a slow consumer does not keep other
+        analyses waiting for ``llm_concurrency``.
+        """
+        self._ensure_async_resources()
+        queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+        reader = asyncio.ensure_future(self._aread_tokens(chain, inputs, stage, queue))
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is None:
+                    break
+                yield chunk
+            await reader  # Re-raises a provider error
+        finally:
+            reader.cancel()
+    
+    async def _aread_tokens(
+        self,
+        chain: "LLMChain",
+        inputs: Dict[str, Any],
+        stage: str,
+        queue: "asyncio.Queue[Optional[str]]"
+    ) -> None:
+        """Put a chain's output tokens on ``queue``, then ``None``."""
+        try:
+            async with self._llm_semaphore:
+                with track_llm_stage(stage, self._chain_model(chain)) as usage:
+                    async for chunk in (chain.prompt | chain.llm).astream(inputs, config={'callbacks': [usage]}):
+                        queue.put_nowait(chunk.content)
+        finally:
+            queue.put_nowait(None)
+    
+    def _tracked_events(self, events: Iterator[AnalysisEvent]) -> Iterator[AnalysisEvent]:
+        """Collect metrics while streaming and attach them to the result event.
+        
+        The metrics are current only while the pipeline computes its next
+        event, never while the consumer holds one.
+        """
+        metrics = AnalysisMetrics(hooks=self.hooks)
+        try:
+            while True:
+                with using_metrics(metrics):
+                    event = next(events, None)
+                if event is None:
+                    return
+                if event.stage == STAGE_RESULT and event.kind == EVENT_END:
+                    event.data.update(metrics.to_dict())
+                yield event
+        finally:
+            with using_metrics(metrics):
+                events.close()
+            metrics.finish()
+    
+    async def _atracked_events(self, events: AsyncIterator[AnalysisEvent]) -> AsyncIterator[AnalysisEvent]:
+        """Async version of :meth:`_tracked_events`."""
+        metrics = AnalysisMetrics(hooks=self.hooks)
+        try:
+            while True:
+                with using_metrics(metrics):
+                    event = await events.__anext__()
+                if event.stage == STAGE_RESULT and event.kind == EVENT_END:
+                    event.data.update(metrics.to_dict())
+                yield event
+        except StopAsyncIteration:
+            pass
+        finally:
+            with using_metrics(metrics):
+                await events.aclose()
+            metrics.finish()
+    
+    def stream_content(self, article_data: Dict[str, Any]) -> Iterator[AnalysisEvent]:
+        """Stream the three LLM stages over loaded article data.
+        
+        Each stage starts as soon as the previous one completes; the last
+        event is a ``result`` event carrying the same dict as
+        :meth:`analyze_article`.
+        """
+        return self._tracked_events(self._condensed_events(article_data))
+    
+    def _condensed_events(self, article_data: Dict[str, Any]) -> Iterator[AnalysisEvent]:
+        """:meth:`_content_events` over the condensed text, with offsets mapped back.
+        
+        A stored analysis of the same text or a near-duplicate's analysis is
+        replayed instead, as in :meth:`_analyze_content`.
+        """
+        text_hash, stored = self._stored_analysis(article_data)
+        if stored is not None:
+            yield from self._replayed_events(self._record_stats(article_data, stored))
+            return
+        signature, reused = self._find_duplicate(article_data)
+        if reused is not None:
+            self._save_analysis(article_data, text_hash, reused)
+            yield from self._replayed_events(self._record_stats(article_data, reused))
+            return
+        condensed_data, condensed = self._condense(article_data)
+        for event in self._content_events(condensed_data):
+            event = self._restore_event(event, condensed)
+            if event.stage == STAGE_RESULT and event.kind == EVENT_END:
+                self._remember_analysis(signature, event.data)
+                self._save_analysis(article_data, text_hash, event.data)
+                self._record_stats(article_data, event.data)
+            yield event
+    
+    @staticmethod
+    def _replayed_events(result: Dict[str, Any]) -> Iterator[AnalysisEvent]:
+        """Stage events for a finished result that is served instead of analyzed."""
+        yield AnalysisEvent(STAGE_DETECTION, EVENT_START)
+        if 'fallacies' in result:
+            for record in result['fallacies']:
+                detection = DetectedFallacy(**{**record, 'confidence': Confidence.parse(record.get('confidence'))})
+                yield AnalysisEvent(STAGE_DETECTION, EVENT_FALLACY, detection)
+        else:
+            yield AnalysisEvent(STAGE_DETECTION, EVENT_TOKEN, result['detected_fallacies'])
+        yield AnalysisEvent(STAGE_DETECTION, EVENT_END, result['detected_fallacies'])
+        for stage, key in ((STAGE_EXPLANATION, 'educational_explanations'), (STAGE_SYNTHESIS, 'synthesized_result')):
+            yield AnalysisEvent(stage, EVENT_START)
+            yield AnalysisEvent(stage, EVENT_TOKEN, result[key])
+            yield AnalysisEvent(stage, EVENT_END, result[key])
+        yield AnalysisEvent(STAGE_RESULT, EVENT_END, result)
+    
+    def _content_events(self, article_data: Dict[str, Any]) -> Iterator[AnalysisEvent]:
+        """Untracked event generator behind :meth:`stream_content`."""
+        try:
+            result = yield from self._drive(self._pipeline_steps(article_data))
         except Exception as e:
             self.logger.error(f"Analysis failed: {str(e)}")
-            return {'error': f'Analysis failed: {str(e)}'}
+            yield AnalysisEvent(STAGE_RESULT, EVENT_ERROR, {'error': f'Analysis failed: {str(e)}'})
+            return
+        yield AnalysisEvent(STAGE_RESULT, EVENT_END, result)
     
-    def get_fallacies_info(self) -> pd.DataFrame:
-        """Return information about available fallacies."""
-        return self.fallacies_df.copy()
+    def stream_analysis(self, search_topic: str, domain: str = "") -> Iterator[AnalysisEvent]:
+        """Streaming version of :meth:`analyze_article`."""
+        return self._tracked_events(self._analysis_events(search_topic, domain))
+    
+    def _analysis_events(self, search_topic: str, domain: str = "") -> Iterator[AnalysisEvent]:
+        """Untracked event generator behind :meth:`stream_analysis`."""
+        yield AnalysisEvent(STAGE_SEARCH, EVENT_START, {'topic': search_topic, 'domain': domain})
+        article_data = self.load_article(search_topic, domain)
+        if 'error' in article_data:
+            yield AnalysisEvent(STAGE_RESULT, EVENT_ERROR, article_data)
+            return
+        yield AnalysisEvent(STAGE_SEARCH, EVENT_END, {'title': article_data['title'], 'url': article_data['url']})
+        
+        yield from self._condensed_events(article_data)
+    
+    def astream_content(self, article_data: Dict[str, Any]) -> AsyncIterator[AnalysisEvent]:
+        """Async version of :meth:`stream_content`."""
+        return self._atracked_events(self._acondensed_events(article_data))
+    
+    async def _acondensed_events(self, article_data: Dict[str, Any]) -> AsyncIterator[AnalysisEvent]:
+        """Async version of :meth:`_condensed_events`."""
+        text_hash, stored = self._stored_analysis(article_data)
+        if stored is not None:
+            for event in self._replayed_events(self._record_stats(article_data, stored)):
+                yield event
+            return
+        signature, reused = self._find_duplicate(article_data)
+        if reused is not None:
+            self._save_analysis(article_data, text_hash, reused)
+            for event in self._replayed_events(self._record_stats(article_data, reused)):
+                yield event
+            return
+        condensed_data, condensed = self._condense(article_data)
+        async for event in self._acontent_events(condensed_data):
+            event = self._restore_event(event, condensed)
+            if event.stage == STAGE_RESULT and event.kind == EVENT_END:
+                self._remember_analysis(signature, event.data)
+                self._save_analysis(article_data, text_hash, event.data)
+                self._record_stats(article_data, event.data)
+            yield event
+    
+    async def _acontent_events(self, article_data: Dict[str, Any]) -> AsyncIterator[AnalysisEvent]:
+        """Untracked event generator behind :meth:`astream_content`."""
+        outcome: List[Any] = []
+        try:
+            async for event in self._adrive(self._pipeline_steps(article_data), outcome=outcome):
+                yield event
+        except Exception as e:
+            self.logger.error(f"Analysis failed: {str(e)}")
+            yield AnalysisEvent(STAGE_RESULT, EVENT_ERROR, {'error': f'Analysis failed: {str(e)}'})
+            return
+        yield AnalysisEvent(STAGE_RESULT, EVENT_END, outcome[0])
+    
+    def astream_analysis(self, search_topic: str, domain: str = "") -> AsyncIterator[AnalysisEvent]:
+        """Async version of :meth:`stream_analysis`."""
+        return self._atracked_events(self._aanalysis_events(search_topic, domain))
+    
+    async def _aanalysis_events(self, search_topic: str, domain: str = "") -> AsyncIterator[AnalysisEvent]:
+        """Untracked event generator behind :meth:`astream_analysis`."""
+        yield AnalysisEvent(STAGE_SEARCH, EVENT_START, {'topic': search_topic, 'domain': domain})
+        article_data = await self.aload_article(search_topic, domain)
+        if 'error' in article_data:
+            yield AnalysisEvent(STAGE_RESULT, EVENT_ERROR, article_data)
+            return
+        yield AnalysisEvent(STAGE_SEARCH, EVENT_END, {'title': article_data['title'], 'url': article_data['url']})
+        
+        async for event in self._acondensed_events(article_data):
+            yield event
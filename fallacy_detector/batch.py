@@ -0,0 +1,365 @@
+"""
+Provider batch-API execution for large offline jobs.
+
+:class:`BatchRunner` analyzes many documents through the OpenAI Batch API
+instead of one chat call at a time. It runs the normal pipeline over every
+document with a stage collector active: each LLM stage that misses the
+result cache is deferred instead of called. The deferred requests of all
+documents form one batch file, which is uploaded, submitted and polled; the
+runner keeps the outputs under the same keys the pipeline uses and serves
+them ahead of the result cache. The next round then gets past those stages and defers the next ones
+(detection, then explanation, then synthesis), until every document runs
+from the cache alone and produces the same result an interactive run would.
+
+Submitted batches are recorded in a job-state file, so an interrupted run
+polls and collects them again instead of paying for them twice.
+"""
+
+import contextvars
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .metrics import estimate_cost
+
+if TYPE_CHECKING:
+    from langchain.chains import LLMChain
+
+    from .analyzer import FallacyAnalyzer
+    from .config import AnalysisConfig
+    from .corpus import CorpusDocument
+    from .transport import HttpTransport
+
+# Batch statuses after which nothing changes anymore
+TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# Batch requests are billed at half the synchronous price
+BATCH_PRICE_FACTOR = 0.5
+
+
+class StageDeferred(BaseException):
+    """Raised in place of an LLM call while stages are collected for a batch.
+
+    A BaseException so the pipeline's ``except Exception`` error handling
+    does not turn a deferral into a failed result.
+    """
+
+
+class BatchCollector:
+    """Chat requests deferred by the pipeline, keyed by result-cache key.
+
+    ``outputs`` holds the batch outputs collected so far; the pipeline
+    serves a stage from it before looking in the result cache.
+    """
+
+    def __init__(self, failed: Optional[Dict[str, str]] = None, outputs: Optional["CollectedOutputs"] = None):
+        self.requests: Dict[str, Dict[str, Any]] = {}
+        self.failed = failed or {}
+        self.outputs = outputs
+
+    def defer(self, key: str, body: Dict[str, Any]) -> None:
+        """Record a request and stop the pipeline, or fail if it already failed in a batch."""
+        if key in self.failed:
+            raise RuntimeError(f"Batch request failed: {self.failed[key]}")
+        self.requests[key] = body
+        raise StageDeferred(key)
+
+
+_collector: contextvars.ContextVar[Optional[BatchCollector]] = contextvars.ContextVar(
+    "fallacy_detector_batch_collector", default=None
+)
+
+
+@contextmanager
+def collect_stages(
+    failed: Optional[Dict[str, str]] = None,
+    outputs: Optional["CollectedOutputs"] = None
+) -> Iterator[BatchCollector]:
+    """Defer LLM stages that miss the cache for the duration of the block."""
+    collector = BatchCollector(failed, outputs)
+    token = _collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _collector.reset(token)
+
+
+def collecting_stages() -> bool:
+    """Whether stages are being collected for a batch in this context."""
+    return _collector.get() is not None
+
+
+def collected_output(key: str) -> Optional[str]:
+    """The collected batch output for a stage key, if stages are being collected."""
+    collector = _collector.get()
+    if collector is None or collector.outputs is None:
+        return None
+    return collector.outputs.get(key)
+
+
+def chat_request_body(
+    config: "AnalysisConfig",
+    chain: "LLMChain",
+    inputs: Dict[str, Any],
+    model_name: str = ""
+) -> Dict[str, Any]:
+    """The chat completion request a chain would send for ``inputs``."""
+    body = {
+        'model': model_name or config.model_name,
+        'temperature': config.temperature,
+        'messages': [{'role': 'user', 'content': chain.prompt.format(**inputs)}],
+    }
+    # Arguments bound to the model, e.g. the JSON response format
+    body.update(getattr(chain.llm, 'kwargs', None) or {})
+    return body
+
+
+def defer_stage(
+    config: "AnalysisConfig",
+    key: Optional[str],
+    chain: "LLMChain",
+    inputs: Dict[str, Any],
+    model_name: str = ""
+) -> None:
+    """Hand a cache-missing stage to the active collector, if any (raises StageDeferred)."""
+    collector = _collector.get()
+    if collector is not None and key is not None:
+        collector.defer(key, chat_request_body(config, chain, inputs, model_name))
+
+
+class CollectedOutputs:
+    """Batch outputs collected by a runner, served ahead of the result cache.
+
+    The outputs are never evicted: an output dropped by a bounded cache
+    before the next round would be deferred and paid for again. They reach
+    the pipeline through the active :class:`BatchCollector`, so the
+    analyzer itself is left untouched.
+    """
+
+    def __init__(self, cache: Optional[Any] = None):
+        self.cache = cache
+        self.outputs: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.outputs)
+
+    def add(self, key: str, output: str) -> None:
+        """Keep a collected output, and write it through to the result cache."""
+        self.outputs[key] = output
+        if self.cache is not None:
+            self.cache.set(key, output)
+
+    def get(self, key: str) -> Optional[str]:
+        """A collected output, or one written to the result cache earlier."""
+        output = self.outputs.get(key)
+        if output is None and self.cache is not None:
+            output = self.cache.get(key)
+        return output
+
+
+class BatchClient:
+    """Minimal client for the OpenAI Files and Batches endpoints."""
+
+    def __init__(self, transport: "HttpTransport", api_key: str, base_url: str = ""):
+        self.transport = transport
+        self.base_url = (base_url or "https://api.openai.com/v1").rstrip('/')
+        self.headers = {"Authorization": f"Bearer {api_key}"}
+
+    @classmethod
+    def from_analyzer(cls, analyzer: "FallacyAnalyzer") -> "BatchClient":
+        """Client using an analyzer's transport, key and endpoint."""
+        config = analyzer.config
+        return cls(analyzer.transport, config.openai_api_key, config.openai_base_url)
+
+    def _json(self, method: str, path: str, **kwargs: Any) -> Dict[str, Any]:
+        response = self.transport.request(method, f"{self.base_url}{path}", headers=self.headers, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    def upload(self, lines: Sequence[Dict[str, Any]]) -> str:
+        """Upload a batch input file and return its id."""
+        content = "".join(json.dumps(line) + "\n" for line in lines).encode('utf-8')
+        return self._json(
+            "POST", "/files",
+            data={'purpose': 'batch'},
+            files={'file': ('batch.jsonl', content, 'application/jsonl')}
+        )['id']
+
+    def create(self, input_file_id: str) -> Dict[str, Any]:
+        """Submit a batch over an uploaded input file."""
+        return self._json("POST", "/batches", json={
+            'input_file_id': input_file_id,
+            'endpoint': BATCH_ENDPOINT,
+            'completion_window': '24h',
+        })
+
+    def retrieve(self, batch_id: str) -> Dict[str, Any]:
+        """Current state of a batch."""
+        return self._json("GET", f"/batches/{batch_id}")
+
+    def download(self, file_id: str) -> List[Dict[str, Any]]:
+        """Lines of an output or error file."""
+        response = self.transport.request("GET", f"{self.base_url}/files/{file_id}/content", headers=self.headers)
+        response.raise_for_status()
+        return [json.loads(line) for line in response.text.splitlines() if line.strip()]
+
+
+class BatchRunner:
+    """Analyze documents in rounds of provider batches.
+
+    ``state_path`` records submitted batches and failed requests; rerunning
+    with the same file resumes the job. Collected outputs are kept by the
+    runner for the whole job and also written to the analyzer's result
+    cache, if any; with a persistent ``cache_path`` finished stages survive
+    a restart without downloading them again.
+    """
+
+    def __init__(
+        self,
+        analyzer: "FallacyAnalyzer",
+        state_path: Union[str, Path],
+        client: Optional[BatchClient] = None,
+        poll_interval: float = 30.0,
+        max_batch_requests: int = 50_000
+    ):
+        self.analyzer = analyzer
+        self.outputs = CollectedOutputs(analyzer.cache)
+        self.client = client or BatchClient.from_analyzer(analyzer)
+        self.state_path = Path(state_path)
+        self.poll_interval = poll_interval
+        self.max_batch_requests = max_batch_requests
+        self.logger = analyzer.logger
+        self.state = self._load_state()
+        self.stats: Dict[str, Any] = {'rounds': 0, 'batches': 0, 'requests': 0, 'failed_requests': 0,
+                                      'prompt_tokens': 0, 'completion_tokens': 0, 'cost': 0.0}
+
+    def _load_state(self) -> Dict[str, Any]:
+        if self.state_path.exists():
+            with open(self.state_path, encoding='utf-8') as f:
+                return json.load(f)
+        return {'batches': [], 'failed': {}}
+
+    def _save_state(self) -> None:
+        """Write the state atomically, so a crash never leaves half a file."""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def _wait(self, batch: Dict[str, Any]) -> Dict[str, Any]:
+        """Poll a batch until it reaches a terminal status."""
+        while True:
+            info = self.client.retrieve(batch['id'])
+            batch['status'] = info['status']
+            self._save_state()
+            if info['status'] in TERMINAL_STATUSES:
+                return info
+            self.logger.info(f"Batch {batch['id']}: {info['status']} {info.get('request_counts', {})}")
+            time.sleep(self.poll_interval)
+
+    def _collected(self, batch: Dict[str, Any]) -> bool:
+        """Whether a batch was collected before and its outputs are still at hand."""
+        if not batch.get('collected'):
+            return False
+        failed = self.state['failed']
+        return all(key in failed or self.outputs.get(key) is not None for key in batch['keys'])
+
+    def _collect(self, batch: Dict[str, Any]) -> None:
+        """Keep a finished batch's outputs and record its failures.
+
+        Usage and failures are counted only the first time a batch is
+        collected; collecting it again only restores its outputs.
+        """
+        recollect = bool(batch.get('collected'))
+        info = self._wait(batch)
+        failed = self.state['failed']
+        missing = set(batch['keys'])
+
+        if info.get('output_file_id'):
+            for line in self.client.download(info['output_file_id']):
+                key = line['custom_id']
+                response = line.get('response') or {}
+                if response.get('status_code') != 200:
+                    failed[key] = json.dumps(line.get('error') or response.get('body'))
+                    continue
+                body = response['body']
+                self.outputs.add(key, body['choices'][0]['message']['content'])
+                missing.discard(key)
+                if recollect:
+                    continue
+                usage = body.get('usage') or {}
+                prompt_tokens = usage.get('prompt_tokens', 0)
+                completion_tokens = usage.get('completion_tokens', 0)
+                self.stats['prompt_tokens'] += prompt_tokens
+                self.stats['completion_tokens'] += completion_tokens
+                # Priced per request: stages may run on different models
+                self.stats['cost'] += BATCH_PRICE_FACTOR * estimate_cost(
+                    body.get('model') or self.analyzer.config.model_name, prompt_tokens, completion_tokens
+                )
+        missing -= failed.keys()
+
+        if info.get('error_file_id'):
+            for line in self.client.download(info['error_file_id']):
+                failed[line['custom_id']] = json.dumps(line.get('error') or line.get('response'))
+        for key in missing:
+            failed.setdefault(key, f"no output (batch {info['status']})")
+        if not recollect:
+            self.stats['failed_requests'] += len(failed.keys() & set(batch['keys']))
+        batch['collected'] = True
+        self._save_state()
+
+    def _submit(self, requests: Dict[str, Dict[str, Any]]) -> None:
+        """Submit deferred requests as one or more batches and collect them."""
+        keys = list(requests)
+        for start in range(0, len(keys), self.max_batch_requests):
+            part = keys[start:start + self.max_batch_requests]
+            lines = [
+                {'custom_id': key, 'method': 'POST', 'url': BATCH_ENDPOINT, 'body': requests[key]}
+                for key in part
+            ]
+            info = self.client.create(self.client.upload(lines))
+            batch = {'id': info['id'], 'status': info['status'], 'keys': part}
+            self.state['batches'].append(batch)
+            self._save_state()  # Recorded before waiting, so a restart polls it instead of resubmitting
+            self.stats['batches'] += 1
+            self.stats['requests'] += len(part)
+            self.logger.info(f"Submitted batch {info['id']} with {len(part)} requests")
+            self._collect(batch)
+
+    def _attempt(self, document: "CorpusDocument") -> Tuple[Optional[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """Run one document from collected outputs: its result, or the requests it deferred."""
+        with collect_stages(self.state['failed'], self.outputs) as collector:
+            try:
+                return self.analyzer.analyze_text(document.text, document.metadata), {}
+            except StageDeferred:
+                return None, collector.requests
+
+    def run(self, documents: Sequence["CorpusDocument"]) -> List[Dict[str, Any]]:
+        """Analyze every document and return the results in input order."""
+        # Batches submitted by an earlier run are collected, not resubmitted;
+        # collected ones only again if their outputs are no longer cached
+        for batch in self.state['batches']:
+            if not self._collected(batch):
+                self._collect(batch)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(documents)
+        while True:
+            pending: Dict[str, Dict[str, Any]] = {}
+            for index, document in enumerate(documents):
+                if results[index] is None:
+                    results[index], requests = self._attempt(document)
+                    pending.update(requests)
+            if not pending:
+                break
+            self.stats['rounds'] += 1
+            self._submit(pending)
+
+        for document, result in zip(documents, results):
+            result['id'] = document.id
+        return results
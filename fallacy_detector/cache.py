@@ -0,0 +1,240 @@
+"""
+Content-addressed cache for LLM stage outputs, search results and pages.
+
+Entries live in a small in-memory LRU tier and, optionally, a persistent
+SQLite tier so repeat analyses survive process restarts.
+:class:`FetchCache` stores Serper results and extracted page text on the
+same two tiers, with HTTP validators for conditional revalidation.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Build a stable SHA-256 key from JSON-serializable parts."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """Two-tier (memory LRU + SQLite) string cache with TTL and size caps.
+
+    Any object exposing ``get(key)``, ``set(key, value)`` and ``stats()`` can
+    be passed to :class:`FallacyAnalyzer` instead of this class.
+    """
+
+    def __init__(
+        self,
+        path: str = "",
+        ttl: float = 7 * 24 * 3600,
+        max_entries: int = 1024,
+        max_disk_entries: int = 100_000
+    ):
+        """Create the cache; ``path`` enables the on-disk tier."""
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'memory_hits': 0, 'disk_hits': 0, 'evictions': 0}
+
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)")
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value or ``None`` if missing or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._counters['hits'] += 1
+                    self._counters['memory_hits'] += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    self._db.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                    self._remember(key, row[1], row[0])
+                    self._counters['hits'] += 1
+                    self._counters['disk_hits'] += 1
+                    return row[0]
+
+            self._counters['misses'] += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        """Store a value in both tiers."""
+        now = time.time()
+        expires_at = now + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, value)
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, value, expires_at, now)
+                )
+                self._prune_disk(now)
+                self._db.commit()
+
+    def _remember(self, key: str, expires_at: float, value: str) -> None:
+        """Insert into the memory tier, evicting least recently used entries."""
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._counters['evictions'] += 1
+
+    def _prune_disk(self, now: float) -> None:
+        """Drop expired rows and trim the disk tier to its size cap."""
+        self._db.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+        (count,) = self._db.execute("SELECT COUNT(*) FROM cache").fetchone()
+        if count > self.max_disk_entries:
+            self._db.execute(
+                "DELETE FROM cache WHERE key IN ("
+                "SELECT key FROM cache ORDER BY accessed_at ASC LIMIT ?)",
+                (count - self.max_disk_entries,)
+            )
+            self._counters['evictions'] += count - self.max_disk_entries
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current tier sizes."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['memory_entries'] = len(self._memory)
+            if self._db is not None:
+                stats['disk_entries'] = self._db.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            return stats
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+@dataclass
+class CachedPage:
+    """Extracted text of a fetched page with its HTTP validators."""
+
+    text: str
+    etag: str = ""
+    last_modified: str = ""
+    stored_at: float = 0.0
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this page."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class FetchCache:
+    """Serper results and fetched pages on top of a :class:`ResultCache`.
+
+    Search results are reused for ``search_ttl`` seconds. Pages are reused
+    without any request for ``page_ttl`` seconds; after that they are
+    revalidated with their ETag/Last-Modified until the underlying store
+    expires them.
+    """
+
+    def __init__(self, store: Any, search_ttl: float = 15 * 60, page_ttl: float = 3600):
+        self.store = store
+        self.search_ttl = search_ttl
+        self.page_ttl = page_ttl
+        self._lock = threading.Lock()
+        self._counters = {'search_hits': 0, 'search_misses': 0, 'page_hits': 0, 'page_misses': 0, 'page_revalidated': 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def get_search(self, endpoint: str, query: str, num_results: int) -> Optional[List[Dict[str, Any]]]:
+        """Return cached organic hits, or None if missing or stale."""
+        raw = self.store.get(make_cache_key("search", endpoint, query, num_results))
+        if raw is not None:
+            entry = json.loads(raw)
+            if entry['stored_at'] + self.search_ttl > time.time():
+                self._count('search_hits')
+                return entry['hits']
+        self._count('search_misses')
+        return None
+
+    def set_search(self, endpoint: str, query: str, num_results: int, hits: List[Dict[str, Any]]) -> None:
+        """Store the organic hits of a search."""
+        self.store.set(
+            make_cache_key("search", endpoint, query, num_results),
+            json.dumps({'stored_at': time.time(), 'hits': hits})
+        )
+
+    @staticmethod
+    def _page_key(url: str, max_chars: int) -> str:
+        # Extraction stops at max_chars, so text for a smaller limit cannot serve a larger one
+        return make_cache_key("page", url, max_chars)
+
+    def get_page(self, url: str, max_chars: int) -> Optional[CachedPage]:
+        """Return the stored page, fresh or not (see :meth:`is_fresh`)."""
+        raw = self.store.get(self._page_key(url, max_chars))
+        if raw is None:
+            self._count('page_misses')
+            return None
+        return CachedPage(**json.loads(raw))
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        """Whether a page can be used without revalidation (counts as a hit)."""
+        fresh = page.stored_at + self.page_ttl > time.time()
+        if fresh:
+            self._count('page_hits')
+        return fresh
+
+    def set_page(self, url: str, max_chars: int, page: CachedPage, revalidated: bool = False) -> None:
+        """Store a page; ``revalidated`` marks a 304 that renewed a stored copy."""
+        if revalidated:
+            self._count('page_revalidated')
+        page.stored_at = time.time()
+        self.store.set(self._page_key(url, max_chars), json.dumps(asdict(page)))
+
+    def stats(self) -> Dict[str, int]:
+        """Return search/page counters and the store's own stats."""
+        with self._lock:
+            stats = dict(self._counters)
+        stats.update({f'store_{key}': value for key, value in self.store.stats().items()})
+        return stats
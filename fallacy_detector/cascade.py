@@ -0,0 +1,84 @@
+"""
+Cheap-model screening with escalation to the detection model.
+
+With ``cascade_model`` set, the analyzer runs detection with that (small,
+fast) model first. :class:`ModelCascade` decides whether its answer stands
+or the text is detected again with the configured detection model:
+
+- ``"confidence"``: the screening model reports a fallacy at
+  ``cascade_min_confidence`` or above, so the stronger model confirms it;
+- ``"cues"``: it reports nothing, but the local pre-screen cue score reaches
+  ``cascade_cue_score``, i.e. the two screens disagree.
+
+Everything else (clean articles, low-confidence guesses) keeps the cheap
+answer. Escalated texts also tell how often the screening model agreed
+with the stronger one, which is what the escalation threshold is tuned on
+(see ``benchmarks/cascade.py``).
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from .detection import Confidence, DetectedFallacy
+from .prescreen import PreScreener
+
+_CONFIDENCE_RANK = {level: rank for rank, level in enumerate(Confidence)}
+
+
+class ModelCascade:
+    """Escalation policy and counters for a screening model."""
+
+    def __init__(
+        self,
+        screening_model: str,
+        min_confidence: str = "Medium",
+        cue_score: float = 2.0,
+        screener: Optional[PreScreener] = None
+    ):
+        self.screening_model = screening_model
+        self.min_confidence = Confidence(min_confidence)
+        self.cue_score = cue_score
+        self.screener = screener or PreScreener()
+        self._lock = threading.Lock()
+        self._stats = {'screened': 0, 'escalated': 0, 'agreed': 0, 'confidence': 0, 'cues': 0}
+
+    def escalation_reason(self, screened: Sequence[DetectedFallacy], text: str) -> Optional[str]:
+        """Why a screening result needs the detection model, or None if it stands."""
+        threshold = _CONFIDENCE_RANK[self.min_confidence]
+        if any(_CONFIDENCE_RANK[d.confidence] >= threshold for d in screened):
+            return "confidence"
+        if not screened and self.screener.score(text).score >= self.cue_score:
+            return "cues"
+        return None
+
+    def record(
+        self,
+        screened: Sequence[DetectedFallacy],
+        detected: Sequence[DetectedFallacy],
+        reason: Optional[str]
+    ) -> None:
+        """Count one screened text; ``detected`` is the escalated result."""
+        with self._lock:
+            self._stats['screened'] += 1
+            if reason is None:
+                return
+            self._stats['escalated'] += 1
+            self._stats[reason] += 1
+            if {d.fallacy for d in screened} == {d.fallacy for d in detected}:
+                self._stats['agreed'] += 1
+
+    def summary(self, reasons: List[Optional[str]]) -> Dict[str, Any]:
+        """Per-article cascade record from the reasons of its chunks."""
+        return {
+            'screening_model': self.screening_model,
+            'escalated': any(reasons),
+            'reasons': sorted({reason for reason in reasons if reason}),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Screened and escalated texts, escalations by reason, and agreement on escalations."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+        stats['escalation_rate'] = stats['escalated'] / stats['screened'] if stats['screened'] else 0.0
+        stats['agreement'] = stats['agreed'] / stats['escalated'] if stats['escalated'] else None
+        return stats
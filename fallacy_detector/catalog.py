@@ -0,0 +1,125 @@
+"""
+The fallacy catalog: loading, subsetting and compact prompt rendering.
+
+``data/fallacies.csv`` is read with the standard library into an immutable
+:class:`FallacyCatalog` (a tuple of :class:`Fallacy` records plus a name
+index), so the runtime never needs pandas. :meth:`FallacyCatalog.to_dataframe`
+still builds a DataFrame on demand.
+
+For prompts the catalog is rendered once as one ``Name: Description`` line
+per fallacy. Unlike ``DataFrame.to_string()`` this carries no index column
+or column padding, and because it never changes between articles it keeps
+the detection prompts' prefix byte-identical for provider-side prompt caching.
+"""
+
+import csv
+import hashlib
+import io
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .detection import match_fallacy_name
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+CATALOG_PATH = Path(__file__).parent.parent / "data" / "fallacies.csv"
+
+
+class Fallacy(NamedTuple):
+    """One catalog entry."""
+
+    name: str
+    description: str
+
+
+def render_catalog(entries: Iterable[Tuple[str, str]]) -> str:
+    """Render ``(name, description)`` pairs as compact prompt lines."""
+    return "\n".join(f"{name}: {' '.join(description.split())}" for name, description in entries)
+
+
+def resolve_fallacy_subset(requested: Iterable[str], fallacy_names: Iterable[str]) -> List[str]:
+    """Map requested names to catalog spellings, in catalog order.
+
+    Raises ValueError for names that match no catalog fallacy.
+    """
+    names = list(fallacy_names)
+    selected = set()
+    for name in requested:
+        match = match_fallacy_name(name, names)
+        if match is None:
+            raise ValueError(f"Unknown fallacy: {name!r}")
+        selected.add(match)
+    return [name for name in names if name in selected]
+
+
+class FallacyCatalog:
+    """Immutable, name-indexed collection of fallacies."""
+
+    __slots__ = ('entries', '_index')
+
+    def __init__(self, entries: Iterable[Tuple[str, str]]):
+        self.entries: Tuple[Fallacy, ...] = tuple(Fallacy(*entry) for entry in entries)
+        self._index: Dict[str, Fallacy] = {entry.name: entry for entry in self.entries}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[Fallacy]:
+        return iter(self.entries)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    def __repr__(self) -> str:
+        return f"FallacyCatalog({len(self)} fallacies)"
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(entry.name for entry in self.entries)
+
+    def get(self, name: str) -> Optional[Fallacy]:
+        """Return the entry with this exact name, or None."""
+        return self._index.get(name)
+
+    def subset(self, names: Iterable[str]) -> "FallacyCatalog":
+        """Catalog restricted to ``names`` (matched leniently, see resolve_fallacy_subset)."""
+        selected = set(resolve_fallacy_subset(names, self.names))
+        return FallacyCatalog(entry for entry in self.entries if entry.name in selected)
+
+    def render(self) -> str:
+        """Compact prompt rendering (see :func:`render_catalog`)."""
+        return render_catalog(self.entries)
+
+    def to_csv(self) -> str:
+        """Serialize like ``DataFrame.to_csv(index=False)``."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(['Fallacy', 'Description'])
+        writer.writerows(self.entries)
+        return buffer.getvalue()
+
+    @property
+    def version(self) -> str:
+        """Short content hash, used to key cached LLM outputs."""
+        return hashlib.sha256(self.to_csv().encode('utf-8')).hexdigest()[:16]
+
+    def to_dataframe(self) -> "pd.DataFrame":
+        """Return the catalog as a ``Fallacy``/``Description`` DataFrame (imports pandas)."""
+        import pandas as pd
+        return pd.DataFrame(list(self.entries), columns=['Fallacy', 'Description'])
+
+
+@lru_cache(maxsize=None)
+def load_catalog(path: Optional[str] = None) -> FallacyCatalog:
+    """Load the fallacy catalog CSV (bundled file by default); cached per path."""
+    csv_path = Path(path) if path else CATALOG_PATH
+    try:
+        with open(csv_path, encoding='utf-8', newline='') as f:
+            reader = csv.DictReader(f)
+            if not {'Fallacy', 'Description'} <= set(reader.fieldnames or ()):
+                raise ValueError("CSV must contain 'Fallacy' and 'Description' columns")
+            return FallacyCatalog((row['Fallacy'], row['Description']) for row in reader)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Fallacies CSV file not found at {csv_path}")
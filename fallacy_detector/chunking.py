@@ -0,0 +1,115 @@
+"""
+Overlapping chunking of long articles and merging of per-chunk detections.
+
+Long articles are split on sentence boundaries into windows
+of at most ``chunk_chars`` characters that overlap by roughly ``overlap``
+characters, so an argument straddling a boundary is seen whole by at least
+one chunk. Detection runs on every chunk independently; the findings are
+mapped back to article offsets and deduplicated by quote span.
+"""
+
+import bisect
+import re
+from dataclasses import dataclass, replace
+from typing import Iterable, List, Tuple
+
+from .detection import Confidence, DetectedFallacy
+
+# A sentence ends at . ! or ? (optionally followed by closing quotes or
+# brackets) and whitespace. Article text is cleaned before chunking, which
+# collapses all whitespace, so there are no paragraph breaks to split on.
+_BOUNDARY = re.compile(r'(?<=[.!?])["\'”’)\]]*\s+')
+
+_CONFIDENCE_RANK = {level: rank for rank, level in enumerate(Confidence)}
+
+
+@dataclass
+class TextChunk:
+    """A window of the article text and its offset in the article."""
+
+    text: str
+    start: int
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.text)
+
+
+def sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """Start and end offsets of each sentence, without trailing whitespace."""
+    spans = []
+    begin = 0
+    for match in _BOUNDARY.finditer(text):
+        end = begin + len(text[begin:match.end()].rstrip())
+        if end > begin:
+            spans.append((begin, end))
+        begin = match.end()
+    end = begin + len(text[begin:].rstrip())
+    if end > begin:
+        spans.append((begin, end))
+    return spans
+
+
+def split_into_chunks(text: str, chunk_chars: int, overlap: int = 0) -> List[TextChunk]:
+    """Split text into overlapping windows ending on sentence boundaries.
+
+    A sentence longer than ``chunk_chars`` is cut mid-sentence.
+    """
+    if len(text) <= chunk_chars:
+        return [TextChunk(text, 0)]
+
+    starts = [0] + [m.end() for m in _BOUNDARY.finditer(text)]
+    chunks = []
+    begin = 0
+    while True:
+        limit = begin + chunk_chars
+        if limit >= len(text):
+            chunks.append(TextChunk(text[begin:], begin))
+            return chunks
+
+        # End at the last sentence start that fits, or cut hard
+        index = bisect.bisect_right(starts, limit) - 1
+        end = starts[index] if starts[index] > begin else limit
+        chunks.append(TextChunk(text[begin:end], begin))
+
+        # Start the next window at the first sentence inside the overlap
+        index = bisect.bisect_left(starts, max(end - overlap, begin + 1))
+        begin = starts[index] if index < len(starts) and starts[index] < end else end
+
+
+def _shift(detection: DetectedFallacy, offset: int) -> DetectedFallacy:
+    if detection.start is None or detection.end is None:
+        return detection
+    return replace(detection, start=detection.start + offset, end=detection.end + offset)
+
+
+def _same_finding(a: DetectedFallacy, b: DetectedFallacy) -> bool:
+    if a.fallacy != b.fallacy:
+        return False
+    if None in (a.start, a.end, b.start, b.end):
+        return ' '.join(a.quote.lower().split()) == ' '.join(b.quote.lower().split())
+    return a.start < b.end and b.start < a.end
+
+
+def merge_detections(
+    chunk_detections: Iterable[Tuple[TextChunk, List[DetectedFallacy]]]
+) -> List[DetectedFallacy]:
+    """Map per-chunk detections to article offsets and drop duplicates.
+
+    Two detections of the same fallacy whose quote spans overlap (seen by
+    neighbouring chunks) are merged, keeping the more confident one.
+    Results are ordered by position in the article.
+    """
+    merged: List[DetectedFallacy] = []
+    for chunk, detections in chunk_detections:
+        for detection in detections:
+            detection = _shift(detection, chunk.start)
+            for i, existing in enumerate(merged):
+                if _same_finding(existing, detection):
+                    if _CONFIDENCE_RANK[detection.confidence] > _CONFIDENCE_RANK[existing.confidence]:
+                        merged[i] = detection
+                    break
+            else:
+                merged.append(detection)
+
+    return sorted(merged, key=lambda d: (d.start is None, d.start or 0))
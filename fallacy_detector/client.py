@@ -0,0 +1,98 @@
+"""
+Client for a running analysis server (see :mod:`fallacy_detector.server`).
+
+It imports neither LangChain nor the analyzer, so a client process starts
+in the time it takes to import httpx.
+"""
+
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    import httpx
+
+DEFAULT_SERVER_URL = "http://127.0.0.1:8765"
+
+
+class AnalysisClient:
+    """Send analysis requests to a server over one keep-alive connection pool.
+
+    A ``503`` from a full queue is retried after its ``Retry-After`` delay,
+    up to ``busy_retries`` times.
+    """
+
+    def __init__(self, base_url: str = DEFAULT_SERVER_URL, timeout: float = 300.0, busy_retries: int = 30):
+        import httpx
+
+        self.base_url = base_url.rstrip('/')
+        self.busy_retries = busy_retries
+        self._client = httpx.Client(base_url=self.base_url, timeout=httpx.Timeout(timeout, connect=5.0))
+
+    @staticmethod
+    def _request(
+        topic: str = "",
+        domain: str = "",
+        url: str = "",
+        title: str = "",
+        text: str = "",
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        if topic:
+            return {'topic': topic, 'domain': domain}
+        if url:
+            return {'url': url, 'title': title}
+        return {'text': text, 'metadata': metadata}
+
+    def _post(self, path: str, request: Dict[str, Any]) -> "httpx.Response":
+        for attempt in range(self.busy_retries + 1):
+            response = self._client.post(path, json=request)
+            if response.status_code != 503 or attempt == self.busy_retries:
+                break
+            time.sleep(float(response.headers.get('Retry-After', 1)))
+        response.raise_for_status()
+        return response
+
+    def analyze(self, topic: str = "", domain: str = "", url: str = "", title: str = "", text: str = "",
+                metadata: Optional[Dict[str, Any]] = None, poll_interval: float = 1.0) -> Dict[str, Any]:
+        """Analyze the top article for a topic, one URL or a text, and return the result."""
+        response = self._post("/analyze", self._request(topic, domain, url, title, text, metadata))
+        if response.status_code != 202:
+            return response.json()
+        # The server answers 202 with the job when it outlives its request timeout
+        job = response.json()
+        while job['status'] != "done":
+            time.sleep(poll_interval)
+            job = self.job(job['id'])
+        return job['result']
+
+    def submit(self, topic: str = "", domain: str = "", url: str = "", title: str = "", text: str = "",
+               metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Queue a request without waiting; returns the job (see :meth:`job`)."""
+        return self._post("/jobs", self._request(topic, domain, url, title, text, metadata)).json()
+
+    def job(self, job_id: str) -> Dict[str, Any]:
+        """State of a job, with its result once done."""
+        response = self._client.get(f"/jobs/{job_id}")
+        response.raise_for_status()
+        return response.json()
+
+    def health(self) -> Dict[str, Any]:
+        """Queue depth and job counters of the server."""
+        response = self._client.get("/health")
+        response.raise_for_status()
+        return response.json()
+
+    def stats(self, by: str = "fallacy", **filters: str) -> Dict[str, Any]:
+        """Fallacy counts of the server's analyses (see ``GET /stats``)."""
+        response = self._client.get("/stats", params={'by': by, **filters})
+        response.raise_for_status()
+        return response.json()
+
+    def close(self) -> None:
+        self._client.close()
+
+    def __enter__(self) -> "AnalysisClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
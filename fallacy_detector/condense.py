@@ -0,0 +1,215 @@
+"""
+Token-budget condensation of article text before the LLM stages.
+
+Cleaned article text still carries bylines, photo credits, newsletter
+prompts and boilerplate repeated between paragraphs, and only some of its
+sentences argue anything. :class:`Condenser` counts an article's tokens
+with the model's tokenizer and, when it exceeds the budget, keeps the
+sentences with the most argumentative content (pre-screen fallacy cues,
+claims, causal connectives, evaluative language) that fit, in their
+original order. Boilerplate and repeated sentences go first.
+
+The kept sentences are joined with single spaces. :class:`CondensedText`
+remembers where each one came from, so quote offsets found in the
+condensed text map back to the article.
+"""
+
+import bisect
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .chunking import sentence_spans
+from .prescreen import PreScreener
+
+# Markers of argumentative content, matched as whole lower-cased words or phrases
+CLAIM_MARKERS = (
+    "should", "must", "need to", "needs to", "have to", "has to", "ought to", "cannot", "can't",
+    "argue", "argues", "argued", "claim", "claims", "claimed", "believe", "believes", "insist",
+    "insists", "prove", "proves", "proof", "means", "always", "never", "everyone", "nobody", "only",
+)
+CAUSAL_MARKERS = (
+    "because", "therefore", "thus", "hence", "so", "since", "consequently", "as a result",
+    "leads to", "lead to", "led to", "caused", "causes", "due to", "if", "unless", "which is why",
+)
+EVALUATIVE_MARKERS = (
+    "good", "bad", "best", "worst", "great", "terrible", "disaster", "disastrous", "failure",
+    "failed", "wrong", "dangerous", "reckless", "ridiculous", "absurd", "corrupt", "incompetent",
+    "stupid", "crisis", "threat", "destroy", "ruin", "unfair", "lie", "lies", "chaos", "sensible",
+)
+
+# Sentences that carry no argument: bylines, credits, calls to action
+_BOILERPLATE = re.compile(
+    r"^(?:by|reporting by|additional reporting|written by|edited by)\s+[A-Z]"
+    r"|\b(?:photo|image|picture|video|illustration|caption|credit)s?\s*[:/]"
+    r"|getty images|\((?:ap|afp|reuters)\)|all rights reserved|copyright|©"
+    r"|subscribe|sign up|newsletter|read more|click here|follow us|advertisement|share this",
+    re.IGNORECASE
+)
+
+
+def _marker_pattern(markers: Tuple[str, ...]) -> "re.Pattern[str]":
+    return re.compile(r"\b(?:" + "|".join(re.escape(m) for m in markers) + r")\b")
+
+
+_CLAIMS = _marker_pattern(CLAIM_MARKERS)
+_CAUSAL = _marker_pattern(CAUSAL_MARKERS)
+_EVALUATIVE = _marker_pattern(EVALUATIVE_MARKERS)
+
+
+class TokenCounter:
+    """Token counts with tiktoken, or an approximation when it is unavailable.
+
+    The approximation counts words, punctuation and each run of up to four
+    spaces, which is close to how BPE tokenizers split prose. The encoding
+    is loaded on first use.
+    """
+
+    def __init__(self, encoding: str = "o200k_base"):
+        self.encoding = encoding
+        self.name = encoding
+        self._tokenizer: Any = None
+        self._loaded = False
+
+    def _load(self) -> Any:
+        if not self._loaded:
+            try:
+                import tiktoken
+                self._tokenizer = tiktoken.get_encoding(self.encoding)
+            except Exception:  # Not installed, or the encoding cannot be downloaded
+                self._tokenizer = None
+                self.name = "approximate"
+            self._loaded = True
+        return self._tokenizer
+
+    def count(self, text: str) -> int:
+        """Tokens in ``text``."""
+        tokenizer = self._load()
+        if tokenizer is None:
+            return len(re.findall(r"\w+|[^\w\s]| {2,4}", text))
+        return len(tokenizer.encode_ordinary(text))
+
+    def count_many(self, texts: List[str]) -> List[int]:
+        """Tokens in each of ``texts``."""
+        tokenizer = self._load()
+        if tokenizer is None:
+            return [self.count(text) for text in texts]
+        return [len(tokens) for tokens in tokenizer.encode_ordinary_batch(texts)]
+
+
+@dataclass
+class CondensedText:
+    """Condensed article text and the map back to the original.
+
+    ``segments`` holds ``(condensed_start, original_start, length)`` for
+    each kept sentence (or the whole text when nothing was dropped).
+    """
+
+    text: str
+    segments: List[Tuple[int, int, int]]
+    original_tokens: int
+    tokens: int
+    sentences: int
+    dropped: int
+    tokenizer: str
+
+    def _original(self, position: int) -> int:
+        index = max(bisect.bisect_right([s[0] for s in self.segments], position) - 1, 0)
+        condensed_start, original_start, length = self.segments[index]
+        # Positions on a joining space map to the end of the sentence before it
+        return original_start + min(max(position - condensed_start, 0), length)
+
+    def to_original(self, start: Optional[int], end: Optional[int]) -> Tuple[Optional[int], Optional[int]]:
+        """Map a span of the condensed text to the article text."""
+        if start is None or end is None or not self.segments:
+            return start, end
+        if end <= start:
+            position = self._original(start)
+            return position, position
+        return self._original(start), self._original(end - 1) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Tokens before and after, tokens saved and sentences dropped."""
+        return {
+            'original_tokens': self.original_tokens,
+            'tokens': self.tokens,
+            'tokens_saved': self.original_tokens - self.tokens,
+            'sentences': self.sentences,
+            'dropped_sentences': self.dropped,
+            'tokenizer': self.tokenizer,
+        }
+
+
+class Condenser:
+    """Fit article text into ``max_tokens`` by dropping its least argumentative sentences."""
+
+    def __init__(
+        self,
+        max_tokens: int,
+        counter: Optional[TokenCounter] = None,
+        screener: Optional[PreScreener] = None
+    ):
+        if max_tokens < 1:
+            raise ValueError("max_tokens must be at least 1")
+        self.max_tokens = max_tokens
+        self.counter = counter or TokenCounter()
+        self.screener = screener or PreScreener()
+
+    def score(self, sentence: str) -> float:
+        """Argumentative content of a sentence; negative for boilerplate."""
+        if _BOILERPLATE.search(sentence):
+            return -1.0
+        lowered = sentence.lower()
+        return (
+            2.0 * self.screener.score(sentence).score
+            + len(_CLAIMS.findall(lowered))
+            + len(_CAUSAL.findall(lowered))
+            + 0.5 * len(_EVALUATIVE.findall(lowered))
+        )
+
+    def condense(self, text: str) -> CondensedText:
+        """The text itself when it fits the budget, otherwise its best sentences."""
+        total = self.counter.count(text)
+        spans = sentence_spans(text)
+        if total <= self.max_tokens:
+            return CondensedText(text, [(0, 0, len(text))], total, total, len(spans), 0, self.counter.name)
+
+        sentences = [text[start:end] for start, end in spans]
+        # A leading space, as each sentence has in the joined text
+        costs = self.counter.count_many([" " + sentence for sentence in sentences])
+
+        seen = set()
+        scores = []
+        for sentence in sentences:
+            key = " ".join(sentence.lower().split())
+            scores.append(-1.0 if key in seen else self.score(sentence))
+            seen.add(key)
+
+        # Best sentences first, earlier ones on ties; skip what no longer fits
+        kept = []
+        budget = self.max_tokens
+        for index in sorted(range(len(sentences)), key=lambda i: (-scores[i], i)):
+            if scores[index] < 0:
+                break
+            if costs[index] <= budget:
+                kept.append(index)
+                budget -= costs[index]
+        if not kept:  # Nothing fits: the best sentence alone, over budget
+            kept = [min(range(len(sentences)), key=lambda i: (-scores[i], i))]
+
+        parts, segments = [], []
+        position = 0
+        for index in sorted(kept):
+            segments.append((position, spans[index][0], len(sentences[index])))
+            parts.append(sentences[index])
+            position += len(sentences[index]) + 1
+        condensed = " ".join(parts)
+        return CondensedText(
+            text=condensed,
+            segments=segments,
+            original_tokens=total,
+            tokens=self.counter.count(condensed),
+            sentences=len(sentences),
+            dropped=len(sentences) - len(kept),
+            tokenizer=self.counter.name
+        )
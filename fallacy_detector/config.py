@@ -4,7 +4,7 @@ Configuration for the Fallacy Detector AI.
 
 import os
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -18,8 +18,111 @@ class AnalysisConfig:
     temperature: float = 0.0
     max_tokens: int = 16000
     
+    # Per-stage models: "detection", "explanation", "synthesis" or "analysis"
+    # (the fused call) mapped to a model name; unlisted stages use model_name
+    stage_models: Optional[Dict[str, str]] = None
+    
+    # Model cascade: a cheap screening model runs detection first, and only
+    # articles it flags at cascade_min_confidence or above, or where it finds
+    # nothing although the local cue score reaches cascade_cue_score, are
+    # detected again with the detection model. Empty disables the cascade
+    cascade_model: str = ""
+    cascade_min_confidence: str = "Medium"  # "Low", "Medium" or "High"
+    cascade_cue_score: float = 2.0  # Pre-screen cue score at which a clean screening result is doubted
+    
     # Article processing
     article_char_limit: int = 5000
+    max_page_bytes: int = 5_000_000  # Stop reading a fetched page after this many bytes
+    
+    # Token budget for the article text given to the LLM stages; longer
+    # articles keep their most argumentative sentences (see condense.py).
+    # 0 sends the text as is
+    condense_tokens: int = 0
+    condense_encoding: str = "o200k_base"  # tiktoken encoding used to count tokens
+    
+    # Restrict detection to these catalog fallacies (None checks all of them)
+    fallacy_subset: Optional[List[str]] = None
+    
+    # Long articles: "truncate" analyzes the first article_char_limit
+    # characters, "chunk" detects over overlapping windows of that size in
+    # parallel and merges the findings
+    long_article_mode: str = "truncate"
+    chunk_overlap: int = 500  # Characters shared by neighbouring chunks
+    max_article_chars: int = 100_000  # Hard cap on article length in chunk mode
+    
+    # Batch analysis
+    max_workers: int = 5  # Articles fetched and analyzed in parallel
+    
+    # Processes that load, clean and sign texts for the async text API
+    # (corpus runs), leaving the event loop to the LLM calls; 0 does that
+    # work in the event loop thread
+    cpu_workers: int = 0
+    
+    # Async concurrency limits (per event loop)
+    search_concurrency: int = 8
+    fetch_concurrency: int = 32
+    llm_concurrency: int = 16
+    
+    # HTTP transport shared by searches and article fetches
+    http_timeout: float = 20.0  # Read timeout (s)
+    http_connect_timeout: float = 5.0
+    http_per_host_concurrency: int = 8  # Requests in flight per host
+    http_max_retries: int = 3  # Retries on 429/5xx responses and connection errors
+    http_backoff_base: float = 0.5  # First backoff (s), doubled per retry, with full jitter
+    http_backoff_max: float = 30.0  # Cap on backoff, including honored Retry-After
+    
+    # Pipeline: "staged" runs detection, explanation and synthesis as three
+    # sequential LLM calls, "fused" asks for all three in one JSON response
+    pipeline_mode: str = "staged"
+    
+    # Detection stage: "text" passes free-form markdown through, "structured"
+    # uses JSON mode and returns typed records with article offsets
+    detection_mode: str = "text"
+    
+    # Explanation stage: "full" regenerates everything per article, "primer"
+    # reuses generic per-fallacy explanations and only asks for article advice
+    explanation_mode: str = "full"
+    primers_path: str = ""  # Optional precomputed primers JSON (see FallacyAnalyzer.save_primers)
+    
+    # Local pre-screen before detection: "off", "skip" (no LLM calls below the
+    # threshold) or "detect" (detection only below the threshold, full
+    # pipeline if it still finds something)
+    prescreen_mode: str = "off"
+    prescreen_threshold: float = 1.0  # Cue score an article needs for the full pipeline
+    
+    # Result cache for the LLM stages
+    cache_enabled: bool = True
+    cache_path: str = ""  # SQLite file for the persistent tier; empty keeps it in memory
+    cache_ttl: float = 7 * 24 * 3600  # Seconds
+    cache_max_entries: int = 1024
+    cache_max_disk_entries: int = 100_000
+    
+    # Near-duplicate reuse: an article whose MinHash similarity to an already
+    # analyzed one reaches the threshold reuses that analysis (syndicated copies)
+    dedup_enabled: bool = False
+    dedup_threshold: float = 0.85  # Estimated Jaccard similarity of 5-word shingles
+    dedup_max_entries: int = 10_000  # Analyses kept in the index, oldest evicted first
+    
+    # SQLite store of finished analyses; an article whose text, model and
+    # analysis version match a stored analysis is served from it (see store.py)
+    store_path: str = ""
+    
+    # Running fallacy x domain x day counts of structured detections (see aggregate.py);
+    # needs detection_mode "structured" or the fused pipeline
+    stats_enabled: bool = False
+    
+    # Cache for Serper results and fetched pages, so repeat jobs skip network I/O
+    fetch_cache_enabled: bool = True
+    fetch_cache_path: str = ""  # SQLite file for the persistent tier; empty keeps it in memory
+    search_cache_ttl: float = 15 * 60  # Seconds a search result is reused
+    page_cache_ttl: float = 3600  # Seconds a page is reused before revalidating it
+    page_cache_max_age: float = 7 * 24 * 3600  # Seconds a page is kept for revalidation
+    fetch_cache_max_entries: int = 256
+    fetch_cache_max_disk_entries: int = 10_000
+    
+    # Endpoints (overridable for proxies and the offline benchmark stand-ins)
+    openai_base_url: str = ""  # Empty uses OPENAI_BASE_URL or the OpenAI default
+    serper_endpoint: str = "https://google.serper.dev/search"
     
     # API keys from environment - FIXED
     openai_api_key: str = ""  # Empty string instead of None
@@ -34,9 +137,58 @@ class AnalysisConfig:
         if not self.serper_api_key:  # If empty
             self.serper_api_key = os.getenv("SERPER_API_KEY", "")
         
+        if not self.openai_base_url:
+            self.openai_base_url = os.getenv("OPENAI_BASE_URL", "")
+        
+        if self.pipeline_mode not in ("staged", "fused"):
+            raise ValueError("pipeline_mode must be 'staged' or 'fused'")
+        
+        if self.detection_mode not in ("text", "structured"):
+            raise ValueError("detection_mode must be 'text' or 'structured'")
+        
+        if self.explanation_mode not in ("full", "primer"):
+            raise ValueError("explanation_mode must be 'full' or 'primer'")
+        
+        if self.long_article_mode not in ("truncate", "chunk"):
+            raise ValueError("long_article_mode must be 'truncate' or 'chunk'")
+        
+        if not 0 <= self.chunk_overlap < self.article_char_limit:
+            raise ValueError("chunk_overlap must be between 0 and article_char_limit")
+        
+        if set(self.stage_models or ()) - {"detection", "explanation", "synthesis", "analysis"}:
+            raise ValueError("stage_models keys must be 'detection', 'explanation', 'synthesis' or 'analysis'")
+        
+        if self.cascade_min_confidence not in ("Low", "Medium", "High"):
+            raise ValueError("cascade_min_confidence must be 'Low', 'Medium' or 'High'")
+        
+        if self.cascade_model and self.pipeline_mode != "staged":
+            raise ValueError("cascade_model requires pipeline_mode 'staged'")
+        
+        if self.prescreen_mode not in ("off", "skip", "detect"):
+            raise ValueError("prescreen_mode must be 'off', 'skip' or 'detect'")
+        
+        if self.condense_tokens < 0:
+            raise ValueError("condense_tokens must not be negative")
+        
+        if self.cpu_workers < 0:
+            raise ValueError("cpu_workers must not be negative")
+        
+        if self.stats_enabled and self.detection_mode != "structured" and self.pipeline_mode != "fused":
+            raise ValueError("stats_enabled requires detection_mode 'structured' or pipeline_mode 'fused'")
+        
+        if not 0 < self.dedup_threshold <= 1:
+            raise ValueError("dedup_threshold must be between 0 and 1")
+        
+        if self.page_cache_max_age < self.page_cache_ttl:
+            raise ValueError("page_cache_max_age must be at least page_cache_ttl")
+        
         # Validate required keys
         if not self.openai_api_key:
             raise ValueError("OpenAI API key required. Set OPENAI_API_KEY environment variable.")
             
         if not self.serper_api_key:
             raise ValueError("Serper API key required. Set SERPER_API_KEY environment variable.")
+    
+    def stage_model(self, stage: str) -> str:
+        """Model used by a pipeline stage."""
+        return (self.stage_models or {}).get(stage) or self.model_name
@@ -0,0 +1,282 @@
+"""
+Bulk analysis of local corpora.
+
+Documents are streamed from a JSONL file, a CSV file or a directory of
+text/HTML files and analyzed with :meth:`FallacyAnalyzer.aanalyze_text`,
+a bounded number at a time. Each result is appended to a JSONL output file
+as soon as it is ready, and that file doubles as the checkpoint: a rerun
+skips every document that already has a successful result there, so long
+runs can be resumed after a crash without redoing work.
+:func:`batch_analyze_corpus` does the same through the provider Batch API.
+"""
+
+import asyncio
+import csv
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+from .extraction import extract_article_text
+
+if TYPE_CHECKING:
+    from .analyzer import FallacyAnalyzer
+
+# File suffixes picked up when the corpus is a directory
+TEXT_SUFFIXES = frozenset({".txt", ".md"})
+HTML_SUFFIXES = frozenset({".html", ".htm"})
+
+
+@dataclass
+class CorpusDocument:
+    """One document of a corpus: a stable id, its text and any other fields.
+
+    A document read lazily has an empty ``text`` and the file to read it
+    from in ``source``.
+    """
+
+    id: str
+    text: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    source: str = ""
+
+
+def _record_document(record: Dict[str, Any], fallback_id: str, text_field: str, id_field: str) -> CorpusDocument:
+    if text_field not in record:
+        raise ValueError(f"Record {fallback_id} has no '{text_field}' field")
+    metadata = {key: value for key, value in record.items() if key not in (text_field, id_field)}
+    doc_id = record.get(id_field)
+    return CorpusDocument(
+        id=str(doc_id) if doc_id not in (None, "") else fallback_id,
+        text=record[text_field] or "",
+        metadata=metadata
+    )
+
+
+def iter_jsonl(path: Path, text_field: str = "text", id_field: str = "id") -> Iterator[CorpusDocument]:
+    """Documents from a JSONL file; records without an id use ``<file>:<line>``."""
+    with open(path, encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            if line.strip():
+                yield _record_document(json.loads(line), f"{path.name}:{line_no}", text_field, id_field)
+
+
+def iter_csv(path: Path, text_field: str = "text", id_field: str = "id") -> Iterator[CorpusDocument]:
+    """Documents from a CSV file with a header row; rows without an id use ``<file>:<row>``."""
+    csv.field_size_limit(sys.maxsize)  # Article bodies exceed the 128 KiB default
+    with open(path, encoding='utf-8', newline='') as f:
+        for row_no, row in enumerate(csv.DictReader(f), 1):
+            yield _record_document(row, f"{path.name}:{row_no}", text_field, id_field)
+
+
+def read_document(path: Union[str, Path]) -> str:
+    """Text of a text file, or the article text of an HTML file."""
+    path = Path(path)
+    if path.suffix.lower() in HTML_SUFFIXES:
+        data = path.read_bytes()
+        return extract_article_text(data, max_chars=len(data))
+    return path.read_text(encoding='utf-8', errors='replace')
+
+
+def iter_directory(path: Path, load: bool = True) -> Iterator[CorpusDocument]:
+    """Text and HTML files under a directory, in path order; ids are relative paths.
+
+    Without ``load`` files are not read here; each document names its file
+    in ``source`` (see :mod:`.cpu_pool`).
+    """
+    for file in sorted(path.rglob("*")):
+        if not file.is_file() or file.suffix.lower() not in TEXT_SUFFIXES | HTML_SUFFIXES:
+            continue
+        doc_id = file.relative_to(path).as_posix()
+        metadata = {'title': file.stem, 'path': doc_id}
+        if load:
+            yield CorpusDocument(id=doc_id, text=read_document(file), metadata=metadata)
+        else:
+            yield CorpusDocument(id=doc_id, text="", metadata=metadata, source=str(file))
+
+
+def iter_corpus(
+    path: Union[str, Path],
+    text_field: str = "text",
+    id_field: str = "id",
+    load: bool = True
+) -> Iterator[CorpusDocument]:
+    """Stream the documents of a JSONL file, CSV file or directory.
+
+    ``load=False`` defers reading directory files to the analysis.
+    """
+    path = Path(path)
+    if path.is_dir():
+        return iter_directory(path, load)
+    suffix = path.suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        return iter_jsonl(path, text_field, id_field)
+    if suffix == ".csv":
+        return iter_csv(path, text_field, id_field)
+    raise ValueError(f"Unsupported corpus format: {path.name} (expected .jsonl, .csv or a directory)")
+
+
+def _trim_partial_line(path: Path, block_size: int = 64 * 1024) -> None:
+    """Drop an unterminated last line, scanning back from the end of the file."""
+    with open(path, 'rb+') as f:
+        end = pos = f.seek(0, 2)
+        while pos > 0:
+            step = min(block_size, pos)
+            f.seek(pos - step)
+            block = f.read(step)
+            if pos == end and block.endswith(b"\n"):
+                return
+            newline = block.rfind(b"\n")
+            if newline != -1:
+                f.truncate(pos - step + newline + 1)
+                return
+            pos -= step
+        f.truncate(0)
+
+
+def load_checkpoint(output_path: Union[str, Path]) -> Set[str]:
+    """Ids with a successful result in an output file.
+
+    A partial last line left by a crash is truncated away so appends start
+    on a fresh line. Failed documents are not included and run again.
+    """
+    path = Path(output_path)
+    if not path.exists():
+        return set()
+    _trim_partial_line(path)
+
+    done = set()
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            if 'error' not in record:
+                done.add(record['id'])
+    return done
+
+
+def _result_line(document_id: str, result: Dict[str, Any]) -> str:
+    return json.dumps({'id': document_id, **result}, ensure_ascii=False, default=str) + "\n"
+
+
+async def aanalyze_corpus(
+    analyzer: "FallacyAnalyzer",
+    documents: Iterable[CorpusDocument],
+    output_path: Union[str, Path],
+    concurrency: int = 8,
+    resume: bool = True,
+    progress: Optional[Callable[[Dict[str, int]], None]] = None
+) -> Dict[str, int]:
+    """Analyze documents into a JSONL file, ``concurrency`` at a time.
+
+    Documents are pulled from ``documents`` only as workers free up, so
+    memory stays bounded for corpora of any size. Results are written in
+    completion order, one ``{"id": ..., **result}`` line each, and flushed
+    immediately. With ``resume`` documents already done in ``output_path``
+    are skipped; without it the file is overwritten. ``progress`` is called
+    with the running counts after each document.
+    """
+    output = Path(output_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    done = load_checkpoint(output) if resume else set()
+    stats = {'analyzed': 0, 'failed': 0, 'skipped': 0}
+    queue: "asyncio.Queue[Optional[CorpusDocument]]" = asyncio.Queue(maxsize=concurrency)
+
+    with open(output, 'a' if resume else 'w', encoding='utf-8') as out:
+        async def worker() -> None:
+            while True:
+                document = await queue.get()
+                if document is None:
+                    return
+                result = await analyzer.aanalyze_text(document.text, document.metadata, document.source)
+                out.write(_result_line(document.id, result))
+                out.flush()
+                stats['failed' if 'error' in result else 'analyzed'] += 1
+                if progress is not None:
+                    progress(dict(stats))
+
+        workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+        try:
+            for document in documents:
+                if document.id in done:
+                    stats['skipped'] += 1
+                    continue
+                await _put(queue, document, workers)
+            for _ in workers:
+                await _put(queue, None, workers)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+    return stats
+
+
+async def _put(queue: asyncio.Queue, item: Any, workers: List["asyncio.Task[None]"]) -> None:
+    """Put ``item`` on ``queue``, raising the first worker failure instead of waiting forever.
+
+    Workers only return after the sentinel, so one finishing while the
+    producer is still blocked means it died and nobody will drain the queue.
+    """
+    put = asyncio.ensure_future(queue.put(item))
+    done, _ = await asyncio.wait([put, *workers], return_when=asyncio.FIRST_COMPLETED)
+    if put in done:
+        return
+    put.cancel()
+    for task in done:
+        task.result()  # Re-raises the worker's exception
+    raise RuntimeError("corpus worker exited before the input was exhausted")
+
+
+def analyze_corpus(
+    analyzer: "FallacyAnalyzer",
+    documents: Iterable[CorpusDocument],
+    output_path: Union[str, Path],
+    concurrency: int = 8,
+    resume: bool = True,
+    progress: Optional[Callable[[Dict[str, int]], None]] = None
+) -> Dict[str, int]:
+    """Blocking wrapper around :func:`aanalyze_corpus`."""
+    async def run() -> Dict[str, int]:
+        async with analyzer:
+            return await aanalyze_corpus(analyzer, documents, output_path, concurrency, resume, progress)
+
+    return asyncio.run(run())
+
+
+def batch_analyze_corpus(
+    analyzer: "FallacyAnalyzer",
+    documents: Iterable[CorpusDocument],
+    output_path: Union[str, Path],
+    state_path: Union[str, Path],
+    resume: bool = True,
+    poll_interval: float = 30.0
+) -> Dict[str, Any]:
+    """Analyze documents through the provider Batch API (see :mod:`.batch`).
+
+    Unlike :func:`analyze_corpus` the documents not yet done are held in
+    memory, since every batch round revisits them; results are written once
+    all rounds are finished. Returns the counts plus the batch statistics.
+    """
+    from .batch import BatchRunner
+
+    output = Path(output_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    done = load_checkpoint(output) if resume else set()
+    pending = []
+    skipped = 0
+    for document in documents:
+        if document.id in done:
+            skipped += 1
+        else:
+            pending.append(document)
+
+    runner = BatchRunner(analyzer, state_path, poll_interval=poll_interval)
+    results = runner.run(pending)
+
+    stats: Dict[str, Any] = {'analyzed': 0, 'failed': 0, 'skipped': skipped}
+    with open(output, 'a' if resume else 'w', encoding='utf-8') as out:
+        for result in results:
+            out.write(_result_line(result.pop('id'), result))
+            stats['failed' if 'error' in result else 'analyzed'] += 1
+    stats['batch'] = runner.stats
+    return stats
@@ -0,0 +1,90 @@
+"""
+Process pool for the CPU-bound side of corpus-scale runs.
+
+With ``cpu_workers`` set, :meth:`FallacyAnalyzer.aanalyze_text` hands the
+local work on each document to worker processes: reading and parsing an
+HTML file, cleaning the text and, with near-duplicate reuse on, its
+MinHash signature. A worker receives the raw text or just the file path
+and sends back the cleaned text (at most the analysis limit) and a 1 KiB
+signature, so little is pickled compared to the work done. Searches,
+fetches and LLM calls stay on the event loop in the parent, which is then
+free to keep them in flight while the workers parse.
+
+Workers are started with ``spawn`` (no inherited event loop, threads or
+sockets) and do not import LangChain.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from .corpus import read_document
+from .dedup import NearDuplicateIndex
+from .utils import clean_article_text
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# MinHash index of this worker process, built by _init_worker
+_worker_index: Optional[NearDuplicateIndex] = None
+
+
+def _init_worker(dedup_params: Optional[Dict[str, Any]]) -> None:
+    global _worker_index
+    if dedup_params is not None:
+        _worker_index = NearDuplicateIndex(**dedup_params)
+
+
+def prepare_text(text: str, source: str, char_limit: int) -> Tuple[str, Optional["np.ndarray"]]:
+    """Load (from ``source`` when given), clean and sign one document."""
+    if source:
+        text = read_document(source)
+    content = clean_article_text(text, char_limit)
+    signature = _worker_index.signature(content) if _worker_index is not None and content else None
+    return content, signature
+
+
+class CpuPool:
+    """Worker processes preparing documents for analysis.
+
+    ``dedup`` is the analyzer's near-duplicate index; workers build an
+    identical one (same seed and sizes) so their signatures match it. The
+    processes start on first use and :meth:`close` stops them.
+    """
+
+    def __init__(self, processes: int, char_limit: int, dedup: Optional[NearDuplicateIndex] = None):
+        if processes < 1:
+            raise ValueError("processes must be at least 1")
+        self.processes = processes
+        self.char_limit = char_limit
+        self._dedup_params = None
+        if dedup is not None:
+            self._dedup_params = {
+                'num_perm': dedup.num_perm,
+                'bands': dedup.bands,
+                'shingle_size': dedup.shingle_size,
+                'seed': dedup.seed,
+            }
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._dedup_params,)
+            )
+        return self._executor
+
+    async def prepare(self, text: str, source: str = "") -> Tuple[str, Optional["np.ndarray"]]:
+        """Cleaned text and MinHash signature (None without dedup or without any shingle) of one document."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool(), prepare_text, text, source, self.char_limit)
+
+    def close(self) -> None:
+        """Stop the worker processes; the next :meth:`prepare` starts new ones."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
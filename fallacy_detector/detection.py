@@ -0,0 +1,221 @@
+"""
+Structured fallacy detection records and an incremental JSON parser.
+"""
+
+import difflib
+import json
+import re
+from dataclasses import dataclass, asdict
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Detection output when the article is clean (matches FALLACY_DETECTION_PROMPT)
+NO_FALLACIES_DETECTED = "No significant logical fallacies detected."
+
+
+class Confidence(str, Enum):
+    """Confidence levels used by the detection prompts."""
+
+    LOW = "Low"
+    MEDIUM = "Medium"
+    HIGH = "High"
+
+    @classmethod
+    def parse(cls, value: Any) -> "Confidence":
+        """Parse a loosely formatted confidence value, defaulting to Low."""
+        text = str(value or "").strip().lower()
+        for level in cls:
+            if text.startswith(level.value.lower()):
+                return level
+        return cls.LOW
+
+
+@dataclass
+class DetectedFallacy:
+    """A single detected fallacy resolved against the catalog and article."""
+
+    fallacy: str
+    quote: str
+    reason: str
+    confidence: Confidence
+    start: Optional[int] = None  # Character offsets into the cleaned article text
+    end: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable dict."""
+        data = asdict(self)
+        data['confidence'] = self.confidence.value
+        return data
+
+
+class IncrementalFallacyParser:
+    """Parse ``{"fallacies": [{...}, ...]}`` from a token stream.
+
+    Each element of the ``fallacies`` array is returned by :meth:`feed` as
+    soon as its closing brace arrives, so callers can act on the first
+    detection before the model has finished the response.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._item: Optional[List[str]] = None
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consume a chunk of output and return any completed records."""
+        completed = []
+        for char in chunk:
+            if self._item is not None:
+                self._item.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+                # Objects opened directly inside the top-level array are records
+                if char == '{' and self._depth == 3:
+                    self._item = ['{']
+            elif char in '}]':
+                if char == '}' and self._depth == 3 and self._item is not None:
+                    record = self._decode(''.join(self._item))
+                    if record is not None:
+                        completed.append(record)
+                    self._item = None
+                self._depth -= 1
+        return completed
+
+    @staticmethod
+    def _decode(raw: str) -> Optional[Dict[str, Any]]:
+        try:
+            record = json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+        return record if isinstance(record, dict) else None
+
+
+def parse_detection_json(raw: str) -> List[Dict[str, Any]]:
+    """Parse a complete structured detection response."""
+    return IncrementalFallacyParser().feed(raw)
+
+
+def parse_fused_json(raw: str) -> Dict[str, Any]:
+    """Parse a FUSED_ANALYSIS_PROMPT response into records and the two texts.
+
+    Malformed JSON still yields whatever complete records it contains.
+    """
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError:
+        data = None
+    if not isinstance(data, dict):
+        return {'fallacies': parse_detection_json(raw), 'explanations': '', 'report': ''}
+    records = data.get('fallacies')
+    return {
+        'fallacies': [r for r in records if isinstance(r, dict)] if isinstance(records, list) else [],
+        'explanations': str(data.get('explanations') or ''),
+        'report': str(data.get('report') or ''),
+    }
+
+
+_TEXT_ENTRY = re.compile(
+    r'\*\*\[?(?P<fallacy>[^*\]]+?)\]?\*\*\s*\(Confidence:\s*(?P<confidence>\w+)\)'
+    r'(?P<body>.*?)(?=\n\s*\d+\.\s*\*\*|\Z)',
+    re.DOTALL
+)
+
+
+def parse_detection_text(text: str) -> List[Dict[str, Any]]:
+    """Parse the markdown format of FALLACY_DETECTION_PROMPT into records."""
+    records = []
+    for entry in _TEXT_ENTRY.finditer(text):
+        body = entry.group('body')
+        quote = re.search(r'Text:\s*"(.*?)"\s*(?:\n|$)', body, re.DOTALL)
+        reason = re.search(r'Reason:\s*(.*)', body, re.DOTALL)
+        records.append({
+            'fallacy': entry.group('fallacy').strip(),
+            'confidence': entry.group('confidence'),
+            'quote': quote.group(1).strip() if quote else '',
+            'reason': ' '.join(reason.group(1).split()) if reason else '',
+        })
+    return records
+
+
+def _normalize_name(name: str) -> str:
+    return re.sub(r'[^a-z]', '', name.lower())
+
+
+def match_fallacy_name(name: str, fallacy_names: Iterable[str]) -> Optional[str]:
+    """Match a model-produced fallacy name to its catalog spelling."""
+    names = list(fallacy_names)
+    normalized = {_normalize_name(n): n for n in names}
+    key = _normalize_name(name or "")
+    if not key:
+        return None
+    if key in normalized:
+        return normalized[key]
+    close = difflib.get_close_matches(key, list(normalized), n=1, cutoff=0.8)
+    return normalized[close[0]] if close else None
+
+
+def resolve_quote_offsets(quote: str, text: str) -> Tuple[Optional[int], Optional[int]]:
+    """Locate a quote in the article, tolerating case and whitespace differences."""
+    quote = (quote or "").strip().strip('"“”').strip('.… ')
+    if not quote:
+        return None, None
+
+    start = text.find(quote)
+    if start >= 0:
+        return start, start + len(quote)
+
+    pattern = r'\s+'.join(re.escape(word) for word in quote.split())
+    match = re.search(pattern, text, re.IGNORECASE)
+    if match:
+        return match.start(), match.end()
+    return None, None
+
+
+def build_detection(
+    record: Dict[str, Any],
+    article_text: str,
+    fallacy_names: Iterable[str]
+) -> Optional[DetectedFallacy]:
+    """Turn a raw JSON record into a DetectedFallacy, or None if unknown."""
+    fallacy = match_fallacy_name(str(record.get('fallacy', '')), fallacy_names)
+    if fallacy is None:
+        return None
+
+    quote = str(record.get('quote', ''))
+    start, end = resolve_quote_offsets(quote, article_text)
+    return DetectedFallacy(
+        fallacy=fallacy,
+        quote=quote,
+        reason=str(record.get('reason', '')),
+        confidence=Confidence.parse(record.get('confidence')),
+        start=start,
+        end=end
+    )
+
+
+def render_detections(detections: List[DetectedFallacy]) -> str:
+    """Render detections in the text format of FALLACY_DETECTION_PROMPT."""
+    if not detections:
+        return NO_FALLACIES_DETECTED
+
+    lines = ["FALLACY ANALYSIS:"]
+    for i, detection in enumerate(detections, 1):
+        lines.append(f"{i}. **{detection.fallacy}** (Confidence: {detection.confidence.value})")
+        lines.append(f"   - Text: \"{detection.quote}\"")
+        lines.append(f"   - Reason: {detection.reason}")
+        lines.append("")
+    return "\n".join(lines).rstrip()
@@ -0,0 +1,166 @@
+"""
+Streaming main-text extraction for fetched article pages.
+
+:class:`ArticleExtractor` is fed the response body chunk by chunk and parses
+it incrementally with lxml's pull parser. Text is collected from block-level
+elements (paragraphs, headings, list items...) outside of navigation,
+scripts, forms and other boilerplate, preferring ``<article>``/``<main>``
+content when the page has it. Feeding stops as soon as enough text has been
+collected or the byte cap is reached, so heavy pages are neither fully
+downloaded nor fully parsed.
+"""
+
+from typing import Any, List, Optional, Union
+
+# Content types the extractor understands
+HTML_CONTENT_TYPES = frozenset({"text/html", "application/xhtml+xml"})
+TEXT_CONTENT_TYPES = frozenset({"text/plain"})
+
+# Subtrees that never contain article text
+BOILERPLATE_TAGS = frozenset({
+    "script", "style", "noscript", "template", "svg", "iframe", "canvas",
+    "nav", "header", "footer", "aside", "form", "button", "select", "menu",
+})
+
+# Elements whose text is collected as one block
+BLOCK_TAGS = frozenset({
+    "p", "h1", "h2", "h3", "h4", "h5", "h6", "li", "blockquote", "pre",
+    "figcaption", "dd", "dt", "td", "th",
+})
+
+# Containers marking the main content of the page
+MAIN_TAGS = frozenset({"article", "main"})
+
+
+def media_type(content_type: Optional[str]) -> str:
+    """The lower-cased media type of a Content-Type header, without parameters."""
+    return (content_type or "").split(";")[0].strip().lower()
+
+
+def check_content_type(content_type: Optional[str]) -> None:
+    """Raise ValueError unless the page is HTML or plain text (missing is allowed)."""
+    kind = media_type(content_type)
+    if kind and kind not in HTML_CONTENT_TYPES | TEXT_CONTENT_TYPES:
+        raise ValueError(f"Unsupported content type: {kind}")
+
+
+class ArticleExtractor:
+    """Incremental article text extractor.
+
+    Call :meth:`feed` with raw body chunks until it returns True (enough text
+    or ``max_bytes`` reached) or the body ends, then :meth:`close` for the
+    text. ``encoding`` is the charset from the response headers; without it
+    lxml detects the encoding from the page.
+    """
+
+    def __init__(
+        self,
+        max_chars: int = 5000,
+        max_bytes: int = 5_000_000,
+        encoding: Optional[str] = None,
+        content_type: Optional[str] = None
+    ):
+        self.max_chars = max_chars
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self.plain = media_type(content_type) in TEXT_CONTENT_TYPES
+        self.encoding = encoding
+        self.done = False
+
+        self._raw: List[bytes] = []  # Plain-text bodies
+        self._parser: Optional[Any] = None  # lxml HTMLPullParser
+        if not self.plain:
+            from lxml import etree
+
+            self._parser = etree.HTMLPullParser(events=("start", "end"), encoding=encoding)
+        self._skip_depth = 0
+        self._main_depth = 0
+        self._main_blocks: List[str] = []
+        self._blocks: List[str] = []
+        self._main_chars = 0
+        self._chars = 0
+
+    def feed(self, data: bytes) -> bool:
+        """Consume a body chunk; returns True once no more input is needed."""
+        if self.done:
+            return True
+        if self.bytes_read + len(data) >= self.max_bytes:
+            data = data[:self.max_bytes - self.bytes_read]
+            self.done = True
+        self.bytes_read += len(data)
+
+        if self.plain:
+            self._raw.append(data)
+            self._chars += len(data)
+        else:
+            self._parser.feed(data)
+            self._collect()
+
+        if self._enough():
+            self.done = True
+        return self.done
+
+    def _enough(self) -> bool:
+        # Main content, once seen, is what close() returns
+        chars = self._main_chars if self._main_blocks else self._chars
+        return chars >= self.max_chars
+
+    def _collect(self) -> None:
+        for event, element in self._parser.read_events():
+            tag = element.tag if isinstance(element.tag, str) else ""
+            if event == "start":
+                if tag in BOILERPLATE_TAGS:
+                    self._skip_depth += 1
+                elif tag in MAIN_TAGS:
+                    self._main_depth += 1
+                continue
+
+            if tag in BOILERPLATE_TAGS:
+                self._skip_depth -= 1
+                element.clear(keep_tail=True)
+            elif tag in MAIN_TAGS:
+                self._main_depth -= 1
+            elif tag in BLOCK_TAGS and not self._skip_depth:
+                text = " ".join("".join(element.itertext()).split())
+                # Drop collected blocks so enclosing blocks do not repeat them
+                element.clear(keep_tail=True)
+                if text:
+                    self._blocks.append(text)
+                    self._chars += len(text) + 1
+                    if self._main_depth:
+                        self._main_blocks.append(text)
+                        self._main_chars += len(text) + 1
+
+    def close(self) -> str:
+        """Finish parsing and return the extracted text."""
+        if self.plain:
+            return b"".join(self._raw).decode(self.encoding or "utf-8", errors="replace")
+
+        try:
+            root = self._parser.close()
+        except Exception:
+            root = None  # Truncated or empty documents
+        self._collect()
+
+        blocks = self._main_blocks or self._blocks
+        if blocks:
+            return "\n".join(blocks)
+        # Pages without block markup: whatever text is left outside boilerplate
+        return " ".join("".join(root.itertext()).split()) if root is not None else ""
+
+
+def extract_article_text(
+    html: Union[str, bytes],
+    max_chars: int = 5000,
+    content_type: Optional[str] = None
+) -> str:
+    """Extract article text from a complete page."""
+    data = html.encode("utf-8") if isinstance(html, str) else html
+    extractor = ArticleExtractor(
+        max_chars=max_chars,
+        max_bytes=len(data) + 1,
+        encoding="utf-8" if isinstance(html, str) else None,
+        content_type=content_type
+    )
+    extractor.feed(data)
+    return extractor.close()
@@ -0,0 +1,311 @@
+"""
+Per-stage latency, token and cost instrumentation.
+
+The analyzer records a :class:`StageMetrics` entry for every pipeline stage
+into the :class:`AnalysisMetrics` of the analysis currently running (tracked
+with a context variable so concurrent analyses never mix). Hooks receive
+each entry as it is recorded; :class:`PrometheusExporter` is a ready-made
+hook that renders the Prometheus text exposition format.
+"""
+
+import bisect
+import contextvars
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Protocol, Sequence, Tuple
+
+# USD per 1M tokens (prompt, completion); update as provider pricing changes
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+
+# Dated snapshot suffix of provider model names, e.g. "gpt-4.1-nano-2025-04-14"
+_SNAPSHOT_SUFFIX = re.compile(r"-\d{4}-\d{2}-\d{2}$")
+
+
+def estimate_cost(model_name: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimate the USD cost of a call; unknown models cost 0."""
+    prices = MODEL_PRICES.get(model_name) or MODEL_PRICES.get(_SNAPSHOT_SUFFIX.sub("", model_name))
+    prompt_price, completion_price = prices or (0.0, 0.0)
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+@dataclass
+class StageMetrics:
+    """Measurements for one execution of a pipeline stage."""
+
+    stage: str
+    duration: float
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: float = 0.0
+    cached: bool = False
+    model_name: str = ""
+
+
+class MetricsHook(Protocol):
+    """Callback protocol for receiving metrics as they are recorded."""
+
+    def on_stage(self, metrics: StageMetrics) -> None:
+        ...
+
+    def on_analysis(self, metrics: "AnalysisMetrics") -> None:
+        ...
+
+
+@dataclass
+class AnalysisMetrics:
+    """All stage measurements for one article analysis."""
+
+    hooks: Sequence[MetricsHook] = ()
+    stages: List[StageMetrics] = field(default_factory=list)
+    http: Dict[str, int] = field(default_factory=dict)  # Request, retry and connection counts
+    started_at: float = field(default_factory=time.perf_counter)
+    total_time: Optional[float] = None
+
+    def record(self, stage_metrics: StageMetrics) -> None:
+        """Store a stage measurement and notify hooks."""
+        self.stages.append(stage_metrics)
+        for hook in self.hooks:
+            hook.on_stage(stage_metrics)
+
+    def count_http(self, retries: int, reused: bool) -> None:
+        """Count one HTTP request made by the shared transport."""
+        for key, value in (
+            ('requests', 1),
+            ('retries', retries),
+            ('connections_reused' if reused else 'connections_opened', 1),
+        ):
+            self.http[key] = self.http.get(key, 0) + value
+
+    def finish(self) -> None:
+        """Stop the analysis clock and notify hooks."""
+        self.total_time = time.perf_counter() - self.started_at
+        for hook in self.hooks:
+            hook.on_analysis(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize per stage for inclusion in an analysis result."""
+        timings: Dict[str, float] = {}
+        token_usage: Dict[str, Dict[str, int]] = {}
+        cost: Dict[str, float] = {}
+        for m in self.stages:
+            timings[m.stage] = timings.get(m.stage, 0.0) + m.duration
+            if m.prompt_tokens or m.completion_tokens:
+                usage = token_usage.setdefault(m.stage, {'prompt_tokens': 0, 'completion_tokens': 0})
+                usage['prompt_tokens'] += m.prompt_tokens
+                usage['completion_tokens'] += m.completion_tokens
+            if m.cost:
+                cost[m.stage] = cost.get(m.stage, 0.0) + m.cost
+        cost['total'] = sum(cost.values())
+
+        total_time = self.total_time
+        if total_time is None:
+            total_time = time.perf_counter() - self.started_at
+        return {
+            'processing_time': total_time,
+            'timings': timings,
+            'token_usage': token_usage,
+            'cost': cost,
+            'http': dict(self.http),
+        }
+
+
+_current_metrics: contextvars.ContextVar = contextvars.ContextVar(
+    'fallacy_detector_metrics', default=None
+)
+
+
+def current_metrics() -> Optional[AnalysisMetrics]:
+    """Return the metrics of the analysis running in this context, if any."""
+    return _current_metrics.get()
+
+
+@contextmanager
+def using_metrics(metrics: AnalysisMetrics) -> Iterator[AnalysisMetrics]:
+    """Make ``metrics`` the current metrics inside the ``with`` block.
+
+    Generators must not yield inside the block, or the variable leaks into
+    the consumer and is reset from another context; they activate it
+    around each step instead.
+    """
+    token = _current_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current_metrics.reset(token)
+
+
+@contextmanager
+def track_analysis(hooks: Sequence[MetricsHook] = ()) -> Iterator[AnalysisMetrics]:
+    """Collect metrics for the analysis run inside the ``with`` block."""
+    metrics = AnalysisMetrics(hooks=hooks)
+    with using_metrics(metrics):
+        try:
+            yield metrics
+        finally:
+            metrics.finish()
+
+
+@contextmanager
+def time_stage(stage: str) -> Iterator[None]:
+    """Record the wall time of a non-LLM stage (search, fetch, clean...)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.record(StageMetrics(stage=stage, duration=time.perf_counter() - start))
+
+
+@lru_cache(maxsize=None)
+def _usage_handler_class() -> type:
+    """Define UsageCallbackHandler on first use (imports langchain_core)."""
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class UsageCallbackHandler(BaseCallbackHandler):
+        """LangChain callback that collects token usage from chat model calls."""
+
+        def __init__(self):
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+
+        def on_llm_end(self, response, **kwargs: Any) -> None:
+            found = False
+            for generations in response.generations:
+                for generation in generations:
+                    usage = getattr(getattr(generation, 'message', None), 'usage_metadata', None)
+                    if usage:
+                        self.prompt_tokens += usage.get('input_tokens', 0)
+                        self.completion_tokens += usage.get('output_tokens', 0)
+                        found = True
+            if not found and response.llm_output:
+                usage = response.llm_output.get('token_usage') or {}
+                self.prompt_tokens += usage.get('prompt_tokens', 0)
+                self.completion_tokens += usage.get('completion_tokens', 0)
+
+    return UsageCallbackHandler
+
+
+def __getattr__(name: str) -> Any:
+    if name == 'UsageCallbackHandler':
+        return _usage_handler_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@contextmanager
+def track_llm_stage(stage: str, model_name: str) -> Iterator[Any]:
+    """Time an LLM stage; pass the yielded handler as a LangChain callback."""
+    handler = _usage_handler_class()()
+    start = time.perf_counter()
+    try:
+        yield handler
+    finally:
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.record(StageMetrics(
+                stage=stage,
+                duration=time.perf_counter() - start,
+                prompt_tokens=handler.prompt_tokens,
+                completion_tokens=handler.completion_tokens,
+                cost=estimate_cost(model_name, handler.prompt_tokens, handler.completion_tokens),
+                model_name=model_name
+            ))
+
+
+def record_cache_hit(stage: str) -> None:
+    """Record a stage served from the result cache."""
+    metrics = current_metrics()
+    if metrics is not None:
+        metrics.record(StageMetrics(stage=stage, duration=0.0, cached=True))
+
+
+def record_http_request(retries: int, reused: bool) -> None:
+    """Record an HTTP request made by the shared transport."""
+    metrics = current_metrics()
+    if metrics is not None:
+        metrics.count_http(retries, reused)
+
+
+class PrometheusExporter:
+    """Metrics hook that aggregates stage metrics into Prometheus text format."""
+
+    DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0)
+
+    def __init__(self, namespace: str = "fallacy_detector", buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.namespace = namespace
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Tuple[List[int], List[float]]] = {}
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+
+    def _observe(self, name: str, value: float) -> None:
+        counts, totals = self._histograms.setdefault(name, ([0] * (len(self.buckets) + 1), [0.0]))
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        totals[0] += value
+
+    def _inc(self, name: str, value: float, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def on_stage(self, metrics: StageMetrics) -> None:
+        with self._lock:
+            self._observe(f'stage_duration_seconds|{metrics.stage}', metrics.duration)
+            if metrics.cached:
+                self._inc('stage_cache_hits_total', 1, stage=metrics.stage)
+            if metrics.prompt_tokens or metrics.completion_tokens:
+                self._inc('tokens_total', metrics.prompt_tokens, stage=metrics.stage, type='prompt')
+                self._inc('tokens_total', metrics.completion_tokens, stage=metrics.stage, type='completion')
+            if metrics.cost:
+                self._inc('cost_usd_total', metrics.cost, stage=metrics.stage)
+
+    def on_analysis(self, metrics: AnalysisMetrics) -> None:
+        with self._lock:
+            self._inc('analyses_total', 1)
+            self._inc('http_requests_total', metrics.http.get('requests', 0))
+            self._inc('http_retries_total', metrics.http.get('retries', 0))
+            self._inc('http_connections_total', metrics.http.get('connections_reused', 0), state='reused')
+            self._inc('http_connections_total', metrics.http.get('connections_opened', 0), state='opened')
+            self._observe('analysis_duration_seconds|', metrics.total_time or 0.0)
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            seen = set()
+            for key in sorted(self._histograms):
+                name, stage = key.split('|')
+                full_name = f'{self.namespace}_{name}'
+                if full_name not in seen:
+                    lines.append(f'# TYPE {full_name} histogram')
+                    seen.add(full_name)
+                label = f'stage="{stage}",' if stage else ''
+                counts, totals = self._histograms[key]
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    lines.append(f'{full_name}_bucket{{{label}le="{bound}"}} {cumulative}')
+                cumulative += counts[-1]
+                lines.append(f'{full_name}_bucket{{{label}le="+Inf"}} {cumulative}')
+                plain = f'{{{label.rstrip(",")}}}' if label else ''
+                lines.append(f'{full_name}_sum{plain} {totals[0]}')
+                lines.append(f'{full_name}_count{plain} {cumulative}')
+
+            for (name, labels), value in sorted(self._counters.items()):
+                full_name = f'{self.namespace}_{name}'
+                if full_name not in seen:
+                    lines.append(f'# TYPE {full_name} counter')
+                    seen.add(full_name)
+                label_text = ','.join(f'{k}="{v}"' for k, v in labels)
+                lines.append(f'{full_name}{{{label_text}}} {value}' if label_text else f'{full_name} {value}')
+        return '\n'.join(lines) + '\n'
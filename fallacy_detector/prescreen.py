@@ -0,0 +1,191 @@
+"""
+Cheap local pre-screen for fallacy cue phrases.
+
+Straight reporting rarely contains the rhetorical markers fallacies rely on
+("everyone knows", "either ... or", personal attacks). Scoring those cues
+takes microseconds per article and lets the analyzer skip (or downgrade)
+the LLM stages for articles that score below a threshold.
+"""
+
+import re
+import string
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+# Cue patterns per fallacy (names match data/fallacies.csv). Each cue lists
+# the lowercase literals it can start with (each beginning with a whole
+# word), a regex anchored at that start (matched against lowercased text)
+# and a weight. Weak cues (0.5) are common
+# in neutral prose and only count in combination.
+CUE_PATTERNS: Dict[str, List[Tuple[Tuple[str, ...], str, float]]] = {
+    "Adhominem": [
+        (("idiot", "idiots", "moron", "morons", "liar", "liars", "clown", "clowns",
+          "crook", "crooks", "hypocrite", "hypocrites", "fool", "fools"),
+         r"(?:idiots?|morons?|liars?|clowns?|crooks?|hypocrites?|fools?)\b", 1.0),
+        (("out-of-touch", "so-called "),
+         r"out-of-touch\b|so-called (?:experts?|scientists?|leaders?)\b", 1.0),
+        (("never ",), r"never (?:worked|held) a real job\b", 1.0),
+    ],
+    "Adpopulum": [
+        (("everyone knows", "everybody knows"), r"every(?:one|body) knows\b", 1.0),
+        (("most ", "all "), r"(?:most|all) (?:people|americans|voters|citizens) (?:agree|believe|think|know)\b", 1.0),
+        (("millions of ",), r"millions of (?:people|americans|voters) can'?t be wrong\b", 1.0),
+        (("nobody ",), r"nobody (?:believes|thinks|wants)\b", 0.5),
+    ],
+    "Appeal to Emotion": [
+        (("think of the children",), r"think of the children\b", 1.0),
+        (("heartbreaking", "terrifying", "outrageous", "shameful", "disgraceful", "horrifying"),
+         r"(?:heartbreaking|terrifying|outrageous|shameful|disgraceful|horrifying)\b", 0.5),
+        (("nightmare", "catastrophe", "catastrophic"), r"(?:nightmare|catastrophe|catastrophic)\b", 0.5),
+    ],
+    "Fallacy of Extension": [
+        (("slippery slope", "next thing you know", "before long", "before you know it"),
+         r"slippery slope\b|next thing you know\b|before (?:long|you know it)\b", 1.0),
+        (("the end of ",), r"the end of (?:democracy|freedom|civilization|the country)\b", 1.0),
+        (("will inevitably ", "will eventually "), r"will (?:inevitably|eventually) (?:lead|result) (?:to|in)\b", 1.0),
+    ],
+    "Intentional Fallacy": [
+        (("secretly ", "really "), r"(?:secretly|really) (?:wants?|wanted|intends?|meant)\b", 1.0),
+        (("hidden agenda", "true intention", "real motive"), r"(?:hidden agenda|true intentions?|real motive)\b", 1.0),
+    ],
+    "False Causality": [
+        (("must have caused", "clearly caused"), r"(?:must have|clearly) caused\b", 1.0),
+        (("ever since ",), r"ever since\b[^.]{0,80}\b(?:has|have) (?:risen|fallen|increased|decreased|declined)\b", 1.0),
+        (("since ",), r"since\b[^.]{0,100}\bso\b[^.]{0,60}\b(?:must|caused)\b", 1.0),
+    ],
+    "False Dilemma": [
+        (("either ",), r"either\b[^.]{0,120}\bor\b", 1.0),
+        (("only two ", "only one "), r"only (?:two|one) (?:options?|choices?|ways?|paths?)\b", 1.0),
+        (("there is no ", "there's no "), r"there(?: is|'s) no (?:other|middle ground|alternative)\b", 1.0),
+        (("with us or against us", "the only sensible"), r"with us or against us\b|the only sensible\b", 1.0),
+    ],
+    "Hasty Generalization": [
+        (("one ", "a single "),
+         r"(?:one|a single) (?:resident|person|case|example|study|incident)\b[^.]{0,80}\b(?:proves?|shows)\b", 1.0),
+        (("all of them", "all these people", "all those people", "every one of them"),
+         r"(?:all of them|all (?:these|those) people|every one of them)\b", 0.5),
+    ],
+    "Fallacy of Credibility": [
+        (("can't be trusted", "cant be trusted", "cannot be trusted", "has no credibility"),
+         r"(?:can'?t|cannot) be trusted\b|has no credibility\b", 1.0),
+        (("who is ", "who are "), r"who (?:is|are) (?:he|she|they) to\b", 1.0),
+    ],
+    "Circular Reasoning": [
+        (("true because", "right because", "wrong because"),
+         r"(?:true|right|wrong) because (?:it|they) (?:is|are) (?:true|right|wrong)\b", 1.0),
+    ],
+    "Begging the Question": [
+        (("it goes without saying", "undeniable", "undeniably"), r"it goes without saying\b|undeniabl[ey]\b", 1.0),
+        (("obviously", "clearly", "of course"), r"(?:obviously|clearly|of course)\b", 0.5),
+    ],
+    "Trick Question": [
+        (("have you stopped", "when did "), r"have you stopped\b|when did [^.?]{0,40} stop\b", 1.0),
+        (("why do ", "why does ", "why did "), r"why (?:do|does|did) [^.?]{0,60}\b(?:still|continue to)\b[^.]{0,60}\?", 1.0),
+    ],
+    "Overapplying": [
+        (("rules are rules", "the law is the law", "no exceptions", "without exception"),
+         r"rules are rules\b|the law is the law\b|no exceptions\b|without exception\b", 1.0),
+    ],
+    "Composition": [
+        (("each ", "every "),
+         r"(?:each|every) (?:part|member|player|component)\b[^.]{0,80}\b(?:so|therefore) the (?:whole|team|group)\b", 1.0),
+    ],
+    "Division": [
+        (("the team is", "the company is", "the country is", "the group is", "the party is"),
+         r"the (?:team|company|country|group|party) is\b[^.]{0,60}\b(?:so|therefore) (?:each|every)\b", 1.0),
+    ],
+}
+
+
+# Stage outputs for articles cleared without explanation and synthesis
+PRESCREEN_EXPLANATION = "No fallacies to explain."
+PRESCREEN_SYNTHESIS = (
+    "No significant logical fallacies detected. The article showed too few "
+    "rhetorical cues to warrant a full analysis."
+)
+
+# Everything except letters, apostrophes and hyphens separates words
+_WORD_SEPARATORS = str.maketrans({
+    c: ' ' for c in string.punctuation + string.digits if c not in "'-"
+})
+
+
+@dataclass
+class PreScreenResult:
+    """Outcome of pre-screening one article."""
+
+    score: float
+    matches: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {'score': self.score, 'matches': dict(self.matches)}
+
+
+class PreScreener:
+    """Lexical scorer over fallacy cue phrases.
+    
+    The article's vocabulary is built once; only cues whose first word
+    occurs in it are located with ``str.find`` and confirmed with a regex
+    anchored at each hit, so neutral articles cost little more than a split.
+    """
+
+    def __init__(self, patterns: Mapping[str, Sequence[Tuple[Tuple[str, ...], str, float]]] = CUE_PATTERNS):
+        self._cues = [
+            (fallacy, frozenset(t.split()[0] for t in triggers), triggers, re.compile(pattern), weight)
+            for fallacy, cues in patterns.items()
+            for triggers, pattern, weight in cues
+        ]
+
+    def score(self, text: str) -> PreScreenResult:
+        """Score an article; higher means more fallacy cues."""
+        lowered = text.lower()
+        words = set(lowered.translate(_WORD_SEPARATORS).split())
+        total = 0.0
+        matches: Dict[str, int] = {}
+        for fallacy, first_words, triggers, regex, weight in self._cues:
+            if words.isdisjoint(first_words):
+                continue
+            hits = 0
+            for trigger in triggers:
+                index = lowered.find(trigger)
+                while index != -1:
+                    # Cues start at a word boundary
+                    if (index == 0 or not lowered[index - 1].isalnum()) and regex.match(lowered, index):
+                        hits += 1
+                    index = lowered.find(trigger, index + 1)
+            if hits:
+                total += weight * hits
+                matches[fallacy] = matches.get(fallacy, 0) + hits
+        return PreScreenResult(score=total, matches=matches)
+
+
+def evaluate(
+    screener: PreScreener,
+    labeled: Iterable[Tuple[str, bool]],
+    threshold: float
+) -> Dict[str, float]:
+    """Precision/recall of "score >= threshold" against labeled examples."""
+    tp = fp = fn = tn = 0
+    for text, has_fallacy in labeled:
+        flagged = screener.score(text).score >= threshold
+        if flagged and has_fallacy:
+            tp += 1
+        elif flagged:
+            fp += 1
+        elif has_fallacy:
+            fn += 1
+        else:
+            tn += 1
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        'threshold': threshold,
+        'precision': precision,
+        'recall': recall,
+        'f1': f1,
+        'true_positives': tp,
+        'false_positives': fp,
+        'false_negatives': fn,
+        'true_negatives': tn,
+    }
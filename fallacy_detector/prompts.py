@@ -35,10 +35,12 @@ FALLACY DEFINITIONS:
 ANALYSIS:"""
 
 # Missing prompts that analyzer.py needs:
+# The detection prompts keep everything that is the same for every article
+# (instructions and catalog) before {content} so providers can cache the prefix
 FALLACY_DETECTION_PROMPT = """You are an expert in classical logic and Aristotelian fallacies. Analyze this article content for logical fallacies.
 
 AVAILABLE FALLACIES:
-{fallacies_df}
+{fallacy_catalog}
 
 ARTICLE CONTENT:
 {content}
@@ -64,6 +66,49 @@ If no fallacies detected, write: "No significant logical fallacies detected."
 
 ANALYSIS:"""
 
+STRUCTURED_FALLACY_DETECTION_PROMPT = """You are an expert in classical logic and Aristotelian fallacies. Analyze this article content for logical fallacies.
+
+AVAILABLE FALLACIES:
+{fallacy_catalog}
+
+ARTICLE CONTENT:
+{content}
+
+Instructions:
+- Identify logical fallacies present in the text
+- Use the exact fallacy name from the list above
+- Quote the exact text that contains each fallacy, copied verbatim from the article
+- Explain why it constitutes that particular fallacy
+- Rate confidence as one of: Low, Medium, High
+
+Respond with a JSON object only, using this schema:
+{{"fallacies": [{{"fallacy": "<name>", "confidence": "High", "quote": "<exact quote>", "reason": "<explanation>"}}]}}
+
+If no fallacies are detected, respond with {{"fallacies": []}}."""
+
+# Fused pipeline: detection, explanation and synthesis in one JSON response
+FUSED_ANALYSIS_PROMPT = """You are an expert in classical logic and Aristotelian fallacies and an educator helping people develop critical thinking skills. Analyze this article content for logical fallacies, explain them and write a final report.
+
+AVAILABLE FALLACIES:
+{fallacy_catalog}
+
+ARTICLE CONTENT:
+{content}
+
+Instructions:
+- Identify logical fallacies present in the text
+- Use the exact fallacy name from the list above
+- Quote the exact text that contains each fallacy, copied verbatim from the article
+- Explain why it constitutes that particular fallacy
+- Rate confidence as one of: Low, Medium, High
+- In "explanations", for each detected fallacy explain what it is, why it's problematic, how to recognize it and how the argument could be improved
+- In "report", summarize the key findings, explain the educational value and give actionable insights for readers in a balanced, educational tone
+
+Respond with a JSON object only, using this schema:
+{{"fallacies": [{{"fallacy": "<name>", "confidence": "High", "quote": "<exact quote>", "reason": "<explanation>"}}], "explanations": "<markdown>", "report": "<markdown>"}}
+
+If no fallacies are detected, use an empty "fallacies" list and say so in "explanations" and "report"."""
+
 EDUCATIONAL_EXPLANATION_PROMPT = """You are an educator explaining logical fallacies to help people develop critical thinking skills.
 
 DETECTED FALLACIES:
@@ -94,3 +139,28 @@ Create a final report that:
 4. Maintains a balanced, educational tone
 
 FINAL REPORT:"""
+
+# Generic, article-independent material for one fallacy (generated once per fallacy)
+FALLACY_PRIMER_PROMPT = """You are an educator explaining logical fallacies to help people develop critical thinking skills.
+
+FALLACY: {fallacy_name}
+DEFINITION: {fallacy_description}
+
+Provide:
+1. **What it is**: Clear definition
+2. **Why it's problematic**: How it misleads reasoning
+3. **How to recognize it**: Warning signs to watch for
+
+Keep it concise, accessible and educational. Do not refer to any specific article.
+
+EXPLANATION:"""
+
+# Article-specific part of the explanation stage when primers are used
+ARTICLE_IMPROVEMENT_PROMPT = """You are an educator helping readers think critically about a specific article.
+
+DETECTED FALLACIES:
+{detected_fallacies}
+
+For each detected fallacy, explain only the **Better approach**: how the quoted argument could be improved to avoid the fallacy. Be brief and specific to the quoted text.
+
+BETTER APPROACHES:"""
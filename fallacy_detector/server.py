@@ -0,0 +1,410 @@
+"""
+Resident analysis service.
+
+``python -m fallacy_detector serve`` keeps one warm :class:`FallacyAnalyzer`
+(chat models, chains, fallacy table, pooled HTTP client and caches) in
+memory and answers JSON requests over HTTP, so a request pays for the
+pipeline only. Requests become jobs in a bounded queue worked by a fixed
+number of workers on one event loop; when the queue is full, new requests
+get ``503`` with ``Retry-After`` instead of piling up. A request identical
+to one that is still queued or running (same topic and domain, URL or
+text) joins that job instead of running the pipeline a second time.
+
+Endpoints:
+
+- ``POST /analyze`` - run a request and return its result
+- ``POST /jobs`` - queue a request and return the job (``202``)
+- ``GET /jobs/<id>`` - a job's state, with the result once it is done
+- ``GET /health`` - queue depth and job counters
+- ``GET /metrics`` - stage metrics in the Prometheus text format
+- ``GET /stats`` - fallacy counts over the analyzed articles (with
+  ``stats_enabled``), grouped by ``?by=fallacy,domain,day`` and filtered
+  by ``fallacy``, ``domain``, ``since``, ``until`` and ``min_confidence``
+
+A request is ``{"topic": ..., "domain": ...}``, ``{"url": ..., "title": ...}``
+or ``{"text": ..., "metadata": {...}}``.
+"""
+
+import asyncio
+import hashlib
+import itertools
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .metrics import PrometheusExporter
+
+if TYPE_CHECKING:
+    from .analyzer import FallacyAnalyzer
+
+DEFAULT_PORT = 8765
+
+
+class QueueFullError(Exception):
+    """Raised when a request arrives while the job queue is at capacity."""
+
+
+def request_key(request: Dict[str, Any]) -> str:
+    """Validate a request and return the key identical requests share.
+
+    The key covers every field the analysis uses, so requests that differ
+    only in ``domain``, ``title`` or ``metadata`` are not coalesced.
+    """
+    kinds = [kind for kind in ('topic', 'url', 'text') if kind in request]
+    if len(kinds) != 1 or not isinstance(request[kinds[0]], str) or not request[kinds[0]].strip():
+        raise ValueError("Request needs exactly one non-empty 'topic', 'url' or 'text'")
+    for name in ('domain', 'title'):
+        if not isinstance(request.get(name, ''), str):
+            raise ValueError(f"'{name}' must be a string")
+    if not isinstance(request.get('metadata') or {}, dict):
+        raise ValueError("'metadata' must be an object")
+    kind = kinds[0]
+    if kind == 'topic':
+        topic = " ".join(request['topic'].lower().split())
+        return f"topic:{request.get('domain', '').strip().lower()}:{topic}"
+    if kind == 'url':
+        return f"url:{request['url'].strip()}:{request.get('title', '').strip()}"
+    payload = json.dumps([request['text'], request.get('metadata') or {}], sort_keys=True, default=str)
+    digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    return f"text:{digest}"
+
+
+@dataclass
+class Job:
+    """One pipeline execution, shared by every identical request that joins it."""
+
+    id: str
+    key: str
+    request: Dict[str, Any]
+    status: str = "queued"  # "queued", "running" or "done"
+    requests: int = 1  # Requests answered by this job, including coalesced ones
+    submitted_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON view of the job."""
+        data: Dict[str, Any] = {
+            'id': self.id,
+            'status': self.status,
+            'requests': self.requests,
+            'submitted_at': self.submitted_at,
+        }
+        if self.result is not None:
+            data['finished_at'] = self.finished_at
+            data['result'] = self.result
+        return data
+
+
+class AnalysisService:
+    """Job queue, coalescing and workers around one analyzer.
+
+    The analyzer's async pipeline runs on an event loop in a background
+    thread; :meth:`submit` may be called from any thread. At most
+    ``max_queue`` jobs wait for one of the ``workers``; the last
+    ``max_finished`` finished jobs stay available to :meth:`job`.
+    """
+
+    def __init__(
+        self,
+        analyzer: "FallacyAnalyzer",
+        workers: int = 4,
+        max_queue: int = 64,
+        max_finished: int = 1024
+    ):
+        if workers < 1 or max_queue < 1:
+            raise ValueError("workers and max_queue must be at least 1")
+        self.analyzer = analyzer
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_finished = max_finished
+        self.logger = analyzer.logger
+
+        # Stage metrics of every job, served by /metrics
+        self.exporter = next((h for h in analyzer.hooks if isinstance(h, PrometheusExporter)), None)
+        if self.exporter is None:
+            self.exporter = PrometheusExporter()
+            analyzer.hooks.append(self.exporter)
+
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._inflight: Dict[str, Job] = {}
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queued = 0
+        self._running = 0
+        self._stats = {'submitted': 0, 'coalesced': 0, 'rejected': 0, 'completed': 0, 'failed': 0}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> "AnalysisService":
+        """Build the analyzer's chains, then start the event loop thread and its workers."""
+        self.analyzer.llm  # Pay for the LangChain/OpenAI imports now, not on the first request
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, args=(ready,), name="analysis-service", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def _run_loop(self, ready: threading.Event) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        self._tasks = [self._loop.create_task(self._worker()) for _ in range(self.workers)]
+        ready.set()
+        self._loop.run_forever()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Cancel the workers, close the analyzer's async client and stop the loop."""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._loop.close()
+        self._loop = None
+
+    async def _shutdown(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.analyzer.aclose()
+
+    def submit(self, request: Dict[str, Any]) -> Tuple[Job, bool]:
+        """Queue a request, or join the identical one in flight.
+
+        Returns the job and whether the request was coalesced into an
+        existing one. Raises ValueError for malformed requests and
+        :class:`QueueFullError` when the queue is at capacity.
+        """
+        key = request_key(request)
+        with self._lock:
+            job = self._inflight.get(key)
+            if job is not None:
+                job.requests += 1
+                self._stats['coalesced'] += 1
+                return job, True
+            if self._queued >= self.max_queue:
+                self._stats['rejected'] += 1
+                raise QueueFullError(f"{self._queued} jobs queued")
+
+            job = Job(id=f"job-{next(self._ids)}", key=key, request=request)
+            self._inflight[key] = job
+            self._jobs[job.id] = job
+            self._queued += 1
+            self._stats['submitted'] += 1
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, job)
+        return job, False
+
+    def job(self, job_id: str) -> Optional[Job]:
+        """A queued, running or recently finished job."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    async def _analyze(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if 'topic' in request:
+            return await self.analyzer.aanalyze_article(request['topic'], request.get('domain', ''))
+        if 'url' in request:
+            return await self.analyzer.aanalyze_url(request['url'], request.get('title', ''))
+        return await self.analyzer.aanalyze_text(request['text'], request.get('metadata'))
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                job.status = "running"
+            try:
+                result = await self._analyze(job.request)
+            except Exception as e:
+                self.logger.error(f"Job {job.id} failed: {str(e)}")
+                result = {'error': f'Analysis failed: {str(e)}'}
+            with self._lock:
+                self._running -= 1
+                job.result = result
+                job.status = "done"
+                job.finished_at = time.time()
+                del self._inflight[job.key]
+                self._stats['failed' if 'error' in result else 'completed'] += 1
+                self._trim_finished()
+            job.done.set()
+
+    def _trim_finished(self) -> None:
+        """Forget the oldest finished jobs beyond ``max_finished`` (lock held)."""
+        finished = len(self._jobs) - self._queued - self._running
+        for job_id in list(self._jobs):
+            if finished <= self.max_finished:
+                break
+            if self._jobs[job_id].status == "done":
+                del self._jobs[job_id]
+                finished -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, running jobs and job counters."""
+        with self._lock:
+            return dict(
+                self._stats,
+                queued=self._queued,
+                running=self._running,
+                workers=self.workers,
+                max_queue=self.max_queue
+            )
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    """JSON endpoints of :class:`AnalysisServer`."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, so clients reuse connections
+    server_version = "FallacyDetector/1.0"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        self.service.logger.debug("%s - %s", self.address_string(), format % args)
+
+    @property
+    def service(self) -> AnalysisService:
+        return self.server.service  # type: ignore[attr-defined]
+
+    def _send_json(self, payload: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_request(self) -> Dict[str, Any]:
+        length = int(self.headers.get('Content-Length') or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(request, dict):
+            raise ValueError("Request body must be a JSON object")
+        return request
+
+    def do_POST(self) -> None:
+        if self.path not in ("/analyze", "/jobs"):
+            self._send_json({'error': f'Unknown endpoint {self.path}'}, 404)
+            return
+        try:
+            job, coalesced = self.service.submit(self._read_request())
+        except QueueFullError as e:
+            self._send_json({'error': f'Server busy: {e}'}, 503, {'Retry-After': '1'})
+            return
+        except ValueError as e:  # Includes malformed JSON
+            self._send_json({'error': str(e)}, 400)
+            return
+
+        headers = {'X-Job-Id': job.id, 'X-Coalesced': str(int(coalesced))}
+        if self.path == "/jobs" or not job.done.wait(self.server.request_timeout):  # type: ignore[attr-defined]
+            self._send_json(job.to_dict(), 202, headers)
+            return
+        self._send_json(job.result, 200, headers)
+
+    def _send_stats(self, query: str) -> None:
+        stats = self.service.analyzer.fallacy_stats
+        if stats is None:
+            self._send_json({'error': 'Statistics are not enabled (stats_enabled)'}, 404)
+            return
+        params = {name: values[-1] for name, values in parse_qs(query).items()}
+        by = [name for name in params.pop('by', "fallacy").split(",") if name]
+        filters = {name: params.get(name) for name in ("fallacy", "domain", "since", "until")}
+        try:
+            rows = stats.counts(by, min_confidence=params.get('min_confidence'), **filters)
+            histogram = stats.confidence_histogram(**filters)
+            articles = stats.articles(filters['domain'], filters['since'], filters['until'])
+        except ValueError as e:  # Unknown group field or malformed date
+            self._send_json({'error': str(e)}, 400)
+            return
+        self._send_json({'articles': articles, 'confidence': histogram, 'counts': rows})
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if url.path == "/stats":
+            self._send_stats(url.query)
+        elif self.path == "/health":
+            self._send_json({'status': 'ok', **self.service.stats()})
+        elif self.path == "/metrics":
+            body = self.service.exporter.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path.startswith("/jobs/"):
+            job = self.service.job(self.path[len("/jobs/"):])
+            if job is None:
+                self._send_json({'error': 'Unknown job'}, 404)
+            else:
+                self._send_json(job.to_dict())
+        else:
+            self._send_json({'error': f'Unknown endpoint {self.path}'}, 404)
+
+
+class AnalysisServer:
+    """HTTP server exposing an :class:`AnalysisService`.
+
+    Usage::
+
+        with AnalysisServer(FallacyAnalyzer(AnalysisConfig()), port=0) as server:
+            AnalysisClient(server.base_url).analyze(topic="climate policy")
+    """
+
+    def __init__(
+        self,
+        analyzer: "FallacyAnalyzer",
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        workers: int = 4,
+        max_queue: int = 64,
+        request_timeout: float = 300.0
+    ):
+        self.service = AnalysisService(analyzer, workers=workers, max_queue=max_queue)
+        self.httpd = ThreadingHTTPServer((host, port), _ServiceHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.service = self.service  # type: ignore[attr-defined]
+        self.httpd.request_timeout = request_timeout  # type: ignore[attr-defined]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "AnalysisServer":
+        """Serve from a background thread."""
+        self.service.start()
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="analysis-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve from the calling thread until interrupted."""
+        self.service.start()
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """Stop accepting requests, then stop the workers."""
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.httpd.server_close()
+        self.service.stop()
+
+    def __enter__(self) -> "AnalysisServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
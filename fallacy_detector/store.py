@@ -0,0 +1,194 @@
+"""
+Persistent store of finished analyses.
+
+:class:`ResultStore` keeps every successful analysis in a SQLite file,
+keyed by URL, a hash of the cleaned article text, the model and the
+analysis version (prompts, fallacy table and the pipeline settings that
+change results). Before running the LLM stages the analyzer looks the
+article up: the same text under the same model and version is served from
+the store, so a daily sweep of a topic only analyzes articles that are new
+or whose text changed. Stored analyses can be listed by domain and date.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .aggregate import domain_of
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS analyses ("
+    "id INTEGER PRIMARY KEY, url TEXT NOT NULL, domain TEXT NOT NULL, title TEXT NOT NULL, "
+    "content_hash TEXT NOT NULL, model TEXT NOT NULL, prompt_version TEXT NOT NULL, "
+    "analyzed_at REAL NOT NULL, published TEXT, fallacies INTEGER, result TEXT NOT NULL, "
+    "UNIQUE (url, content_hash, model, prompt_version))",
+    "CREATE INDEX IF NOT EXISTS analyses_content ON analyses (content_hash, model, prompt_version)",
+    "CREATE INDEX IF NOT EXISTS analyses_url ON analyses (url, analyzed_at)",
+    "CREATE INDEX IF NOT EXISTS analyses_domain ON analyses (domain, analyzed_at)",
+    "CREATE INDEX IF NOT EXISTS analyses_time ON analyses (analyzed_at)",
+)
+
+# Columns returned by list(); the result JSON is only read by get()
+_SUMMARY_COLUMNS = (
+    "id", "url", "domain", "title", "content_hash", "model", "prompt_version", "analyzed_at", "published", "fallacies"
+)
+
+
+# Unix time, a datetime, a date (UTC) or an ISO string of either
+When = Union[float, str, date, datetime]
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of cleaned article text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _timestamp(value: When, end_of_day: bool = False) -> float:
+    """Unix time of a datetime, date or ISO string; with ``end_of_day`` a date means its end."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        text = value.strip()
+        value = date.fromisoformat(text) if len(text) == 10 else datetime.fromisoformat(text.replace("Z", "+00:00"))
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day, tzinfo=timezone.utc) + timedelta(days=end_of_day)
+    elif value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class ResultStore:
+    """SQLite table of analyses indexed by URL, content hash, model and version."""
+
+    def __init__(self, path: Union[str, Path]):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._counters = {'served': 0, 'stored': 0}
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")  # Readers (results listings) do not block a sweep
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+        self._db.commit()
+
+    def find(self, url: str, text_hash: str, model: str, prompt_version: str) -> Optional[Dict[str, Any]]:
+        """The latest stored result for this text, model and version, preferring the same URL.
+
+        The result carries the title and URL it was stored under and a
+        ``store`` record with its id and analysis time.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, url, analyzed_at, result FROM analyses "
+                "WHERE content_hash = ? AND model = ? AND prompt_version = ? "
+                "ORDER BY url = ? DESC, analyzed_at DESC LIMIT 1",
+                (text_hash, model, prompt_version, url)
+            ).fetchone()
+            if row is None:
+                return None
+            self._counters['served'] += 1
+        entry_id, stored_url, analyzed_at, raw = row
+        result = json.loads(raw)
+        result['store'] = {'id': entry_id, 'url': stored_url, 'analyzed_at': analyzed_at, 'reused': True}
+        return result
+
+    def save(
+        self,
+        result: Dict[str, Any],
+        text_hash: str,
+        model: str,
+        prompt_version: str,
+        published: Optional[str] = None
+    ) -> Optional[int]:
+        """Store a successful result (replacing one for the same key); returns its id."""
+        if 'error' in result:
+            return None
+        result = {key: value for key, value in result.items() if key != 'store'}
+        fallacies = result.get('fallacies')
+        url = result.get('url') or ""
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO analyses (url, domain, title, content_hash, model, prompt_version, "
+                "analyzed_at, published, fallacies, result) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (url, content_hash, model, prompt_version) DO UPDATE SET "
+                "title = excluded.title, analyzed_at = excluded.analyzed_at, "
+                "published = excluded.published, fallacies = excluded.fallacies, result = excluded.result",
+                (
+                    url,
+                    domain_of(url),
+                    result.get('title') or "",
+                    text_hash,
+                    model,
+                    prompt_version,
+                    time.time(),
+                    str(published) if published else None,
+                    len(fallacies) if isinstance(fallacies, list) else None,
+                    json.dumps(result, ensure_ascii=False, default=str)
+                )
+            )
+            (entry_id,) = self._db.execute(
+                "SELECT id FROM analyses WHERE url = ? AND content_hash = ? AND model = ? AND prompt_version = ?",
+                (url, text_hash, model, prompt_version)
+            ).fetchone()
+            self._db.commit()
+            self._counters['stored'] += 1
+        return entry_id
+
+    def get(self, entry_id: int) -> Optional[Dict[str, Any]]:
+        """The full stored result with this id."""
+        with self._lock:
+            row = self._db.execute("SELECT result FROM analyses WHERE id = ?", (entry_id,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def list(
+        self,
+        domain: Optional[str] = None,
+        url: Optional[str] = None,
+        since: Optional[When] = None,
+        until: Optional[When] = None,
+        model: Optional[str] = None,
+        limit: Optional[int] = 100
+    ) -> List[Dict[str, Any]]:
+        """Stored analyses, newest first, without their result text.
+
+        ``since``/``until`` bound the analysis time; a plain date as
+        ``until`` includes that whole day.
+        """
+        conditions, params = [], []
+        for column, value in (("domain", domain), ("url", url), ("model", model)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            conditions.append("analyzed_at >= ?")
+            params.append(_timestamp(since))
+        if until is not None:
+            conditions.append("analyzed_at < ?")
+            params.append(_timestamp(until, end_of_day=True))
+        query = f"SELECT {', '.join(_SUMMARY_COLUMNS)} FROM analyses"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY analyzed_at DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [dict(zip(_SUMMARY_COLUMNS, row)) for row in rows]
+
+    def stats(self) -> Dict[str, int]:
+        """Results served and stored by this process, and rows in the store."""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = self._db.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+            return stats
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,29 @@
+"""
+Stage-tagged events emitted by the streaming analysis API.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+# Pipeline stages, in the order events are emitted
+STAGE_SEARCH = "search"
+STAGE_DETECTION = "detection"
+STAGE_EXPLANATION = "explanation"
+STAGE_SYNTHESIS = "synthesis"
+STAGE_RESULT = "result"
+
+# Event kinds
+EVENT_START = "start"        # data: stage-specific context (query, article, ...)
+EVENT_TOKEN = "token"        # data: text chunk
+EVENT_FALLACY = "fallacy"    # data: DetectedFallacy (structured detection only)
+EVENT_END = "end"            # data: full stage output
+EVENT_ERROR = "error"        # data: error message
+
+
+@dataclass
+class AnalysisEvent:
+    """One event from :meth:`FallacyAnalyzer.stream_analysis`."""
+
+    stage: str
+    kind: str
+    data: Any = None
@@ -0,0 +1,317 @@
+"""
+Pooled, retrying HTTP transport shared by Serper searches and article fetches.
+
+One keep-alive :class:`httpx.Client` (and one :class:`httpx.AsyncClient` per
+event loop) is reused for every request, so repeat calls to the same host
+skip the TCP/TLS handshake. Each request is bounded by connect/read timeouts
+and a per-host concurrency cap. Responses with a retryable status (429/5xx)
+and connection errors are retried with exponential backoff and full jitter,
+honoring ``Retry-After`` when the server sends one.
+
+Connection reuse and retries are counted in :meth:`HttpTransport.stats` and
+recorded into the metrics of the analysis in progress.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterator, Optional, Set
+from urllib.parse import urlsplit
+
+from .metrics import record_http_request
+
+if TYPE_CHECKING:
+    import httpx
+
+    from .config import AnalysisConfig
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` header (delay or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+async def _aclose_quietly(client: "httpx.AsyncClient") -> None:
+    """Close a client whose event loop is already closed.
+
+    The pool is marked closed; sockets whose transports can no longer be
+    shut down through the dead loop are released with the client.
+    """
+    try:
+        await client.aclose()
+    except RuntimeError:
+        pass
+
+
+class HttpTransport:
+    """Shared HTTP client pool with timeouts, per-host caps and retries.
+
+    ``sync_transport``/``async_transport`` replace the network layer of the
+    underlying httpx clients (e.g. ``httpx.MockTransport`` in tests).
+    """
+
+    def __init__(
+        self,
+        timeout: float = 20.0,
+        connect_timeout: float = 5.0,
+        max_connections: int = 40,
+        per_host_concurrency: int = 8,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        headers: Optional[Dict[str, str]] = None,
+        sync_transport: Optional[Any] = None,
+        async_transport: Optional[Any] = None
+    ):
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_connections = max_connections
+        self.per_host_concurrency = per_host_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.headers = dict(headers or {})
+        self._sync_transport = sync_transport
+        self._async_transport = async_transport
+
+        self._lock = threading.Lock()
+        self._client: Optional["httpx.Client"] = None
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+
+        # Async resources are bound to the event loop that first uses them
+        self._aio_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_client: Optional["httpx.AsyncClient"] = None
+        self._async_host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._closing: Set["asyncio.Task[None]"] = set()
+
+        self._stats = {'requests': 0, 'retries': 0, 'connections_opened': 0, 'connections_reused': 0}
+
+    @classmethod
+    def from_config(cls, config: "AnalysisConfig", **kwargs: Any) -> "HttpTransport":
+        """Build a transport from the ``http_*`` settings of a config."""
+        return cls(
+            timeout=config.http_timeout,
+            connect_timeout=config.http_connect_timeout,
+            max_connections=config.search_concurrency + config.fetch_concurrency,
+            per_host_concurrency=config.http_per_host_concurrency,
+            max_retries=config.http_max_retries,
+            backoff_base=config.http_backoff_base,
+            backoff_max=config.http_backoff_max,
+            **kwargs
+        )
+
+    def _client_options(self) -> Dict[str, Any]:
+        import httpx
+
+        return {
+            'headers': self.headers,
+            'follow_redirects': True,
+            'timeout': httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            'limits': httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections
+            ),
+        }
+
+    @property
+    def client(self) -> "httpx.Client":
+        """The shared blocking client, created on first use."""
+        with self._lock:
+            if self._client is None:
+                import httpx
+
+                self._client = httpx.Client(transport=self._sync_transport, **self._client_options())
+            return self._client
+
+    def async_client(self) -> "httpx.AsyncClient":
+        """The shared async client for the running event loop.
+
+        The client of a previous event loop is closed when it is replaced.
+        """
+        loop = asyncio.get_running_loop()
+        if self._aio_loop is not loop:
+            import httpx
+
+            self._close_stale_client(loop)
+            self._aio_loop = loop
+            self._async_host_slots = {}
+            self._async_client = httpx.AsyncClient(transport=self._async_transport, **self._client_options())
+        return self._async_client
+
+    def _close_stale_client(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Schedule closing the async client left by a previous event loop."""
+        client, old_loop = self._async_client, self._aio_loop
+        self._async_client = None
+        if client is None or client.is_closed:
+            return
+        if old_loop.is_running():
+            # Its connections belong to that loop, so they are closed there
+            asyncio.run_coroutine_threadsafe(client.aclose(), old_loop)
+        else:
+            # A stopped loop would never run the coroutine
+            task = loop.create_task(_aclose_quietly(client))
+            self._closing.add(task)  # Keep a reference until the task is done
+            task.add_done_callback(self._closing.discard)
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host_concurrency)
+            return slot
+
+    def _async_host_slot(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        slot = self._async_host_slots.get(host)
+        if slot is None:
+            slot = self._async_host_slots[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return slot
+
+    def _backoff(self, retry: int, response: Optional["httpx.Response"]) -> float:
+        """Delay before retry number ``retry`` (0-based)."""
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** retry))
+
+    def _record(self, retries: int, opened: bool) -> None:
+        with self._lock:
+            self._stats['requests'] += 1
+            self._stats['retries'] += retries
+            self._stats['connections_opened' if opened else 'connections_reused'] += 1
+        record_http_request(retries, reused=not opened)
+
+    def _send(self, method: str, url: str, stream: bool, kwargs: Dict[str, Any]) -> "httpx.Response":
+        """Send with retries; the caller holds the host slot."""
+        import httpx
+
+        client = self.client
+        state = {'opened': False}
+
+        def trace(event: str, info: Dict[str, Any]) -> None:
+            if event == 'connection.connect_tcp.started':
+                state['opened'] = True
+
+        retry = 0
+        while True:
+            response = None
+            try:
+                request = client.build_request(method, url, extensions={'trace': trace}, **kwargs)
+                response = client.send(request, stream=stream)
+                if response.status_code not in RETRY_STATUSES or retry >= self.max_retries:
+                    break
+                response.close()
+            except httpx.TransportError:
+                if retry >= self.max_retries:
+                    self._record(retry, state['opened'])
+                    raise
+            time.sleep(self._backoff(retry, response))
+            retry += 1
+        self._record(retry, state['opened'])
+        return response
+
+    async def _asend(self, method: str, url: str, stream: bool, kwargs: Dict[str, Any]) -> "httpx.Response":
+        """Async version of :meth:`_send`."""
+        import httpx
+
+        client = self.async_client()
+        state = {'opened': False}
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            if event == 'connection.connect_tcp.started':
+                state['opened'] = True
+
+        retry = 0
+        while True:
+            response = None
+            try:
+                request = client.build_request(method, url, extensions={'trace': trace}, **kwargs)
+                response = await client.send(request, stream=stream)
+                if response.status_code not in RETRY_STATUSES or retry >= self.max_retries:
+                    break
+                await response.aclose()
+            except httpx.TransportError:
+                if retry >= self.max_retries:
+                    self._record(retry, state['opened'])
+                    raise
+            await asyncio.sleep(self._backoff(retry, response))
+            retry += 1
+        self._record(retry, state['opened'])
+        return response
+
+    def request(self, method: str, url: str, **kwargs: Any) -> "httpx.Response":
+        """Send a request, retrying 429/5xx responses and connection errors.
+
+        The last response is returned once retries are exhausted; the last
+        error is raised if no attempt produced a response.
+        """
+        with self._host_slot(url):
+            return self._send(method, url, False, kwargs)
+
+    async def arequest(self, method: str, url: str, **kwargs: Any) -> "httpx.Response":
+        """Async version of :meth:`request`."""
+        async with self._async_host_slot(url):
+            return await self._asend(method, url, False, kwargs)
+
+    @contextmanager
+    def stream(self, method: str, url: str, **kwargs: Any) -> Iterator["httpx.Response"]:
+        """Like :meth:`request`, but the body is read by the caller.
+
+        The host slot is held, and the response kept open, until the block exits.
+        """
+        with self._host_slot(url):
+            response = self._send(method, url, True, kwargs)
+            try:
+                yield response
+            finally:
+                response.close()
+
+    @asynccontextmanager
+    async def astream(self, method: str, url: str, **kwargs: Any) -> AsyncIterator["httpx.Response"]:
+        """Async version of :meth:`stream`."""
+        async with self._async_host_slot(url):
+            response = await self._asend(method, url, True, kwargs)
+            try:
+                yield response
+            finally:
+                await response.aclose()
+
+    def stats(self) -> Dict[str, int]:
+        """Requests, retries and connections opened vs reused so far."""
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self) -> None:
+        """Close the blocking client."""
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    async def aclose(self) -> None:
+        """Close the async client of the current event loop."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+        self._async_client = None
+        self._aio_loop = None
@@ -3,11 +3,15 @@ Utility functions for the Fallacy Detector.
 """
 
 import logging
-import pandas as pd
-from pathlib import Path
-from typing import Dict, Any
+import re
+from typing import TYPE_CHECKING, Dict, Any, Iterable, List
 from datetime import datetime
 
+from .catalog import load_catalog
+
+if TYPE_CHECKING:
+    import pandas as pd
+
 def setup_logging() -> logging.Logger:
     """Set up logging configuration."""
     logging.basicConfig(
@@ -16,19 +20,9 @@ def setup_logging() -> logging.Logger:
     )
     return logging.getLogger(__name__)
 
-def load_fallacies_data() -> pd.DataFrame:
-    """Load fallacies data from CSV file."""
-    # Get path relative to this module
-    current_dir = Path(__file__).parent
-    csv_path = current_dir.parent / "data" / "fallacies.csv"
-    
-    try:
-        fallacies_df = pd.read_csv(csv_path)
-        if 'Fallacy' not in fallacies_df.columns or 'Description' not in fallacies_df.columns:
-            raise ValueError("CSV must contain 'Fallacy' and 'Description' columns")
-        return fallacies_df
-    except FileNotFoundError:
-        raise FileNotFoundError(f"Fallacies CSV file not found at {csv_path}")
+def load_fallacies_data() -> "pd.DataFrame":
+    """Load fallacies data from CSV file as a DataFrame (imports pandas)."""
+    return load_catalog().to_dataframe()
 
 def clean_article_text(text: str, char_limit: int = 5000) -> str:
     """Clean and limit article text for processing."""
@@ -49,6 +43,24 @@ def clean_article_text(text: str, char_limit: int = 5000) -> str:
     
     return cleaned_text
 
+def extract_fallacy_names(detected_text: str, fallacy_names: Iterable[str]) -> List[str]:
+    """Return catalog fallacy names mentioned in detection output, in order of appearance."""
+    lookup = {name.lower(): name for name in fallacy_names}
+    
+    # Prefer the bolded headings the detection prompt asks for
+    found = []
+    for heading in re.findall(r'\*\*(.+?)\*\*', detected_text):
+        name = lookup.get(heading.strip().strip('[]').lower())
+        if name and name not in found:
+            found.append(name)
+    if found:
+        return found
+    
+    # Fall back to plain mentions anywhere in the text
+    lowered = detected_text.lower()
+    positions = [(lowered.find(key), name) for key, name in lookup.items() if key in lowered]
+    return [name for _, name in sorted(positions)]
+
 def format_analysis_result(result_data: Dict[str, Any]) -> str:
     """Format analysis results for display."""
     if 'error' in result_data:
@@ -0,0 +1,32 @@
+"""
+Shared test helpers.
+"""
+
+from unittest.mock import patch
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from fallacy_detector.analyzer import FallacyAnalyzer
+from fallacy_detector.config import AnalysisConfig
+
+# One response per stage of the staged pipeline
+STAGE_RESPONSES = ("detected", "explained", "synthesized")
+
+
+def make_analyzer(responses=STAGE_RESPONSES, llm=None, model_factory=None, hooks=None, **config):
+    """An analyzer with test API keys whose model answers ``responses`` in turn.
+
+    ``llm`` replaces the fake model, and ``model_factory(config, model_name)``
+    picks a model per stage instead. The chains are built while the model
+    factory is patched, so ``analyzer.llm`` is the fake model.
+    """
+    config = AnalysisConfig(openai_api_key="test_openai_key", serper_api_key="test_serper_key", **config)
+    if model_factory is None:
+        fake_llm = llm if llm is not None else FakeListChatModel(responses=list(responses))
+        factory = patch('fallacy_detector.analyzer.create_chat_model', return_value=fake_llm)
+    else:
+        factory = patch('fallacy_detector.analyzer.create_chat_model', side_effect=model_factory)
+    with factory:
+        analyzer = FallacyAnalyzer(config, hooks=hooks)
+        analyzer.llm  # Build the chains while the factory is patched
+    return analyzer
@@ -0,0 +1,151 @@
+"""
+Test the running fallacy statistics.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+
+import httpx
+import pandas as pd
+
+from fallacy_detector.aggregate import FallacyStats, day_number, domain_of
+from fallacy_detector.config import AnalysisConfig
+from fallacy_detector.server import AnalysisServer
+from tests.conftest import make_analyzer
+
+QUOTE = "Critics of the plan are out-of-touch elites"
+ARTICLE = f"{QUOTE}, so their objections must be ignored. The council meets again in May."
+
+
+def result(url, *fallacies):
+    records = [{'fallacy': name, 'quote': "q", 'reason': "r", 'confidence': level} for name, level in fallacies]
+    return {'title': "T", 'url': url, 'fallacies': records}
+
+
+class TestFallacyStats(unittest.TestCase):
+    """Test cases for FallacyStats."""
+
+    def setUp(self):
+        self.stats = FallacyStats(flush_size=3)
+        self.stats.add_result(result("https://www.cnn.com/a", ("Ad Hominem", "High"), ("Straw Man", "Low")), "2024-03-01")
+        self.stats.add_result(result("https://cnn.com/b", ("Ad Hominem", "Medium")), date(2024, 3, 2))
+        self.stats.add_result(result("https://bbc.co.uk/c", ("Ad Hominem", "High")), "2024-03-02T08:00:00Z")
+        self.stats.add_result(result("https://bbc.co.uk/d"), "2024-03-03")
+
+    def test_helpers(self):
+        self.assertEqual(domain_of("https://www.cnn.com/x?y=1"), "cnn.com")
+        self.assertEqual(domain_of(""), "")
+        self.assertEqual(day_number("1970-01-02"), 1)
+        self.assertEqual(day_number(datetime(1970, 1, 2, 23, tzinfo=timezone.utc)), 1)
+
+    def test_counts_grouped(self):
+        self.assertEqual(
+            [(row['fallacy'], row['count']) for row in self.stats.counts()],
+            [("Ad Hominem", 3), ("Straw Man", 1)]
+        )
+        by_domain = self.stats.counts(by=("fallacy", "domain"), fallacy="Ad Hominem")
+        self.assertEqual([(r['domain'], r['count']) for r in by_domain], [("cnn.com", 2), ("bbc.co.uk", 1)])
+        self.assertEqual(by_domain[0]['confidence'], {'Low': 0, 'Medium': 1, 'High': 1})
+
+        by_day = self.stats.counts(by=("day",), since="2024-03-02", until="2024-03-02")
+        self.assertEqual(by_day, [{'day': "2024-03-02", 'count': 2, 'confidence': {'Low': 0, 'Medium': 1, 'High': 1}}])
+        self.assertEqual(self.stats.counts(by=(), min_confidence="High")[0]['count'], 2)
+        self.assertEqual(self.stats.counts(domain="example.com"), [])
+        with self.assertRaises(ValueError):
+            self.stats.counts(by=("source",))
+
+    def test_histogram_and_articles(self):
+        self.assertEqual(self.stats.confidence_histogram(), {'Low': 1, 'Medium': 1, 'High': 2})
+        self.assertEqual(self.stats.confidence_histogram(domain="bbc.co.uk"), {'Low': 0, 'Medium': 0, 'High': 1})
+        self.assertEqual(self.stats.articles(), 4)
+        self.assertEqual(self.stats.articles(domain="bbc.co.uk", since="2024-03-03"), 1)
+        self.assertEqual(
+            self.stats.stats(),
+            {'detections': 4, 'articles': 4, 'fallacies': 2, 'domains': 2, 'cells': 4}
+        )
+
+    def test_results_not_counted(self):
+        self.assertFalse(self.stats.add_result({'error': "failed"}))
+        self.assertFalse(self.stats.add_result({'url': "u", 'detected_fallacies': "text mode"}))
+        # An unparseable publication date counts for today
+        self.assertTrue(self.stats.add_result(result("https://cnn.com/e", ("Straw Man", "Low")), "3 days ago"))
+        today = datetime.now(timezone.utc).date().isoformat()
+        self.assertEqual(self.stats.counts(by=("day",), since=today)[0]['count'], 1)
+
+    def test_add_many_matches_add(self):
+        rows = [("Ad Hominem", "cnn.com", 19783, "High"), ("Straw Man", "bbc.co.uk", 19784, "Low")] * 50
+        one_by_one, bulk = FallacyStats(flush_size=7), FallacyStats()
+        for row in rows:
+            one_by_one.add(*row)
+        bulk.add_many(*zip(*rows))
+        by = ("fallacy", "domain", "day")
+        self.assertEqual(one_by_one.counts(by), bulk.counts(by))
+        with self.assertRaises(ValueError):
+            bulk.add_many(["Ad Hominem"], ["cnn.com"], [])
+
+    def test_sparse_days(self):
+        stats = FallacyStats()
+        stats.add_many(["Straw Man"] * 3, ["cnn.com", "bbc.co.uk", "cnn.com"], ["1990-01-01", "2024-01-01", "2024-01-01"])
+        self.assertEqual(
+            [(row['day'], row['count']) for row in stats.counts(by=("day",))],
+            [("2024-01-01", 2), ("1990-01-01", 1)]
+        )
+
+    def test_export(self):
+        frame = self.stats.to_frame()
+        self.assertEqual(list(frame.columns), ['fallacy', 'domain', 'day', 'Low', 'Medium', 'High', 'count'])
+        self.assertEqual(frame['count'].sum(), 4)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = self.stats.export(os.path.join(tmpdir, "stats.csv"))
+            exported = pd.read_csv(path)
+        self.assertEqual(len(exported), 4)
+        self.assertEqual(exported.loc[exported['domain'] == "bbc.co.uk", 'day'].tolist(), ["2024-03-02"])
+
+        with patch.dict('sys.modules', {'pyarrow': None}), self.assertRaises(ImportError):
+            self.stats.export("stats.parquet")
+
+
+class TestAnalyzerStats(unittest.TestCase):
+    """Test statistics collected by the analyzer."""
+
+    def setUp(self):
+        record = {'fallacy': "False Dilemma", 'quote': QUOTE, 'reason': "Dismisses critics.", 'confidence': "High"}
+        self.analyzer = make_analyzer(
+            [json.dumps({'fallacies': [record]}), "explained", "synthesized"] * 2,
+            detection_mode="structured",
+            stats_enabled=True,
+            cache_enabled=False
+        )
+
+    def test_results_counted_with_publication_date(self):
+        self.analyzer.analyze_text(ARTICLE, {'url': "https://www.cnn.com/a", 'date': "2024-05-01"})
+        rows = self.analyzer.fallacy_stats.counts(by=("fallacy", "domain", "day"))
+        self.assertEqual(rows[0], {
+            'fallacy': "False Dilemma", 'domain': "cnn.com", 'day': "2024-05-01", 'count': 1,
+            'confidence': {'Low': 0, 'Medium': 0, 'High': 1}
+        })
+
+    def test_stats_endpoint(self):
+        with AnalysisServer(self.analyzer, port=0) as server:
+            httpx.post(f"{server.base_url}/analyze", json={'text': ARTICLE, 'metadata': {'url': "https://bbc.co.uk/x"}})
+            response = httpx.get(f"{server.base_url}/stats", params={'by': "domain", 'min_confidence': "High"})
+            bad = httpx.get(f"{server.base_url}/stats", params={'since': "yesterday"})
+
+        stats = response.json()
+        self.assertEqual(stats['articles'], 1)
+        self.assertEqual(stats['counts'][0]['domain'], "bbc.co.uk")
+        self.assertEqual(stats['confidence']['High'], 1)
+        self.assertEqual(bad.status_code, 400)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            AnalysisConfig(openai_api_key="k", serper_api_key="k", stats_enabled=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,12 +2,23 @@
 Test the main analyzer functionality.
 """
 
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
+import httpx
 import pandas as pd
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
 
 from fallacy_detector.analyzer import FallacyAnalyzer
+from fallacy_detector.catalog import FallacyCatalog
 from fallacy_detector.config import AnalysisConfig
+from fallacy_detector.transport import HttpTransport
+from tests.conftest import make_analyzer
 
 
 class TestFallacyAnalyzer(unittest.TestCase):
@@ -20,78 +31,318 @@ class TestFallacyAnalyzer(unittest.TestCase):
             serper_api_key="test_serper_key"
         )
     
-    @patch('fallacy_detector.analyzer.load_fallacies_data')
-    @patch('fallacy_detector.analyzer.ChatOpenAI')
-    @patch('fallacy_detector.analyzer.GoogleSerperAPIWrapper')
-    def test_analyzer_initialization(self, mock_serper, mock_openai, mock_load_data):
+    @patch('fallacy_detector.analyzer.load_catalog')
+    @patch('fallacy_detector.analyzer.create_chat_model')
+    def test_analyzer_initialization(self, mock_openai, mock_load_catalog):
         """Test that analyzer initializes correctly."""
         # Mock the fallacies data
-        mock_load_data.return_value = pd.DataFrame({
-            'Fallacy': ['Ad Hominem', 'False Dilemma'],
-            'Description': ['Attack on person', 'Only two options']
-        })
+        mock_load_catalog.return_value = FallacyCatalog([
+            ('Ad Hominem', 'Attack on person'),
+            ('False Dilemma', 'Only two options')
+        ])
+        mock_openai.return_value = FakeListChatModel(responses=["analysis"])
         
         analyzer = FallacyAnalyzer(self.config)
         
         self.assertIsInstance(analyzer, FallacyAnalyzer)
         self.assertEqual(len(analyzer.fallacies_df), 2)
-        mock_openai.assert_called_once()
-        mock_serper.assert_called_once()
+        self.assertIsInstance(analyzer.get_fallacies_info(), pd.DataFrame)
+        
+        # The chat model is only created once an LLM stage needs it
+        mock_openai.assert_not_called()
+        self.assertIs(analyzer.llm, mock_openai.return_value)
+        analyzer.fallacy_detection_chain
+        mock_openai.assert_called_once_with(self.config)
+    
+    @staticmethod
+    def _transport(handler):
+        """Shared transport whose network layer is replaced by ``handler``."""
+        return HttpTransport(sync_transport=httpx.MockTransport(handler))
     
-    @patch('fallacy_detector.analyzer.load_fallacies_data')
-    @patch('fallacy_detector.analyzer.ChatOpenAI')
-    @patch('fallacy_detector.analyzer.GoogleSerperAPIWrapper')
-    def test_load_article_success(self, mock_serper, mock_openai, mock_load_data):
+    @patch('fallacy_detector.analyzer.load_catalog')
+    @patch('fallacy_detector.analyzer.create_chat_model')
+    def test_load_article_success(self, mock_openai, mock_load_catalog):
         """Test successful article loading."""
         # Setup mocks
-        mock_load_data.return_value = pd.DataFrame({
-            'Fallacy': ['Ad Hominem'], 'Description': ['Attack on person']
-        })
-        
-        mock_search_instance = MagicMock()
-        mock_serper.return_value = mock_search_instance
-        mock_search_instance.results.return_value = {
-            'news': [{
-                'link': 'https://example.com/article',
-                'title': 'Test Article'
-            }]
-        }
+        mock_load_catalog.return_value = FallacyCatalog([('Ad Hominem', 'Attack on person')])
+        mock_openai.return_value = FakeListChatModel(responses=["analysis"])
+        requests_seen = []
+        
+        def handler(request):
+            requests_seen.append(request)
+            if request.method == "POST":
+                return httpx.Response(200, json={'organic': [{
+                    'link': 'https://example.com/article',
+                    'title': 'Test Article'
+                }]})
+            return httpx.Response(200, html="<html><body><p>This is test article content.</p></body></html>")
         
         # Create analyzer
         analyzer = FallacyAnalyzer(self.config)
+        analyzer.transport = self._transport(handler)
         
-        # Mock WebBaseLoader
-        with patch('fallacy_detector.analyzer.WebBaseLoader') as mock_loader:
-            mock_content = MagicMock()
-            mock_content.page_content = "This is test article content."
-            mock_loader.return_value.load.return_value = [mock_content]
-            
-            result = analyzer.load_article("test topic", "example.com")
-            
-            self.assertIn('url', result)
-            self.assertIn('title', result)
-            self.assertIn('content', result)
-            self.assertEqual(result['url'], 'https://example.com/article')
-    
-    @patch('fallacy_detector.analyzer.load_fallacies_data')
-    @patch('fallacy_detector.analyzer.ChatOpenAI')
-    @patch('fallacy_detector.analyzer.GoogleSerperAPIWrapper')
-    def test_load_article_no_results(self, mock_serper, mock_openai, mock_load_data):
+        result = analyzer.load_article("test topic", "example.com")
+        
+        self.assertIn('url', result)
+        self.assertIn('title', result)
+        self.assertEqual(result['content'], "This is test article content.")
+        self.assertEqual(result['url'], 'https://example.com/article')
+        self.assertEqual(json.loads(requests_seen[0].content)['q'], 'site:example.com test topic')
+        self.assertEqual(requests_seen[0].headers['X-API-KEY'], 'test_serper_key')
+        self.assertEqual(str(requests_seen[1].url), 'https://example.com/article')
+    
+    @patch('fallacy_detector.analyzer.load_catalog')
+    @patch('fallacy_detector.analyzer.create_chat_model')
+    def test_load_article_no_results(self, mock_openai, mock_load_catalog):
         """Test article loading when no results found."""
         # Setup mocks
-        mock_load_data.return_value = pd.DataFrame({
-            'Fallacy': ['Ad Hominem'], 'Description': ['Attack on person']
-        })
-        
-        mock_search_instance = MagicMock()
-        mock_serper.return_value = mock_search_instance
-        mock_search_instance.results.return_value = {'news': []}
+        mock_load_catalog.return_value = FallacyCatalog([('Ad Hominem', 'Attack on person')])
+        mock_openai.return_value = FakeListChatModel(responses=["analysis"])
         
         analyzer = FallacyAnalyzer(self.config)
+        analyzer.transport = self._transport(lambda request: httpx.Response(200, json={'organic': []}))
         result = analyzer.load_article("test topic", "example.com")
         
         self.assertIn('error', result)
 
 
+class TestAnalyzeArticles(unittest.TestCase):
+    """Test cases for batch analysis over one search."""
+    
+    def setUp(self):
+        """Set up an analyzer backed by a fake chat model."""
+        self.config = AnalysisConfig(
+            openai_api_key="test_openai_key",
+            serper_api_key="test_serper_key",
+            max_workers=3
+        )
+        with patch('fallacy_detector.analyzer.create_chat_model') as mock_openai:
+            mock_openai.return_value = FakeListChatModel(responses=["analysis"])
+            self.analyzer = FallacyAnalyzer(self.config)
+        
+        self.hits = [
+            {'link': f'https://example.com/{i}', 'title': f'Article {i}'}
+            for i in range(1, 6)
+        ]
+    
+    def test_single_search_and_stable_order(self):
+        """All hits come from one search and results keep search-rank order."""
+        # Later hits finish first so completion order differs from rank order
+        def fake_fetch(url, title):
+            time.sleep(0.05 * (6 - int(url.rsplit('/', 1)[1])))
+            return {'url': url, 'title': title, 'content': 'Everyone knows this.'}
+        
+        with patch.object(self.analyzer, 'search_articles', return_value=self.hits) as mock_search, \
+                patch.object(self.analyzer, '_fetch_article', side_effect=fake_fetch):
+            results = self.analyzer.analyze_articles("topic", "example.com", max_articles=5)
+        
+        mock_search.assert_called_once_with("topic", "example.com", num_results=5)
+        self.assertEqual([r['url'] for r in results], [h['link'] for h in self.hits])
+        self.assertEqual([r['rank'] for r in results], [1, 2, 3, 4, 5])
+        for result in results:
+            self.assertNotIn('error', result)
+            self.assertEqual(result['synthesized_result'], 'analysis')
+            self.assertGreater(result['processing_time'], 0)
+    
+    def test_worker_pool_is_bounded(self):
+        """No more than ``max_workers`` articles are processed at once."""
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+        
+        def fake_fetch(url, title):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return {'url': url, 'title': title, 'content': 'text'}
+        
+        with patch.object(self.analyzer, 'search_articles', return_value=self.hits), \
+                patch.object(self.analyzer, '_fetch_article', side_effect=fake_fetch):
+            self.analyzer.analyze_articles("topic", max_articles=5)
+        
+        self.assertEqual(peak[0], 3)
+    
+    def test_failed_article_does_not_abort_batch(self):
+        """A fetch failure is reported per article."""
+        def fake_fetch(url, title):
+            if url.endswith('/2'):
+                raise ConnectionError("boom")
+            return {'url': url, 'title': title, 'content': 'text'}
+        
+        with patch.object(self.analyzer, 'search_articles', return_value=self.hits[:3]), \
+                patch.object(self.analyzer, '_fetch_article', side_effect=fake_fetch):
+            results = self.analyzer.analyze_articles("topic", max_articles=3)
+        
+        self.assertEqual(len(results), 3)
+        self.assertIn('error', results[1])
+        self.assertEqual(results[1]['url'], 'https://example.com/2')
+        self.assertNotIn('error', results[2])
+    
+    def test_no_results(self):
+        """An empty search yields a single error entry."""
+        with patch.object(self.analyzer, 'search_articles', return_value=[]):
+            results = self.analyzer.analyze_articles("topic")
+        
+        self.assertEqual(len(results), 1)
+        self.assertIn('error', results[0])
+
+
+class TestAsyncAnalyzer(unittest.TestCase):
+    """Test cases for the asyncio pipeline."""
+    
+    def setUp(self):
+        """Set up an analyzer with a fake chat model and a mocked HTTP transport."""
+        self.config = AnalysisConfig(
+            openai_api_key="test_openai_key",
+            serper_api_key="test_serper_key",
+            fetch_concurrency=2
+        )
+        with patch('fallacy_detector.analyzer.create_chat_model') as mock_openai:
+            mock_openai.return_value = FakeListChatModel(responses=["analysis"])
+            self.analyzer = FallacyAnalyzer(self.config)
+        
+        self.requests_seen = []
+        self.active_fetches = 0
+        self.peak_fetches = 0
+    
+    async def _handler(self, request):
+        """Serve fake Serper results and article pages."""
+        self.requests_seen.append(request)
+        if request.url.host == "google.serper.dev":
+            query = json.loads(request.content)['q']
+            if 'nothing' in query:
+                return httpx.Response(200, json={'organic': []})
+            return httpx.Response(200, json={'organic': [
+                {'link': f'https://news.example/{i}', 'title': f'{query} {i}'}
+                for i in range(1, 4)
+            ]})
+        
+        self.active_fetches += 1
+        self.peak_fetches = max(self.peak_fetches, self.active_fetches)
+        await asyncio.sleep(0.02)
+        self.active_fetches -= 1
+        return httpx.Response(
+            200, html="<html><body><p>Everyone   knows this.</p></body></html>"
+        )
+    
+    def _run(self, coro_factory):
+        """Run a coroutine with the shared client swapped for a mock transport."""
+        async def runner():
+            self.analyzer.transport = HttpTransport(async_transport=httpx.MockTransport(self._handler))
+            async with self.analyzer:
+                return await coro_factory()
+        return asyncio.run(runner())
+    
+    def test_aload_article(self):
+        """The top hit is fetched and cleaned through the shared client."""
+        result = self._run(lambda: self.analyzer.aload_article("topic", "news.example"))
+        
+        self.assertEqual(result['url'], 'https://news.example/1')
+        self.assertEqual(result['content'], 'Everyone knows this.')
+        search_request = self.requests_seen[0]
+        self.assertEqual(search_request.headers['X-API-KEY'], 'test_serper_key')
+        self.assertEqual(json.loads(search_request.content)['q'], 'site:news.example topic')
+    
+    def test_aanalyze_article(self):
+        """The async pipeline runs all three chains."""
+        result = self._run(lambda: self.analyzer.aanalyze_article("topic"))
+        
+        self.assertNotIn('error', result)
+        self.assertEqual(result['detected_fallacies'], 'analysis')
+        self.assertEqual(result['synthesized_result'], 'analysis')
+    
+    def test_aanalyze_article_no_results(self):
+        """An empty search is reported as an error."""
+        result = self._run(lambda: self.analyzer.aanalyze_article("nothing"))
+        
+        self.assertIn('error', result)
+    
+    def test_aanalyze_many_keeps_order_and_limits_fetches(self):
+        """Results follow input order and fetches respect the semaphore."""
+        topics = [f"topic {i}" for i in range(6)]
+        results = self._run(lambda: self.analyzer.aanalyze_many(topics))
+        
+        self.assertEqual([r['title'] for r in results], [f"{t} 1" for t in topics])
+        self.assertLessEqual(self.peak_fetches, 2)
+    
+    def test_aanalyze_articles(self):
+        """All hits from one search are analyzed in rank order."""
+        results = self._run(lambda: self.analyzer.aanalyze_articles("topic", max_articles=3))
+        
+        self.assertEqual([r['rank'] for r in results], [1, 2, 3])
+        self.assertTrue(all('processing_time' in r for r in results))
+
+
+class RecordingChatModel(FakeListChatModel):
+    """Fake chat model that records prompts and answers by prompt type."""
+    
+    prompts: list = []
+    
+    def _call(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt = messages[-1].content
+        self.prompts.append(prompt)
+        if "AVAILABLE FALLACIES" in prompt:
+            return "1. **False Dilemma** (Confidence: High)\n   - Text: \"either us or them\""
+        if "FALLACY: " in prompt:
+            return "Generic primer"
+        if "BETTER APPROACHES" in prompt:
+            return "Acknowledge other options."
+        return "other"
+
+
+class TestPrimerExplanations(unittest.TestCase):
+    """Test cases for explanation_mode='primer'."""
+    
+    def setUp(self):
+        """Set up an analyzer in primer mode with a recording model."""
+        self.llm = RecordingChatModel(responses=[""], prompts=[])
+        self.analyzer = make_analyzer(llm=self.llm, explanation_mode="primer", cache_enabled=False)
+    
+    def _count(self, marker):
+        return sum(marker in prompt for prompt in self.llm.prompts)
+    
+    def test_primer_generated_once_per_fallacy(self):
+        """Two articles with the same fallacy share one primer call."""
+        for i in range(2):
+            result = self.analyzer._analyze_content({
+                'url': f'https://example.com/{i}', 'title': 'T', 'content': f'Article {i}'
+            })
+        
+        self.assertEqual(self._count("FALLACY: "), 1)
+        self.assertEqual(self._count("BETTER APPROACHES"), 2)
+        self.assertEqual(self._count("EDUCATIONAL EXPLANATION:"), 0)
+        self.assertIn("### False Dilemma\nGeneric primer", result['educational_explanations'])
+        self.assertIn("Acknowledge other options.", result['educational_explanations'])
+    
+    def test_async_primer_mode(self):
+        """The async pipeline composes primers the same way."""
+        result = asyncio.run(self.analyzer._aanalyze_content({
+            'url': 'https://example.com', 'title': 'T', 'content': 'Article'
+        }))
+        
+        self.assertIn("### False Dilemma\nGeneric primer", result['educational_explanations'])
+    
+    def test_primers_round_trip(self):
+        """Saved primers are reused without any LLM call."""
+        self.analyzer.get_primer("False Dilemma")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "primers.json")
+            self.analyzer.save_primers(path)
+            
+            reloaded = make_analyzer(llm=self.llm, explanation_mode="primer", primers_path=path)
+        
+        self.assertEqual(reloaded.primers, {"False Dilemma": "Generic primer"})
+    
+    def test_falls_back_to_full_explanation(self):
+        """Without recognizable fallacy names the full chain is used."""
+        explanation = self.analyzer._explain("No significant logical fallacies detected.")
+        
+        self.assertEqual(explanation, "other")
+        self.assertEqual(self._count("EDUCATIONAL EXPLANATION:"), 1)
+
+
 if __name__ == '__main__':
     unittest.main()
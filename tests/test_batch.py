@@ -0,0 +1,203 @@
+"""
+Test batch-API execution against the local stand-in.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from benchmarks.stubs import ARTICLE_SENTENCES, StubConfig, StubServer
+from fallacy_detector.__main__ import main
+from fallacy_detector.analyzer import FallacyAnalyzer
+from fallacy_detector.batch import BatchClient, BatchRunner
+from fallacy_detector.cache import ResultCache
+from fallacy_detector.corpus import CorpusDocument, load_checkpoint
+from tests.conftest import make_analyzer
+
+FAST = StubConfig(llm_latency=0.0, tokens_per_second=100000, batch_polls=2)
+
+DOCUMENTS = [
+    CorpusDocument(id=str(i), text=" ".join(ARTICLE_SENTENCES[i:i + 4]), metadata={'title': f"Doc {i}"})
+    for i in range(3)
+]
+
+
+class FailingBatchClient:
+    """In-memory batch client whose requests all fail."""
+
+    def __init__(self):
+        self.lines = []
+
+    def upload(self, lines):
+        self.lines = list(lines)
+        return "file-in"
+
+    def create(self, input_file_id):
+        return {'id': "batch-1", 'status': 'validating'}
+
+    def retrieve(self, batch_id):
+        return {'id': batch_id, 'status': 'completed', 'output_file_id': "file-out"}
+
+    def download(self, file_id):
+        return [
+            {'custom_id': line['custom_id'], 'response': {'status_code': 429, 'body': {'error': 'rate limited'}}}
+            for line in self.lines
+        ]
+
+
+class TestBatchRunner(unittest.TestCase):
+    """Test cases for BatchRunner."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.stubs = StubServer(FAST).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stubs.stop()
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.tmpdir.name, "job.json")
+        self.stubs.requests.clear()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _analyzer(self, **config):
+        return FallacyAnalyzer(self.stubs.analysis_config(**config))
+
+    def test_stages_run_as_batches(self):
+        """Each stage is one batch round and results match an interactive run."""
+        runner = BatchRunner(self._analyzer(), self.state_path, poll_interval=0.0)
+        results = runner.run(DOCUMENTS)
+
+        self.assertEqual(self.stubs.requests.get('chat'), None)
+        self.assertEqual(runner.stats['rounds'], 3)
+        self.assertEqual(runner.stats['requests'], 9)
+        self.assertGreater(runner.stats['prompt_tokens'], 0)
+        self.assertEqual([r['id'] for r in results], ["0", "1", "2"])
+
+        interactive = self._analyzer().analyze_text(DOCUMENTS[0].text, DOCUMENTS[0].metadata)
+        for key in ('detected_fallacies', 'educational_explanations', 'synthesized_result', 'title'):
+            self.assertEqual(results[0][key], interactive[key])
+
+    def test_more_outputs_than_cache_entries(self):
+        """Outputs evicted from a small cache are not deferred and submitted again."""
+        documents = [
+            CorpusDocument(id=str(i), text=" ".join(ARTICLE_SENTENCES[i:i + 3]), metadata={'title': f"Doc {i}"})
+            for i in range(6)
+        ]
+        analyzer = FallacyAnalyzer(self.stubs.analysis_config(), cache=ResultCache(max_entries=4))
+        runner = BatchRunner(analyzer, self.state_path, poll_interval=0.0)
+        with patch.object(BatchClient, 'upload', autospec=True, side_effect=BatchClient.upload) as upload:
+            results = runner.run(documents)
+
+        submitted = [line['custom_id'] for call in upload.call_args_list for line in call.args[1]]
+        self.assertEqual(len(submitted), 18)
+        self.assertEqual(len(set(submitted)), 18)
+        self.assertEqual(runner.stats['rounds'], 3)
+        self.assertTrue(all('error' not in r for r in results))
+        self.assertIs(analyzer.cache, runner.outputs.cache)
+
+    def test_analyzer_left_untouched(self):
+        """Collected outputs reach the pipeline without swapping the shared analyzer's cache."""
+        analyzer = self._analyzer()
+        cache = analyzer.cache
+        seen = []
+        analyze_text = analyzer.analyze_text
+
+        def spy(*args, **kwargs):
+            seen.append(analyzer.cache)
+            return analyze_text(*args, **kwargs)
+
+        with patch.object(analyzer, 'analyze_text', side_effect=spy):
+            results = BatchRunner(analyzer, self.state_path, poll_interval=0.0).run(DOCUMENTS[:1])
+        self.assertTrue(seen)
+        self.assertTrue(all(c is cache for c in seen))
+        self.assertNotIn('error', results[0])
+
+    def test_fused_and_structured_modes(self):
+        runner = BatchRunner(self._analyzer(pipeline_mode="fused"), self.state_path, poll_interval=0.0)
+        results = runner.run(DOCUMENTS[:1])
+
+        self.assertEqual(runner.stats['rounds'], 1)
+        self.assertIn('**Adpopulum**', results[0]['detected_fallacies'])
+
+        stubs_state = os.path.join(self.tmpdir.name, "structured.json")
+        runner = BatchRunner(self._analyzer(detection_mode="structured"), stubs_state, poll_interval=0.0)
+        self.assertEqual(runner.run(DOCUMENTS[:1])[0]['fallacies'][0]['fallacy'], 'Adpopulum')
+
+    def test_resume_collects_submitted_batches(self):
+        """A run interrupted while polling resumes without resubmitting."""
+        runner = BatchRunner(self._analyzer(), self.state_path, poll_interval=0.0)
+        with patch.object(BatchClient, 'retrieve', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                runner.run(DOCUMENTS)
+        with open(self.state_path, encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)['batches']), 1)
+
+        # A new process: fresh analyzer and in-memory cache, same state file
+        resumed = BatchRunner(self._analyzer(), self.state_path, poll_interval=0.0)
+        results = resumed.run(DOCUMENTS)
+
+        self.assertTrue(all('error' not in r for r in results))
+        self.assertEqual(self.stubs.requests['batches'], 3)
+        self.assertEqual(resumed.stats['rounds'], 2)
+
+    def test_rerun_skips_collected_batches(self):
+        """Collected batches are neither polled nor counted again while their outputs are cached."""
+        cache_path = os.path.join(self.tmpdir.name, "cache.sqlite")
+        analyzer = self._analyzer(cache_enabled=True, cache_path=cache_path)
+        BatchRunner(analyzer, self.state_path, poll_interval=0.0).run(DOCUMENTS)
+        polls = self.stubs.requests['batch_status']
+
+        analyzer = self._analyzer(cache_enabled=True, cache_path=cache_path)
+        rerun = BatchRunner(analyzer, self.state_path, poll_interval=0.0)
+        results = rerun.run(DOCUMENTS)
+        self.assertTrue(all('error' not in r for r in results))
+        self.assertEqual(self.stubs.requests['batch_status'], polls)
+        self.assertEqual((rerun.stats['rounds'], rerun.stats['prompt_tokens'], rerun.stats['cost']), (0, 0, 0.0))
+
+        # Without the cache the outputs are downloaded again, still not counted
+        rerun = BatchRunner(self._analyzer(), self.state_path, poll_interval=0.0)
+        self.assertTrue(all('error' not in r for r in rerun.run(DOCUMENTS)))
+        self.assertGreater(self.stubs.requests['batch_status'], polls)
+        self.assertEqual((rerun.stats['batches'], rerun.stats['prompt_tokens']), (0, 0))
+
+    def test_failed_requests_become_errors(self):
+        """Failed batch requests fail their documents instead of calling the LLM live."""
+        analyzer = make_analyzer(["unused"])
+
+        runner = BatchRunner(analyzer, self.state_path, client=FailingBatchClient(), poll_interval=0.0)
+        with patch.object(FakeListChatModel, '_call', side_effect=AssertionError("LLM called")):
+            results = runner.run(DOCUMENTS[:2])
+
+        self.assertTrue(all('Batch request failed' in r['error'] for r in results))
+        self.assertEqual(runner.stats['failed_requests'], 2)
+
+    def test_cli_batch_mode(self):
+        corpus = os.path.join(self.tmpdir.name, "corpus.jsonl")
+        output = os.path.join(self.tmpdir.name, "results.jsonl")
+        with open(corpus, 'w', encoding='utf-8') as f:
+            for document in DOCUMENTS:
+                f.write(json.dumps({'id': document.id, 'text': document.text}) + "\n")
+
+        env = {
+            'OPENAI_API_KEY': 'stub-openai-key',
+            'SERPER_API_KEY': 'stub-serper-key',
+            'OPENAI_BASE_URL': self.stubs.openai_base_url,
+        }
+        with patch.dict(os.environ, env), patch('builtins.print'):
+            main(["corpus", corpus, "--output", output, "--batch-state", self.state_path, "--poll-interval", "0"])
+
+        self.assertEqual(load_checkpoint(output), {"0", "1", "2"})
+        self.assertIsNone(self.stubs.requests.get('chat'))
+
+
+if __name__ == '__main__':
+    unittest.main()
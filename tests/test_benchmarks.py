@@ -0,0 +1,74 @@
+"""
+Smoke test the offline benchmark stand-ins against the real pipeline.
+"""
+
+import asyncio
+import unittest
+
+from benchmarks.run import compare, percentile
+from benchmarks.stubs import StubConfig, StubServer
+from fallacy_detector.analyzer import FallacyAnalyzer
+
+FAST = StubConfig(llm_latency=0.0, tokens_per_second=100000, search_latency=0.0, fetch_latency=0.0)
+
+
+class TestStubServer(unittest.TestCase):
+    """End-to-end runs over HTTP against the local stand-ins."""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.stubs = StubServer(FAST).start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.stubs.stop()
+    
+    def test_analyze_article_end_to_end(self):
+        """Search, fetch and all three chat calls go through the stubs."""
+        analyzer = FallacyAnalyzer(self.stubs.analysis_config())
+        result = analyzer.analyze_article("city budget")
+        
+        self.assertNotIn('error', result)
+        self.assertIn('**Adpopulum**', result['detected_fallacies'])
+        self.assertTrue(result['url'].startswith(self.stubs.base_url))
+        self.assertGreater(result['token_usage']['detection']['prompt_tokens'], 0)
+    
+    def test_search_and_fetch_reuse_connections(self):
+        """A second analysis goes over the pooled keep-alive connection."""
+        analyzer = FallacyAnalyzer(self.stubs.analysis_config())
+        analyzer.analyze_article("city budget")
+        result = analyzer.analyze_article("city budget")
+        analyzer.close()
+        
+        self.assertEqual(result['http']['requests'], 2)
+        self.assertEqual(result['http']['connections_reused'], 2)
+        self.assertEqual(result['http'].get('retries'), 0)
+    
+    def test_streaming_and_structured_async(self):
+        """SSE streaming and JSON-mode detection work against the stub."""
+        analyzer = FallacyAnalyzer(self.stubs.analysis_config(detection_mode="structured"))
+        
+        async def run():
+            async with analyzer:
+                return await analyzer.aanalyze_article("city budget")
+        
+        result = asyncio.run(run())
+        self.assertEqual([f['fallacy'] for f in result['fallacies']], ['Adpopulum', 'False Dilemma'])
+        self.assertIsNotNone(result['fallacies'][0]['start'])
+
+
+class TestReportHelpers(unittest.TestCase):
+    """Test cases for report helpers."""
+    
+    def test_percentile(self):
+        self.assertEqual(percentile([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], 95), 10)
+        self.assertEqual(percentile([3, 1, 2], 50), 2)
+    
+    def test_compare(self):
+        table = compare({'latency': {'p50': 2.0}}, {'latency': {'p50': 1.0}})
+        self.assertIn('latency.p50', table)
+        self.assertIn('-50.0%', table)
+
+
+if __name__ == '__main__':
+    unittest.main()
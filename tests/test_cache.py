@@ -0,0 +1,213 @@
+"""
+Test the LLM stage result cache and the search/page cache.
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+import httpx
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from fallacy_detector.cache import CachedPage, FetchCache, ResultCache, make_cache_key
+from fallacy_detector.metrics import track_analysis
+from fallacy_detector.transport import HttpTransport
+from tests.conftest import make_analyzer
+
+PAGE = "<html><body><article><p>Everyone knows this is true.</p></article></body></html>"
+
+
+class TestResultCache(unittest.TestCase):
+    """Test cases for the ResultCache class."""
+    
+    def setUp(self):
+        """Create a temporary directory for the SQLite tier."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "cache.sqlite")
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def test_key_is_stable_and_content_addressed(self):
+        """Equal parts give equal keys; any change gives a new key."""
+        key = make_cache_key("gpt", 0.0, "template", "v1", {"content": "text"})
+        self.assertEqual(key, make_cache_key("gpt", 0.0, "template", "v1", {"content": "text"}))
+        self.assertNotEqual(key, make_cache_key("gpt", 0.0, "template", "v1", {"content": "other"}))
+        self.assertNotEqual(key, make_cache_key("gpt", 0.7, "template", "v1", {"content": "text"}))
+    
+    def test_hit_and_miss_counters(self):
+        """Lookups are counted as hits or misses."""
+        cache = ResultCache()
+        self.assertIsNone(cache.get("a"))
+        cache.set("a", "value")
+        self.assertEqual(cache.get("a"), "value")
+        
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+    
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted at the size cap."""
+        cache = ResultCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "1")
+        self.assertEqual(cache.stats()['evictions'], 1)
+    
+    def test_ttl_expiry(self):
+        """Entries older than the TTL are treated as misses."""
+        cache = ResultCache(path=self.db_path, ttl=10)
+        with patch('fallacy_detector.cache.time.time', return_value=1000.0):
+            cache.set("a", "1")
+        with patch('fallacy_detector.cache.time.time', return_value=1011.0):
+            self.assertIsNone(cache.get("a"))
+        cache.close()
+    
+    def test_disk_tier_persists(self):
+        """Values survive a new cache instance on the same file."""
+        cache = ResultCache(path=self.db_path)
+        cache.set("a", "1")
+        cache.close()
+        
+        reopened = ResultCache(path=self.db_path)
+        self.assertEqual(reopened.get("a"), "1")
+        self.assertEqual(reopened.stats()['disk_hits'], 1)
+        reopened.close()
+    
+    def test_disk_size_cap(self):
+        """The disk tier is trimmed to its entry cap."""
+        cache = ResultCache(path=self.db_path, max_entries=1, max_disk_entries=2)
+        for key in "abc":
+            cache.set(key, key)
+        
+        self.assertEqual(cache.stats()['disk_entries'], 2)
+        cache.close()
+
+
+class TestAnalyzerCaching(unittest.TestCase):
+    """Test that repeat analyses are served from the cache."""
+    
+    def test_repeat_analysis_skips_llm(self):
+        """The second run over the same article makes no LLM calls."""
+        analyzer = make_analyzer()
+        
+        article = {'url': 'https://example.com', 'title': 'T', 'content': 'Everyone knows this.'}
+        first = analyzer._analyze_content(article)
+        with patch.object(FakeListChatModel, '_call', side_effect=AssertionError("LLM called")):
+            second = analyzer._analyze_content(article)
+        
+        self.assertEqual(first, second)
+        self.assertEqual(second['synthesized_result'], 'synthesized')
+        self.assertEqual(analyzer.cache.stats()['hits'], 3)
+    
+    def test_cache_can_be_disabled(self):
+        """No cache is built when caching is turned off."""
+        analyzer = make_analyzer(cache_enabled=False)
+        
+        self.assertIsNone(analyzer.cache)
+
+
+class TestFetchCache(unittest.TestCase):
+    """Test cases for the FetchCache class."""
+    
+    def test_search_ttl(self):
+        cache = FetchCache(ResultCache(), search_ttl=60)
+        hits = [{'link': 'https://news.example/a', 'title': 'A'}]
+        cache.set_search("endpoint", "topic", 5, hits)
+        
+        self.assertEqual(cache.get_search("endpoint", "topic", 5), hits)
+        self.assertIsNone(cache.get_search("endpoint", "site:bbc.com topic", 5))
+        with patch('fallacy_detector.cache.time.time', return_value=time.time() + 61):
+            self.assertIsNone(cache.get_search("endpoint", "topic", 5))
+        self.assertEqual(cache.stats()['search_hits'], 1)
+    
+    def test_page_validators(self):
+        page = CachedPage(text="x", etag='"v1"', last_modified="Wed, 01 Jan 2025 00:00:00 GMT")
+        self.assertEqual(page.validators(), {
+            'If-None-Match': '"v1"',
+            'If-Modified-Since': "Wed, 01 Jan 2025 00:00:00 GMT",
+        })
+        self.assertEqual(CachedPage(text="x").validators(), {})
+    
+    def test_pages_persist_on_disk(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "fetch.sqlite")
+            first = FetchCache(ResultCache(path=path))
+            first.set_page("https://news.example/a", 5000, CachedPage(text="Body", etag='"v1"'))
+            first.store.close()
+            
+            second = FetchCache(ResultCache(path=path))
+            page = second.get_page("https://news.example/a", 5000)
+            second.store.close()
+        
+        self.assertEqual((page.text, page.etag), ("Body", '"v1"'))
+        self.assertTrue(FetchCache(ResultCache()).is_fresh(page))
+
+
+class TestAnalyzerFetchCache(unittest.TestCase):
+    """Test that repeat searches and fetches skip the network."""
+    
+    def setUp(self):
+        self.requests = []
+        self.page_status = 200
+        self.analyzer = make_analyzer()
+        mock = httpx.MockTransport(self._handler)
+        self.analyzer.transport = HttpTransport(sync_transport=mock, async_transport=mock)
+    
+    def _handler(self, request):
+        self.requests.append(request)
+        if request.method == "POST":
+            return httpx.Response(200, json={'organic': [{'link': 'https://news.example/a', 'title': 'A'}]})
+        if self.page_status == 304:
+            return httpx.Response(304, headers={'ETag': '"v1"'})
+        return httpx.Response(200, html=PAGE, headers={'ETag': '"v1"'})
+    
+    def test_repeat_load_makes_no_requests(self):
+        first = self.analyzer.load_article("topic")
+        with track_analysis() as metrics:
+            second = self.analyzer.load_article("topic")
+        
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.requests), 2)
+        cached = {m.stage for m in metrics.stages if m.cached}
+        self.assertEqual(cached, {'search', 'fetch'})
+        self.assertEqual(metrics.to_dict()['http'], {})
+    
+    def test_stale_page_is_revalidated(self):
+        """After page_cache_ttl the page is fetched conditionally and a 304 reuses it."""
+        first = self.analyzer.load_article("topic")
+        self.page_status = 304
+        with patch('fallacy_detector.cache.time.time', return_value=time.time() + 3601):
+            second = self.analyzer.load_article("topic")
+        
+        self.assertEqual(first['content'], second['content'])
+        self.assertEqual([r.method for r in self.requests], ["POST", "GET", "POST", "GET"])
+        self.assertEqual(self.requests[-1].headers['If-None-Match'], '"v1"')
+        self.assertEqual(self.analyzer.fetch_cache.stats()['page_revalidated'], 1)
+    
+    def test_changed_page_is_replaced(self):
+        self.analyzer.load_article("topic")
+        self.analyzer.fetch_cache.page_ttl = 0
+        self.analyzer.load_article("topic")
+        
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual(self.analyzer.fetch_cache.stats()['page_revalidated'], 0)
+    
+    def test_async_repeat_load_makes_no_requests(self):
+        async def run():
+            async with self.analyzer:
+                await self.analyzer.aload_article("topic")
+                return await self.analyzer.aload_article("topic")
+        
+        self.assertNotIn('error', asyncio.run(run()))
+        self.assertEqual(len(self.requests), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
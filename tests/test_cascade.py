@@ -0,0 +1,187 @@
+"""
+Test per-stage models and the screening-model cascade.
+"""
+
+import asyncio
+import unittest
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from benchmarks.cascade import bench_cascade
+from benchmarks.stubs import StubConfig, StubServer
+from fallacy_detector.cascade import ModelCascade
+from fallacy_detector.config import AnalysisConfig
+from fallacy_detector.detection import Confidence, DetectedFallacy
+from tests.conftest import make_analyzer
+
+CLEAN = "Officials said the budget would be reviewed in the spring."
+CUES = ("Everyone knows the plan works. Either we pass it today or the city collapses. "
+        "Critics are out-of-touch elites, so their objections can be ignored.")
+
+
+def detection_text(confidence):
+    return (f"FALLACY ANALYSIS:\n1. **Adpopulum** (Confidence: {confidence})\n"
+            f"   - Text: \"{CLEAN}\"\n   - Reason: Appeals to popularity.")
+
+
+def found(confidence):
+    return DetectedFallacy(fallacy="Adpopulum", quote="", reason="", confidence=Confidence(confidence))
+
+
+class RecordingHook:
+    """Metrics hook keeping every stage measurement."""
+
+    def __init__(self):
+        self.stages = []
+
+    def on_stage(self, metrics):
+        self.stages.append(metrics)
+
+    def on_analysis(self, metrics):
+        pass
+
+
+class TestModelCascade(unittest.TestCase):
+    """Test cases for the escalation policy."""
+
+    def test_escalates_at_min_confidence(self):
+        cascade = ModelCascade("gpt-4.1-nano", min_confidence="Medium")
+        self.assertEqual(cascade.escalation_reason([found("High")], CLEAN), "confidence")
+        self.assertEqual(cascade.escalation_reason([found("Medium")], CLEAN), "confidence")
+        self.assertIsNone(cascade.escalation_reason([found("Low")], CLEAN))
+        self.assertIsNone(ModelCascade("m", min_confidence="High").escalation_reason([found("Medium")], CLEAN))
+
+    def test_clean_answer_doubted_on_strong_cues(self):
+        cascade = ModelCascade("gpt-4.1-nano", cue_score=2.0)
+        self.assertEqual(cascade.escalation_reason([], CUES), "cues")
+        self.assertIsNone(cascade.escalation_reason([], CLEAN))
+
+    def test_stats(self):
+        cascade = ModelCascade("gpt-4.1-nano")
+        cascade.record([], [], None)
+        cascade.record([found("High")], [found("High")], "confidence")
+        cascade.record([], [found("High")], "cues")
+
+        stats = cascade.stats()
+        self.assertEqual((stats['screened'], stats['escalated'], stats['agreed']), (3, 2, 1))
+        self.assertEqual((stats['confidence'], stats['cues']), (1, 1))
+        self.assertAlmostEqual(stats['escalation_rate'], 2 / 3)
+        self.assertEqual(stats['agreement'], 0.5)
+
+
+class TestCascadeConfig(unittest.TestCase):
+    """Test cases for the model configuration."""
+
+    def _config(self, **config):
+        return AnalysisConfig(openai_api_key="k", serper_api_key="k", **config)
+
+    def test_stage_model(self):
+        config = self._config(model_name="gpt-4.1-nano", stage_models={'synthesis': "gpt-4.1"})
+        self.assertEqual(config.stage_model("synthesis"), "gpt-4.1")
+        self.assertEqual(config.stage_model("detection"), "gpt-4.1-nano")
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            self._config(stage_models={'summary': "gpt-4.1"})
+        with self.assertRaises(ValueError):
+            self._config(cascade_model="gpt-4.1-nano", cascade_min_confidence="Certain")
+        with self.assertRaises(ValueError):
+            self._config(cascade_model="gpt-4.1-nano", pipeline_mode="fused")
+
+
+class TestAnalyzerCascade(unittest.TestCase):
+    """Test the cascade and per-stage models in the pipeline."""
+
+    def _analyzer(self, screening, strong=(), **config):
+        self.models = {
+            "gpt-4.1": FakeListChatModel(responses=[*strong, "explained", "synthesized"]),
+            "gpt-4.1-nano": FakeListChatModel(responses=screening),
+        }
+        self.hook = RecordingHook()
+
+        def create_chat_model(config, model_name=""):
+            return self.models[model_name or config.model_name]
+
+        return make_analyzer(
+            model_factory=create_chat_model,
+            hooks=[self.hook],
+            model_name="gpt-4.1",
+            cascade_model="gpt-4.1-nano",
+            **config
+        )
+
+    def _detection_models(self):
+        return [m.model_name for m in self.hook.stages if m.stage == "detection"]
+
+    def test_clean_screening_result_stands(self):
+        analyzer = self._analyzer(["No significant logical fallacies detected."])
+        result = analyzer.analyze_text(CLEAN)
+
+        self.assertEqual(result['cascade'], {'screening_model': "gpt-4.1-nano", 'escalated': False, 'reasons': []})
+        self.assertEqual(self._detection_models(), ["gpt-4.1-nano"])
+        self.assertEqual(result['synthesized_result'], "synthesized")
+
+    def test_confident_finding_escalates(self):
+        analyzer = self._analyzer([detection_text("Medium")], strong=[detection_text("High")])
+        result = analyzer.analyze_text(CLEAN)
+
+        self.assertEqual(result['cascade']['reasons'], ["confidence"])
+        self.assertIn("(Confidence: High)", result['detected_fallacies'])
+        self.assertEqual(self._detection_models(), ["gpt-4.1-nano", "gpt-4.1"])
+        self.assertEqual(analyzer.cascade.stats()['agreement'], 1.0)
+
+    def test_low_confidence_finding_stands(self):
+        analyzer = self._analyzer([detection_text("Low")])
+        result = analyzer.analyze_text(CLEAN)
+
+        self.assertFalse(result['cascade']['escalated'])
+        self.assertIn("(Confidence: Low)", result['detected_fallacies'])
+
+    def test_cue_disagreement_escalates_async(self):
+        analyzer = self._analyzer(["No significant logical fallacies detected."], strong=[detection_text("High")])
+        result = asyncio.run(analyzer.aanalyze_text(CUES))
+
+        self.assertEqual(result['cascade']['reasons'], ["cues"])
+        self.assertEqual(analyzer.cascade.stats()['agreement'], 0.0)
+
+    def test_stage_models_and_cache_keys(self):
+        analyzer = self._analyzer(
+            ["No significant logical fallacies detected.", "explained"],
+            stage_models={'explanation': "gpt-4.1-nano"}
+        )
+        analyzer.analyze_text(CLEAN)
+
+        models = {m.stage: m.model_name for m in self.hook.stages if not m.cached}
+        self.assertEqual(models['explanation'], "gpt-4.1-nano")
+        self.assertEqual(models['synthesis'], "gpt-4.1")
+
+        inputs = {'content': CLEAN, 'fallacy_catalog': analyzer.fallacy_catalog}
+        self.assertNotEqual(
+            analyzer._stage_cache_key(analyzer.fallacy_detection_chain, inputs),
+            analyzer._stage_cache_key(analyzer.screening_detection_chain, inputs)
+        )
+
+
+class TestCascadeBenchmark(unittest.TestCase):
+    """Smoke test for the fixture benchmark."""
+
+    def test_reports_every_configuration(self):
+        labeled = [(CUES, True), (CLEAN, False)]
+        stub_config = StubConfig(
+            llm_latency=0.0,
+            tokens_per_second=100000,
+            labels=dict(labeled),
+            model_error_rates={"gpt-4.1-nano": 0.0},
+        )
+        with StubServer(stub_config) as stubs:
+            report = bench_cascade(stubs.analysis_config, labeled, "gpt-4.1", "gpt-4.1-nano")
+
+        self.assertEqual(set(report), {'strong', 'screening', 'cascade_high', 'cascade_medium', 'cascade_low'})
+        self.assertEqual(report['strong']['precision'], 1.0)
+        self.assertLess(report['screening']['cost_usd'], report['strong']['cost_usd'])
+        self.assertEqual(report['cascade_low']['cascade']['screened'], 2)
+        self.assertEqual(report['cascade_low']['detection_calls'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
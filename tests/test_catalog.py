@@ -0,0 +1,77 @@
+"""
+Test the compact fallacy catalog and per-job fallacy subsets.
+"""
+
+import unittest
+
+from fallacy_detector.catalog import FallacyCatalog, load_catalog, render_catalog, resolve_fallacy_subset
+from tests.conftest import make_analyzer
+
+NAMES = ["Adhominem", "Adpopulum", "False Dilemma"]
+
+
+class TestCatalog(unittest.TestCase):
+    """Test cases for catalog helpers."""
+
+    def test_render_catalog(self):
+        """One unpadded line per fallacy."""
+        text = render_catalog([("Adhominem", "Attacks the  person."), ("Adpopulum", "Popularity.")])
+        self.assertEqual(text, "Adhominem: Attacks the person.\nAdpopulum: Popularity.")
+
+    def test_resolve_subset_uses_catalog_spelling_and_order(self):
+        self.assertEqual(resolve_fallacy_subset(["false dilemma", "Ad Hominem"], NAMES),
+                         ["Adhominem", "False Dilemma"])
+
+    def test_resolve_subset_rejects_unknown(self):
+        with self.assertRaises(ValueError):
+            resolve_fallacy_subset(["Red Herring"], NAMES)
+
+    def test_load_catalog_matches_pandas(self):
+        """The stdlib loader reads the same rows and hashes like the DataFrame CSV."""
+        catalog = load_catalog()
+        df = catalog.to_dataframe()
+
+        self.assertIsInstance(catalog, FallacyCatalog)
+        self.assertEqual(list(catalog.names), list(df['Fallacy']))
+        self.assertEqual(catalog.to_csv(), df.to_csv(index=False))
+        self.assertEqual(catalog.get("Adhominem").name, "Adhominem")
+        self.assertIsNone(catalog.get("Red Herring"))
+
+    def test_catalog_subset(self):
+        catalog = FallacyCatalog([(name, "d") for name in NAMES])
+        self.assertEqual(catalog.subset(["adhominem"]).names, ("Adhominem",))
+
+
+class TestAnalyzerCatalog(unittest.TestCase):
+    """Test cases for the catalog used by the analyzer."""
+
+    def _analyzer(self, **overrides):
+        return make_analyzer(**overrides)
+
+    def test_prompt_uses_compact_catalog(self):
+        """The detection prompt carries the rendered catalog, not a padded table."""
+        analyzer = self._analyzer()
+        prompt = analyzer.fallacy_detection_chain.prompt.format(
+            fallacy_catalog=analyzer.fallacy_catalog, content="Article"
+        )
+        self.assertIn("\nAdhominem: Attacks on the character", prompt)
+        self.assertNotIn("   ", analyzer.fallacy_catalog)
+        self.assertLess(len(analyzer.fallacy_catalog), len(analyzer.fallacies_df.to_string()))
+
+    def test_fallacy_subset(self):
+        """A subset shrinks the catalog and the names detections can match."""
+        analyzer = self._analyzer(fallacy_subset=["False Dilemma", "adpopulum"])
+
+        self.assertEqual(list(analyzer.fallacies_df['Fallacy']), ["Adpopulum", "False Dilemma"])
+        self.assertEqual(len(analyzer.fallacy_catalog.splitlines()), 2)
+        self.assertEqual(analyzer._build_detections([{'fallacy': 'Adhominem', 'quote': 'x'}], "x"), [])
+
+    def test_subset_changes_cache_version(self):
+        """Results cached for the full catalog are not reused for a subset."""
+        full = self._analyzer()
+        subset = self._analyzer(fallacy_subset=["Adhominem"])
+        self.assertNotEqual(full.fallacies_version, subset.fallacies_version)
+
+
+if __name__ == '__main__':
+    unittest.main()
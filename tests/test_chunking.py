@@ -0,0 +1,145 @@
+"""
+Test chunked detection for long articles.
+"""
+
+import asyncio
+import re
+import time
+import unittest
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from fallacy_detector.chunking import TextChunk, merge_detections, split_into_chunks
+from fallacy_detector.detection import Confidence, DetectedFallacy
+from tests.conftest import make_analyzer
+
+FALLACY_SENTENCE = "Everyone knows the plan is the only sensible path."
+
+
+def long_article(sentences: int = 60) -> str:
+    body = [f"Officials reviewed item {i} of the budget in detail." for i in range(sentences)]
+    body[sentences // 2] = FALLACY_SENTENCE
+    return " ".join(body)
+
+
+class SlowDetectionModel(FakeListChatModel):
+    """Fake model that takes a fixed time and flags the fallacy sentence if present."""
+
+    delay: float = 0.0
+    contents: list = []
+
+    def _call(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.delay)
+        prompt = messages[-1].content
+        content = re.search(r'ARTICLE CONTENT:\n(.*?)\n\n', prompt, re.DOTALL).group(1)
+        self.contents.append(content)
+        if FALLACY_SENTENCE in content:
+            return f'1. **Adpopulum** (Confidence: High)\n   - Text: "{FALLACY_SENTENCE}"\n   - Reason: Popularity.'
+        return "No significant logical fallacies detected."
+
+
+class TestSplitIntoChunks(unittest.TestCase):
+    """Test cases for split_into_chunks."""
+
+    def test_short_text_is_one_chunk(self):
+        self.assertEqual(split_into_chunks("One. Two.", 100, 10), [TextChunk("One. Two.", 0)])
+
+    def test_chunks_cover_text_on_sentence_boundaries(self):
+        """Chunks are exact slices, fit the limit, overlap and end at sentences."""
+        text = long_article()
+        chunks = split_into_chunks(text, 500, 100)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(chunks[0].start, 0)
+        self.assertEqual(chunks[-1].end, len(text))
+        for previous, chunk in zip(chunks, chunks[1:]):
+            self.assertLess(chunk.start, previous.end)  # Overlap
+            self.assertTrue(previous.text.rstrip().endswith('.'))
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk.text), 500)
+            self.assertEqual(text[chunk.start:chunk.end], chunk.text)
+
+    def test_long_sentence_is_cut(self):
+        """A sentence longer than a chunk still makes progress."""
+        chunks = split_into_chunks("x" * 250, 100, 20)
+        self.assertEqual("".join(c.text for c in chunks), "x" * 250)
+
+
+class TestMergeDetections(unittest.TestCase):
+    """Test cases for merge_detections."""
+
+    def test_overlapping_duplicates_are_merged(self):
+        """The same finding from two chunks is kept once, with the higher confidence."""
+        low = DetectedFallacy("Adpopulum", "Everyone knows", "r", Confidence.LOW, 10, 24)
+        high = DetectedFallacy("Adpopulum", "Everyone knows", "r", Confidence.HIGH, 0, 14)
+        other = DetectedFallacy("False Dilemma", "Either", "r", Confidence.MEDIUM, 2, 8)
+
+        merged = merge_detections([
+            (TextChunk("a" * 50, 0), [low]),
+            (TextChunk("a" * 50, 10), [high, other]),
+        ])
+
+        self.assertEqual([(d.fallacy, d.start, d.confidence) for d in merged], [
+            ("Adpopulum", 10, Confidence.HIGH),
+            ("False Dilemma", 12, Confidence.MEDIUM),
+        ])
+
+
+class TestChunkedAnalyzer(unittest.TestCase):
+    """Test cases for long_article_mode='chunk'."""
+
+    def _analyzer(self, delay=0.0, **overrides):
+        self.llm = SlowDetectionModel(responses=[""], delay=delay, contents=[])
+        return make_analyzer(
+            llm=self.llm,
+            long_article_mode="chunk",
+            article_char_limit=600,
+            chunk_overlap=120,
+            cache_enabled=False,
+            **overrides
+        )
+
+    def test_detection_finds_fallacy_beyond_char_limit(self):
+        """Findings past the old truncation point are detected once, at article offsets."""
+        analyzer = self._analyzer()
+        content = long_article()
+        detections = analyzer._detect_chunks(analyzer._chunks(content))
+
+        self.assertEqual(len(detections), 1)
+        self.assertGreater(detections[0].start, 600)
+        self.assertEqual(content[detections[0].start:detections[0].end], FALLACY_SENTENCE.rstrip("."))
+
+    def test_chunks_run_in_parallel(self):
+        """Detection latency stays close to one chunk's latency."""
+        analyzer = self._analyzer(delay=0.3, max_workers=16)
+        chunks = analyzer._chunks(long_article())
+
+        start = time.perf_counter()
+        result = analyzer._detect(long_article())
+        elapsed = time.perf_counter() - start
+
+        self.assertGreater(len(chunks), 3)
+        self.assertEqual(len(self.llm.contents), len(chunks))
+        self.assertLess(elapsed, 0.3 * 2)
+        self.assertIn("**Adpopulum**", result['detected_fallacies'])
+
+    def test_async_detection(self):
+        """The async pipeline chunks the same way."""
+        analyzer = self._analyzer()
+        result = asyncio.run(analyzer._adetect(long_article()))
+        self.assertIn("**Adpopulum**", result['detected_fallacies'])
+
+    def test_synthesis_gets_article_lead(self):
+        """Synthesis sees at most article_char_limit characters."""
+        analyzer = self._analyzer()
+        self.assertLessEqual(len(analyzer._synthesis_text(long_article())), 603)
+
+    def test_truncate_mode_is_unchanged(self):
+        """The default mode never chunks."""
+        analyzer = self._analyzer()
+        analyzer.config.long_article_mode = "truncate"
+        self.assertEqual(len(analyzer._chunks(long_article())), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Test token-budget condensation and the offset map back to the article.
+"""
+
+import json
+import sys
+import unittest
+from unittest.mock import patch
+
+from fallacy_detector.condense import Condenser, TokenCounter
+from fallacy_detector.config import AnalysisConfig
+from fallacy_detector.streaming import EVENT_FALLACY, STAGE_RESULT
+from tests.conftest import make_analyzer
+
+ARGUMENT = "Critics of the plan are out-of-touch elites, so their objections must be ignored."
+DILEMMA = "Either the council approves the plan this week or the city will collapse into chaos."
+ARTICLE = " ".join([
+    "By Jane Smith and Tom Lee.",
+    "Photo: Getty Images.",
+    "The council met on Tuesday in the old town hall.",
+    ARGUMENT,
+    "Subscribe to our newsletter for daily updates.",
+    "The meeting lasted three hours and was streamed online.",
+    DILEMMA,
+    "Subscribe to our newsletter for daily updates.",
+    "Several residents attended and some left early.",
+])
+
+
+def approximate():
+    """A token counter that never loads tiktoken."""
+    with patch.dict(sys.modules, {'tiktoken': None}):
+        counter = TokenCounter()
+        counter.count("")
+    return counter
+
+
+class TestCondenser(unittest.TestCase):
+    """Test cases for the sentence ranking."""
+
+    def setUp(self):
+        self.counter = approximate()
+
+    def test_fallback_counter(self):
+        self.assertEqual(self.counter.name, "approximate")
+        self.assertEqual(self.counter.count("Everyone knows, right?"), 5)
+        self.assertEqual(self.counter.count_many(["a b", "c"]), [2, 1])
+
+    def test_text_within_budget_unchanged(self):
+        condensed = Condenser(1000, self.counter).condense(ARTICLE)
+        self.assertEqual(condensed.text, ARTICLE)
+        self.assertEqual(condensed.stats()['tokens_saved'], 0)
+        self.assertEqual(condensed.to_original(10, 20), (10, 20))
+
+    def test_keeps_argumentative_sentences_in_order(self):
+        condenser = Condenser(40, self.counter)
+        condensed = condenser.condense(ARTICLE)
+
+        self.assertEqual(condensed.text, f"{ARGUMENT} {DILEMMA}")
+        self.assertLessEqual(condensed.tokens, 40)
+        stats = condensed.stats()
+        self.assertEqual((stats['sentences'], stats['dropped_sentences']), (9, 7))
+        self.assertEqual(stats['tokens_saved'], stats['original_tokens'] - stats['tokens'])
+        self.assertLess(condenser.score("Photo: Getty Images."), 0)
+
+    def test_offsets_map_back(self):
+        condensed = Condenser(40, self.counter).condense(ARTICLE)
+        for quote in (ARGUMENT, DILEMMA, "out-of-touch elites", "ignored. Either the council"):
+            start = condensed.text.find(quote)
+            original_start, original_end = condensed.to_original(start, start + len(quote))
+            if quote.startswith("ignored"):  # Spans the gap left by dropped sentences
+                self.assertEqual(ARTICLE[original_start:original_start + 8], "ignored.")
+                self.assertTrue(ARTICLE[:original_end].endswith("Either the council"))
+            else:
+                self.assertEqual(ARTICLE[original_start:original_end], quote)
+        self.assertEqual(condensed.to_original(None, None), (None, None))
+
+    def test_nothing_fits(self):
+        condensed = Condenser(3, self.counter).condense(ARTICLE)
+        self.assertEqual(condensed.text, ARGUMENT)
+
+
+class TestAnalyzerCondensation(unittest.TestCase):
+    """Test condensation in the pipeline."""
+
+    def setUp(self):
+        record = {'fallacy': "False Dilemma", 'quote': DILEMMA, 'reason': "Two options.", 'confidence': "High"}
+        self.analyzer = make_analyzer(
+            [json.dumps({'fallacies': [record]}), "explained", "synthesized"],
+            detection_mode="structured",
+            condense_tokens=40
+        )
+        self.analyzer.condenser.counter = approximate()
+
+    def test_offsets_point_into_the_article(self):
+        result = self.analyzer.analyze_text(ARTICLE)
+
+        finding = result['fallacies'][0]
+        # Quotes are matched without their final period
+        self.assertEqual(ARTICLE[finding['start']:finding['end']], DILEMMA.rstrip("."))
+        self.assertEqual(result['condensed']['dropped_sentences'], 7)
+        self.assertGreater(result['condensed']['tokens_saved'], 0)
+        self.assertIn("condense", result['timings'])
+
+    def test_streamed_offsets_point_into_the_article(self):
+        article = {'url': 'u', 'title': 't', 'content': ARTICLE}
+        events = list(self.analyzer.stream_content(article))
+
+        finding = next(e.data for e in events if e.kind == EVENT_FALLACY)
+        self.assertEqual(ARTICLE[finding.start:finding.end], DILEMMA.rstrip("."))
+        result = events[-1].data
+        self.assertEqual(events[-1].stage, STAGE_RESULT)
+        self.assertEqual(result['fallacies'][0]['start'], finding.start)
+        self.assertIn('condensed', result)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            AnalysisConfig(openai_api_key="k", serper_api_key="k", condense_tokens=-1)
+
+
+if __name__ == '__main__':
+    unittest.main()
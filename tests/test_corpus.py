@@ -0,0 +1,144 @@
+"""
+Test bulk analysis of local corpora.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from fallacy_detector.__main__ import main
+from fallacy_detector.corpus import CorpusDocument, analyze_corpus, iter_corpus, load_checkpoint
+from tests.conftest import make_analyzer
+
+
+def read_jsonl(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+class TestAnalyzeText(unittest.TestCase):
+    """Test cases for FallacyAnalyzer.analyze_text."""
+
+    def test_text_skips_search_and_fetch(self):
+        analyzer = make_analyzer()
+        with patch.object(analyzer, 'search_articles', side_effect=AssertionError("searched")):
+            result = analyzer.analyze_text("Everyone knows this.", {'title': 'T', 'source': 'archive'})
+
+        self.assertEqual(result['synthesized_result'], 'synthesized')
+        self.assertEqual(result['title'], 'T')
+        self.assertEqual(result['metadata'], {'title': 'T', 'source': 'archive'})
+        self.assertIn('processing_time', result)
+
+    def test_empty_text_is_an_error(self):
+        self.assertIn('No text to analyze', make_analyzer().analyze_text("   ")['error'])
+
+
+class TestCorpusReaders(unittest.TestCase):
+    """Test cases for the corpus readers."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def test_jsonl(self):
+        path = self._write("corpus.jsonl", '{"id": 7, "text": "One.", "url": "u"}\n\n{"text": "Two."}\n')
+        documents = list(iter_corpus(path))
+
+        self.assertEqual([d.id for d in documents], ["7", "corpus.jsonl:3"])
+        self.assertEqual(documents[0].metadata, {'url': 'u'})
+
+    def test_csv_with_custom_fields(self):
+        path = self._write("corpus.csv", 'key,body,title\na,"First, body.",T\n')
+        documents = list(iter_corpus(path, text_field="body", id_field="key"))
+
+        self.assertEqual(documents, [CorpusDocument(id="a", text="First, body.", metadata={'title': 'T'})])
+
+    def test_directory(self):
+        self._write("b/page.html", "<html><body><nav><p>Menu</p></nav><p>Body text.</p></body></html>")
+        self._write("a.txt", "Plain text.")
+        self._write("notes.pdf", "skipped")
+        documents = list(iter_corpus(self.root))
+
+        self.assertEqual([(d.id, d.text) for d in documents], [("a.txt", "Plain text."), ("b/page.html", "Body text.")])
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            iter_corpus(self._write("corpus.xml", "<x/>"))
+
+
+class TestAnalyzeCorpus(unittest.TestCase):
+    """Test cases for analyze_corpus."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmpdir.name, "out", "results.jsonl")
+        self.documents = [CorpusDocument(id=str(i), text=f"Article number {i}.") for i in range(5)]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_writes_one_line_per_document(self):
+        stats = analyze_corpus(make_analyzer(), self.documents, self.output, concurrency=2)
+
+        self.assertEqual(stats, {'analyzed': 5, 'failed': 0, 'skipped': 0})
+        records = read_jsonl(self.output)
+        self.assertEqual(sorted(r['id'] for r in records), ["0", "1", "2", "3", "4"])
+        self.assertTrue(all('error' not in r and r['synthesized_result'] for r in records))
+
+    def test_resume_after_crash(self):
+        """Done documents are skipped, a torn last line is dropped and failures rerun."""
+        os.makedirs(os.path.dirname(self.output))
+        with open(self.output, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'id': "0", 'synthesized_result': 'old'}) + "\n")
+            f.write(json.dumps({'id': "1", 'error': 'Analysis failed: rate limited'}) + "\n")
+            f.write('{"id": "2", "synthes')
+        self.assertEqual(load_checkpoint(self.output), {"0"})
+
+        stats = analyze_corpus(make_analyzer(), self.documents, self.output)
+
+        self.assertEqual(stats, {'analyzed': 4, 'failed': 0, 'skipped': 1})
+        self.assertEqual(load_checkpoint(self.output), {"0", "1", "2", "3", "4"})
+        self.assertEqual(len(read_jsonl(self.output)), 6)
+
+    def test_worker_failure_is_raised(self):
+        """A worker that dies surfaces its error instead of blocking the producer on a full queue."""
+        analyzer = make_analyzer()
+        with patch.object(analyzer, 'aanalyze_text', side_effect=OSError("disk full")):
+            with self.assertRaisesRegex(OSError, "disk full"):
+                analyze_corpus(analyzer, self.documents * 10, self.output, concurrency=1)
+
+    def test_no_resume_overwrites(self):
+        analyze_corpus(make_analyzer(), self.documents[:2], self.output)
+        stats = analyze_corpus(make_analyzer(), self.documents[:2], self.output, resume=False)
+
+        self.assertEqual(stats['analyzed'], 2)
+        self.assertEqual(len(read_jsonl(self.output)), 2)
+
+    def test_cli(self):
+        corpus = os.path.join(self.tmpdir.name, "corpus.jsonl")
+        with open(corpus, 'w', encoding='utf-8') as f:
+            for document in self.documents[:3]:
+                f.write(json.dumps({'id': document.id, 'text': document.text}) + "\n")
+
+        env = {'OPENAI_API_KEY': 'test_openai_key', 'SERPER_API_KEY': 'test_serper_key'}
+        with patch.dict(os.environ, env), patch('builtins.print'), \
+                patch('fallacy_detector.__main__.FallacyAnalyzer', return_value=make_analyzer()):
+            main(["corpus", corpus, "--output", self.output, "--concurrency", "2"])
+
+        self.assertEqual(load_checkpoint(self.output), {"0", "1", "2"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Test the process pool for loading, cleaning and signing texts.
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from fallacy_detector import cpu_pool
+from fallacy_detector.config import AnalysisConfig
+from fallacy_detector.corpus import aanalyze_corpus, iter_corpus
+from fallacy_detector.dedup import NearDuplicateIndex
+from tests.conftest import make_analyzer
+
+BODY = " ".join(f"Sentence number {i} says the council    approved the plan." for i in range(40))
+PAGE = f"<html><body><nav><p>Menu</p></nav><article><p>{BODY}</p></article><script>x()</script></body></html>"
+
+
+class TestPrepareText(unittest.TestCase):
+    """Test cases for the worker function."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "page.html")
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(PAGE)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        cpu_pool._worker_index = None
+
+    def test_reads_and_cleans_source(self):
+        content, signature = cpu_pool.prepare_text("", self.path, 200)
+        self.assertTrue(content.startswith("Sentence number 0 says the council approved"))
+        self.assertNotIn("Menu", content)
+        self.assertLessEqual(len(content), 203)
+        self.assertIsNone(signature)
+
+    def test_signature_matches_parent_index(self):
+        index = NearDuplicateIndex(seed=7)
+        pool = cpu_pool.CpuPool(1, 5000, index)
+        cpu_pool._init_worker(pool._dedup_params)
+
+        content, signature = cpu_pool.prepare_text(BODY, "", 5000)
+        self.assertEqual(content, " ".join(BODY.split()))
+        self.assertTrue((signature == index.signature(content)).all())
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            cpu_pool.CpuPool(0, 5000)
+        with self.assertRaises(ValueError):
+            AnalysisConfig(openai_api_key="k", serper_api_key="k", cpu_workers=-1)
+
+
+class TestCpuPoolCorpus(unittest.TestCase):
+    """Test corpus runs with worker processes."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmpdir.name, "corpus")
+        os.makedirs(self.root)
+        pages = {"a.html": PAGE, "b.html": PAGE.replace("Menu", "Other menu"), "c.txt": "Unrelated plain text."}
+        for name, content in pages.items():
+            with open(os.path.join(self.root, name), 'w', encoding='utf-8') as f:
+                f.write(content)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_lazy_documents(self):
+        documents = list(iter_corpus(self.root, load=False))
+        self.assertEqual([(d.id, d.text) for d in documents], [("a.html", ""), ("b.html", ""), ("c.txt", "")])
+        self.assertEqual(documents[2].source, os.path.join(self.root, "c.txt"))
+
+        # Without a pool the source is read in the calling thread
+        result = make_analyzer().analyze_text("", documents[2].metadata, documents[2].source)
+        self.assertEqual(result['synthesized_result'], "synthesized")
+
+    def test_workers_prepare_documents(self):
+        analyzer = make_analyzer(cpu_workers=2, dedup_enabled=True)
+        output = os.path.join(self.tmpdir.name, "results.jsonl")
+
+        async def run():
+            async with analyzer:
+                return await aanalyze_corpus(analyzer, iter_corpus(self.root, load=False), output, concurrency=1)
+
+        with patch('fallacy_detector.analyzer.clean_article_text', side_effect=AssertionError("cleaned here")):
+            stats = asyncio.run(run())
+
+        self.assertEqual(stats, {'analyzed': 3, 'failed': 0, 'skipped': 0})
+        self.assertIsNone(analyzer.cpu_pool._executor)  # Stopped by aclose()
+        # b.html differs from a.html only in boilerplate, so its signature matches
+        self.assertEqual(analyzer.dedup.stats()['duplicates'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
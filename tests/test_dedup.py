@@ -0,0 +1,151 @@
+"""
+Test near-duplicate detection.
+"""
+
+import json
+import random
+import unittest
+from unittest.mock import patch
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from fallacy_detector.config import AnalysisConfig
+from fallacy_detector.dedup import NearDuplicateIndex, shingles
+from tests.conftest import STAGE_RESPONSES, make_analyzer
+
+WORDS = ("council budget plan critics officials report residents policy city "
+         "program crime decline spring review decision analysts noise project").split()
+
+
+def article(seed, length=400):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+
+def syndicated(text):
+    """A wire copy: new byline, one sentence rewritten, the last words trimmed."""
+    words = text.split()
+    words[150:158] = "a spokesperson declined to comment on the matter".split()
+    return "By Staff Reporter, Associated Press. " + " ".join(words[:-10])
+
+
+class TestNearDuplicateIndex(unittest.TestCase):
+    """Test cases for NearDuplicateIndex."""
+
+    def test_shingles(self):
+        self.assertEqual(shingles("One two, THREE four", size=3), ["one two three", "two three four"])
+        self.assertEqual(shingles("Short text", size=5), ["short text"])
+        self.assertEqual(shingles("", size=5), [])
+
+    def test_finds_syndicated_copy(self):
+        index = NearDuplicateIndex()
+        for seed in range(50):
+            index.add(index.signature(article(seed)), seed)
+
+        value, similarity = index.query(index.signature(syndicated(article(7))))
+
+        self.assertEqual(value, 7)
+        self.assertGreaterEqual(similarity, 0.85)
+
+    def test_different_articles_do_not_match(self):
+        index = NearDuplicateIndex()
+        index.add(index.signature(article(1)), 1)
+        self.assertIsNone(index.query(index.signature(article(2))))
+
+    def test_text_without_shingles_has_no_signature(self):
+        self.assertIsNone(NearDuplicateIndex().signature("-- ... --"))
+
+    def test_eviction_and_stats(self):
+        index = NearDuplicateIndex(max_entries=2)
+        for seed in range(3):
+            index.add(index.signature(article(seed)), seed, llm_calls=3)
+
+        self.assertIsNone(index.query(index.signature(article(0))))
+        self.assertIsNotNone(index.query(index.signature(article(2))))
+        self.assertEqual(index.stats(), {'lookups': 2, 'duplicates': 1, 'llm_calls_saved': 3, 'entries': 2})
+
+
+class TestAnalyzerDedup(unittest.TestCase):
+    """Test that near-duplicates reuse an earlier analysis."""
+
+    def _analyzer(self, **config):
+        return make_analyzer(cache_enabled=False, **config)
+
+    def test_near_duplicate_reuses_analysis(self):
+        analyzer = self._analyzer(dedup_enabled=True)
+        original = article(3)
+        analyzer.analyze_text(original, {'title': 'Wire', 'url': 'https://a.example/wire'})
+
+        with patch.object(FakeListChatModel, '_call', side_effect=AssertionError("LLM called")):
+            result = analyzer.analyze_text(syndicated(original), {'title': 'Copy', 'url': 'https://b.example/copy'})
+
+        self.assertEqual(result['synthesized_result'], 'synthesized')
+        self.assertEqual(result['url'], 'https://b.example/copy')
+        self.assertEqual(result['near_duplicate']['url'], 'https://a.example/wire')
+        self.assertEqual(result['near_duplicate']['llm_calls_saved'], 3)
+        self.assertIn('dedup', result['timings'])
+        self.assertEqual(analyzer.dedup.stats()['llm_calls_saved'], 3)
+
+    def test_offsets_resolved_in_the_duplicate(self):
+        original = article(3)
+        kept, rewritten = " ".join(original.split()[20:28]), " ".join(original.split()[150:158])
+        records = [
+            {'fallacy': "False Dilemma", 'quote': kept, 'reason': "r", 'confidence': "High"},
+            {'fallacy': "Hasty Generalization", 'quote': rewritten, 'reason': "r", 'confidence': "Low"},
+        ]
+        analyzer = self._analyzer(
+            responses=[json.dumps({'fallacies': records}), "explained", "synthesized"],
+            dedup_enabled=True,
+            detection_mode="structured"
+        )
+        first = analyzer.analyze_text(original)
+        copy = syndicated(original)
+        second = analyzer.analyze_text(copy)
+
+        self.assertIn('near_duplicate', second)
+        shifted, missing = second['fallacies']
+        self.assertEqual(copy[shifted['start']:shifted['end']], kept)
+        self.assertGreater(shifted['start'], first['fallacies'][0]['start'])
+        self.assertEqual((missing['start'], missing['end']), (None, None))
+        self.assertEqual(original[first['fallacies'][1]['start']:first['fallacies'][1]['end']], rewritten)
+
+    def test_streamed_near_duplicate_reuses_analysis(self):
+        analyzer = self._analyzer(dedup_enabled=True)
+        original = article(3)
+        list(analyzer.stream_content({'title': 'Wire', 'url': 'https://a.example/wire', 'content': original}))
+
+        copy = {'title': 'Copy', 'url': 'https://b.example/copy', 'content': syndicated(original)}
+        with patch.object(analyzer, '_stream_chain', side_effect=AssertionError("LLM called")):
+            events = list(analyzer.stream_content(copy))
+
+        result = events[-1].data
+        self.assertEqual(result['synthesized_result'], 'synthesized')
+        self.assertEqual(result['near_duplicate']['llm_calls_saved'], 3)
+        self.assertEqual(''.join(e.data for e in events if e.stage == "synthesis" and e.kind == "token"), 'synthesized')
+
+    def test_distinct_articles_are_analyzed(self):
+        analyzer = self._analyzer(dedup_enabled=True)
+        analyzer.analyze_text(article(1))
+        result = analyzer.analyze_text(article(2))
+
+        self.assertNotIn('near_duplicate', result)
+        self.assertEqual(analyzer.dedup.stats()['entries'], 2)
+
+    def test_texts_without_words_are_not_matched(self):
+        analyzer = self._analyzer(responses=STAGE_RESPONSES * 2, dedup_enabled=True)
+        analyzer.analyze_text("-- ... --")
+        result = analyzer.analyze_text("*** !!! ***")
+
+        self.assertNotIn('near_duplicate', result)
+        self.assertEqual(analyzer.dedup.stats()['entries'], 0)
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(self._analyzer().dedup)
+
+    def test_threshold_validation(self):
+        with self.assertRaises(ValueError):
+            AnalysisConfig(openai_api_key="k", serper_api_key="k", dedup_threshold=1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
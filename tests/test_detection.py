@@ -0,0 +1,154 @@
+"""
+Test structured fallacy detection.
+"""
+
+import asyncio
+import json
+import unittest
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+
+from fallacy_detector.detection import (
+    Confidence,
+    IncrementalFallacyParser,
+    match_fallacy_name,
+    parse_detection_json,
+    parse_detection_text,
+    render_detections,
+    resolve_quote_offsets
+)
+from tests.conftest import make_analyzer
+
+ARTICLE = "Everyone knows the plan works. Either we pass it or the city collapses."
+
+RESPONSE = json.dumps({"fallacies": [
+    {"fallacy": "Ad Populum", "confidence": "High",
+     "quote": "Everyone knows the plan works", "reason": "Appeals to popularity {braces}"},
+    {"fallacy": "false dilemma", "confidence": "medium",
+     "quote": "either we pass it or the city   collapses", "reason": "Only two \"options\""},
+    {"fallacy": "Made-up Fallacy", "confidence": "Low", "quote": "x", "reason": "y"}
+]})
+
+
+class StreamingChatModel(FakeListChatModel):
+    """Fake chat model streaming fixed-size chunks and counting them."""
+    
+    chunks_sent: int = 0
+    
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        response = self.responses[0]
+        for i in range(0, len(response), 8):
+            self.chunks_sent += 1
+            yield ChatGenerationChunk(message=AIMessageChunk(content=response[i:i + 8]))
+
+
+class TestDetectionHelpers(unittest.TestCase):
+    """Test cases for parsing and resolving detection records."""
+    
+    def test_incremental_parser_emits_records_as_they_close(self):
+        """Records are returned as soon as their closing brace arrives."""
+        parser = IncrementalFallacyParser()
+        emitted = []
+        for i in range(0, len(RESPONSE), 5):
+            emitted.append(len(parser.feed(RESPONSE[i:i + 5])))
+        
+        self.assertEqual(sum(emitted), 3)
+        first_emit = next(i for i, n in enumerate(emitted) if n)
+        self.assertLess(first_emit, len(emitted) // 2)
+    
+    def test_parser_handles_strings_with_braces_and_escapes(self):
+        """Braces and escaped quotes inside strings do not confuse the parser."""
+        records = parse_detection_json(RESPONSE)
+        
+        self.assertEqual(records[0]['reason'], "Appeals to popularity {braces}")
+        self.assertEqual(records[1]['reason'], 'Only two "options"')
+    
+    def test_match_fallacy_name(self):
+        """Model spellings are mapped onto catalog names."""
+        names = ["Adpopulum", "False Dilemma", "Adhominem"]
+        self.assertEqual(match_fallacy_name("Ad Populum", names), "Adpopulum")
+        self.assertEqual(match_fallacy_name("false dilemma", names), "False Dilemma")
+        self.assertEqual(match_fallacy_name("Ad Hominen", names), "Adhominem")
+        self.assertIsNone(match_fallacy_name("Strawman", names))
+    
+    def test_resolve_quote_offsets(self):
+        """Quotes resolve to offsets despite case and whitespace differences."""
+        start, end = resolve_quote_offsets("either we pass it or the city   collapses", ARTICLE)
+        self.assertEqual(ARTICLE[start:end], "Either we pass it or the city collapses")
+        self.assertEqual(resolve_quote_offsets("not in the text", ARTICLE), (None, None))
+    
+    def test_confidence_parse(self):
+        """Confidence strings are normalized to the enum."""
+        self.assertIs(Confidence.parse("medium"), Confidence.MEDIUM)
+        self.assertIs(Confidence.parse("High confidence"), Confidence.HIGH)
+        self.assertIs(Confidence.parse(None), Confidence.LOW)
+    
+    def test_parse_detection_text(self):
+        """Text-mode output parses into the same records as JSON mode."""
+        text = (
+            "FALLACY ANALYSIS:\n"
+            "1. **Adpopulum** (Confidence: High)\n"
+            "   - Text: \"Everyone knows the plan works\"\n"
+            "   - Reason: Appeals to\n     popularity.\n\n"
+            "2. **[False Dilemma]** (Confidence: Medium)\n"
+            "   - Text: \"Either we pass it or the city collapses\"\n"
+            "   - Reason: Only two options."
+        )
+        records = parse_detection_text(text)
+        
+        self.assertEqual([r['fallacy'] for r in records], ['Adpopulum', 'False Dilemma'])
+        self.assertEqual(records[0]['quote'], "Everyone knows the plan works")
+        self.assertEqual(records[0]['reason'], "Appeals to popularity.")
+        self.assertEqual(parse_detection_text(render_detections([])), [])
+    
+    def test_render_no_detections(self):
+        """An empty list renders the text-mode 'no fallacies' sentence."""
+        self.assertEqual(render_detections([]), "No significant logical fallacies detected.")
+
+
+class TestStructuredDetection(unittest.TestCase):
+    """Test cases for structured detection through the analyzer."""
+    
+    def setUp(self):
+        """Set up an analyzer in structured mode with a streaming fake model."""
+        self.llm = StreamingChatModel(responses=[RESPONSE])
+        self.analyzer = make_analyzer(llm=self.llm, detection_mode="structured")
+    
+    def test_first_detection_before_stream_ends(self):
+        """The first record is yielded while the response is still streaming."""
+        stream = self.analyzer.iter_fallacies(ARTICLE)
+        first = next(stream)
+        
+        self.assertEqual(first.fallacy, "Adpopulum")
+        self.assertEqual((first.start, first.end), (0, 29))
+        self.assertLess(self.llm.chunks_sent, len(RESPONSE) // 8)
+        
+        rest = list(stream)
+        self.assertEqual([d.fallacy for d in rest], ["False Dilemma"])
+        self.assertIs(rest[0].confidence, Confidence.MEDIUM)
+    
+    def test_async_iteration(self):
+        """The async iterator yields the same records."""
+        async def collect():
+            return [d async for d in self.analyzer.aiter_fallacies(ARTICLE)]
+        
+        detections = asyncio.run(collect())
+        self.assertEqual([d.fallacy for d in detections], ["Adpopulum", "False Dilemma"])
+    
+    def test_structured_result_and_cache(self):
+        """Analysis results carry typed records, and repeats come from the cache."""
+        result = self.analyzer._analyze_content({'url': 'u', 'title': 't', 'content': ARTICLE})
+        
+        self.assertEqual(len(result['fallacies']), 2)
+        self.assertEqual(result['fallacies'][0]['confidence'], "High")
+        self.assertIn("**False Dilemma** (Confidence: Medium)", result['detected_fallacies'])
+        
+        sent = self.llm.chunks_sent
+        self.assertEqual(len(self.analyzer.detect_fallacies_structured(ARTICLE)), 2)
+        self.assertEqual(self.llm.chunks_sent, sent)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+Test the streaming article extractor.
+"""
+
+import unittest
+from unittest.mock import patch
+import httpx
+
+from fallacy_detector.extraction import ArticleExtractor, check_content_type, extract_article_text
+from fallacy_detector.transport import HttpTransport
+from tests.conftest import make_analyzer
+
+PAGE = """<html><head><title>T</title><script>track()</script><style>p {}</style></head>
+<body><nav><p>Home</p><p>World</p></nav><div class="ad">Subscribe now</div>
+<article><h1>Headline</h1><p>First <b>bold</b> claim.<script>inline()</script></p>
+<!-- advertisement --><ul><li><p>Nested point.</p></li></ul></article>
+<aside><p>Most read</p></aside><footer><p>Copyright</p></footer></body></html>"""
+
+
+class TestArticleExtractor(unittest.TestCase):
+    """Test cases for ArticleExtractor."""
+
+    def test_boilerplate_is_removed(self):
+        """Only article blocks remain; scripts, nav, comments and footers are dropped."""
+        self.assertEqual(extract_article_text(PAGE), "Headline\nFirst bold claim.\nNested point.")
+
+    def test_pages_without_article_use_all_blocks(self):
+        page = "<body><nav><p>Menu</p></nav><div><p>One.</p><p>Two.</p></div></body>"
+        self.assertEqual(extract_article_text(page), "One.\nTwo.")
+
+    def test_pages_without_blocks_use_loose_text(self):
+        page = "<body><div>Loose <span>text</span></div><script>x()</script></body>"
+        self.assertEqual(extract_article_text(page), "Loose text")
+
+    def test_stops_once_enough_text(self):
+        """Feeding reports completion before the whole body is read."""
+        paragraph = "<p>" + "word " * 40 + "</p>"
+        body = ("<html><body><article>" + paragraph * 200 + "</article></body></html>").encode()
+        extractor = ArticleExtractor(max_chars=1000)
+
+        for start in range(0, len(body), 512):
+            if extractor.feed(body[start:start + 512]):
+                break
+
+        self.assertLess(extractor.bytes_read, len(body) // 4)
+        self.assertGreaterEqual(len(extractor.close()), 1000)
+
+    def test_byte_cap(self):
+        extractor = ArticleExtractor(max_chars=10**6, max_bytes=100)
+        self.assertTrue(extractor.feed(b"<p>" + b"x" * 500 + b"</p>"))
+        self.assertEqual(extractor.bytes_read, 100)
+
+    def test_declared_encoding(self):
+        page = '<meta charset="iso-8859-1"><p>Caf\xe9 policy</p>'.encode('latin-1')
+        self.assertEqual(extract_article_text(page), "Café policy")
+
+    def test_plain_text(self):
+        self.assertEqual(extract_article_text(b"Plain body.", content_type="text/plain"), "Plain body.")
+
+    def test_content_type_check(self):
+        check_content_type("text/html; charset=utf-8")
+        check_content_type(None)
+        with self.assertRaises(ValueError):
+            check_content_type("application/pdf")
+
+
+class TestAnalyzerFetch(unittest.TestCase):
+    """Test cases for fetching pages through the extractor."""
+
+    def setUp(self):
+        self.analyzer = make_analyzer()
+
+    def _serve(self, response):
+        self.analyzer.transport = HttpTransport(sync_transport=httpx.MockTransport(lambda request: response))
+
+    def test_fetch_extracts_article(self):
+        self._serve(httpx.Response(200, html=PAGE))
+        article = self.analyzer._fetch_article("https://news.example/a", "A")
+        self.assertEqual(article['content'], "Headline First bold claim. Nested point.")
+
+    def test_unsupported_content_type_is_an_error(self):
+        """Non-HTML pages fail the load instead of being analyzed as text."""
+        self._serve(httpx.Response(200, content=b"%PDF-1.7", headers={'Content-Type': 'application/pdf'}))
+        with patch.object(self.analyzer, 'search_articles', return_value=[{'link': 'https://news.example/a.pdf', 'title': 'A'}]):
+            result = self.analyzer.load_article("topic")
+        self.assertIn('Unsupported content type', result['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Test the single-call fused pipeline mode.
+"""
+
+import asyncio
+import json
+import unittest
+
+from fallacy_detector.config import AnalysisConfig
+from fallacy_detector.detection import NO_FALLACIES_DETECTED, parse_fused_json
+from fallacy_detector.streaming import (
+    STAGE_DETECTION,
+    STAGE_EXPLANATION,
+    STAGE_SYNTHESIS,
+    STAGE_RESULT,
+    EVENT_FALLACY,
+    EVENT_END
+)
+from tests.conftest import make_analyzer
+
+QUOTE = "Everyone knows the plan works"
+ARTICLE = {
+    'url': 'https://example.com',
+    'title': 'T',
+    'content': f"{QUOTE}. Officials will review it in the spring."
+}
+FUSED_RESPONSE = json.dumps({
+    'fallacies': [{'fallacy': 'Adpopulum', 'confidence': 'High', 'quote': QUOTE, 'reason': 'Popularity.'}],
+    'explanations': "Appeal to popularity explained.",
+    'report': "Final report."
+})
+
+
+class TestParseFusedJson(unittest.TestCase):
+    """Test cases for parse_fused_json."""
+
+    def test_complete_response(self):
+        parsed = parse_fused_json(FUSED_RESPONSE)
+        self.assertEqual(parsed['fallacies'][0]['fallacy'], 'Adpopulum')
+        self.assertEqual(parsed['explanations'], "Appeal to popularity explained.")
+        self.assertEqual(parsed['report'], "Final report.")
+
+    def test_truncated_response_keeps_complete_records(self):
+        """A cut-off response still yields the records that were finished."""
+        parsed = parse_fused_json(FUSED_RESPONSE[:FUSED_RESPONSE.index('"explanations"')])
+        self.assertEqual(len(parsed['fallacies']), 1)
+        self.assertEqual(parsed['report'], '')
+
+
+class TestFusedPipeline(unittest.TestCase):
+    """Test cases for pipeline_mode='fused'."""
+
+    def _analyzer(self, responses=(FUSED_RESPONSE, "unused"), **overrides):
+        analyzer = make_analyzer(responses, pipeline_mode="fused", cache_enabled=False, **overrides)
+        self.llm = analyzer.llm
+        return analyzer
+
+    def test_single_llm_call(self):
+        """Detection, explanations and synthesis come from one round trip."""
+        analyzer = self._analyzer()
+        result = analyzer._analyze_content(ARTICLE)
+
+        self.assertEqual(self.llm.i, 1)
+        self.assertIn("**Adpopulum** (Confidence: High)", result['detected_fallacies'])
+        self.assertEqual(result['educational_explanations'], "Appeal to popularity explained.")
+        self.assertEqual(result['synthesized_result'], "Final report.")
+        self.assertNotIn('fallacies', result)
+
+    def test_structured_mode_adds_records(self):
+        analyzer = self._analyzer(detection_mode="structured")
+        result = analyzer._analyze_content(ARTICLE)
+
+        self.assertEqual(result['fallacies'][0]['start'], 0)
+        self.assertEqual(result['fallacies'][0]['end'], len(QUOTE))
+
+    def test_async(self):
+        analyzer = self._analyzer()
+        result = asyncio.run(analyzer._aanalyze_content(ARTICLE))
+
+        self.assertEqual(self.llm.i, 1)
+        self.assertEqual(result['synthesized_result'], "Final report.")
+
+    def test_streaming_events(self):
+        """Detections stream first, then the stage texts and the result."""
+        analyzer = self._analyzer()
+        events = list(analyzer.stream_content(ARTICLE))
+        stages = [(e.stage, e.kind) for e in events]
+
+        self.assertIn((STAGE_DETECTION, EVENT_FALLACY), stages)
+        self.assertLess(stages.index((STAGE_DETECTION, EVENT_FALLACY)), stages.index((STAGE_EXPLANATION, EVENT_END)))
+        self.assertIn((STAGE_SYNTHESIS, EVENT_END), stages)
+        self.assertEqual(stages[-1], (STAGE_RESULT, EVENT_END))
+        self.assertEqual(events[-1].data['synthesized_result'], "Final report.")
+        self.assertIn('analysis', events[-1].data['timings'])
+
+    def test_clean_article_with_detect_prescreen(self):
+        """The detect pre-screen still stops at an empty detection."""
+        clean = json.dumps({'fallacies': [], 'explanations': "None.", 'report': "Clean."})
+        analyzer = self._analyzer(responses=[clean], prescreen_mode="detect")
+        result = analyzer._analyze_content({**ARTICLE, 'content': "Officials will review the plan."})
+
+        self.assertEqual(result['detected_fallacies'], NO_FALLACIES_DETECTED)
+        self.assertEqual(result['prescreen']['action'], "detect")
+
+    def test_chunked_articles_use_staged_pipeline(self):
+        """Articles that need several chunks keep per-chunk detection."""
+        analyzer = self._analyzer(long_article_mode="chunk", article_char_limit=100, chunk_overlap=10)
+        self.assertTrue(analyzer._uses_fused(ARTICLE['content'][:80]))
+        self.assertFalse(analyzer._uses_fused(" ".join([ARTICLE['content']] * 5)))
+
+    def test_invalid_mode_rejected(self):
+        with self.assertRaises(ValueError):
+            AnalysisConfig(openai_api_key="k", serper_api_key="k", pipeline_mode="parallel")
+
+
+if __name__ == '__main__':
+    unittest.main()
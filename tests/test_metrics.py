@@ -0,0 +1,165 @@
+"""
+Test per-stage instrumentation.
+"""
+
+import asyncio
+import unittest
+from typing import Any, List
+from unittest.mock import patch
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from fallacy_detector.metrics import (
+    PrometheusExporter,
+    StageMetrics,
+    estimate_cost,
+    record_http_request,
+    track_analysis,
+    time_stage
+)
+from tests.conftest import make_analyzer
+
+ARTICLE = {'url': 'https://example.com', 'title': 'Title', 'content': 'Everyone knows this.'}
+
+
+class UsageChatModel(BaseChatModel):
+    """Fake chat model that reports fixed token usage."""
+    
+    @property
+    def _llm_type(self) -> str:
+        return "usage-fake"
+    
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        message = AIMessage(
+            content="output",
+            usage_metadata={'input_tokens': 100, 'output_tokens': 20, 'total_tokens': 120}
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class RecordingHook:
+    """Metrics hook that keeps everything it receives."""
+    
+    def __init__(self):
+        self.stages: List[StageMetrics] = []
+        self.analyses: List[Any] = []
+    
+    def on_stage(self, metrics):
+        self.stages.append(metrics)
+    
+    def on_analysis(self, metrics):
+        self.analyses.append(metrics)
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Test cases for metrics attached to analysis results."""
+    
+    def setUp(self):
+        """Set up an analyzer with a usage-reporting model and a hook."""
+        self.hook = RecordingHook()
+        self.exporter = PrometheusExporter()
+        self.analyzer = make_analyzer(
+            llm=UsageChatModel(),
+            hooks=[self.hook, self.exporter],
+            model_name="gpt-4.1-nano"
+        )
+    
+    def test_result_carries_timings_tokens_and_cost(self):
+        """analyze_article sets processing_time and a per-stage breakdown."""
+        with patch.object(self.analyzer, 'load_article', return_value=ARTICLE):
+            result = self.analyzer.analyze_article("topic")
+        
+        self.assertGreater(result['processing_time'], 0)
+        self.assertEqual(set(result['timings']), {'detection', 'explanation', 'synthesis'})
+        self.assertEqual(result['token_usage']['detection'], {'prompt_tokens': 100, 'completion_tokens': 20})
+        self.assertAlmostEqual(result['cost']['total'], 3 * estimate_cost("gpt-4.1-nano", 100, 20))
+        
+        self.assertEqual(len(self.hook.stages), 3)
+        self.assertEqual(len(self.hook.analyses), 1)
+    
+    def test_cache_hits_are_recorded(self):
+        """Cached stages appear with zero tokens."""
+        with patch.object(self.analyzer, 'load_article', return_value=ARTICLE):
+            self.analyzer.analyze_article("topic")
+            result = self.analyzer.analyze_article("topic")
+        
+        self.assertEqual(result['token_usage'], {})
+        self.assertEqual(result['cost']['total'], 0)
+        self.assertTrue(all(m.cached for m in self.hook.stages[3:]))
+    
+    def test_async_and_batch_results_are_isolated(self):
+        """Concurrent analyses keep separate metrics."""
+        async def run():
+            return await asyncio.gather(*(
+                self.analyzer._aanalyze_hit(i, {'link': f'u{i}', 'title': 't'}) for i in range(3)
+            ))
+        
+        async def fake_fetch(url, title):
+            return {'url': url, 'title': title, 'content': f'content {url}'}
+        
+        with patch.object(self.analyzer, '_afetch_article', side_effect=fake_fetch):
+            results = asyncio.run(run())
+        
+        for result in results:
+            self.assertEqual(result['token_usage']['synthesis']['prompt_tokens'], 100)
+    
+    def test_streaming_result_has_metrics(self):
+        """The final streamed result carries the same breakdown."""
+        events = list(self.analyzer.stream_content(ARTICLE))
+        
+        self.assertIn('timings', events[-1].data)
+        self.assertIsNotNone(self.hook.analyses[-1].total_time)
+    
+    def test_prometheus_render(self):
+        """The exporter renders histograms and counters in text format."""
+        with patch.object(self.analyzer, 'load_article', return_value=ARTICLE):
+            self.analyzer.analyze_article("topic")
+        
+        text = self.exporter.render()
+        self.assertIn('# TYPE fallacy_detector_stage_duration_seconds histogram', text)
+        self.assertIn('fallacy_detector_stage_duration_seconds_bucket{stage="detection",le="+Inf"} 1', text)
+        self.assertIn('fallacy_detector_tokens_total{stage="synthesis",type="prompt"} 100', text)
+        self.assertIn('fallacy_detector_analyses_total 1', text)
+
+
+class TestMetricHelpers(unittest.TestCase):
+    """Test cases for the metrics helpers."""
+    
+    def test_time_stage_outside_analysis_is_noop(self):
+        """Timing a stage without an active analysis does nothing."""
+        with time_stage("fetch"):
+            pass
+    
+    def test_time_stage_records(self):
+        """Non-LLM stages are summed into timings."""
+        with track_analysis() as metrics:
+            with time_stage("fetch"):
+                pass
+            with time_stage("fetch"):
+                pass
+        
+        self.assertEqual(len(metrics.stages), 2)
+        self.assertIn('fetch', metrics.to_dict()['timings'])
+    
+    def test_http_counts_reach_prometheus(self):
+        """Transport request counts are summed per analysis and exported."""
+        exporter = PrometheusExporter()
+        with track_analysis([exporter]) as metrics:
+            record_http_request(retries=2, reused=False)
+            record_http_request(retries=0, reused=True)
+        
+        self.assertEqual(metrics.to_dict()['http'], {
+            'requests': 2, 'retries': 2, 'connections_opened': 1, 'connections_reused': 1
+        })
+        text = exporter.render()
+        self.assertIn('fallacy_detector_http_retries_total 2', text)
+        self.assertIn('fallacy_detector_http_connections_total{state="reused"} 1', text)
+    
+    def test_unknown_model_costs_nothing(self):
+        self.assertEqual(estimate_cost("unknown-model", 1000, 1000), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Test the local fallacy cue pre-screen.
+"""
+
+import asyncio
+import json
+import unittest
+from pathlib import Path
+
+from fallacy_detector.config import AnalysisConfig
+from fallacy_detector.detection import NO_FALLACIES_DETECTED
+from fallacy_detector.prescreen import PRESCREEN_SYNTHESIS, PreScreener, evaluate
+from fallacy_detector.streaming import STAGE_RESULT, EVENT_END
+from tests.conftest import make_analyzer
+
+FIXTURE = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures" / "prescreen_labeled.jsonl"
+
+NEUTRAL = "Officials said the budget would be reviewed in the spring after months of consultation."
+LOADED = "Everyone knows the plan works. Either we pass it now or the city collapses."
+
+
+def load_fixture():
+    with open(FIXTURE, encoding='utf-8') as f:
+        return [(item['text'], item['has_fallacy']) for item in map(json.loads, f)]
+
+
+class TestPreScreener(unittest.TestCase):
+    """Test cases for PreScreener scoring."""
+
+    def setUp(self):
+        self.screener = PreScreener()
+
+    def test_neutral_text_scores_zero(self):
+        """Straight reporting has no cues."""
+        result = self.screener.score(NEUTRAL)
+        self.assertEqual(result.score, 0.0)
+        self.assertEqual(result.matches, {})
+
+    def test_cues_are_attributed_to_fallacies(self):
+        """Cue phrases count towards their catalog fallacy."""
+        result = self.screener.score(LOADED)
+        self.assertEqual(result.matches, {'Adpopulum': 1, 'False Dilemma': 1})
+        self.assertEqual(result.score, 2.0)
+
+    def test_cues_need_word_boundaries(self):
+        """Triggers inside longer words do not match."""
+        self.assertEqual(self.screener.score("The foolproof design was shipped.").score, 0.0)
+
+    def test_fixture_precision_recall(self):
+        """The default cues keep precision and recall high on the labeled set."""
+        report = evaluate(self.screener, load_fixture(), threshold=1.0)
+        self.assertGreaterEqual(report['precision'], 0.9)
+        self.assertGreaterEqual(report['recall'], 0.85)
+
+
+class TestAnalyzerPreScreen(unittest.TestCase):
+    """Test cases for prescreen_mode in the analyzer."""
+
+    def _analyzer(self, mode, responses):
+        analyzer = make_analyzer(responses, prescreen_mode=mode, cache_enabled=False)
+        self.llm = analyzer.llm
+        return analyzer
+
+    @staticmethod
+    def _article(content):
+        return {'url': 'https://example.com', 'title': 'T', 'content': content}
+
+    def test_skip_mode_makes_no_llm_calls(self):
+        """Articles below the threshold are answered locally."""
+        analyzer = self._analyzer("skip", ["unused"])
+        result = analyzer._analyze_content(self._article(NEUTRAL))
+
+        self.assertEqual(self.llm.i, 0)
+        self.assertEqual(result['detected_fallacies'], NO_FALLACIES_DETECTED)
+        self.assertEqual(result['synthesized_result'], PRESCREEN_SYNTHESIS)
+        self.assertEqual(result['prescreen']['action'], "skip")
+
+    def test_skip_mode_runs_full_pipeline_above_threshold(self):
+        """Articles with cues still get all three stages."""
+        analyzer = self._analyzer("skip", ["detected", "explained", "synthesized"])
+        result = analyzer._analyze_content(self._article(LOADED))
+
+        self.assertEqual(result['synthesized_result'], "synthesized")
+        self.assertEqual(result['prescreen']['action'], "analyze")
+
+    def test_detect_mode_stops_after_clean_detection(self):
+        """A single detection call confirms a low-scoring article is clean."""
+        analyzer = self._analyzer("detect", [NO_FALLACIES_DETECTED, "explained", "synthesized"])
+        result = analyzer._analyze_content(self._article(NEUTRAL))
+
+        self.assertEqual(self.llm.i, 1)
+        self.assertEqual(result['detected_fallacies'], NO_FALLACIES_DETECTED)
+        self.assertEqual(result['synthesized_result'], PRESCREEN_SYNTHESIS)
+
+    def test_detect_mode_escalates_when_detection_finds_fallacies(self):
+        """Detection overrules the pre-screen when it names a fallacy."""
+        analyzer = self._analyzer("detect", ["1. **Adhominem** (Confidence: High)", "explained", "synthesized"])
+        result = analyzer._analyze_content(self._article(NEUTRAL))
+
+        self.assertEqual(result['synthesized_result'], "synthesized")
+
+    def test_async_and_streaming_skip(self):
+        """The async and streaming pipelines honour the pre-screen too."""
+        analyzer = self._analyzer("skip", ["unused"])
+        result = asyncio.run(analyzer._aanalyze_content(self._article(NEUTRAL)))
+        events = list(analyzer.stream_content(self._article(NEUTRAL)))
+
+        self.assertEqual(self.llm.i, 0)
+        self.assertEqual(result['prescreen']['action'], "skip")
+        self.assertEqual((events[-1].stage, events[-1].kind), (STAGE_RESULT, EVENT_END))
+        self.assertEqual(events[-1].data['synthesized_result'], PRESCREEN_SYNTHESIS)
+        self.assertIn('prescreen', events[-1].data['timings'])
+
+    def test_invalid_mode_rejected(self):
+        """Unknown modes fail fast in the config."""
+        with self.assertRaises(ValueError):
+            AnalysisConfig(openai_api_key="k", serper_api_key="k", prescreen_mode="maybe")
+
+
+if __name__ == '__main__':
+    unittest.main()
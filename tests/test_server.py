@@ -0,0 +1,205 @@
+"""
+Test the resident analysis server and its client.
+"""
+
+import asyncio
+import io
+import threading
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+import httpx
+
+from fallacy_detector.__main__ import main
+from fallacy_detector.client import AnalysisClient
+from fallacy_detector.server import AnalysisServer, AnalysisService, QueueFullError, request_key
+from tests.conftest import make_analyzer
+
+
+def gate_texts(analyzer):
+    """Make aanalyze_text wait for the returned event; returns it and the texts analyzed."""
+    gate, analyzed = threading.Event(), []
+
+    async def aanalyze_text(text, metadata=None):
+        analyzed.append(text)
+        await asyncio.get_running_loop().run_in_executor(None, gate.wait)
+        return {'title': text, 'synthesized_result': 'synthesized'}
+
+    analyzer.aanalyze_text = aanalyze_text
+    return gate, analyzed
+
+
+class TestRequestKey(unittest.TestCase):
+    """Test cases for request validation and coalescing keys."""
+
+    def test_topics_normalized(self):
+        self.assertEqual(request_key({'topic': "Climate  Policy"}), request_key({'topic': "climate policy "}))
+        self.assertNotEqual(
+            request_key({'topic': "climate policy"}),
+            request_key({'topic': "climate policy", 'domain': "cnn.com"})
+        )
+
+    def test_text_and_url(self):
+        self.assertEqual(request_key({'text': "a"}), request_key({'text': "a", 'metadata': {}}))
+        self.assertEqual(request_key({'text': "a", 'metadata': {'x': 1, 'y': 2}}),
+                         request_key({'text': "a", 'metadata': {'y': 2, 'x': 1}}))
+        self.assertNotEqual(request_key({'text': "a"}), request_key({'text': "a", 'metadata': {'x': 1}}))
+        self.assertNotEqual(request_key({'text': "a"}), request_key({'text': "b"}))
+        self.assertEqual(request_key({'url': "https://example.com/a "}), "url:https://example.com/a:")
+        self.assertNotEqual(request_key({'url': "https://example.com/a"}),
+                            request_key({'url': "https://example.com/a", 'title': "A"}))
+
+    def test_invalid_requests(self):
+        for request in ({}, {'topic': ""}, {'topic': 3}, {'topic': "a", 'url': "https://example.com"},
+                        {'topic': "x", 'domain': 5}, {'url': "https://example.com", 'title': ["A"]},
+                        {'text': "a", 'metadata': "m"}):
+            with self.assertRaises(ValueError):
+                request_key(request)
+
+
+class TestAnalysisService(unittest.TestCase):
+    """Test cases for the job queue."""
+
+    def setUp(self):
+        self.analyzer = make_analyzer(cache_enabled=False)
+        self.gate, self.analyzed = gate_texts(self.analyzer)
+        self.service = AnalysisService(self.analyzer, workers=1, max_queue=1).start()
+
+    def tearDown(self):
+        self.gate.set()
+        self.service.stop()
+
+    def test_identical_requests_coalesce(self):
+        first, coalesced = self.service.submit({'text': "same"})
+        self.assertFalse(coalesced)
+        second, coalesced = self.service.submit({'text': "same"})
+        self.assertTrue(coalesced)
+        self.assertIs(first, second)
+
+        self.gate.set()
+        self.assertTrue(first.done.wait(5))
+        self.assertEqual(first.requests, 2)
+        self.assertEqual(first.result['synthesized_result'], 'synthesized')
+        self.assertEqual(self.analyzed, ["same"])
+
+        # Finished jobs are no longer joined
+        third, coalesced = self.service.submit({'text': "same"})
+        self.assertFalse(coalesced)
+        self.assertIsNot(third, first)
+
+    def test_full_queue_refuses(self):
+        running, _ = self.service.submit({'text': "running"})
+        while self.service.stats()['running'] == 0:
+            threading.Event().wait(0.01)
+        queued, _ = self.service.submit({'text': "queued"})
+        with self.assertRaises(QueueFullError):
+            self.service.submit({'text': "refused"})
+        # Joining a job in flight does not take a queue slot
+        self.assertIs(self.service.submit({'text': "queued"})[0], queued)
+
+        self.gate.set()
+        self.assertTrue(queued.done.wait(5))
+        stats = self.service.stats()
+        self.assertEqual((stats['submitted'], stats['coalesced'], stats['rejected']), (2, 1, 1))
+        self.assertEqual(self.service.job(running.id).status, "done")
+
+    def test_failed_job_reports_error(self):
+        async def fail(text, metadata=None):
+            raise RuntimeError("boom")
+
+        self.analyzer.aanalyze_text = fail
+        job, _ = self.service.submit({'text': "fails"})
+        self.assertTrue(job.done.wait(5))
+        self.assertIn("boom", job.result['error'])
+        self.assertEqual(self.service.stats()['failed'], 1)
+
+
+class TestAnalysisServer(unittest.TestCase):
+    """Test the HTTP endpoints through the client."""
+
+    def setUp(self):
+        self.analyzer = make_analyzer(cache_enabled=False)
+        self.server = AnalysisServer(self.analyzer, port=0, workers=2).start()
+        self.client = AnalysisClient(self.server.base_url, busy_retries=0)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def test_analyze_text(self):
+        result = self.client.analyze(text="Everyone knows this.", metadata={'title': "T"})
+        self.assertEqual(result['synthesized_result'], 'synthesized')
+        self.assertEqual(result['title'], "T")
+
+        health = self.client.health()
+        self.assertEqual((health['status'], health['completed']), ('ok', 1))
+        metrics = httpx.get(f"{self.server.base_url}/metrics").text
+        self.assertIn('stage="synthesis"', metrics)
+
+    def test_jobs_endpoint(self):
+        gate, _ = gate_texts(self.analyzer)
+        job = self.client.submit(text="queued")
+        self.assertIn(job['status'], ("queued", "running"))
+        while self.client.job(job['id'])['status'] != "running":
+            threading.Event().wait(0.01)
+
+        results = []
+        joining = threading.Thread(target=lambda: results.append(self.client.analyze(text="queued")))
+        joining.start()
+        while self.client.job(job['id'])['requests'] < 2:
+            threading.Event().wait(0.01)
+        gate.set()
+        joining.join(5)
+        self.assertEqual(results[0]['title'], "queued")
+        self.assertEqual(self.client.job(job['id'])['status'], "done")
+
+    def test_errors(self):
+        response = httpx.post(f"{self.server.base_url}/analyze", json={'topic': ""})
+        self.assertEqual(response.status_code, 400)
+        response = httpx.post(f"{self.server.base_url}/analyze", json={'topic': "x", 'domain': 5})
+        self.assertEqual(response.json(), {'error': "'domain' must be a string"})
+        self.assertEqual(httpx.get(f"{self.server.base_url}/jobs/job-999").status_code, 404)
+
+    def test_busy_server_answers_503(self):
+        with patch.object(self.server.service, 'submit', side_effect=QueueFullError("64 jobs queued")):
+            with self.assertRaises(httpx.HTTPStatusError) as raised:
+                self.client.analyze(text="refused")
+        self.assertEqual(raised.exception.response.status_code, 503)
+        self.assertEqual(raised.exception.response.headers['Retry-After'], "1")
+
+
+class TestServerCli(unittest.TestCase):
+    """Test the command-line client."""
+
+    def test_topic_sent_to_server(self):
+        analyzer = make_analyzer(cache_enabled=False)
+
+        async def aanalyze_article(topic, domain=""):
+            return {'title': f"{topic} ({domain})", 'url': "https://example.com", 'detected_fallacies': "",
+                    'explanation': "", 'synthesized_result': "served"}
+
+        analyzer.aanalyze_article = aanalyze_article
+        with AnalysisServer(analyzer, port=0) as server:
+            output = io.StringIO()
+            with redirect_stdout(output), patch('fallacy_detector.__main__.FallacyAnalyzer') as local:
+                main(["climate", "--domain", "cnn.com", "--server", server.base_url])
+
+        local.assert_not_called()
+        self.assertIn("served", output.getvalue())
+        self.assertIn("climate (cnn.com)", output.getvalue())
+
+    def test_stream_not_supported(self):
+        with redirect_stdout(io.StringIO()), patch('sys.stderr', io.StringIO()):
+            with self.assertRaises(SystemExit):
+                main(["climate", "--server", "--stream"])
+
+    def test_max_articles_not_supported(self):
+        with redirect_stdout(io.StringIO()), patch('sys.stderr', io.StringIO()) as stderr:
+            with self.assertRaises(SystemExit):
+                main(["climate", "--server", "--max-articles", "3"])
+        self.assertIn("--max-articles", stderr.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+"""
+Test the persistent results store and incremental re-analysis.
+"""
+
+import io
+import os
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from fallacy_detector.__main__ import main, render_stream
+from fallacy_detector.store import ResultStore, content_hash
+from tests.conftest import make_analyzer
+
+PAGES = {
+    'https://www.cnn.com/a': "Everyone knows the plan will fail, so nobody should support it.",
+    'https://bbc.co.uk/b': "The council approved the budget after a long debate.",
+}
+
+
+class TestResultStore(unittest.TestCase):
+    """Test cases for ResultStore."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = ResultStore(os.path.join(self.tmpdir.name, "results.sqlite"))
+        self.hash = content_hash("text")
+        self.result = {'title': "A", 'url': "https://www.cnn.com/a", 'synthesized_result': "s", 'fallacies': []}
+
+    def tearDown(self):
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def test_find_by_text_model_and_version(self):
+        entry_id = self.store.save(self.result, self.hash, "gpt-4.1-nano", "v1", "2024-05-01")
+        stored = self.store.find("https://www.cnn.com/a", self.hash, "gpt-4.1-nano", "v1")
+        self.assertEqual(stored['synthesized_result'], "s")
+        self.assertEqual(stored['store']['id'], entry_id)
+
+        # Same text under another URL is found; other text, model or version is not
+        self.assertEqual(self.store.find("https://other.com/a", self.hash, "gpt-4.1-nano", "v1")['store']['id'], entry_id)
+        self.assertIsNone(self.store.find("https://www.cnn.com/a", content_hash("edited"), "gpt-4.1-nano", "v1"))
+        self.assertIsNone(self.store.find("https://www.cnn.com/a", self.hash, "gpt-4.1", "v1"))
+        self.assertIsNone(self.store.find("https://www.cnn.com/a", self.hash, "gpt-4.1-nano", "v2"))
+        self.assertEqual(self.store.stats(), {'served': 2, 'stored': 1, 'entries': 1})
+
+    def test_save_replaces_same_key(self):
+        first = self.store.save(self.result, self.hash, "m", "v1")
+        second = self.store.save({**self.result, 'synthesized_result': "again"}, self.hash, "m", "v1")
+        self.assertEqual(first, second)
+        self.assertEqual(self.store.get(first)['synthesized_result'], "again")
+        self.assertIsNone(self.store.save({'error': "failed"}, self.hash, "m", "v1"))
+
+    def test_list_by_domain_and_date(self):
+        self.store.save(self.result, self.hash, "m", "v1", "2024-05-01")
+        self.store.save({**self.result, 'url': "https://bbc.co.uk/b", 'fallacies': None}, content_hash("b"), "m", "v1")
+
+        entries = self.store.list()
+        self.assertEqual([e['domain'] for e in entries], ["bbc.co.uk", "cnn.com"])
+        self.assertEqual((entries[1]['published'], entries[1]['fallacies']), ("2024-05-01", 0))
+        self.assertEqual([e['url'] for e in self.store.list(domain="cnn.com")], ["https://www.cnn.com/a"])
+
+        today = time.strftime("%Y-%m-%d", time.gmtime())
+        self.assertEqual(len(self.store.list(since=today, until=today)), 2)
+        self.assertEqual(self.store.list(until="2000-01-01"), [])
+        self.assertEqual(len(self.store.list(limit=1)), 1)
+
+
+class TestIncrementalAnalysis(unittest.TestCase):
+    """Test re-runs served from the store."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "results.sqlite")
+        self.pages = dict(PAGES)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def sweep(self, analyzer):
+        hits = [{'link': url, 'title': url.rsplit("/", 1)[-1]} for url in self.pages]
+
+        def fetch(url, title):
+            return {'url': url, 'title': title, 'content': self.pages[url]}
+
+        with patch.object(analyzer, 'search_articles', return_value=hits), \
+                patch.object(analyzer, '_fetch_article', side_effect=fetch):
+            return analyzer.analyze_articles("budget", max_articles=2)
+
+    def test_only_new_or_changed_articles_analyzed(self):
+        first = self.sweep(make_analyzer(cache_enabled=False, store_path=self.path))
+        self.assertFalse(any('store' in result for result in first))
+
+        # The next day, in a new process: one article was edited
+        self.pages['https://bbc.co.uk/b'] += " Updated with reactions."
+        analyzer = make_analyzer(cache_enabled=False, store_path=self.path)
+        with patch.object(analyzer, '_run_chain', wraps=analyzer._run_chain) as run_chain:
+            second = self.sweep(analyzer)
+
+        self.assertTrue(second[0]['store']['reused'])
+        self.assertEqual(second[0]['synthesized_result'], first[0]['synthesized_result'])
+        self.assertNotIn('store', second[1])
+        self.assertEqual(run_chain.call_count, 3)  # One pipeline run, for the edited article
+        self.assertEqual(analyzer.store.stats(), {'served': 1, 'stored': 1, 'entries': 3})
+
+    def test_model_or_prompt_change_reanalyzes(self):
+        make_analyzer(cache_enabled=False, store_path=self.path).analyze_text(PAGES['https://bbc.co.uk/b'])
+        self.assertIn('store', make_analyzer(cache_enabled=False, store_path=self.path).analyze_text(PAGES['https://bbc.co.uk/b']))
+        self.assertNotIn('store', make_analyzer(cache_enabled=False, store_path=self.path, model_name="gpt-4.1").analyze_text(PAGES['https://bbc.co.uk/b']))
+
+        with patch('fallacy_detector.analyzer.RESULT_SYNTHESIS_PROMPT', "Changed {summary} {detailed_analysis}"):
+            analyzer = make_analyzer(cache_enabled=False, store_path=self.path)
+        self.assertNotIn('store', analyzer.analyze_text(PAGES['https://bbc.co.uk/b']))
+
+    def test_condense_encoding_changes_version(self):
+        self.assertNotEqual(
+            make_analyzer(condense_tokens=500).analysis_version,
+            make_analyzer(condense_tokens=500, condense_encoding="cl100k_base").analysis_version
+        )
+
+    def test_stream_served_from_store(self):
+        """Streaming looks up and saves analyses like analyze_text does."""
+        article = {'url': "https://bbc.co.uk/b", 'title': "b", 'content': PAGES['https://bbc.co.uk/b']}
+        first = list(make_analyzer(cache_enabled=False, store_path=self.path).stream_content(article))[-1].data
+        self.assertNotIn('store', first)
+
+        analyzer = make_analyzer(cache_enabled=False, store_path=self.path)
+        output = io.StringIO()
+        with patch.object(analyzer, '_stream_chain', side_effect=AssertionError("LLM called")), \
+                patch.object(analyzer, 'load_article', return_value=article), redirect_stdout(output):
+            result = render_stream(analyzer.stream_analysis("budget"))
+
+        self.assertTrue(result['store']['reused'])
+        self.assertEqual(result['synthesized_result'], first['synthesized_result'])
+        self.assertIn(first['synthesized_result'], output.getvalue())
+        self.assertEqual(analyzer.store.stats(), {'served': 1, 'stored': 0, 'entries': 1})
+
+    def test_results_cli(self):
+        self.sweep(make_analyzer(cache_enabled=False, store_path=self.path))
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(["results", self.path, "--domain", "cnn.com"])
+        self.assertIn("cnn.com", output.getvalue())
+        self.assertNotIn("bbc.co.uk", output.getvalue())
+        self.assertIn("1 analyses", output.getvalue())
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(["results", self.path, "--show", "1"])
+        self.assertIn("synthesized", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Test the streaming analysis API.
+"""
+
+import asyncio
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from fallacy_detector.__main__ import render_stream
+from fallacy_detector.metrics import current_metrics
+from tests.conftest import STAGE_RESPONSES, make_analyzer
+
+ARTICLE = {'url': 'https://example.com', 'title': 'Title', 'content': 'Everyone knows this.'}
+
+
+class TestStreamAnalysis(unittest.TestCase):
+    """Test cases for stream_analysis and astream_content."""
+    
+    def setUp(self):
+        """Set up an analyzer whose fake model streams character by character."""
+        self.analyzer = make_analyzer(cache_enabled=False)
+        self.llm = self.analyzer.llm
+    
+    def test_events_are_stage_tagged_and_ordered(self):
+        """Stages run in order and tokens concatenate to each stage output."""
+        with patch.object(self.analyzer, 'load_article', return_value=ARTICLE):
+            events = list(self.analyzer.stream_analysis("topic"))
+        
+        stages = []
+        for event in events:
+            if not stages or stages[-1] != event.stage:
+                stages.append(event.stage)
+        self.assertEqual(stages, ["search", "detection", "explanation", "synthesis", "result"])
+        
+        for stage, expected in [("detection", "detected"), ("explanation", "explained"), ("synthesis", "synthesized")]:
+            tokens = [e.data for e in events if e.stage == stage and e.kind == "token"]
+            self.assertGreater(len(tokens), 1)
+            self.assertEqual(''.join(tokens), expected)
+        
+        result = events[-1].data
+        self.assertEqual(result['synthesized_result'], 'synthesized')
+        self.assertEqual(result['url'], ARTICLE['url'])
+    
+    def test_first_token_arrives_before_later_stages_run(self):
+        """The first detection token is available before explanation is requested."""
+        with patch.object(self.analyzer, 'load_article', return_value=ARTICLE):
+            stream = self.analyzer.stream_analysis("topic")
+            first_token = next(e for e in stream if e.kind == "token")
+        
+        self.assertEqual(first_token.stage, "detection")
+        self.assertEqual(self.llm.i, 1)  # Only the detection response has been requested
+    
+    def test_search_error_ends_stream(self):
+        """A failed search produces a single error result."""
+        with patch.object(self.analyzer, 'load_article', return_value={'error': 'No articles found'}):
+            events = list(self.analyzer.stream_analysis("topic"))
+        
+        self.assertEqual(events[-1].kind, "error")
+        self.assertEqual(events[-1].data['error'], 'No articles found')
+    
+    def test_async_stream_matches_sync(self):
+        """The async stream produces the same final result."""
+        async def collect():
+            return [e async for e in self.analyzer.astream_content(ARTICLE)]
+        
+        events = asyncio.run(collect())
+        self.assertEqual(events[-1].data['educational_explanations'], 'explained')
+    
+    def test_metrics_do_not_leak_to_the_consumer(self):
+        """The metrics context is active only while the pipeline runs, not between events."""
+        seen = []
+        for event in self.analyzer.stream_content(ARTICLE):
+            seen.append(current_metrics())
+        self.assertEqual(set(seen), {None})
+        self.assertIn('timings', event.data)
+    
+    def test_abandoned_async_stream_finishes_cleanly(self):
+        """Closing an async stream mid-way resets the metrics in the context that set them."""
+        async def first_token():
+            stream = self.analyzer.astream_content(ARTICLE)
+            event = await stream.__anext__()
+            await stream.aclose()
+            return event, current_metrics()
+        
+        event, metrics = asyncio.run(first_token())
+        self.assertEqual(event.stage, "detection")
+        self.assertIsNone(metrics)
+    
+    def test_slow_consumer_releases_llm_slot(self):
+        """A paused stream does not hold the only LLM slot once the provider is done."""
+        analyzer = make_analyzer(responses=["first", "second"], cache_enabled=False, llm_concurrency=1)
+        chain = analyzer.fallacy_detection_chain
+        
+        async def interleave():
+            paused = analyzer._astream_chain(chain, content="A", fallacy_catalog="")
+            first = await paused.__anext__()
+            other = [token async for token in analyzer._astream_chain(chain, content="B", fallacy_catalog="")]
+            rest = [token async for token in paused]
+            return first + ''.join(rest), ''.join(other)
+        
+        self.assertEqual(asyncio.run(asyncio.wait_for(interleave(), 5)), ("first", "second"))
+    
+    def test_stream_and_blocking_results_match(self):
+        """The streaming, blocking and async paths run the same pipeline."""
+        article = {'url': 'https://example.com', 'title': 'Title', 'content': 'Either we act now or all is lost.'}
+        record = {'fallacy': "False Dilemma", 'quote': "Either we act now", 'reason': "r", 'confidence': "High"}
+        structured = json.dumps({'fallacies': [record]})
+        fused = json.dumps({'fallacies': [record], 'explanations': "explained", 'report': "reported"})
+        cases = [
+            ({}, STAGE_RESPONSES),
+            ({'detection_mode': "structured"}, (structured, "explained", "synthesized")),
+            ({'pipeline_mode': "fused"}, (fused,)),
+            ({'explanation_mode': "primer"}, ("1. **False Dilemma** (Confidence: High)", "primer", "advice", "done")),
+            ({'prescreen_mode': "skip", 'prescreen_threshold': 100.0}, ()),
+        ]
+        for config, responses in cases:
+            with self.subTest(**config):
+                def analyzer():
+                    return make_analyzer(responses=responses or ("unused",), cache_enabled=False, **config)
+                
+                blocking = analyzer()._run_pipeline(article)
+                awaited = asyncio.run(analyzer()._arun_pipeline(article))
+                streamed = list(analyzer().stream_content(article))[-1].data
+                self.assertEqual(awaited, blocking)
+                self.assertEqual({key: streamed[key] for key in blocking}, blocking)
+    
+    def test_render_stream(self):
+        """The CLI renderer prints tokens and returns the final result."""
+        with patch.object(self.analyzer, 'load_article', return_value=ARTICLE):
+            output = io.StringIO()
+            with redirect_stdout(output):
+                result = render_stream(self.analyzer.stream_analysis("topic"))
+        
+        self.assertEqual(result['detected_fallacies'], 'detected')
+        self.assertIn("LOGICAL FALLACY ANALYSIS:", output.getvalue())
+        self.assertIn("synthesized", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
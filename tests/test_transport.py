@@ -0,0 +1,261 @@
+"""
+Test the pooled, retrying HTTP transport.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import httpx
+
+from fallacy_detector.metrics import track_analysis
+from fallacy_detector.transport import HttpTransport, parse_retry_after
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Minimal HTTP/1.1 handler that keeps connections open."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def flaky(statuses, headers=None):
+    """Handler answering with ``statuses`` in turn, then 200."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        status = statuses[len(calls) - 1] if len(calls) <= len(statuses) else 200
+        return httpx.Response(status, headers=headers or {}, text="body")
+    return handler, calls
+
+
+class TestParseRetryAfter(unittest.TestCase):
+    """Test cases for parse_retry_after."""
+
+    def test_seconds(self):
+        self.assertEqual(parse_retry_after("2"), 2.0)
+
+    def test_http_date(self):
+        when = datetime.now(timezone.utc) + timedelta(seconds=30)
+        self.assertAlmostEqual(parse_retry_after(format_datetime(when, usegmt=True)), 30, delta=2)
+
+    def test_invalid(self):
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+
+class TestHttpTransport(unittest.TestCase):
+    """Test cases for HttpTransport."""
+
+    def _transport(self, handler, **kwargs):
+        kwargs.setdefault('backoff_base', 0.0)
+        return HttpTransport(
+            sync_transport=httpx.MockTransport(handler),
+            async_transport=httpx.MockTransport(handler),
+            **kwargs
+        )
+
+    def test_retries_transient_statuses(self):
+        """429/5xx responses are retried and counted."""
+        handler, calls = flaky([503, 429])
+        transport = self._transport(handler)
+
+        response = transport.request("GET", "https://news.example/a")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(transport.stats()['retries'], 2)
+
+    def test_gives_up_after_max_retries(self):
+        """The last response is returned once retries are exhausted."""
+        handler, calls = flaky([500] * 10)
+        transport = self._transport(handler, max_retries=2)
+
+        response = transport.request("GET", "https://news.example/a")
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(len(calls), 3)
+
+    def test_client_errors_are_not_retried(self):
+        handler, calls = flaky([404])
+        response = self._transport(handler).request("GET", "https://news.example/a")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(len(calls), 1)
+
+    def test_connection_errors_are_retried_then_raised(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            raise httpx.ConnectError("refused", request=request)
+
+        transport = self._transport(handler, max_retries=2)
+        with self.assertRaises(httpx.ConnectError):
+            transport.request("GET", "https://news.example/a")
+        self.assertEqual(len(calls), 3)
+
+    def test_retry_after_is_honored(self):
+        """Retry-After overrides the jittered backoff, capped at backoff_max."""
+        handler, _ = flaky([429], headers={'Retry-After': '0.2'})
+        transport = self._transport(handler, backoff_base=10.0)
+
+        start = time.perf_counter()
+        transport.request("GET", "https://news.example/a")
+        self.assertGreaterEqual(time.perf_counter() - start, 0.2)
+
+        capped = self._transport(handler, backoff_max=0.1)
+        self.assertEqual(capped._backoff(0, httpx.Response(429, headers={'Retry-After': '60'})), 0.1)
+
+    def test_backoff_grows_with_jitter(self):
+        transport = HttpTransport(backoff_base=1.0, backoff_max=5.0)
+        delays = [transport._backoff(3, None) for _ in range(50)]
+        self.assertTrue(all(0 <= d <= 5.0 for d in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+    def test_per_host_concurrency_cap(self):
+        """No more than per_host_concurrency requests to one host run at once."""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def handler(request):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop()
+            return httpx.Response(200)
+
+        transport = self._transport(handler, per_host_concurrency=2)
+        threads = [
+            threading.Thread(target=transport.request, args=("GET", f"https://news.example/{i}"))
+            for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLessEqual(max(peak), 2)
+
+    def test_async_retries(self):
+        handler, calls = flaky([502])
+        transport = self._transport(handler)
+
+        async def run():
+            try:
+                return await transport.arequest("GET", "https://news.example/a")
+            finally:
+                await transport.aclose()
+
+        response = asyncio.run(run())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(calls), 2)
+
+    def test_metrics_record_retries(self):
+        handler, _ = flaky([503])
+        transport = self._transport(handler)
+        with track_analysis() as metrics:
+            transport.request("GET", "https://news.example/a")
+
+        self.assertEqual(metrics.to_dict()['http']['requests'], 1)
+        self.assertEqual(metrics.to_dict()['http']['retries'], 1)
+
+
+class TestConnectionReuse(unittest.TestCase):
+    """Keep-alive against a real local server."""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_sequential_requests_share_a_connection(self):
+        transport = HttpTransport()
+        try:
+            for _ in range(3):
+                transport.request("GET", self.url)
+        finally:
+            transport.close()
+
+        stats = transport.stats()
+        self.assertEqual(stats['connections_opened'], 1)
+        self.assertEqual(stats['connections_reused'], 2)
+
+    def test_async_requests_share_a_connection(self):
+        transport = HttpTransport()
+
+        async def run():
+            try:
+                for _ in range(3):
+                    await transport.arequest("GET", self.url)
+            finally:
+                await transport.aclose()
+
+        asyncio.run(run())
+        self.assertEqual(transport.stats()['connections_reused'], 2)
+
+    def test_client_of_previous_loop_is_closed(self):
+        transport = HttpTransport()
+
+        async def fetch():
+            await transport.arequest("GET", self.url)
+            return transport.async_client()
+
+        idle_loop = asyncio.new_event_loop()
+        try:
+            first = idle_loop.run_until_complete(fetch())
+            second = asyncio.run(fetch())  # The first loop is open but stopped: closed here
+            self.assertTrue(first.is_closed)
+        finally:
+            idle_loop.close()
+
+        async def fetch_and_close():
+            client = await fetch()
+            self.assertTrue(second.is_closed)  # The previous loop is closed: closed here
+            await transport.aclose()
+            return client
+
+        self.assertIsNot(asyncio.run(fetch_and_close()), second)
+
+    def test_client_of_running_loop_is_closed_there(self):
+        transport = HttpTransport()
+        running_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=running_loop.run_forever)
+        thread.start()
+        try:
+            async def fetch():
+                await transport.arequest("GET", self.url)
+                return transport.async_client()
+
+            first = asyncio.run_coroutine_threadsafe(fetch(), running_loop).result(timeout=5)
+            asyncio.run(fetch())
+            asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), running_loop).result(timeout=5)
+            self.assertTrue(first.is_closed)
+        finally:
+            running_loop.call_soon_threadsafe(running_loop.stop)
+            thread.join()
+            running_loop.close()
+
+
+if __name__ == '__main__':
+    unittest.main()